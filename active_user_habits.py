@@ -1,4 +1,4 @@
-import datetime as dt
+from clock import system_clock
 
 class ActiveUserHabit:
     """
@@ -16,11 +16,12 @@ class ActiveUserHabit:
         goal_streak (int): The number of consecutive days/ weeks/ months the user is aiming to check off the habit.
         end_date (datetime): The date and time when the user plans to stop tracking the habit.
     """
-    def __init__(self, user_ID, habit_ID, interval_ID, goal_streak=None, end_date=None, last_check=None, update_expiry=None):
+    def __init__(self, user_ID, habit_ID, interval_ID, goal_streak=None, end_date=None, last_check=None, update_expiry=None, clock=None):
+        # The clock is only used for the starting_date and not stored, vars() of the object is inserted into active_user_habits
         self.user_ID = user_ID
         self.habit_ID = habit_ID
         self.interval_ID = interval_ID
-        self.starting_date = dt.datetime.now()
+        self.starting_date = (clock or system_clock)()
         self.last_check = last_check
         self.update_expiry = update_expiry
         self.streak = 0
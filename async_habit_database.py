@@ -0,0 +1,174 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncHabitDatabase:
+    """
+    An asyncio front end for MySQLDatabase (or SQLiteDatabase) for headless services which don't use the tkinter app.
+
+    The blocking methods of the wrapped database object are run on a bounded pool of worker threads. The connection
+    and cursor of MySQLDatabase are kept per thread, so several calls can run at the same time. A semaphore limits the
+    number of calls in flight to max_workers, so a large fan-out waits for a free worker instead of queueing up connections.
+
+        async with AsyncHabitDatabase(db) as async_db:
+            daily, weekly, monthly = await async_db.get_leaderboards()
+
+    Attributes:
+        db (MySQLDatabase): The database object whose methods are run on the worker threads.
+        max_workers (int): The maximum number of database calls which run at the same time.
+
+    Methods:
+        __init__: Initializes the AsyncHabitDatabase object.
+        run: Runs any method of the wrapped database object on a worker thread.
+        get_active_habits: Retrieves all active habits for a given user.
+        get_dashboard_rows: Retrieves the rows of the active habits table of the main screen for a given user.
+        get_global_active_habits: Retrieves all active habits across all users with a given monitoring interval.
+        get_leaderboards: Retrieves the global active habits of several monitoring intervals concurrently.
+        insert_data: Inserts a row of data into a table.
+        update_data: Updates a row of data in a table.
+        check_off: Checks off an active habit and returns the new state.
+        mark_expired_habits: Sets all overdue active habits to 'failed'.
+        close: Stops the worker threads and closes the wrapped database object.
+    """
+    def __init__(self, db, max_workers=4):
+        """
+        Initializes a new AsyncHabitDatabase object.
+
+        Args:
+            db (MySQLDatabase): The database object whose methods are run on the worker threads.
+            max_workers (Optional[int]): Per Default 4. The number of worker threads, it should not be larger than the connection pool.
+        """
+        self.db = db
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="habit-tracker-async-db")
+        self._semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Runs a blocking function, e.g. a method of the wrapped database object, on a worker thread.
+
+        Args:
+            func (callable): The function to run.
+            *args: The arguments of the function.
+            **kwargs: The keyword arguments of the function.
+
+        Returns:
+            The return value of the function. Exceptions of the function are raised in the calling coroutine.
+        """
+        # The semaphore is created lazily, so it belongs to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def get_active_habits(self, user_ID):
+        """
+        Retrieves all active habits for a given user, see MySQLDatabase.get_active_habits.
+
+        Args:
+            user_ID (int): The ID of the user.
+
+        Returns:
+            list: The active habits of the user.
+        """
+        return await self.run(self.db.get_active_habits, user_ID)
+
+    async def get_dashboard_rows(self, user_ID):
+        """
+        Retrieves the rows of the active habits table of the main screen, see MySQLDatabase.get_dashboard_rows.
+
+        Args:
+            user_ID (int): The ID of the user.
+
+        Returns:
+            list: The DashboardRow tuples of the user.
+        """
+        return await self.run(self.db.get_dashboard_rows, user_ID)
+
+    async def get_global_active_habits(self, interval_ID):
+        """
+        Retrieves all active habits across all users with a given monitoring interval, see MySQLDatabase.get_global_active_habits.
+
+        Args:
+            interval_ID (int): The ID of the monitoring interval.
+
+        Returns:
+            list: The active habits sorted by the streak decreasing.
+        """
+        return await self.run(self.db.get_global_active_habits, interval_ID)
+
+    async def get_leaderboards(self, interval_IDs=(1, 2, 3)):
+        """
+        Retrieves the global active habits of several monitoring intervals concurrently with asyncio.gather.
+
+        Args:
+            interval_IDs (Optional[iterable]): Per Default the daily, weekly and monthly interval.
+
+        Returns:
+            list: One list of active habits per interval ID, in the order of the interval IDs.
+        """
+        return list(await asyncio.gather(*(self.get_global_active_habits(interval_ID) for interval_ID in interval_IDs)))
+
+    async def insert_data(self, table_name, data):
+        """
+        Inserts a row of data into a table, see MySQLDatabase.insert_data.
+
+        Args:
+            table_name (str): The name of the table.
+            data (dict): The values to be inserted, with keys corresponding to column names.
+        """
+        return await self.run(self.db.insert_data, table_name, data)
+
+    async def update_data(self, table_name, data, object, ID):
+        """
+        Updates a row of data in a table, see MySQLDatabase.update_data.
+
+        Args:
+            table_name (str): The name of the table.
+            data (dict): The values to be updated, with keys corresponding to column names.
+            object (str): The name of the primary key without '_ID'.
+            ID (int): The ID of the row.
+        """
+        return await self.run(self.db.update_data, table_name, data, object, ID)
+
+    async def check_off(self, active_habits_ID, user_ID, now):
+        """
+        Checks off an active habit, see MySQLDatabase.check_off.
+
+        Args:
+            active_habits_ID (int): The ID of the active habit.
+            user_ID (int): The ID of the user who owns the active habit.
+            now (datetime.datetime): The time of the check.
+
+        Returns:
+            CheckOffResult: The new state of the active habit.
+        """
+        return await self.run(self.db.check_off, active_habits_ID, user_ID, now)
+
+    async def mark_expired_habits(self, user_ID=None, now=None):
+        """
+        Sets all overdue active habits which are still 'in progress' to 'failed', see MySQLDatabase.mark_expired_habits.
+
+        Args:
+            user_ID (Optional[int]): Per Default None. Only the active habits of this user are changed.
+            now (Optional[datetime.datetime]): Per Default None, which uses the time of the database.
+
+        Returns:
+            int: The number of active habits which were set to 'failed'.
+        """
+        return await self.run(self.db.mark_expired_habits, user_ID, now)
+
+    def close(self):
+        """
+        Waits for the running calls, stops the worker threads and closes the wrapped database object.
+        """
+        self._executor.shutdown(wait=True)
+        self.db.close()
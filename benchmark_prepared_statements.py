@@ -0,0 +1,92 @@
+"""
+Measures the per-call latency of the hot queries with the old f-string SQL and with the prepared statements of the statement registry.
+
+    python benchmark_prepared_statements.py --mysql localhost root password 3306 habit_tracker
+    python benchmark_prepared_statements.py
+
+Prepared statements are measured with --mysql: the queries run against an existing MySQL database with the sample data,
+on one pooled connection, so the registry prepares every statement once and reuses it.
+Without arguments a temporary SQLite database with the sample data is used. SQLite runs the registered statements on the
+normal cursor, so these numbers are only a baseline for the parameterized queries and show nothing about prepared statements.
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from database import open_database
+from sqlite_database import SQLiteDatabase
+
+
+# The f-string queries of the hot paths before the statement registry, with the registered statement which replaced them
+CASES = [
+    ('get_streak', lambda ID: f"SELECT streak FROM active_user_habits WHERE active_habits_ID = {ID}", lambda ID: (ID,)),
+    ('get_active_habit_ID', lambda ID: f"SELECT active_habits_ID FROM active_user_habits WHERE user_ID = {ID % 3 + 1} AND habit_ID = {ID} AND status = 'in progress'",
+     lambda ID: (ID % 3 + 1, ID, 'in progress')),
+    ('get_habit_ID', lambda ID: f"SELECT habit_ID FROM habits WHERE habit_name = 'Habit {ID}' AND user_ID = 1", lambda ID: (f"Habit {ID}", 1)),
+]
+
+
+def measure(function, calls):
+    # Returns the latency of every call in microseconds
+    latencies = []
+    for i in range(calls):
+        start = time.perf_counter()
+        function(i % 50 + 1)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    return latencies
+
+
+def run(db, calls):
+    """
+    Runs every case with the f-string query on the normal cursor and with the prepared statement on one connection.
+
+    Args:
+        db (MySQLDatabase): The database object with the sample data.
+        calls (int): The number of calls per case and variant.
+    """
+    db.connect()
+    try:
+        print(f"{'statement':<22}{'f-string mean':>15}{'registry mean':>15}{'f-string p50':>14}{'registry p50':>14}")
+        for name, f_string_query, params in CASES:
+            def before(ID):
+                db.cursor.execute(f_string_query(ID))
+                return db.cursor.fetchall()
+
+            def after(ID):
+                return db.query_statement(name, params(ID))
+
+            # Warm up both variants, so the first prepare is not measured
+            before(1)
+            after(1)
+            old = measure(before, calls)
+            new = measure(after, calls)
+            print(f"{name:<22}{statistics.mean(old):>13.1f}us{statistics.mean(new):>13.1f}us{statistics.median(old):>12.1f}us{statistics.median(new):>12.1f}us")
+        print(f"Statement registry: {db.statement_stats()}")
+    finally:
+        db.disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mysql', nargs=5, metavar=('HOST', 'USER', 'PASSWORD', 'PORT', 'DATABASE'))
+    parser.add_argument('--calls', type=int, default=2000)
+    args = parser.parse_args()
+
+    if args.mysql:
+        host, user, password, port, database = args.mysql
+        db = open_database([host, user, password, int(port), database], pool_size=1)
+        run(db, args.calls)
+        db.close()
+        return
+
+    print("SQLite baseline without prepared statements, use --mysql to measure them")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = SQLiteDatabase(os.path.join(tmp_dir, "benchmark"))
+        db.create_database_file(db.database)
+        run(db, args.calls)
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Measures how long the streak engines need for one tick (countdowns and expiry transitions) and for checking off a batch of active habits.
+
+    python benchmark_streak_engine.py
+    python benchmark_streak_engine.py --rows 1000 10000 100000 --repeat 5
+
+The rows are generated in memory with deadlines spread over the next month, about 10 % of them are expired.
+The tick is measured with the StreakEngine (one timedelta per row), with the VectorizedStreakEngine (NumPy) and
+with countdown_arrays on a datetime64 array, the path of batch jobs which don't need row objects.
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime as dt
+from datetime import timedelta
+from database import DashboardRow
+from streak_engine import StreakEngine
+from vectorized_streak_engine import VectorizedStreakEngine, to_datetime64
+
+
+# The rows of the monitoring_interval table
+INTERVALS = [(1, 'daily', 1), (2, 'weekly', 7), (3, 'monthly', 30)]
+
+
+def generate_rows(count, now):
+    # Returns count dashboard rows with random intervals and deadlines
+    rows = []
+    for active_habits_ID in range(1, count + 1):
+        interval_ID, control_interval, days = random.choice(INTERVALS)
+        update_expiry = now + timedelta(seconds=random.randint(-3 * 86400, 30 * 86400))
+        rows.append(DashboardRow(active_habits_ID, active_habits_ID, f"Habit {active_habits_ID}", random.randint(0, 50), interval_ID, control_interval, update_expiry, 'in progress'))
+    return rows
+
+
+def measure(function, repeat):
+    # Returns the duration of every run in milliseconds
+    durations = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def run(sizes, repeat):
+    """
+    Runs a tick and a batch check-off for every number of rows.
+
+    Args:
+        sizes (list): The numbers of rows.
+        repeat (int): The number of runs per number of rows.
+    """
+    now = dt.now()
+    engine = StreakEngine(INTERVALS, clock=lambda: now)
+    vectorized = VectorizedStreakEngine(INTERVALS, clock=lambda: now)
+    # Build the lookup table of the texts before measuring
+    vectorized.tick(generate_rows(1, now))
+    print(f"{'rows':>10}{'tick python':>14}{'tick numpy':>14}{'arrays numpy':>15}{'check-off':>14}   (median, per row)")
+    for size in sizes:
+        rows = generate_rows(size, now)
+        update_expiry = to_datetime64([row.update_expiry for row in rows])
+        in_progress = [row.status == 'in progress' for row in rows]
+        results = [measure(lambda: engine.tick(rows), repeat),
+                   measure(lambda: vectorized.tick(rows), repeat),
+                   measure(lambda: vectorized.countdown_arrays(update_expiry, in_progress), repeat),
+                   measure(lambda: engine.check_off_many(rows), repeat)]
+        print(f"{size:>10}" + "".join(f"{statistics.median(durations):>12.1f}ms" for durations in results) + "   "
+              + " ".join(f"{statistics.median(durations) * 1000 / size:.2f}us" for durations in results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 1000000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    random.seed(1)
+    run(args.rows, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
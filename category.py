@@ -1,4 +1,4 @@
-import datetime
+from clock import system_clock
 
 class Category:
     """A class representing a category for habits.
@@ -7,16 +7,17 @@ class Category:
         category_name (str): The name of the category.
         user_ID (int): The ID of the user who created the category.
         description (str, optional): A brief description of the category. Defaults to None.
-        creation_date (str, optional): The date and time when the category was created, in ISO format. Defaults to the current date and time.
+        creation_date (str, optional): The date and time when the category was created, in ISO format. Defaults to the current time of the clock.
 
     Methods:
         __repr__: Returns a string representation of the category object.
         create_dict: Returns a dictionary
     """
-    def __init__(self, category_name, user_ID, description = None, creation_date = None):
+    def __init__(self, category_name, user_ID, description = None, creation_date = None, clock = None):
+        # The clock is only used for the creation_date and not stored, the attributes are the columns of the category table
         self.category_name = category_name
         self.user_ID = user_ID
-        self.creation_date = creation_date if creation_date is not None else datetime.datetime.now().isoformat()
+        self.creation_date = creation_date if creation_date is not None else (clock or system_clock)().isoformat()
         self.description = description
 
      
@@ -0,0 +1,73 @@
+from datetime import datetime as dt
+from datetime import timedelta
+
+
+def system_clock():
+    """
+    The clock of the application: returns the current local time.
+    Everything which needs the current time takes a clock, a callable without arguments which returns a datetime.datetime,
+    so tests and the simulator can replace the time with a FakeClock.
+
+    Returns:
+        datetime.datetime: The current local time.
+    """
+    return dt.now()
+
+
+class FakeClock:
+    """
+    A clock which only moves when it is told to, used by the tests and the simulator to fast-forward days and weeks.
+    The object is called like system_clock.
+
+        clock = FakeClock(dt(2023, 5, 1, 8, 0))
+        main_screen = Main_screen(isTest=True, clock=clock)
+        clock.advance(days=1)
+
+    Attributes:
+        current (datetime.datetime): The time which is returned.
+
+    Methods:
+        __init__: Initializes the FakeClock object.
+        __call__: Returns the current time of the clock.
+        advance: Moves the clock forward.
+        set: Sets the clock to a time.
+    """
+    def __init__(self, start=None):
+        """
+        Initializes a new FakeClock object.
+
+        Args:
+            start (Optional[datetime.datetime]): Per Default None, which starts at the current time without microseconds.
+        """
+        self.current = start if start is not None else dt.now().replace(microsecond=0)
+
+    def __call__(self):
+        return self.current
+
+    def advance(self, delta=None, **kwargs):
+        """
+        Moves the clock forward.
+
+        Args:
+            delta (Optional[datetime.timedelta]): The time to move forward.
+            **kwargs: Used as the arguments of a timedelta if no delta is given, e.g. days=1.
+
+        Returns:
+            datetime.datetime: The new time of the clock.
+        """
+        self.current += delta if delta is not None else timedelta(**kwargs)
+        return self.current
+
+    def set(self, moment):
+        """
+        Sets the clock to a time. The clock can't be set back, so the deadlines seen by the code only move forward.
+
+        Args:
+            moment (datetime.datetime): The new time of the clock.
+
+        Raises:
+            Exception: If the time is before the current time of the clock.
+        """
+        if moment < self.current:
+            raise Exception(f"The clock can't be set back from {self.current} to {moment}")
+        self.current = moment
@@ -0,0 +1,226 @@
+import threading
+import time
+import mysql.connector
+
+
+class ConnectionPool:
+    """
+    A bounded pool of MySQL connections which can be leased and released again instead of opening a new connection for every query.
+
+    Attributes:
+        connect_args (dict): The keyword arguments passed to mysql.connector.connect for creating a new connection.
+        size (int): The maximum number of connections the pool opens at the same time.
+        timeout (float): The number of seconds a lease waits for a free connection before it fails.
+        health_check_interval (float): Connections idle for longer than this number of seconds are checked before they are leased again.
+        keepalive_interval (Optional[float]): If set, idle connections are pinged in the background every keepalive_interval seconds.
+
+    Methods:
+        __init__: Initializes the ConnectionPool object.
+        lease: Returns a healthy connection from the pool, opening a new one if the pool is not full yet.
+        release: Gives a leased connection back to the pool.
+        keepalive: Pings all idle connections so the server does not close them.
+        close_all: Closes all idle connections and stops the keepalive thread.
+        stats: Returns the counters of the pool as a dictionary.
+    """
+    def __init__(self, connect_args, size=5, timeout=10, health_check_interval=30, keepalive_interval=None, connection_factory=None):
+        """
+        Initializes a new ConnectionPool object. No connection is opened until the first lease.
+
+        Args:
+            connect_args (dict): The keyword arguments for mysql.connector.connect (host, user, password, port, database).
+            size (Optional[int]): Per Default set to 5. The maximum number of open connections.
+            timeout (Optional[float]): Per Default set to 10 seconds. How long a lease waits for a free connection.
+            health_check_interval (Optional[float]): Per Default set to 30 seconds. Idle time after which a connection is checked before it is leased.
+            keepalive_interval (Optional[float]): Per Default None. If set, a daemon thread pings idle connections in this interval.
+            connection_factory (Optional[callable]): Function used for opening a new connection. Defaults to mysql.connector.connect.
+        """
+        if size < 1:
+            raise ValueError("The pool size has to be at least 1.")
+        self.connect_args = connect_args
+        self.size = size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.keepalive_interval = keepalive_interval
+        self.connection_factory = connection_factory if connection_factory is not None else mysql.connector.connect
+
+        # Idle connections are stored together with the time they were released
+        self._idle = []
+        self._created = 0
+        self._in_use = 0
+        self._condition = threading.Condition()
+        self._closed = False
+
+        # Counters which can be read with the stats function
+        self.leases = 0
+        self.waits = 0
+        self.reconnects = 0
+
+        # Start the keepalive thread if an interval is set
+        self._keepalive_stop = threading.Event()
+        self._keepalive_thread = None
+        if keepalive_interval:
+            self._keepalive_thread = threading.Thread(target=self._keepalive_loop, name="ConnectionPool-keepalive", daemon=True)
+            self._keepalive_thread.start()
+
+    def lease(self):
+        """
+        Returns a connection from the pool. Idle connections are reused first, then new connections are opened
+        until the pool size is reached. If all connections are in use the call waits until one is released.
+
+        Returns:
+            connection: A healthy MySQL connection which has to be given back with the release function.
+
+        Raises:
+            Exception: If the pool is closed or no connection got free within the timeout.
+        """
+        deadline = time.monotonic() + self.timeout
+        has_waited = False
+
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise Exception("The connection pool is closed.")
+
+                # Reuse the most recently released connection
+                if self._idle:
+                    connection, released_at = self._idle.pop()
+                    self._in_use += 1
+                    self.leases += 1
+                    break
+
+                # Open a new connection if the pool is not full yet
+                if self._created < self.size:
+                    self._created += 1
+                    self._in_use += 1
+                    self.leases += 1
+                    connection, released_at = None, None
+                    break
+
+                # Otherwise wait until another caller releases a connection
+                if not has_waited:
+                    self.waits += 1
+                    has_waited = True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise Exception(f"No free database connection within {self.timeout} seconds.")
+                self._condition.wait(remaining)
+
+        # Open or check the connection outside of the lock, so other callers are not blocked by network calls
+        try:
+            if connection is None:
+                connection = self.connection_factory(**self.connect_args)
+            elif time.monotonic() - released_at > self.health_check_interval:
+                connection = self._ensure_healthy(connection)
+        except Exception:
+            self._forget_connection()
+            raise
+
+        return connection
+
+    def release(self, connection):
+        """
+        Gives a leased connection back to the pool. Open transactions are rolled back, so the next lease
+        does not see an old snapshot of the data.
+
+        Args:
+            connection: The connection which was returned by the lease function.
+        """
+        try:
+            if connection.in_transaction:
+                connection.rollback()
+        except Exception:
+            # A broken connection is closed and its slot is given free for a new one
+            self._close_quietly(connection)
+            self._forget_connection()
+            return
+
+        with self._condition:
+            self._in_use -= 1
+            if self._closed:
+                self._created -= 1
+                self._close_quietly(connection)
+            else:
+                self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+
+    def keepalive(self):
+        """
+        Pings all connections which are idle at the moment and replaces the ones which lost their connection.
+        This keeps the connections from running into the wait_timeout of the server.
+        """
+        # Take the idle connections out of the pool while they are checked
+        with self._condition:
+            idle = self._idle
+            self._idle = []
+            self._in_use += len(idle)
+
+        for connection, released_at in idle:
+            try:
+                connection = self._ensure_healthy(connection)
+            except Exception:
+                self._forget_connection()
+                continue
+            self.release(connection)
+
+    def close_all(self):
+        """
+        Closes all idle connections and stops the keepalive thread. Connections which are still leased
+        are closed when they are released.
+        """
+        self._keepalive_stop.set()
+        with self._condition:
+            self._closed = True
+            idle = self._idle
+            self._idle = []
+            self._created -= len(idle)
+            self._condition.notify_all()
+        for connection, released_at in idle:
+            self._close_quietly(connection)
+
+    def stats(self):
+        """
+        Returns the counters of the pool.
+
+        Returns:
+            dict: A dictionary with the number of leases, waits, reconnects as well as the open, idle and used connections.
+        """
+        with self._condition:
+            return {'leases': self.leases,
+                    'waits': self.waits,
+                    'reconnects': self.reconnects,
+                    'open': self._created,
+                    'idle': len(self._idle),
+                    'in_use': self._in_use,
+                    'size': self.size}
+
+    def _ensure_healthy(self, connection):
+        # Check the connection with a ping and reconnect if the server closed it
+        if connection.is_connected():
+            return connection
+        with self._condition:
+            self.reconnects += 1
+        try:
+            connection.reconnect(attempts=1, delay=0)
+            return connection
+        except Exception:
+            # Reconnect failed, so the old connection is replaced by a new one
+            self._close_quietly(connection)
+            return self.connection_factory(**self.connect_args)
+
+    def _forget_connection(self):
+        # Give the slot of a connection which could not be used free again
+        with self._condition:
+            self._created -= 1
+            self._in_use -= 1
+            self._condition.notify()
+
+    def _keepalive_loop(self):
+        while not self._keepalive_stop.wait(self.keepalive_interval):
+            self.keepalive()
+
+    @staticmethod
+    def _close_quietly(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
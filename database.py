@@ -1,6 +1,77 @@
+import atexit
 import mysql.connector
+import re
+import threading
 import time
+from collections import namedtuple
+from contextlib import contextmanager
 from tkinter import messagebox
+from connection_pool import ConnectionPool
+from instrumentation import Instrumentation, InstrumentedCursor, instrumented_method, method_scope, running_method
+from name_index import NameIndex
+from slow_query_log import SlowQueryLog
+from query_detector import QueryDetector
+from prepared_statements import StatementRegistry
+from query_cache import QueryCache, cached_query
+from reference_data import SYSTEM_USER_ID, get_reference_data, set_reference_data
+from schema_migrations import MigrationRunner
+from streak_engine import CheckOffResult
+from transaction import Transaction, TransactionConnection
+
+
+# Typed row returned by get_dashboard_rows. It is still a tuple, so it can be used like the other query results.
+DashboardRow = namedtuple('DashboardRow', ['active_habits_ID', 'habit_ID', 'habit_name', 'streak', 'interval_ID', 'control_interval', 'update_expiry', 'status'])
+
+# Matches a single row INSERT statement like the ones in inserts.txt
+INSERT_STATEMENT = re.compile(r"^\s*(INSERT\s+INTO\s+\w+\s*\([^)]*\)\s*VALUES)\s*(\(.*\))\s*;?\s*$", re.IGNORECASE | re.DOTALL)
+
+
+def batch_insert_statements(statements, batch_size=500):
+    """
+    Combines consecutive single row INSERT statements into the same table and columns into multi-row INSERT statements.
+    The order of the statements is kept, so foreign keys of the sample data still refer to rows which were inserted before.
+
+    Args:
+        statements (list): The SQL statements, e.g. the lines of inserts.txt.
+        batch_size (Optional[int]): Per Default 500. The maximum number of rows per INSERT statement.
+
+    Returns:
+        list: The batched statements. Statements which aren't single row INSERT statements are kept as they are.
+    """
+    batches = []
+    prefix = None
+    values = []
+    for statement in statements:
+        if not statement.strip():
+            continue
+        match = INSERT_STATEMENT.match(statement)
+        # Finish the current batch if the table or columns change, the batch is full or the statement can't be batched
+        key = ' '.join(match.group(1).split()) if match else None
+        if values and (key != prefix or len(values) >= batch_size):
+            batches.append(f"{prefix} {', '.join(values)}")
+            values = []
+        if match:
+            prefix = key
+            values.append(match.group(2))
+        else:
+            prefix = None
+            batches.append(statement.strip().rstrip(';'))
+    if values:
+        batches.append(f"{prefix} {', '.join(values)}")
+    return batches
+
+def in_placeholders(values):
+    """
+    Returns the placeholders for a parameterized IN (...) clause.
+
+    Args:
+        values (list): The values of the IN clause.
+
+    Returns:
+        str: One %s placeholder per value, separated by commas.
+    """
+    return ', '.join(['%s'] * len(values))
+
 
 class MySQLDatabase:
     """
@@ -12,36 +83,80 @@ class MySQLDatabase:
         password (str): The password for the MySQL server.
         database (Optional[str]): The name of the MySQL database to use.
         port (Optional[int], Default value 3306): The port of the database connection. 3306 is the  is the default port for the classic MySQL protocol ( port ), which is used by the mysql client, MySQL Connector.
+        pool (Optional[ConnectionPool]): The connection pool used in pooled mode. None if every call opens its own connection.
+        query_cache (Optional[QueryCache]): The cache for the habits and categories of the users. None if the cache is not enabled.
+        reference_data (ReferenceData): The system habits, system categories and monitoring intervals, loaded once per process.
+        name_index (Optional[NameIndex]): The IDs of the habits and categories of the logged in user by name. None if not loaded.
+        statements (StatementRegistry): The parameterized statements of the hot paths and, in pooled mode, their prepared cursors per connection.
+        instrumentation (Optional[Instrumentation]): The call counts and latencies per method and statement. None if not enabled.
+        slow_query_log (Optional[SlowQueryLog]): The log of the statements above a duration threshold. None if not enabled.
+        connection: The open connection of the calling thread.
+        cursor: The cursor of the calling thread.
 
     Methods:
         __init__: Initializes the MySQLDatabase object.
         connect: Connects to the MySQL server.
         disconnect: Disconnects from the MySQL server.
+        transaction: Runs several method calls on one connection and commits them once.
+        close: Closes all pooled connections.
+        pool_stats: Returns the counters of the connection pool.
+        enable_query_cache: Caches the results of the habit and category reads until they expire or the tables are written.
+        invalidate_cache: Removes the cached results which were read from the given tables.
+        cache_stats: Returns the hit and miss counters of the query cache.
+        query_statement: Executes a SELECT of the statement registry, on a prepared cursor in pooled mode.
+        execute_statement: Executes a write statement of the statement registry, on a prepared cursor in pooled mode.
+        statement_stats: Returns the counters of the statement registry.
+        enable_instrumentation: Records the call counts and latencies per method and statement.
+        instrumentation_stats: Returns the recorded call counts and latencies.
+        enable_slow_query_log: Logs the statements above a duration threshold with their EXPLAIN output.
+        explain: Returns the EXPLAIN output of a statement.
+        enable_query_detector: Reports statements which are repeated too often within one operation.
         create_database: Creates a new database on the MySQL server if it not allready exists.
         initialize_database: Initializes the database by creating tables and and inserts sample data using Insert statements.
         create_table: Creates a new table in the MySQL database.
         delete_table: Deletes a table from the MySQL database.
         insert_data: Inserts data into a table in the MySQL database.
+        insert_many: Inserts several rows into a table in the MySQL database within one transaction.
+        load_inserts: Executes the INSERT statements of a file in batches within one transaction.
         update_data: Updates data in a table in the MySQL database.
         check_value: Checks if a given value exists in a table in the MySQL database.
         get_user_credentials: Retrieves user credentials from the MySQL database.
         get_userID: Retrieves the user ID for a given username from the MySQL database.
         get_user_habits: Retrieves all habits for a given user from the MySQL database.
+        get_own_habits: Retrieves only the habits the given user created, without the system habits.
         get_habit_ID: Retrieves the habit ID for a given habit name and user ID from the MySQL database.
         get_active_habits: Retrieves all active habits for a given user from the MySQL database.
+        get_dashboard_rows: Retrieves everything the active habits table of the main screen needs for a given user with one query.
         get_global_active_habits: Retrieves all global active habits from the MySQL database.
         get_all_active_habits: Retrieves all active habits from the MySQL database.
         get_active_habit_ID: Retrieves the active habit ID for a given habit ID and user ID from the MySQL database.
         get_streak: Retrieves the current streak for a given user and habit from the MySQL database.
+        mark_expired_habits: Sets all overdue active habits which are still 'in progress' to 'failed' with one UPDATE.
+        check_off: Checks off an active habit with one conditional UPDATE and returns the new state.
+        check_off_many: Checks off several active habits with one conditional UPDATE and returns their new states.
+        delete_active_habit: Sets the status of one active habit to 'deleted' using its active_habits_ID.
+        delete_active_habits: Sets the status of several active habits to 'deleted' with one UPDATE.
         delete_habit: Deletes a habit for a given user from the MySQL database.
+        delete_habits: Deletes several habits with one DELETE.
         update_value: Updates the value for a given habit for a given user in the MySQL database.
         get_user_categories: Retrieves all categories for a given user from the MySQL database.
+        get_own_categories: Retrieves only the categories the given user created, without the system categories.
+        get_monitoring_intervals: Retrieves the rows of the monitoring_interval table.
         get_user_categories_name: Retrieves only the names of all categories for a given user from the MySQL database.
         get_category_ID: Retrieves the category ID for a given category name and user ID from the MySQL database.
+        get_name_index_rows: Retrieves the IDs and names of all habits and categories of a user and the system user with one query.
+        load_name_index: Loads the name index of the logged in user, so names are resolved without a query.
         delete_category: Deletes a category for a given user from the MySQL database.
+        delete_categories: Deletes several categories with one DELETE.
         execute_query: Executes a custom SQL query on the MySQL database.
+        migrate: Applies the pending schema migrations of the migrations folder.
     """
-    def __init__(self, host, user, password, port=3306, database = None):
+    # The statement which shows the execution plan of a query
+    EXPLAIN = "EXPLAIN"
+    # Locks the selected rows until the end of the transaction, so they can't change between a read and the following UPDATE
+    LOCK_ROWS = "FOR UPDATE"
+
+    def __init__(self, host, user, password, port=3306, database = None, pool_size = None, keepalive_interval = None):
         """
         Initializes a new MySQLDatabase object.
 
@@ -51,49 +166,412 @@ class MySQLDatabase:
             password (str): The password for the MySQL server.
             port (Optional[int]): Per Default set to 3306. Can be changed if antoher port is used.
             database (Optional[str]): The name of the MySQL database to use.
+            pool_size (Optional[int]): Per Default None. If set, connections are leased from a pool with this many connections
+                                       instead of opening a new connection for every call.
+            keepalive_interval (Optional[float]): Per Default None. Only used with a pool. If set, the idle pooled connections
+                                                  are pinged in the background every keepalive_interval seconds, so the server doesn't close them.
         """
         self.host = host
         self.user = user
         self.password = password
         self.port = port
         self.database = database
-        self.connection = None
-        self.cursor = None
+        # Connection and cursor are kept per thread, so the methods can also be called from worker threads (see db_executor.py)
+        self._local = threading.local()
+        self.pool = None
+        self.query_cache = None
+        self.name_index = None
+        # In pooled mode the hot paths run on server-side prepared statements, which are prepared once per pooled connection
+        self.statements = StatementRegistry()
+        self.instrumentation = None
+        self.slow_query_log = None
+        if pool_size:
+            self.pool = ConnectionPool({'host': host, 'user': user, 'password': password, 'port': port, 'database': database}, size=int(pool_size),
+                                       keepalive_interval=keepalive_interval)
     
+    @property
+    def connection(self):
+        return getattr(self._local, 'connection', None)
+
+    @connection.setter
+    def connection(self, connection):
+        self._local.connection = connection
+
+    @property
+    def cursor(self):
+        return getattr(self._local, 'cursor', None)
+
+    @cursor.setter
+    def cursor(self, cursor):
+        self._local.cursor = cursor
+
+    @property
+    def _leased(self):
+        return getattr(self._local, 'leased', False)
+
+    @_leased.setter
+    def _leased(self, leased):
+        self._local.leased = leased
+
+    @property
+    def _transaction(self):
+        return getattr(self._local, 'transaction', None)
+
+    @_transaction.setter
+    def _transaction(self, transaction):
+        self._local.transaction = transaction
+
+    @contextmanager
+    def transaction(self):
+        """
+        Opens a transaction on one pinned connection. All methods called on this thread within the with block run on this
+        connection, their commits are skipped and everything is committed once at the end. If an exception is raised
+        everything is rolled back. A nested with block joins the open transaction.
+
+            with db.transaction() as tx:
+                db.delete_active_habit(active_habits_ID, user_ID)
+                db.insert_data("active_user_habits", data)
+
+        Yields:
+            Transaction: The open transaction.
+        """
+        # Join the open transaction of this thread
+        transaction = self._transaction
+        if transaction is not None:
+            transaction.depth += 1
+            try:
+                yield transaction
+            finally:
+                transaction.depth -= 1
+            return
+
+        # Pin one connection and skip the commits of the methods
+        with method_scope("transaction"):
+            self.connect()
+        connection = self.connection
+        transaction = Transaction(connection, self.cursor)
+        self._transaction = transaction
+        self.connection = TransactionConnection(connection)
+        try:
+            yield transaction
+            transaction.commit()
+        except BaseException:
+            transaction.rollback()
+            # The cache and the name index could contain rows which were rolled back
+            if self.query_cache is not None:
+                self.query_cache.clear()
+            self.name_index = None
+            raise
+        finally:
+            self._transaction = None
+            self.connection = connection
+            self.cursor = transaction.cursor
+            self.disconnect()
+
     def connect(self):
         """
         Connects to the MySQL database using the credentials specified during object initialization.
+        In pooled mode the connection is leased from the connection pool instead.
 
         Raises:
             Exception: If the connection to the database fails.
         """
+        # Inside a transaction all statements run on its pinned connection
+        transaction = self._transaction
+        if transaction is not None:
+            self.cursor = self._instrument_cursor(transaction.cursor)
+            return
+
+        # Give back a leased connection which was not disconnected before, so the pool doesn't run empty
+        if self._leased:
+            self.disconnect()
+
+        connect_started = time.perf_counter()
         try:
-            self.connection = mysql.connector.connect(
-            host = self.host,
-            user = self.user,
-            password = self.password,
-            port = self.port,
-            database = self.database
-            )
-        except Exception as e: 
-            messagebox.showerror("Error","There is something wrong with your database credentials. Please check and try again.")
+            self.connection = self._acquire_connection()
+        except Exception as e:
+            # No messagebox here, connect also runs on the worker threads. The caller shows the error on the tkinter thread
             raise Exception("Failed to connect to MySQL database. Please check your credentials and try again.")
-        self.cursor = self.connection.cursor(buffered=True)
+        self.cursor = self._instrument_cursor(self.connection.cursor(buffered=True), connect_started)
 
     def disconnect(self):
         """
-        Disconnects from the MySQL database.
+        Disconnects from the MySQL database. In pooled mode the connection is given back to the pool.
 
         Note:
             This function does not raise any exceptions.
         """
+        # The connection of a transaction is kept until the transaction ends
+        if self._transaction is not None:
+            return
 
-        if self.connection is not None:
-            self.connection.close()
         if self.cursor is not None:
             self.cursor.close()
+        if self.connection is not None:
+            self._release_connection(self.connection)
+
+    def _acquire_connection(self):
+        # Lease a connection from the pool or open a new one
+        if self.pool is not None:
+            connection = self.pool.lease()
+            self._leased = True
+            return connection
+        return mysql.connector.connect(
+            host = self.host,
+            user = self.user,
+            password = self.password,
+            port = self.port,
+            database = self.database
+            )
+
+    def _release_connection(self, connection):
+        # Give the connection back to the pool or close it
+        if self.pool is not None:
+            # Release a leased connection only once, even if disconnect is called twice
+            if self._leased:
+                self._leased = False
+                self.pool.release(connection)
+        else:
+            connection.close()
+
+    def close(self):
+        """
+        Closes all connections of the connection pool. Does nothing if the object is not in pooled mode.
+        """
+        self.disconnect()
+        if self.slow_query_log is not None:
+            self.slow_query_log.close()
+        if self.pool is not None:
+            self.pool.close_all()
+
+    def pool_stats(self):
+        """
+        Returns the counters of the connection pool.
+
+        Returns:
+            dict: A dictionary with the number of leases, waits and reconnects, or an empty dictionary if not in pooled mode.
+        """
+        if self.pool is None:
+            return {}
+        return self.pool.stats()
+
+    def enable_query_cache(self, maxsize=256, ttl=300):
+        """
+        Caches the results of get_user_habits, get_user_categories, get_user_categories_name and get_category_ID.
+        A result is queried again when it expired or when one of its tables was written by a method of this object.
+
+        Args:
+            maxsize (Optional[int]): Per Default 256. The maximum number of cached results.
+            ttl (Optional[float]): Per Default 300 seconds. The time to live of a result.
+
+        Returns:
+            QueryCache: The new query cache.
+        """
+        self.query_cache = QueryCache(maxsize=maxsize, ttl=ttl)
+        return self.query_cache
+
+    def invalidate_cache(self, *tables):
+        """
+        Removes the cached results which were read from one of the given tables. Does nothing if the cache is not enabled.
+
+        Args:
+            *tables (str): The names of the tables which were written.
+        """
+        if self.query_cache is not None:
+            self.query_cache.invalidate(*tables)
+
+    def _drop_name_index(self, table_name):
+        # Names could have changed in a way the index can't follow, resolve them with queries until the next login
+        if table_name in NameIndex.TABLES:
+            self.name_index = None
+
+    def cache_stats(self):
+        """
+        Returns the counters of the query cache.
+
+        Returns:
+            dict: A dictionary with the number of hits, misses, evictions and invalidations, or an empty dictionary if the cache is not enabled.
+        """
+        if self.query_cache is None:
+            return {}
+        return self.query_cache.stats()
+
+    def _execute_statement(self, name, params=()):
+        # Without a pool every call opens a new connection, so a prepared statement would cost an extra round trip for one execution.
+        # The statement runs with its parameters on the normal cursor instead.
+        if self.pool is None:
+            self.cursor.execute(self.statements.sql(name), params)
+            return self.cursor
+
+        # Run the statement on its prepared cursor of the current connection, the pinned one within a transaction
+        transaction = self._transaction
+        connection = transaction.connection if transaction is not None else self.connection
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            return self.statements.execute(connection, name, params)
+
+        # Time the execution and hand out a cursor which times the fetch
+        query = self.statements.sql(name)
+        start = instrumentation.clock()
+        try:
+            cursor = self.statements.execute(connection, name, params)
+        except Exception:
+            instrumentation.record_execute(query, instrumentation.clock() - start)
+            raise
+        cursor = InstrumentedCursor(cursor, instrumentation)
+        cursor.executed(query, params, instrumentation.clock() - start)
+        return cursor
+
+    def query_statement(self, name, params=()):
+        """
+        Executes a SELECT statement of the current connection. The caller has to connect before.
+        In pooled mode it runs on the prepared cursor of the connection, otherwise on the normal cursor.
+
+        Args:
+            name (str): The name of a statement of the statement registry or the SQL of a statement with %s placeholders.
+            params (Optional[tuple]): The values of the placeholders.
+
+        Returns:
+            list: All rows of the result.
+        """
+        # Prepared cursors are not buffered, so all rows are fetched before the next statement
+        return self._execute_statement(name, params).fetchall()
+
+    def execute_statement(self, name, params=()):
+        """
+        Executes an INSERT, UPDATE or DELETE statement of the current connection. The caller has to connect and commit.
+        In pooled mode it runs on the prepared cursor of the connection, otherwise on the normal cursor.
+
+        Args:
+            name (str): The name of a statement of the statement registry or the SQL of a statement with %s placeholders.
+            params (Optional[tuple]): The values of the placeholders.
+
+        Returns:
+            int: The number of changed rows.
+        """
+        return self._execute_statement(name, params).rowcount
+
+    def statement_stats(self):
+        """
+        Returns the counters of the statement registry.
+
+        Returns:
+            dict: A dictionary with the number of prepared cursors, prepares, reuses and retries.
+        """
+        return self.statements.stats()
+
+    def enable_instrumentation(self, dump_path=None):
+        """
+        Records per method and per statement the number of calls, the fetched rows and the connect, execute and fetch times.
+        The times are kept in histograms, so the recording is cheap enough to stay enabled.
+
+        Args:
+            dump_path (Optional[str]): Per Default None. If set, the recording is written to this JSON file when the process exits.
+
+        Returns:
+            Instrumentation: The object which records the calls, e.g. for dump_json or format_table.
+        """
+        self.instrumentation = Instrumentation()
+        if dump_path:
+            atexit.register(self.instrumentation.dump_json, dump_path)
+        return self.instrumentation
+
+    def instrumentation_stats(self):
+        """
+        Returns the recorded calls and latencies.
+
+        Returns:
+            dict: The counters and histograms per method and statement, or an empty dictionary if the instrumentation is not enabled.
+        """
+        if self.instrumentation is None:
+            return {}
+        return self.instrumentation.stats()
+
+    def enable_slow_query_log(self, path="slow_queries.log", threshold=0.2, explain=True, max_bytes=1000000, backup_count=3):
+        """
+        Writes every statement which takes longer than the threshold with its parameters, duration and rows to a rotating
+        log file. The EXPLAIN output of slow SELECT statements is captured on a background thread.
+        Enables the instrumentation, because the statements are timed by it. Use `python slow_query_log.py` to summarize the log.
+
+        Args:
+            path (Optional[str]): Per Default "slow_queries.log". The path of the log file.
+            threshold (Optional[float]): Per Default 0.2 seconds. Statements which take longer are logged.
+            explain (Optional[bool]): Per Default True. Capture the EXPLAIN output of slow SELECT statements.
+            max_bytes (Optional[int]): Per Default 1 MB. The size at which the log file is rotated.
+            backup_count (Optional[int]): Per Default 3. The number of rotated files which are kept.
+
+        Returns:
+            SlowQueryLog: The slow query log.
+        """
+        if self.instrumentation is None:
+            self.enable_instrumentation()
+        if self.slow_query_log is not None:
+            self.instrumentation.remove_observer(self.slow_query_log)
+            self.slow_query_log.close()
+        self.slow_query_log = SlowQueryLog(path, threshold, self.explain if explain else None, max_bytes, backup_count)
+        self.instrumentation.add_observer(self.slow_query_log)
+        return self.slow_query_log
+
+    def enable_query_detector(self, threshold=5, report=print):
+        """
+        Reports statements with the same fingerprint which are executed more often than the threshold within one
+        operation, e.g. one query per row in a loop. The operations are opened with QueryDetector.operation or the
+        detect_queries decorator. Enables the instrumentation, because the statements are counted by it.
+
+        Args:
+            threshold (Optional[int]): Per Default 5. More executions of the same statement within one operation are reported.
+            report (Optional[callable]): Per Default print. Called with the message of a reported statement.
+
+        Returns:
+            QueryDetector: The query detector.
+        """
+        if self.instrumentation is None:
+            self.enable_instrumentation()
+        detector = QueryDetector(threshold, report)
+        self.instrumentation.add_observer(detector)
+        return detector
+
+    @instrumented_method
+    def explain(self, query, params=()):
+        """
+        Returns the execution plan of a statement without running it.
+
+        Args:
+            query (str): The SQL of the statement.
+            params (Optional[tuple]): The values of the placeholders.
+
+        Returns:
+            list: The rows of the EXPLAIN output as dictionaries by column name.
+        """
+        # Connect to database
+        self.connect()
+        try:
+            self.cursor.execute(f"{self.EXPLAIN} {query}", params)
+            rows = self.cursor.fetchall()
+            columns = [column[0] for column in self.cursor.description]
+        finally:
+            self.disconnect()
+        return [dict(zip(columns, row)) for row in rows]
+
+    def _instrument_cursor(self, cursor, connect_started=None):
+        # Count the call of the running decorated method and time the statements of its cursor.
+        # A connect outside of a decorated method, e.g. by a script, is counted as 'connect'.
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            return cursor
+        connect_seconds = None if connect_started is None else time.perf_counter() - connect_started
+        instrumentation.begin_call(running_method() or "connect", connect_seconds)
+        if isinstance(cursor, InstrumentedCursor):
+            return cursor
+        return InstrumentedCursor(cursor, instrumentation)
+
+    @property
+    def reference_data(self):
+        # Loaded at the first use and shared by all objects of the same database
+        return get_reference_data(self)
     
     
+    @instrumented_method
     def create_database(self,new_database):
         """
         Creates a new MySQL database with the given name if it does not already exist, and initializes the database with the necessary tables and sample data.
@@ -153,37 +631,19 @@ class MySQLDatabase:
 
         # Execute each SQL statement
         for statement in statements:
-            #print(statement)
+            if not statement:
+                continue
             try:
                 self.cursor.execute(statement)
-                self.connection.commit()
                 print(f"Table created")
             except Exception as e:
                 print(f"An error occurred while executing SQL statement: {statement}")
                 print(f"Error message: {str(e)}")
 
-        # Insert all predefinded insert statements using the insert.txt file. First open txt file:
-        with open('inserts.txt', 'r') as f:
-            inserts = f.readlines()
-        # Execeute each query in the file 
-        counter = 0
-        for insert in inserts:
-            try:
-                counter +=1
-                self.connect()
-                query = insert
-                self.cursor.execute(query)
-                self.connection.commit()
-                rows_affected = self.cursor.rowcount
-                if rows_affected == 0:
-                    print("No rows were inserted into the database.")
-                else:
-                    print(f"{rows_affected} rows were inserted into the database.")
-                print(f"Insert {counter} executed, {query}")
-                time.sleep(0.15)
-            except Exception as e:
-                print("An error occurred:", e)
+        # Insert all predefinded insert statements of the inserts.txt file in batches on the same connection
+        self.load_inserts('inserts.txt')
 
+    @instrumented_method
     def create_table(self, table_name, *columns):
         """
         Creates a new table in the database if it doesn't already exist.
@@ -208,6 +668,7 @@ class MySQLDatabase:
             print(f"Table '{table_name}' created successfully")
         self.disconnect()
     
+    @instrumented_method
     def delete_table(self, table_name):
         """
         Deletes a table from the database.
@@ -225,6 +686,7 @@ class MySQLDatabase:
  
  
     # Inserts Values into tables  
+    @instrumented_method
     def insert_data(self, table_name, data):
         """
         Inserts a row of data into a table.
@@ -234,7 +696,7 @@ class MySQLDatabase:
             data (dict): A dictionary containing the values to be inserted into the table, with keys corresponding to column names.
 
         Returns:
-            None
+            int: The ID of the inserted row.
         """
 
         # Establish a connection to the database
@@ -249,13 +711,99 @@ class MySQLDatabase:
         # Execute the SQL query to insert data into the table
         self.cursor.execute(query, values)
         self.connection.commit()
+        self.invalidate_cache(table_name)
+        row_ID = self.cursor.lastrowid
+
+        # Keep the name index coherent with a new habit or category
+        if self.name_index is not None:
+            self.name_index.added(table_name, data, row_ID)
 
         # Print the number of rows inserted into the table
         print(f"{self.cursor.rowcount} row(s) inserted into {table_name}.")
 
         # Disconnct from the datbase
         self.disconnect()
+        return row_ID
+
+    @instrumented_method
+    def insert_many(self, table_name, rows):
+        """
+        Inserts several rows into a table with executemany within one transaction.
+        For INSERT statements MySQL Connector sends the rows as one multi-row INSERT.
+
+        Args:
+            table_name (str): The name of the table into which the rows should be inserted.
+            rows (list): A list of dictionaries with the same keys, the keys correspond to column names.
+
+        Returns:
+            int: The number of inserted rows.
+
+        Raises:
+            Exception: If the insert fails. Nothing is inserted in this case.
+        """
+        if not rows:
+            return 0
+
+        # Establish a connection to the database
+        self.connect()
+
+        # Construct the SQL query from the keys of the first row
+        columns = list(rows[0].keys())
+        placeholders = ', '.join(['%s'] * len(columns))
+        query = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+        values = [tuple(None if row[column] == '' else row[column] for column in columns) for row in rows] # set None for empty string values in dict
+
+        # Execute the query for all rows and commit them together
+        try:
+            self.cursor.executemany(query, values)
+            self.connection.commit()
+            self.invalidate_cache(table_name)
+            self._drop_name_index(table_name)
+        except Exception as e:
+            self.connection.rollback()
+            raise Exception(f"Failed to insert rows into {table_name}: {e}")
+        finally:
+            self.disconnect()
+
+        print(f"{len(values)} row(s) inserted into {table_name}.")
+        return len(values)
 
+    def load_inserts(self, file_name, batch_size=500):
+        """
+        Executes the INSERT statements of a file (one statement per line, like inserts.txt) on the current connection.
+        Consecutive statements into the same table are combined into multi-row INSERT statements and everything is committed once.
+
+        Args:
+            file_name (str): The path of the file with the INSERT statements.
+            batch_size (Optional[int]): Per Default 500. The maximum number of rows per INSERT statement.
+
+        Returns:
+            int: The number of inserted rows.
+        """
+        # Open the file and combine the statements into batches
+        with open(file_name, 'r') as f:
+            batches = batch_insert_statements(f.readlines(), batch_size)
+
+        # Execute each batch and commit all of them together
+        rows_inserted = 0
+        try:
+            for batch in batches:
+                self.cursor.execute(batch)
+                rows_inserted += self.cursor.rowcount
+            self.connection.commit()
+            if self.query_cache is not None:
+                self.query_cache.clear()
+            # The system habits and categories could have changed, load them again at the next use
+            set_reference_data(self, None)
+            self.name_index = None
+            print(f"{rows_inserted} rows were inserted into the database with {len(batches)} statements.")
+        except Exception as e:
+            self.connection.rollback()
+            print("An error occurred:", e)
+            rows_inserted = 0
+        return rows_inserted
+
+    @instrumented_method
     def update_data(self, table_name, data, object, ID):
         """
         Updates the values of a row in a given table.
@@ -276,17 +824,20 @@ class MySQLDatabase:
         # Construct name of the primary key for where clause
         primary_key = f"{object}_ID"
         
-        # Set string for the sql query
-        set_str = ", ".join([f"{col_name} = '{col_value}'" for col_name, col_value in data.items()])
+        # Set string for the sql query, the values are sent as parameters
+        set_str = ", ".join([f"{col_name} = %s" for col_name in data.keys()])
         
-        # Execute the query for updating values
-        self.cursor.execute(f"UPDATE {table_name} SET {set_str} WHERE {primary_key} = {ID}")
+        # Execute the prepared query for updating values, it is prepared once per table and set of columns
+        self.execute_statement(f"UPDATE {table_name} SET {set_str} WHERE {primary_key} = %s", tuple(data.values()) + (ID,))
         self.connection.commit()
+        self.invalidate_cache(table_name)
+        self._drop_name_index(table_name)
 
         
         # Disconnect from database 
         self.disconnect()
 
+    @instrumented_method
     def  check_value(self, searched_value, table, column, value):
         """
         Searches for a specific value in a table column.
@@ -317,6 +868,7 @@ class MySQLDatabase:
             print("User not found.")
             self.disconnect()
     
+    @instrumented_method
     def get_user_credentials(self,user_ID):
         """
         Queries the database for user credentials using the user_ID as the primary key.
@@ -352,11 +904,12 @@ class MySQLDatabase:
         else:
             result_dict = {}
         
-        self.cursor.close()
-        self.connection.close()
+        # Disconnect from the database
+        self.disconnect()
         
         return result_dict
 
+    @instrumented_method
     def  get_userID(self, username):
         """
         Retrieves the unique user_ID for a given username.
@@ -391,6 +944,7 @@ class MySQLDatabase:
             print("User not found.")
             self.disconnect()
    
+    @cached_query("habits", "category")
     def get_user_habits(self, user_ID):
         """
         Retrieves all stored habits of a given user.
@@ -401,15 +955,34 @@ class MySQLDatabase:
         Returns:
             list of tuples: A list of tuples, where each tuple contains information about a habit, including the habit's ID, name, description, creation date, and category name.
         """
+        # Query only the habits of the user
+        habits = self.get_own_habits(user_ID)
+
+        # Add the predefined system user habits from the reference data. The Systemuser has the user_ID 99
+        if user_ID != SYSTEM_USER_ID:
+            habits = self.reference_data.habits + habits
+        return habits
+
+    @instrumented_method
+    def get_own_habits(self, user_ID):
+        """
+        Retrieves only the habits a given user created, without the predefined habits of the system user.
+
+        Args:
+            user_ID (int): The user_ID of the user whose habits to retrieve.
+
+        Returns:
+            list of tuples: The habits in the format of get_user_habits.
+        """
 
         # Establish connection to the database
         self.connect()
 
-        # Query for returning all habits from the user plus the predefined system user habits. The Systemuser has the user_ID 99
+        # Query for returning all habits from the user
         query = """SELECT habits.habit_ID, habits.habit_name, habits.description, habits.creation_date, category.category_name
 	                    FROM habits  
                         INNER JOIN category ON habits.category_ID = category.category_ID
-                        WHERE habits.user_ID = %s OR habits.user_ID = 99;                
+                        WHERE habits.user_ID = %s;                
                 """
         # Execute query    
         self.cursor.execute(query, (user_ID,))
@@ -420,6 +993,7 @@ class MySQLDatabase:
         return habits
     
     # Function to get a habit_ID by using the habit_name and user_ID
+    @instrumented_method
     def get_habit_ID(self, user_ID, habit_name):
         """
         Retrieves the habit_ID for a given habit name and user_ID.
@@ -429,25 +1003,29 @@ class MySQLDatabase:
             habit_name (str): The name of the habit to search for.
 
         Returns:
-            int: The habit_ID for the given habit name and user_ID, or None if no matching habit is found.
+            tuple: The habit_ID for the given habit name and user_ID as (habit_ID,), or None if no matching habit is found.
         """
-
-        # Connect to database
-        self.connect()
-
         # Information about user and habit
         self.user_ID = user_ID
         self.habit_name = habit_name
 
+        # The predefined system user habits are found in the reference data without a query
+        system_habit_ID = self.reference_data.habit_ID(habit_name)
+        if system_habit_ID is not None:
+            return (system_habit_ID,)
+
+        # The habits of the logged in user are found in the name index without a query
+        name_index = self.name_index
+        if name_index is not None and name_index.covers(user_ID):
+            habit_ID = name_index.habit_ID(user_ID, habit_name)
+            return (habit_ID,) if habit_ID is not None else None
+
+        # Connect to database
+        self.connect()
         
-        # Construct query for returning the habit_ID 
-        query = f'''SELECT habit_ID FROM habits
-                WHERE habit_name = '{habit_name}' AND (user_ID = {user_ID} OR user_ID = 99);
-                '''
-        
-        # Execute query
-        self.cursor.execute(query)
-        habit_ID = self.cursor.fetchone()
+        # Execute the prepared query for returning the habit_ID
+        rows = self.query_statement('get_habit_ID', (habit_name, user_ID))
+        habit_ID = rows[0] if rows else None
 
         # Commit changes to the database
         self.connection.commit()
@@ -458,6 +1036,7 @@ class MySQLDatabase:
         # Return the habit_ID
         return habit_ID
     
+    @instrumented_method
     def get_active_habits(self, user_ID):
         """
         Returns all stored active habits of a user, excluding those with the status 'deleted'.
@@ -493,10 +1072,6 @@ class MySQLDatabase:
 
         # Commit changes to the database
         self.connection.commit()
-        
-        # Close cursor and connection
-        self.cursor.close()
-        self.connection.close()
 
         # Disconnect function
         self.disconnect()
@@ -504,6 +1079,52 @@ class MySQLDatabase:
         # Return loist with active habits
         return active_habits
     
+    @instrumented_method
+    def get_dashboard_rows(self, user_ID):
+        """
+        Returns everything the active habits table of the main screen needs for a user with a single query,
+        excluding active habits with the status 'deleted'.
+
+        Args:
+            user_ID (int): The user ID for the user whose active habits are to be retrieved.
+
+        Returns:
+            A list of DashboardRow tuples with the following values:
+            - active_habits_ID (int): The ID of the active habit.
+            - habit_ID (int): The ID of the habit.
+            - habit_name (str): The name of the habit.
+            - streak (int): The current streak of the active habit.
+            - interval_ID (int): The ID of the monitoring interval.
+            - control_interval (str): The name of the monitoring interval (daily, weekly, monthly).
+            - update_expiry (datetime.datetime): The deadline until the habit has to be checked off.
+            - status (str): The status of the active habit.
+        """
+
+        # Establish connection to the database
+        self.connect()
+
+        # Query for returning all columns of the dashboard in one round trip
+        query = """SELECT active_user_habits.active_habits_ID, active_user_habits.habit_ID, habits.habit_name, active_user_habits.streak, active_user_habits.interval_ID, monitoring_interval.control_interval, active_user_habits.update_expiry, active_user_habits.status
+                    FROM active_user_habits
+                    INNER JOIN habits ON active_user_habits.habit_ID = habits.habit_ID
+                    INNER JOIN monitoring_interval ON active_user_habits.interval_ID = monitoring_interval.interval_ID
+                    WHERE active_user_habits.user_ID = %s AND active_user_habits.status != 'deleted'
+                    ORDER BY active_user_habits.active_habits_ID;
+                """
+        # Execute constructed query
+        self.cursor.execute(query, (user_ID,))
+        rows = [DashboardRow(*record) for record in self.cursor.fetchall()]
+
+        # Commit changes to the database
+        self.connection.commit()
+
+        # Disconnect function
+        self.disconnect()
+
+        # Return list with typed rows
+        return rows
+
+    @instrumented_method
     def get_global_active_habits(self,interval_ID):
         """
         Returns all stored active habits across all users with a given monitoring interval.
@@ -526,32 +1147,18 @@ class MySQLDatabase:
         # Connect to database
         self.connect()
 
-        # Query for returning all active habits from the user.
-        query = f"""SELECT active_user_habits.active_habits_ID, habits.habit_name, active_user_habits.starting_date, active_user_habits.last_check, active_user_habits.update_expiry, active_user_habits.streak, monitoring_interval.control_interval, active_user_habits.status, user_table.username
-	                    FROM active_user_habits  
-                        INNER JOIN habits ON active_user_habits.habit_ID = habits.habit_ID
-                        INNER JOIN monitoring_interval ON active_user_habits.interval_ID = monitoring_interval.interval_ID
-                        INNER JOIN user_table ON active_user_habits.user_ID = user_table.user_ID
-                        WHERE active_user_habits.interval_ID = {interval_ID}   
-                        ORDER BY active_user_habits.streak DESC;
-                """
-        
-        # Execute constructed query
-        self.cursor.execute(query)
-        active_habits = self.cursor.fetchall()
+        # Execute the prepared query for returning all active habits with the monitoring interval
+        active_habits = self.query_statement('get_global_active_habits', (interval_ID,))
 
         # Commit changes to the database
         self.connection.commit()
-        
-        # Close cursor and connection
-        self.cursor.close()
-        self.connection.close()
 
         # Disconnect function
         self.disconnect()
         # Return list
         return active_habits
     
+    @instrumented_method
     def get_all_active_habits(self, user_ID):
         """
         Returns all stored active habits of a user.
@@ -588,10 +1195,6 @@ class MySQLDatabase:
 
         # Commit changes to the database
         self.connection.commit()
-        
-        # Close cursor and connection
-        self.cursor.close()
-        self.connection.close()
 
         # Disconnect function
         self.disconnect()
@@ -599,6 +1202,7 @@ class MySQLDatabase:
         # Return all active habits as a list of tuples
         return active_habits
 
+    @instrumented_method
     def get_active_habit_ID(self, user_ID, habit_ID, status):
         """
         Returns the active_habit_ID for a specific active habit of a user.
@@ -615,12 +1219,9 @@ class MySQLDatabase:
         # Connect to db.
         self.connect()
 
-        # Query
-        query = f""" SELECT active_habits_ID FROM active_user_habits
-                    WHERE user_ID = {user_ID} AND habit_ID = {habit_ID} AND status = "{status}";
-        """ 
-        self.cursor.execute(query)
-        active_habit_ID = self.cursor.fetchone()
+        # Execute the prepared query, the first matching row is used
+        rows = self.query_statement('get_active_habit_ID', (user_ID, habit_ID, status))
+        active_habit_ID = rows[0] if rows else ()
 
         # Commit changes to the database
         self.connection.commit()
@@ -635,6 +1236,7 @@ class MySQLDatabase:
             return result
     
     # Function to get the current streak for a active_habit
+    @instrumented_method
     def get_streak(self, active_habits_ID):
         """
         Returns the current streak for a specific active habit from a user.
@@ -649,15 +1251,9 @@ class MySQLDatabase:
         # Establish connection
         self.connect()
 
-        # Construct query
-        query = f"""SELECT streak FROM active_user_habits
-                    WHERE active_habits_ID = {active_habits_ID}"""
-        
-        # Execute query
-        self.cursor.execute(query)
-
-        # Get the streak
-        streak = self.cursor.fetchone()
+        # Execute the prepared query and get the streak
+        rows = self.query_statement('get_streak', (active_habits_ID,))
+        streak = rows[0] if rows else ()
 
         # Commit changes to the database
         self.connection.commit()
@@ -677,6 +1273,225 @@ class MySQLDatabase:
             # Return the current streak
             return result
          
+    @instrumented_method
+    def mark_expired_habits(self, user_ID = None, now = None):
+        """
+        Sets the status of all active habits which are still 'in progress' but whose update_expiry has passed to 'failed'.
+        This is done with one set-based UPDATE instead of one update per habit.
+
+        Args:
+            user_ID (Optional[int]): Only sweep the active habits of this user. Per Default None, which sweeps all users.
+            now (Optional[datetime.datetime]): The time to compare update_expiry with. Per Default None, which uses NOW() of the database server.
+
+        Returns:
+            int: The number of active habits which were set to 'failed'.
+        """
+
+        # Establish connection
+        self.connect()
+
+        # Construct the where clause depending on the given arguments
+        conditions = ["status = 'in progress'"]
+        params = []
+        if now is None:
+            conditions.append("update_expiry < NOW()")
+        else:
+            conditions.append("update_expiry < %s")
+            params.append(now)
+        if user_ID is not None:
+            conditions.append("user_ID = %s")
+            params.append(user_ID)
+        query = f"UPDATE active_user_habits SET status = 'failed' WHERE {' AND '.join(conditions)}"
+
+        # Execute query and get the number of changed rows
+        self.cursor.execute(query, tuple(params))
+        rows_affected = self.cursor.rowcount
+
+        # Commit changes to the database
+        self.connection.commit()
+
+        # Disconnect function
+        self.disconnect()
+
+        return rows_affected
+
+    def delete_active_habit(self, active_habits_ID, user_ID):
+        """
+        Sets the status of one active habit to 'deleted' using its primary key, so the habit isn't displayed any longer
+        but its streaks are kept for later analysis.
+
+        Args:
+            active_habits_ID (int): The ID of the active habit.
+            user_ID (int): The ID of the user, an active habit of another user isn't changed.
+
+        Returns:
+            int: The number of changed rows, 0 if the active habit doesn't exist or belongs to another user.
+        """
+
+        return self.delete_active_habits([active_habits_ID], user_ID)
+
+    @instrumented_method
+    def delete_active_habits(self, active_habits_IDs, user_ID):
+        """
+        Sets the status of several active habits to 'deleted' with one UPDATE in one transaction.
+
+        Args:
+            active_habits_IDs (list): The IDs of the active habits.
+            user_ID (int): The ID of the user, active habits of other users aren't changed.
+
+        Returns:
+            int: The number of changed rows.
+        """
+        active_habits_IDs = list(active_habits_IDs)
+        if not active_habits_IDs:
+            return 0
+
+        # Establish connection
+        self.connect()
+
+        # Update all active habits using their primary keys
+        query = f"UPDATE active_user_habits SET status = 'deleted' WHERE user_ID = %s AND active_habits_ID IN ({in_placeholders(active_habits_IDs)})"
+        try:
+            self.cursor.execute(query, (user_ID, *active_habits_IDs))
+            rows_affected = self.cursor.rowcount
+            self.connection.commit()
+        except Exception as e:
+            self.connection.rollback()
+            raise Exception(f"Failed to delete the active habits: {e}")
+        finally:
+            self.disconnect()
+
+        return rows_affected
+
+    @instrumented_method
+    def check_off(self, active_habits_ID, user_ID, now):
+        """
+        Checks off an active habit with one conditional UPDATE. The streak is increased by 1, last_check is set to now
+        and update_expiry is moved forward by the days of the monitoring interval.
+
+        The UPDATE only changes the row if the habit is still 'in progress', its update_expiry hasn't passed and
+        the current period wasn't checked already (update_expiry is at most one interval ahead, or the streak is 0).
+        Because the conditions are part of the UPDATE, two clients can't check off the same period twice.
+
+        Args:
+            active_habits_ID (int): The ID of the active habit.
+            user_ID (int): The ID of the user, an active habit of another user is 'not_found'.
+            now (datetime.datetime): The time of the check-off.
+
+        Returns:
+            CheckOffResult: The status 'checked', 'too_early', 'expired' or 'not_found' and the state of the active habit after the check-off.
+        """
+
+        # Establish connection
+        self.connect()
+
+        # Construct the conditional update, the interval days are taken from the monitoring_interval table
+        interval_days = "(SELECT monitoring_interval.days FROM monitoring_interval WHERE monitoring_interval.interval_ID = active_user_habits.interval_ID)"
+        query = f"""UPDATE active_user_habits
+                    SET streak = streak + 1,
+                        last_check = %s,
+                        update_expiry = DATE_ADD(update_expiry, INTERVAL {interval_days} DAY)
+                    WHERE active_habits_ID = %s
+                    AND user_ID = %s
+                    AND status = 'in progress'
+                    AND update_expiry > %s
+                    AND (streak = 0 OR update_expiry <= DATE_ADD(%s, INTERVAL {interval_days} DAY))"""
+
+        # Execute query and check if the row was changed
+        self.cursor.execute(query, (now, active_habits_ID, user_ID, now, now))
+        checked = self.cursor.rowcount == 1
+
+        # Read the state back on the same connection
+        self.cursor.execute("""SELECT active_user_habits.streak, active_user_habits.last_check, active_user_habits.update_expiry, active_user_habits.status, monitoring_interval.days
+                               FROM active_user_habits
+                               INNER JOIN monitoring_interval ON active_user_habits.interval_ID = monitoring_interval.interval_ID
+                               WHERE active_user_habits.active_habits_ID = %s AND active_user_habits.user_ID = %s""", (active_habits_ID, user_ID))
+        row = self.cursor.fetchone()
+
+        # Commit changes to the database
+        self.connection.commit()
+
+        # Disconnect function
+        self.disconnect()
+
+        # Find out why the habit wasn't checked off
+        if row is None:
+            return CheckOffResult('not_found', None, None, None, None)
+        streak, last_check, update_expiry, status, days = row
+        if checked:
+            result = 'checked'
+        elif status != 'in progress' or update_expiry <= now:
+            result = 'expired'
+        else:
+            result = 'too_early'
+        return CheckOffResult(result, streak, last_check, update_expiry, days)
+
+    @instrumented_method
+    def check_off_many(self, active_habits_IDs, user_ID, now):
+        """
+        Checks off several active habits with one conditional UPDATE in one transaction, see check_off for the conditions.
+        The streaks and deadlines are read and locked before the UPDATE and the new states are read back afterwards.
+        A habit was checked off if the UPDATE changed its streak and deadline. Comparing last_check with now wouldn't work:
+        a second check-off within the same second finds the last_check of the first one and MySQL rounds the microseconds of now.
+
+        Args:
+            active_habits_IDs (list): The IDs of the active habits.
+            user_ID (int): The ID of the user, active habits of other users are 'not_found'.
+            now (datetime.datetime): The time of the check-off.
+
+        Returns:
+            dict: The CheckOffResult of every active_habits_ID.
+        """
+        active_habits_IDs = list(active_habits_IDs)
+        if not active_habits_IDs:
+            return {}
+        placeholders = in_placeholders(active_habits_IDs)
+
+        # Establish connection
+        self.connect()
+
+        # Construct the conditional update for all active habits, the interval days are taken from the monitoring_interval table
+        interval_days = "(SELECT monitoring_interval.days FROM monitoring_interval WHERE monitoring_interval.interval_ID = active_user_habits.interval_ID)"
+        query = f"""UPDATE active_user_habits
+                    SET streak = streak + 1,
+                        last_check = %s,
+                        update_expiry = DATE_ADD(update_expiry, INTERVAL {interval_days} DAY)
+                    WHERE user_ID = %s AND active_habits_ID IN ({placeholders})
+                    AND status = 'in progress'
+                    AND update_expiry > %s
+                    AND (streak = 0 OR update_expiry <= DATE_ADD(%s, INTERVAL {interval_days} DAY))"""
+
+        try:
+            # Read and lock the states before the update, execute the update and read the states back in the same transaction
+            self.cursor.execute(f"SELECT active_habits_ID, streak, update_expiry FROM active_user_habits WHERE user_ID = %s AND active_habits_ID IN ({placeholders}) {self.LOCK_ROWS}",
+                                (user_ID, *active_habits_IDs))
+            before = {active_habits_ID: (streak, update_expiry) for active_habits_ID, streak, update_expiry in self.cursor.fetchall()}
+            self.cursor.execute(query, (now, user_ID, *active_habits_IDs, now, now))
+            self.cursor.execute(f"""SELECT active_user_habits.active_habits_ID, active_user_habits.streak, active_user_habits.last_check, active_user_habits.update_expiry, active_user_habits.status, monitoring_interval.days
+                                    FROM active_user_habits
+                                    INNER JOIN monitoring_interval ON active_user_habits.interval_ID = monitoring_interval.interval_ID
+                                    WHERE active_user_habits.user_ID = %s AND active_user_habits.active_habits_ID IN ({placeholders})""", (user_ID, *active_habits_IDs))
+            rows = self.cursor.fetchall()
+            self.connection.commit()
+        except Exception as e:
+            self.connection.rollback()
+            raise Exception(f"Failed to check off the active habits: {e}")
+        finally:
+            self.disconnect()
+
+        # Find out which habits were checked off and why the others weren't
+        results = {active_habits_ID: CheckOffResult('not_found', None, None, None, None) for active_habits_ID in active_habits_IDs}
+        for active_habits_ID, streak, last_check, update_expiry, status, days in rows:
+            if before.get(active_habits_ID) != (streak, update_expiry):
+                result = 'checked'
+            elif status != 'in progress' or update_expiry <= now:
+                result = 'expired'
+            else:
+                result = 'too_early'
+            results[active_habits_ID] = CheckOffResult(result, streak, last_check, update_expiry, days)
+        return results
+
+    @instrumented_method
     def delete_habit(self, habit_ID):
         """
         Deletes a habit from the habits table in the database.
@@ -688,18 +1503,56 @@ class MySQLDatabase:
         # Establish connection
         self.connect()
 
-        # Query for deleting a habit from the habits table using the habit_ID
-        query = f"""DELETE FROM habits WHERE habit_ID = {habit_ID};"""
-
-        # Execute query
-        self.cursor.execute(query)
+        # Execute the prepared query for deleting a habit from the habits table using the habit_ID
+        self.execute_statement('delete_habit', (habit_ID,))
 
         # Commit changes to the database
         self.connection.commit()
+        self.invalidate_cache("habits")
+        if self.name_index is not None:
+            self.name_index.removed("habits", habit_ID)
         
         # Disconnect function
         self.disconnect()
 
+    @instrumented_method
+    def delete_habits(self, habit_IDs):
+        """
+        Deletes several habits from the habits table with one DELETE in one transaction.
+
+        Args:
+            habit_IDs (list): The IDs of the habits to be deleted.
+
+        Returns:
+            int: The number of deleted habits.
+        """
+        habit_IDs = list(habit_IDs)
+        if not habit_IDs:
+            return 0
+
+        # Establish connection
+        self.connect()
+
+        # Query for deleting all habits using their habit_IDs
+        query = f"DELETE FROM habits WHERE habit_ID IN ({in_placeholders(habit_IDs)})"
+        try:
+            self.cursor.execute(query, tuple(habit_IDs))
+            rows_affected = self.cursor.rowcount
+            self.connection.commit()
+        except Exception as e:
+            self.connection.rollback()
+            raise Exception(f"Failed to delete the habits: {e}")
+        finally:
+            self.disconnect()
+
+        # Keep the cache and the name index coherent
+        self.invalidate_cache("habits")
+        if self.name_index is not None:
+            for habit_ID in habit_IDs:
+                self.name_index.removed("habits", habit_ID)
+        return rows_affected
+
+    @instrumented_method
     def update_value(self, table_name, data, column1, column2, value1, value2, join_table = None):
         """
         Updates a value in a  database table with the information of two columns.
@@ -716,17 +1569,21 @@ class MySQLDatabase:
         # Connect to db
         self.connect()      
         
-        # Set string for the sql query
-        set_str = ", ".join([f"{col_name} = '{col_value}'" for col_name, col_value in data.items()])
+        # Set string for the sql query, the values are sent as parameters
+        set_str = ", ".join([f"{col_name} = %s" for col_name in data.keys()])
         table_join = f" INNER JOIN {join_table} ON {table_name}"
         
-        # Execute the query for updating values
-        self.cursor.execute(f"UPDATE {table_name} SET {set_str} WHERE {table_name}.{column1} = '{value1}' AND {table_name}.{column2} = '{value2}';")
+        # Execute the prepared query for updating values
+        query = f"UPDATE {table_name} SET {set_str} WHERE {table_name}.{column1} = %s AND {table_name}.{column2} = %s"
+        self.execute_statement(query, tuple(data.values()) + (value1, value2))
         
         self.connection.commit()
+        self.invalidate_cache(table_name)
+        self._drop_name_index(table_name)
         print(f"Data updated successfully")
         self.disconnect()  
 
+    @cached_query("category")
     def get_user_categories(self, user_ID):
         """
         Retrieves all categories stored for a given user from the database.
@@ -741,12 +1598,31 @@ class MySQLDatabase:
             - description (str): The description of the category.
             - creation_date (str): The date when the category was created.
         """
+        # Query only the categories of the user
+        categories = self.get_own_categories(user_ID)
+
+        # Add the predefined system user categories from the reference data
+        if user_ID != SYSTEM_USER_ID:
+            categories = self.reference_data.categories + categories
+        return categories
+
+    @instrumented_method
+    def get_own_categories(self, user_ID):
+        """
+        Retrieves only the categories a given user created, without the predefined categories of the system user.
+
+        Args:
+        - user_ID (int): The unique identifier for the user.
+
+        Returns:
+        - categories (list of tuples): The categories in the format of get_user_categories.
+        """
         # Connect to db
         self.connect()
 
         query = """SELECT category.category_ID, category.category_name, category.description, category.creation_date
 	                    FROM category  
-                        WHERE category.user_ID = %s OR category.user_ID = 99;
+                        WHERE category.user_ID = %s;
                 """    
         self.cursor.execute(query, (user_ID,))
         categories = self.cursor.fetchall()
@@ -760,6 +1636,8 @@ class MySQLDatabase:
         return categories
     
     # Function for querying for all stored categories of a user (only catgeory name)
+    @cached_query("category")
+    @instrumented_method
     def get_user_categories_name(self, user_ID):
         """
         Retrieves the names of all categories stored for a given user from the database.
@@ -776,7 +1654,7 @@ class MySQLDatabase:
 
         query = """SELECT category.category_name
 	                    FROM category  
-                        WHERE category.user_ID = %s OR category.user_ID = 99;      
+                        WHERE category.user_ID = %s;      
                 """    
         self.cursor.execute(query, (user_ID,))
         categories = self.cursor.fetchall()
@@ -787,8 +1665,13 @@ class MySQLDatabase:
         # Disconnect function
         self.disconnect()
 
+        # Add the names of the predefined system user categories from the reference data
+        if user_ID != SYSTEM_USER_ID:
+            categories = [(category[1],) for category in self.reference_data.categories] + categories
         return categories
 
+    @cached_query("category")
+    @instrumented_method
     def get_category_ID(self, category_name, user_ID):
         """
         Retrieves the unique identifier for a category given its name and the unique identifier of its owner.
@@ -800,22 +1683,25 @@ class MySQLDatabase:
         Returns:
         - category_ID (int): The unique identifier for the category.
         """
-        
+        # The predefined system user categories are found in the reference data without a query
+        system_category_ID = self.reference_data.category_ID(category_name)
+        if system_category_ID is not None:
+            return system_category_ID
+
+        # The categories of the logged in user are found in the name index without a query
+        name_index = self.name_index
+        if name_index is not None and name_index.covers(user_ID):
+            return name_index.category_ID(user_ID, category_name)
+
         # Connect to db
         self.connect()
 
-        table = "category"
-        column = "category_name"
-
-        # Query for returning user_ID
-        sql = f"SELECT category_ID FROM {table} WHERE {column} = '{category_name}' AND (user_ID = {user_ID} OR user_ID = 99);"
-
-        # Execute Query
-        self.cursor.execute(sql)
-        result = self.cursor.fetchone()
+        # Execute the prepared query for returning the category_ID
+        rows = self.query_statement('get_category_ID', (category_name, user_ID))
+        result = rows[0] if rows else None
 
         # Print out the results
-        if len(result) > 0:
+        if result:
             category_ID = result[0]
 
             # Commit changes to the database
@@ -829,6 +1715,72 @@ class MySQLDatabase:
             self.connection.commit()
             self.disconnect()
     
+    @instrumented_method
+    def get_name_index_rows(self, user_ID):
+        """
+        Retrieves the IDs and names of all habits and categories of a user and the system user with one query.
+
+        Args:
+        - user_ID (int): The unique identifier for the user.
+
+        Returns:
+        - rows (list of tuples): The (table_name, ID, name, user_ID) tuples, table_name is 'habits' or 'category'.
+        """
+        # Connect to db
+        self.connect()
+
+        query = """SELECT 'habits', habits.habit_ID, habits.habit_name, habits.user_ID
+                        FROM habits
+                        WHERE habits.user_ID IN (%s, %s)
+                   UNION ALL
+                   SELECT 'category', category.category_ID, category.category_name, category.user_ID
+                        FROM category
+                        WHERE category.user_ID IN (%s, %s)
+                   ORDER BY 1, 2;
+                """
+        self.cursor.execute(query, (user_ID, SYSTEM_USER_ID, user_ID, SYSTEM_USER_ID))
+        rows = self.cursor.fetchall()
+
+        # Disconnect function
+        self.disconnect()
+
+        return rows
+
+    def load_name_index(self, user_ID):
+        """
+        Loads the IDs of the habits and categories of the logged in user and the system user with one query.
+        Afterwards get_habit_ID and get_category_ID resolve the names of this user without a query.
+
+        Args:
+        - user_ID (int): The unique identifier for the logged in user.
+
+        Returns:
+        - name_index (NameIndex): The loaded name index.
+        """
+        self.name_index = NameIndex(user_ID, self.get_name_index_rows(user_ID))
+        return self.name_index
+
+    @instrumented_method
+    def get_monitoring_intervals(self):
+        """
+        Retrieves the rows of the monitoring_interval table.
+
+        Returns:
+        - intervals (list of tuples): The (interval_ID, control_interval, days) tuples ordered by interval_ID.
+        """
+        # Connect to db
+        self.connect()
+
+        query = "SELECT interval_ID, control_interval, days FROM monitoring_interval ORDER BY interval_ID;"
+        self.cursor.execute(query)
+        intervals = self.cursor.fetchall()
+
+        # Disconnect function
+        self.disconnect()
+
+        return intervals
+
+    @instrumented_method
     def delete_category(self, category_ID):
         """Delete a category from a specific user in the database.
         
@@ -842,18 +1794,56 @@ class MySQLDatabase:
         # Connect to db
         self.connect()
 
-        # Query for deleting a category from the category table using the category_ID
-        query = f"""DELETE FROM category WHERE category_ID = {category_ID};"""
-
-        # Execute query
-        self.cursor.execute(query)
+        # Execute the prepared query for deleting a category from the category table using the category_ID
+        self.execute_statement('delete_category', (category_ID,))
 
         # Commit changes to the database
         self.connection.commit()
+        self.invalidate_cache("category")
+        if self.name_index is not None:
+            self.name_index.removed("category", category_ID)
         
         # Disconnect function
         self.disconnect()
 
+    @instrumented_method
+    def delete_categories(self, category_IDs):
+        """
+        Deletes several categories from the category table with one DELETE in one transaction.
+
+        Args:
+            category_IDs (list): The IDs of the categories to be deleted.
+
+        Returns:
+            int: The number of deleted categories.
+        """
+        category_IDs = list(category_IDs)
+        if not category_IDs:
+            return 0
+
+        # Connect to db
+        self.connect()
+
+        # Query for deleting all categories using their category_IDs
+        query = f"DELETE FROM category WHERE category_ID IN ({in_placeholders(category_IDs)})"
+        try:
+            self.cursor.execute(query, tuple(category_IDs))
+            rows_affected = self.cursor.rowcount
+            self.connection.commit()
+        except Exception as e:
+            self.connection.rollback()
+            raise Exception(f"Failed to delete the categories: {e}")
+        finally:
+            self.disconnect()
+
+        # Keep the cache and the name index coherent
+        self.invalidate_cache("category")
+        if self.name_index is not None:
+            for category_ID in category_IDs:
+                self.name_index.removed("category", category_ID)
+        return rows_affected
+
+    @instrumented_method
     def execute_query(self, query):
         """Execute a SQL query.
     
@@ -876,6 +1866,10 @@ class MySQLDatabase:
             results = self.cursor.fetchone()
         else:
             results = "Query executed successfully"
+            # The query could have written to any table
+            if self.query_cache is not None:
+                self.query_cache.clear()
+            self.name_index = None
 
         # Commit changes to the database
         self.connection.commit()
@@ -884,4 +1878,35 @@ class MySQLDatabase:
         self.disconnect()
 
         return results
-  
+
+    def migrate(self):
+        """
+        Applies the pending migrations of the migrations folder (e.g. new indexes) to the database, so existing installs are upgraded in place.
+
+        Returns:
+            list: The versions which were applied.
+        """
+        return MigrationRunner(self).migrate()
+
+
+def open_database(database_variables, pool_size = None, keepalive_interval = None):
+    """
+    Creates the database object for the values stored in the environment variable Database_Variables.
+
+    Args:
+        database_variables (list): The values host, user, password, port, database and optionally the engine ('MySQL' or 'SQLite').
+        pool_size (Optional[int]): Per Default None. Size of the connection pool, only used for MySQL.
+        keepalive_interval (Optional[float]): Per Default None. Seconds between the pings of the idle pooled connections, only used for MySQL with a pool.
+
+    Returns:
+        MySQLDatabase: A MySQLDatabase object or a SQLiteDatabase object if the engine is 'SQLite'.
+    """
+    host, user, password, port, database = database_variables[:5]
+    engine = database_variables[5] if len(database_variables) > 5 else "MySQL"
+
+    if engine == "SQLite":
+        # Import here, because sqlite_database itself imports this module
+        from sqlite_database import SQLiteDatabase
+        return SQLiteDatabase(database)
+    return MySQLDatabase(host, user, password, port, database, pool_size = pool_size, keepalive_interval = keepalive_interval)
+
@@ -0,0 +1,199 @@
+import contextvars
+import itertools
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import messagebox
+
+
+class DatabaseRequest:
+    """
+    A database call which was handed to the TkDatabaseExecutor.
+
+    Attributes:
+        request_ID (int): The running number of the request.
+        key (Optional[str]): Requests with the same key replace each other, only the newest result is delivered.
+        future (concurrent.futures.Future): The future of the call on the worker thread.
+        cancelled (bool): True if the result of the request won't be delivered any longer.
+    """
+    def __init__(self, request_ID, key, on_success, on_error):
+        self.request_ID = request_ID
+        self.key = key
+        self.on_success = on_success
+        self.on_error = on_error
+        self.future = None
+        self.cancelled = False
+
+    def cancel(self):
+        """
+        Cancels the request. If the call didn't start yet it isn't run at all, otherwise its result is dropped.
+        """
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+
+def show_database_error(error):
+    """
+    Default error callback of the TkDatabaseExecutor, shows the error in a messagebox.
+    """
+    messagebox.showerror("Error", f"An error occurred: {str(error)}")
+
+
+class TkDatabaseExecutor:
+    """
+    Runs database calls (e.g. methods of MySQLDatabase) on a pool of worker threads, so the tkinter mainloop never waits for the database.
+
+    The worker threads put the results into a queue. The queue is polled on the tkinter thread with after() while requests are pending,
+    so the callbacks run on the tkinter thread and can update widgets. A request with a key cancels the pending request with the same key,
+    e.g. an older refresh of the same table, so only the newest result is delivered.
+
+    Attributes:
+        widget (tk.Misc): The tkinter widget whose after method is used for polling.
+        poll_interval_ms (int): The number of milliseconds between two polls of the result queue.
+
+    Methods:
+        __init__: Initializes the TkDatabaseExecutor object.
+        submit: Runs a function on a worker thread and calls on_success or on_error with its result on the tkinter thread.
+        cancel: Cancels the pending request with the given key.
+        is_pending: Checks if a request with the given key is pending.
+        poll: Delivers the finished results, called with after() while requests are pending.
+        shutdown: Cancels all pending requests and stops the worker threads.
+        pending: The number of pending requests.
+    """
+    def __init__(self, widget, max_workers=3, poll_interval_ms=20):
+        """
+        Initializes a new TkDatabaseExecutor object.
+
+        Args:
+            widget (tk.Misc): The tkinter widget used for polling.
+            max_workers (Optional[int]): Per Default 3. The number of worker threads, it should not be larger than the connection pool.
+            poll_interval_ms (Optional[int]): Per Default 20. The number of milliseconds between two polls of the result queue.
+        """
+        self.widget = widget
+        self.poll_interval_ms = poll_interval_ms
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="habit-tracker-db")
+        self._results = queue.SimpleQueue()
+        self._counter = itertools.count(1)
+        self._requests = {}
+        self._latest = {}
+        self._after_id = None
+
+    @property
+    def pending(self):
+        """
+        Returns:
+            int: The number of requests whose result wasn't delivered yet.
+        """
+        return len(self._requests)
+
+    def submit(self, func, *args, on_success=None, on_error=show_database_error, key=None, **kwargs):
+        """
+        Runs func(*args, **kwargs) on a worker thread.
+
+        Args:
+            func (callable): The function to run, e.g. db.get_dashboard_rows.
+            *args: The arguments of the function.
+            on_success (Optional[callable]): Called with the result on the tkinter thread.
+            on_error (Optional[callable]): Called with the exception on the tkinter thread. Per Default a messagebox is shown.
+            key (Optional[str]): Per Default None. A pending request with the same key is cancelled.
+            **kwargs: The keyword arguments of the function.
+
+        Returns:
+            DatabaseRequest: The submitted request.
+        """
+        # Cancel the stale request with the same key
+        if key is not None:
+            self.cancel(key)
+
+        request = DatabaseRequest(next(self._counter), key, on_success, on_error)
+        self._requests[request.request_ID] = request
+        if key is not None:
+            self._latest[key] = request
+        # Run the call in a copy of the current context, so e.g. the operation of the query detector is known on the worker thread
+        context = contextvars.copy_context()
+        request.future = self._executor.submit(context.run, self._call, request, func, args, kwargs)
+
+        # Start polling the result queue
+        if self._after_id is None:
+            self._after_id = self.widget.after(self.poll_interval_ms, self.poll)
+        return request
+
+    def cancel(self, key):
+        """
+        Cancels the pending request with the given key.
+
+        Args:
+            key (str): The key of the request.
+
+        Returns:
+            bool: True if a pending request was cancelled.
+        """
+        request = self._latest.pop(key, None)
+        if request is None:
+            return False
+        request.cancel()
+        # A request which never started won't put anything into the queue
+        if request.future is not None and request.future.cancelled():
+            self._requests.pop(request.request_ID, None)
+        return True
+
+    def is_pending(self, key):
+        """
+        Checks if a request with the given key is pending.
+
+        Args:
+            key (str): The key of the request.
+
+        Returns:
+            bool: True if the result of the request wasn't delivered yet.
+        """
+        return key in self._latest
+
+    def _call(self, request, func, args, kwargs):
+        # Runs on a worker thread, the result is only put into the queue
+        if request.cancelled:
+            self._results.put((request, None, None))
+            return
+        try:
+            self._results.put((request, func(*args, **kwargs), None))
+        except Exception as e:
+            self._results.put((request, None, e))
+
+    def poll(self):
+        """
+        Delivers the results of all finished requests on the tkinter thread and polls again while requests are pending.
+        """
+        self._after_id = None
+        while True:
+            try:
+                request, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._requests.pop(request.request_ID, None)
+            if request.key is not None and self._latest.get(request.key) is request:
+                del self._latest[request.key]
+
+            # Drop the results of cancelled requests
+            if request.cancelled:
+                continue
+            if error is not None:
+                if request.on_error is not None:
+                    request.on_error(error)
+            elif request.on_success is not None:
+                request.on_success(result)
+
+        if self._requests:
+            self._after_id = self.widget.after(self.poll_interval_ms, self.poll)
+
+    def shutdown(self):
+        """
+        Cancels all pending requests and stops the worker threads. Calls which are running are finished, their results are dropped.
+        """
+        for request in list(self._requests.values()):
+            request.cancel()
+        self._requests = {}
+        self._latest = {}
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,100 @@
+import argparse
+import time
+from database import open_database
+
+
+class ExpirySweeper:
+    """
+    Marks all overdue active habits as 'failed' with one set-based UPDATE (MySQLDatabase.mark_expired_habits)
+    instead of updating every expired habit on its own.
+
+    The sweeper is used by the main screen on a coarse cadence and can also be started as a standalone batch job for all users:
+
+        python expiry_sweeper.py --engine MySQL --host localhost --user root --password secret --database habit_tracker
+
+    Attributes:
+        db (MySQLDatabase): The database object used for the sweep.
+        user_ID (Optional[int]): Only the active habits of this user are swept. None sweeps all users.
+        interval (float): The number of seconds between two sweeps when the sweeper runs periodically.
+        last_sweep (Optional[float]): The time of the last sweep (time.monotonic) or None if it never ran.
+        total_transitioned (int): The number of active habits set to 'failed' by this sweeper so far.
+        clock (Optional[callable]): Returns the time to compare the deadlines with, see clock.py. None means the time of the database.
+
+    Methods:
+        __init__: Initializes the ExpirySweeper object.
+        sweep: Sets all overdue active habits to 'failed' and returns how many were changed.
+        is_due: Checks if the interval since the last sweep has passed.
+    """
+    def __init__(self, db, user_ID=None, interval=60, clock=None):
+        """
+        Initializes a new ExpirySweeper object.
+
+        Args:
+            db (MySQLDatabase): The database object used for the sweep.
+            user_ID (Optional[int]): Per Default None. Only sweep the active habits of this user.
+            interval (Optional[float]): Per Default 60 seconds. The cadence for periodic sweeps.
+            clock (Optional[callable]): Per Default None, which compares the deadlines with the time of the database.
+        """
+        self.db = db
+        self.user_ID = user_ID
+        self.interval = interval
+        self.last_sweep = None
+        self.total_transitioned = 0
+        self.clock = clock
+
+    def sweep(self, now=None):
+        """
+        Sets all overdue active habits which are still 'in progress' to 'failed'.
+
+        Args:
+            now (Optional[datetime.datetime]): The time to compare the deadlines with. Per Default None, which uses the clock or the time of the database.
+
+        Returns:
+            int: The number of active habits which were set to 'failed'.
+        """
+        if now is None and self.clock is not None:
+            now = self.clock()
+        transitioned = self.db.mark_expired_habits(self.user_ID, now)
+        self.last_sweep = time.monotonic()
+        self.total_transitioned += transitioned
+        return transitioned
+
+    def is_due(self):
+        """
+        Checks if the next periodic sweep is due.
+
+        Returns:
+            bool: True if the sweeper never ran or the interval since the last sweep has passed.
+        """
+        return self.last_sweep is None or time.monotonic() - self.last_sweep >= self.interval
+
+
+def main(argv=None):
+    """
+    Runs the sweeper as a batch job for all users. With --repeat the sweep is repeated every given number of seconds.
+    """
+    parser = argparse.ArgumentParser(description="Set all overdue active habits of all users to 'failed'.")
+    parser.add_argument("--engine", choices=["MySQL", "SQLite"], default="MySQL")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--port", type=int, default=3306)
+    parser.add_argument("--database", required=True, help="Name of the MySQL database or path of the SQLite file")
+    parser.add_argument("--repeat", type=float, default=None, help="Repeat the sweep every REPEAT seconds")
+    args = parser.parse_args(argv)
+
+    db = open_database([args.host, args.user, args.password, args.port, args.database, args.engine])
+    sweeper = ExpirySweeper(db)
+    try:
+        while True:
+            transitioned = sweeper.sweep()
+            print(f"{transitioned} active habit(s) set to 'failed'.")
+            if args.repeat is None:
+                break
+            time.sleep(args.repeat)
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,4 @@
-import datetime
+from clock import system_clock
 from database import MySQLDatabase
 
 
@@ -18,11 +18,12 @@ class Habit:
     - create_dict(self): Returns a dictionary of the habit object.
     """
     
-    def __init__(self, habit_name, user_ID, category_ID, description = None, creation_date = None):
+    def __init__(self, habit_name, user_ID, category_ID, description = None, creation_date = None, clock = None):
+        # The clock is only used for the creation_date and not stored, the attributes are the columns of the habits table
         self.habit_name = habit_name
         self.user_ID = user_ID
         self.category_ID = category_ID
-        self.creation_date = creation_date if creation_date is not None else datetime.datetime.now().isoformat()
+        self.creation_date = creation_date if creation_date is not None else (clock or system_clock)().isoformat()
         self.description = description
 
     def __repr__(self):
@@ -0,0 +1,546 @@
+import contextvars
+import datetime
+import functools
+import json
+import math
+import re
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+
+
+# Values below 2 ** SUB_BUCKET_BITS microseconds are counted exactly, larger values with a relative error of at most 1/16
+SUB_BUCKET_BITS = 5
+
+
+# The name of the database method which runs in the current context, set by instrumented_method
+_running_method = contextvars.ContextVar('running_method', default=None)
+
+
+def instrumented_method(func):
+    """
+    Decorator for the public methods of MySQLDatabase. The name of the method is set for the current context while it runs,
+    so the instrumentation counts the call under this name when the method connects. A nested call of another decorated
+    method counts under the inner name until it returns.
+
+    Args:
+        func (callable): The method.
+
+    Returns:
+        callable: The wrapped method.
+    """
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _running_method.set(name)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _running_method.reset(token)
+    return wrapper
+
+
+@contextmanager
+def method_scope(name):
+    """
+    Sets the method name of the instrumentation for a with block, e.g. for the connect of a transaction.
+
+    Args:
+        name (str): The name the calls are counted under.
+    """
+    token = _running_method.set(name)
+    try:
+        yield
+    finally:
+        _running_method.reset(token)
+
+
+def running_method():
+    """
+    Returns:
+        Optional[str]: The name of the decorated database method which runs in the current context, None outside of one.
+    """
+    return _running_method.get()
+
+
+def _bucket_index(value):
+    # Log-linear bucket like in an HDR histogram: the exponent and the first bits of the value
+    if value < (1 << SUB_BUCKET_BITS):
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+
+def _bucket_upper(index):
+    # The largest value which is counted in a bucket
+    if index < (1 << SUB_BUCKET_BITS):
+        return index
+    shift, mantissa = index >> SUB_BUCKET_BITS, index & ((1 << SUB_BUCKET_BITS) - 1)
+    return ((mantissa + 1) << shift) - 1
+
+
+@lru_cache(maxsize=1024)
+def statement_fingerprint(query):
+    """
+    Normalizes a statement, so all executions of the same statement with different values are counted together.
+
+    Args:
+        query (str): The SQL of the statement.
+
+    Returns:
+        str: The statement with collapsed whitespace and ? for the values, e.g. "SELECT streak FROM active_user_habits WHERE active_habits_ID = ?".
+    """
+    fingerprint = re.sub(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"", "?", query)
+    fingerprint = re.sub(r"%s", "?", fingerprint)
+    fingerprint = re.sub(r"(?<![\w.])-?\d+(?:\.\d+)?\b", "?", fingerprint)
+    fingerprint = re.sub(r"\s+", " ", fingerprint).strip().rstrip(";").strip()
+    # Lists of values, e.g. of WHERE x IN (...) or multi-row INSERTs, are counted as one statement
+    fingerprint = re.sub(r"\(\s*\?(?:\s*,\s*\?)*\s*\)", "(?)", fingerprint)
+    fingerprint = re.sub(r"\(\?\)(?:\s*,\s*\(\?\))+", "(?)", fingerprint)
+    return fingerprint
+
+
+class LatencyHistogram:
+    """
+    An HDR-style latency histogram with log-linear buckets in microseconds. Recording a value is O(1) and the memory
+    only grows with the number of used buckets, not with the number of values.
+
+    Attributes:
+        count (int): The number of recorded values.
+        total (int): The sum of all recorded values in microseconds.
+        min (Optional[int]): The smallest recorded value.
+        max (int): The largest recorded value.
+
+    Methods:
+        __init__: Initializes the LatencyHistogram object.
+        record: Records a duration.
+        percentile: Returns the value below which the given percentage of the recorded values is.
+        mean: Returns the average of the recorded values.
+        to_dict: Returns the count, min, mean, percentiles, max and total.
+    """
+    def __init__(self):
+        """
+        Initializes a new, empty LatencyHistogram object.
+        """
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+        self._counts = {}
+
+    def record(self, seconds):
+        """
+        Records a duration.
+
+        Args:
+            seconds (float): The duration in seconds.
+        """
+        value = max(int(round(seconds * 1e6)), 0)
+        index = _bucket_index(value)
+        self._counts[index] = self._counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percent):
+        """
+        Returns the value below which the given percentage of the recorded values is.
+
+        Args:
+            percent (float): The percentage, e.g. 99 for the 99th percentile.
+
+        Returns:
+            int: The upper bound of the bucket of the percentile in microseconds, 0 if nothing was recorded.
+        """
+        if not self.count:
+            return 0
+        rank = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= rank:
+                return min(_bucket_upper(index), self.max)
+        return self.max
+
+    def mean(self):
+        """
+        Returns:
+            float: The average of the recorded values in microseconds, 0 if nothing was recorded.
+        """
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: The count, min, mean, p50, p90, p99, max and total in microseconds.
+        """
+        return {
+            'count': self.count,
+            'min': self.min or 0,
+            'mean': round(self.mean(), 1),
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'max': self.max,
+            'total': self.total,
+        }
+
+
+class OperationStats:
+    """
+    The counters of one MySQLDatabase method or one statement fingerprint.
+
+    Attributes:
+        calls (int): The number of method calls or executions of the statement.
+        rows (int): The number of fetched rows.
+        connect (LatencyHistogram): The time for getting a connection.
+        execute (LatencyHistogram): The time for executing the statements.
+        fetch (LatencyHistogram): The time for fetching the rows.
+
+    Methods:
+        __init__: Initializes the OperationStats object.
+        total: Returns the summed up connect, execute and fetch time.
+        to_dict: Returns the counters and histograms.
+    """
+    def __init__(self):
+        """
+        Initializes a new OperationStats object without any calls.
+        """
+        self.calls = 0
+        self.rows = 0
+        self.connect = LatencyHistogram()
+        self.execute = LatencyHistogram()
+        self.fetch = LatencyHistogram()
+
+    def total(self):
+        """
+        Returns:
+            int: The summed up connect, execute and fetch time in microseconds.
+        """
+        return self.connect.total + self.execute.total + self.fetch.total
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: The calls, rows, total time and the connect, execute and fetch histograms in microseconds.
+        """
+        return {
+            'calls': self.calls,
+            'rows': self.rows,
+            'total_us': self.total(),
+            'connect_us': self.connect.to_dict(),
+            'execute_us': self.execute.to_dict(),
+            'fetch_us': self.fetch.to_dict(),
+        }
+
+
+class Instrumentation:
+    """
+    Records per MySQLDatabase method and per statement fingerprint the number of calls, the fetched rows and the
+    connect, execute and fetch times (see MySQLDatabase.enable_instrumentation).
+
+    A method call is counted when the method connects, under the name set by instrumented_method, and its statements
+    are timed by the InstrumentedCursor. Every
+    thread has its own current method, so the calls of the worker threads are counted correctly. The times are kept
+    in LatencyHistogram objects, so the memory doesn't grow with the number of calls.
+
+    Attributes:
+        methods (dict): The OperationStats by method name.
+        statements (dict): The OperationStats by statement fingerprint.
+        started (datetime.datetime): The time the recording started.
+        observers (list): Objects which are told about every statement, e.g. the SlowQueryLog and the QueryDetector.
+
+    Methods:
+        __init__: Initializes the Instrumentation object.
+        begin_call: Counts a method call and its connect time.
+        record_execute: Records the execution of a statement.
+        record_fetch: Records fetched rows of a statement.
+        add_observer: Tells an observer about every statement.
+        remove_observer: Stops calling an observer.
+        statement_finished: Passes a finished statement to the observers.
+        stats: Returns all counters and histograms as a dictionary.
+        dump_json: Returns the counters as JSON and optionally writes them to a file.
+        format_table: Returns the counters as a text table.
+        reset: Removes all recorded values.
+    """
+    def __init__(self, clock=time.perf_counter):
+        """
+        Initializes a new Instrumentation object.
+
+        Args:
+            clock (Optional[callable]): Per Default time.perf_counter. Returns the current time in seconds.
+        """
+        self.clock = clock
+        self.methods = {}
+        self.statements = {}
+        self.started = datetime.datetime.now()
+        self.observers = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def current_method(self):
+        """
+        Returns:
+            Optional[str]: The name of the method which connected last on the calling thread.
+        """
+        return getattr(self._local, 'method', None)
+
+    def _stats(self, table, key):
+        # Called with the lock held
+        stats = table.get(key)
+        if stats is None:
+            stats = table[key] = OperationStats()
+        return stats
+
+    def begin_call(self, method, connect_seconds=None):
+        """
+        Counts a method call, the following statements of the calling thread are added to this method.
+
+        Args:
+            method (str): The name of the method.
+            connect_seconds (Optional[float]): The time for getting the connection, None if an open connection was used.
+        """
+        self._local.method = method
+        with self._lock:
+            stats = self._stats(self.methods, method)
+            stats.calls += 1
+            if connect_seconds is not None:
+                stats.connect.record(connect_seconds)
+
+    def record_execute(self, query, seconds):
+        """
+        Records the execution of a statement for the statement and the current method.
+
+        Args:
+            query (str): The SQL of the statement.
+            seconds (float): The execution time.
+        """
+        fingerprint = statement_fingerprint(query)
+        method = self.current_method
+        with self._lock:
+            statement = self._stats(self.statements, fingerprint)
+            statement.calls += 1
+            statement.execute.record(seconds)
+            if method is not None:
+                self._stats(self.methods, method).execute.record(seconds)
+        for observer in self.observers:
+            observer.statement_executed(query, method)
+
+    def record_fetch(self, query, seconds, rows):
+        """
+        Records fetched rows of a statement for the statement and the current method.
+
+        Args:
+            query (Optional[str]): The SQL of the statement whose rows were fetched.
+            seconds (float): The fetch time.
+            rows (int): The number of fetched rows.
+        """
+        fingerprint = statement_fingerprint(query) if query else "(unknown)"
+        method = self.current_method
+        with self._lock:
+            statement = self._stats(self.statements, fingerprint)
+            statement.rows += rows
+            statement.fetch.record(seconds)
+            if method is not None:
+                method_stats = self._stats(self.methods, method)
+                method_stats.rows += rows
+                method_stats.fetch.record(seconds)
+
+    def add_observer(self, observer):
+        """
+        Tells an observer about every statement: statement_executed is called right after the execution,
+        statement_finished when the rows were fetched.
+
+        Args:
+            observer: An object with the methods statement_executed(query, method) and statement_finished(query, params, seconds, rows, method).
+        """
+        # Replace the list, so the observers can be called without the lock
+        self.observers = self.observers + [observer]
+
+    def remove_observer(self, observer):
+        """
+        Stops calling an observer.
+
+        Args:
+            observer: An object which was added with add_observer.
+        """
+        self.observers = [other for other in self.observers if other is not observer]
+
+    def statement_finished(self, query, params, seconds, rows):
+        """
+        Passes a finished statement to the observers.
+
+        Args:
+            query (str): The SQL of the statement.
+            params (tuple): The values of the placeholders.
+            seconds (float): The execute and fetch time of the statement.
+            rows (int): The number of fetched rows, or the number of changed rows of a write.
+        """
+        observers = self.observers
+        if observers:
+            method = self.current_method
+            for observer in observers:
+                observer.statement_finished(query, params, seconds, rows, method)
+
+    def stats(self):
+        """
+        Returns all counters and histograms, the methods and statements are sorted by their total time decreasing.
+
+        Returns:
+            dict: The start of the recording and the counters of the methods and statements.
+        """
+        with self._lock:
+            methods = sorted(self.methods.items(), key=lambda item: item[1].total(), reverse=True)
+            statements = sorted(self.statements.items(), key=lambda item: item[1].total(), reverse=True)
+            return {
+                'started': self.started.isoformat(" ", "seconds"),
+                'methods': {name: stats.to_dict() for name, stats in methods},
+                'statements': {fingerprint: stats.to_dict() for fingerprint, stats in statements},
+            }
+
+    def dump_json(self, path=None):
+        """
+        Returns the counters as JSON and optionally writes them to a file.
+
+        Args:
+            path (Optional[str]): Per Default None. The path of the JSON file.
+
+        Returns:
+            str: The counters as JSON.
+        """
+        dump = json.dumps(self.stats(), indent=2)
+        if path:
+            with open(path, 'w') as f:
+                f.write(dump)
+        return dump
+
+    def format_table(self, limit=20):
+        """
+        Returns the counters of the methods and statements with the largest total time as a text table.
+
+        Args:
+            limit (Optional[int]): Per Default 20. The maximum number of rows per table.
+
+        Returns:
+            str: The text table, the times are in milliseconds.
+        """
+        stats = self.stats()
+        header = f"{'calls':>7} {'rows':>8} {'total':>10} {'connect p50':>12} {'execute p50':>12} {'execute p99':>12} {'fetch p50':>10}"
+        lines = []
+        for title, rows in (("Methods", stats['methods']), ("Statements", stats['statements'])):
+            lines.append(f"{title} (times in ms)")
+            lines.append(f"{header}  name")
+            for name, row in list(rows.items())[:limit]:
+                lines.append(
+                    f"{row['calls']:>7} {row['rows']:>8} {row['total_us'] / 1000:>10.2f} {row['connect_us']['p50'] / 1000:>12.3f} "
+                    f"{row['execute_us']['p50'] / 1000:>12.3f} {row['execute_us']['p99'] / 1000:>12.3f} {row['fetch_us']['p50'] / 1000:>10.3f}  {name[:100]}"
+                )
+            lines.append("")
+        return "\n".join(lines)
+
+    def reset(self):
+        """
+        Removes all recorded values and starts a new recording.
+        """
+        with self._lock:
+            self.methods = {}
+            self.statements = {}
+            self.started = datetime.datetime.now()
+
+
+class InstrumentedCursor:
+    """
+    Wraps a cursor and records the execute and fetch times and the fetched rows of its statements.
+    When the rows of a statement are fetched (or right after the execution of a statement without rows),
+    the statement is passed to the observers of the Instrumentation.
+    All other attributes, e.g. rowcount and lastrowid, are taken from the wrapped cursor.
+
+    Methods:
+        execute: Executes and times a statement.
+        executemany: Executes and times a statement for several rows of parameters.
+        executed: Records a statement which was executed on the wrapped cursor.
+        fetchone: Fetches and times the next row.
+        fetchall: Fetches and times all remaining rows.
+    """
+    def __init__(self, cursor, instrumentation):
+        """
+        Initializes a new InstrumentedCursor object.
+
+        Args:
+            cursor: The cursor to be wrapped.
+            instrumentation (Instrumentation): The object which records the times.
+        """
+        self._cursor = cursor
+        self._instrumentation = instrumentation
+        self._statement = None
+        # The statement whose rows were not fetched yet as (query, params, execute seconds)
+        self._pending = None
+
+    def execute(self, query, *args, **kwargs):
+        clock = self._instrumentation.clock
+        start = clock()
+        try:
+            result = self._cursor.execute(query, *args, **kwargs)
+        except Exception:
+            self._instrumentation.record_execute(query, clock() - start)
+            raise
+        self.executed(query, args[0] if args else kwargs.get('params', ()), clock() - start)
+        return result
+
+    def executemany(self, query, *args, **kwargs):
+        clock = self._instrumentation.clock
+        start = clock()
+        try:
+            return self._cursor.executemany(query, *args, **kwargs)
+        finally:
+            self._statement = query
+            self._pending = None
+            self._instrumentation.record_execute(query, clock() - start)
+
+    def executed(self, query, params, seconds):
+        """
+        Records a statement which was executed on the wrapped cursor.
+
+        Args:
+            query (str): The SQL of the statement.
+            params (tuple): The values of the placeholders.
+            seconds (float): The execution time.
+        """
+        self._statement = query
+        self._instrumentation.record_execute(query, seconds)
+        if self._cursor.description is None:
+            # A statement without rows is finished right away
+            self._pending = None
+            self._instrumentation.statement_finished(query, params, seconds, self._cursor.rowcount)
+        else:
+            self._pending = (query, params, seconds)
+
+    def _fetched(self, seconds, rows):
+        self._instrumentation.record_fetch(self._statement, seconds, rows)
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            query, params, execute_seconds = pending
+            self._instrumentation.statement_finished(query, params, execute_seconds + seconds, rows)
+
+    def fetchone(self):
+        clock = self._instrumentation.clock
+        start = clock()
+        row = self._cursor.fetchone()
+        self._fetched(clock() - start, 0 if row is None else 1)
+        return row
+
+    def fetchall(self):
+        clock = self._instrumentation.clock
+        start = clock()
+        rows = self._cursor.fetchall()
+        self._fetched(clock() - start, len(rows))
+        return rows
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
@@ -5,7 +5,8 @@ from tkinter import messagebox
 # import tkcalendar
 import mysql.connector
 # from mysql.connector.errors import Error
-from database import MySQLDatabase
+from database import MySQLDatabase, open_database
+from sqlite_database import SQLiteDatabase
 from user import User
 from main_screen import Main_screen
 # from habit import Habit
@@ -32,6 +33,7 @@ class database_connection_screen(tk.Tk):
     This screen contains several labels and input fields, including:
 
         - A label welcoming the user to the screen.
+        - A dropdown menu to choose the database engine (MySQL or a local SQLite file).
         - A label indicating the 'Host' input field.
         - An input field for the user to enter the host of their MySQL database.
         - A label indicating the 'User' input field.
@@ -49,13 +51,20 @@ class database_connection_screen(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("Database Connection")
-        self.geometry("500x350")
+        self.geometry("500x400")
 
         global entry_host, entry_user, entry_password, entry_database
     
         # Create the welcome label
         self.welcome_label = tk.Label(self, text="Welcome! Please enter your database connection information:")
         self.welcome_label.pack()
+
+        # Create the engine label and dropdown menu. SQLite only needs the database (file) name.
+        self.engine_label = tk.Label(self, text="Engine:")
+        self.engine_label.pack()
+        self.engine_var = tk.StringVar(self, value="MySQL")
+        self.engine_dropdown = tk.OptionMenu(self, self.engine_var, "MySQL", "SQLite")
+        self.engine_dropdown.pack()
         
         # Create the host label and entry widget
         self.host_label = tk.Label(self, text="Host:")
@@ -105,6 +114,9 @@ class database_connection_screen(tk.Tk):
         an environmental variable for use in the habit tracker. Finally, close the database connection, destroy the current
         window, and open the login screen.
 
+        If the SQLite engine is chosen, a local SQLite database file with the name of the `database` entry field is created
+        and initialized instead, the other fields are ignored.
+
         Raises:
             mysql.connector.Error: If there is an error connecting to the database.
 
@@ -117,8 +129,36 @@ class database_connection_screen(tk.Tk):
         password = self.entry_password.get()
         database = self.entry_database.get()
 
+        # Use the local SQLite file if the SQLite engine was chosen
+        if self.engine_var.get() == "SQLite":
+            db = SQLiteDatabase(database)
+            db.create_database(database)
+            # Bring new and existing database files up to the latest schema version
+            try:
+                db.migrate()
+            except Exception as e:
+                print(f"Schema migration failed: {e}")
+            db.close()
+            self.var_string = f",,,,{db.database},SQLite" # Only the database file and the engine are needed
+            os.environ["Database_Variables"] = self.var_string
+            self.destroy()
+            self.open_next_window()
+            return
+
         db = MySQLDatabase(host,user,password,port)
-        db.create_database(database)
+        try:
+            db.create_database(database)
+        except Exception as e:
+            # The connection to the server failed, e.g. because of wrong credentials
+            messagebox.showerror("Error", "There is something wrong with your database credentials. Please check and try again.")
+            print(e)
+            return
+        # Bring new and existing databases up to the latest schema version
+        db.database = database
+        try:
+            db.migrate()
+        except Exception as e:
+            print(f"Schema migration failed: {e}")
 
         try:
             db = mysql.connector.connect(host=host, user=user, password=password, port=port, database=database)
@@ -127,7 +167,7 @@ class database_connection_screen(tk.Tk):
             print(f"Error connecting to database: {err}")
         finally:
             if db:
-                self.var_string = f"{host},{user},{password},{port},{database}" # Concatenate database variables into a single string
+                self.var_string = f"{host},{user},{password},{port},{database},MySQL" # Concatenate database variables into a single string
                 os.environ["Database_Variables"] = self.var_string       # Set environment variable for later database connection
                 db.disconnect()
                 self.destroy() 
@@ -153,7 +193,7 @@ class login_screen(tk.Tk):
         retrieved_var_string = os.getenv("Database_Variables")
         # Split the string back into separate variables
         retrieved_vars = retrieved_var_string.split(",")
-        self.db = MySQLDatabase(retrieved_vars[0],retrieved_vars[1],retrieved_vars[2], retrieved_vars[3], retrieved_vars[4])
+        self.db = open_database(retrieved_vars)
 
         tk.Label(text = "Login/Registration Habit Tracker", bg = "grey", width = "300", height = "2", font = ("Calibri", 13)).pack()
         tk.Label(text = "").pack()
@@ -302,7 +342,11 @@ class login_screen(tk.Tk):
 
         # Create query for checking the database for the user
         query = "SELECT * FROM user_table WHERE username = %s AND password = %s"
-        self.db.connect()
+        try:
+            self.db.connect()
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
         self.db.cursor.execute(query, (username, password))
         user = self.db.cursor.fetchone()
         
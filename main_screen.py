@@ -5,7 +5,17 @@ from tkinter import simpledialog
 import tkcalendar
 import mysql.connector
 from mysql.connector.errors import Error
-from database import MySQLDatabase
+from database import MySQLDatabase, open_database
+from reference_data import SYSTEM_USER_ID, get_reference_data
+from expiry_sweeper import ExpirySweeper
+from refresh_scheduler import DeadlineScheduler, RefreshController
+from tree_reconciler import TreeReconciler
+from db_executor import TkDatabaseExecutor, show_database_error
+from query_detector import detect_queries
+from streak_engine import TIME_IS_UP
+from vectorized_streak_engine import VectorizedStreakEngine
+from clock import system_clock
+from functools import partial
 from user import User
 from habit import Habit
 from active_user_habits import ActiveUserHabit
@@ -24,6 +34,15 @@ class Main_screen(tk.Tk):
     - username: A string representing the active user's username
     - password: A string representing the active user's password
     - user_ID: An integer representing the active user's ID in the database
+    - sweeper: An ExpirySweeper which sets the expired active habits of the user to "failed"
+    - active_habits: The cached dashboard rows of the active habits table
+    - scheduler: A DeadlineScheduler which decides when the cached dashboard rows have to be queried again
+    - refresh_controller: A RefreshController which owns the one timer of the active habits refresh loop
+    - sweep_controller: A RefreshController which owns the timer of the expiry sweep
+    - reconciler: A TreeReconciler which applies only the changed rows to the active habits treeview
+    - db_executor: A TkDatabaseExecutor which runs the database calls of the buttons and refresh loops on worker threads
+    - clock: The clock which returns the current time, the system clock or a FakeClock of the tests and the simulator
+    - streak_engine: A VectorizedStreakEngine which computes the countdowns, expiry transitions and deadlines of the active habits
 
     Methods:
     - open_myHabits: Opens the MyHabits screen where the user can create and delete habits
@@ -36,10 +55,28 @@ class Main_screen(tk.Tk):
     - reactivate_active_habit: Reactivates an active habit where to user failed to check in time and updates the table accordingly
     - delete_active_habit: Deletes an active habit and updates the table accordingly
     - update_active_habits_table: Updates the table of active habits with current data from the database
+    - load_active_habits: Queries the dashboard rows of the user and hands their deadlines to the scheduler
+    - refresh_active_habits: Queries the dashboard rows of the user on a worker thread
+    - run_db: Runs a database call on a worker thread and hands the result to a callback on the tkinter thread
+    - run_expiry_sweep: Sets all expired active habits of the user to "failed"
+    - request_table_update: Lets the refresh controller rebuild the table of active habits, used by the Update Table button
     - update_time: Updates the time label on the screen with the current time
     """
     # init method of the Main_screen class. The isTest paramter is per default False and can be set to True for the purpose of testing single methods without mocking all GUI.
-    def __init__(self, isTest=False):
+    # The clock is per default the system clock, tests can pass a FakeClock to fast-forward the time.
+    def __init__(self, isTest=False, clock=None):
+        # Every time logic of the screen asks this clock for the current time
+        self.clock = clock or system_clock
+        # Cached dashboard rows and the scheduler which decides when they have to be queried again
+        self.active_habits = []
+        self.active_habit_rows = {}
+        self.scheduler = DeadlineScheduler(max_age=timedelta(minutes=10), clock=self.clock)
+        # Countdown and deadline rules, the days of the intervals are read from the reference data when they are needed
+        self.streak_engine = VectorizedStreakEngine(lambda: self.db.reference_data.intervals, clock=self.clock)
+        # Without an executor (e.g. in tests) the database calls run directly
+        self.db_executor = None
+        # Flags repeated statements within one callback, only set if enabled with an environment variable
+        self.query_detector = None
         if not isTest:
             super().__init__()
             self.title("Habit Tracker")
@@ -50,7 +87,26 @@ class Main_screen(tk.Tk):
             retrieved_var_string = os.getenv("Database_Variables")
             # Split the string back into separate variables
             retrieved_vars = retrieved_var_string.split(",")
-            self.db = MySQLDatabase(retrieved_vars[0],retrieved_vars[1],retrieved_vars[2], retrieved_vars[3], retrieved_vars[4])
+            # Use pooled mode for MySQL, so the refresh loop doesn't open a new connection for every query.
+            # The idle connections are pinged every 5 minutes, so the server doesn't close them while the screen is open.
+            self.db = open_database(retrieved_vars, pool_size=3, keepalive_interval=300)
+            # Cache the habits and categories of the user, they are read by every popup and invalidated by the writes
+            self.db.enable_query_cache(maxsize=128, ttl=300)
+            # Record the latencies per database method if a dump file is set, F12 shows them and they are written on exit
+            self.instrumentation_path = os.getenv("Habit_Tracker_Instrumentation")
+            if self.instrumentation_path:
+                self.db.enable_instrumentation(dump_path=self.instrumentation_path)
+                self.bind("<F12>", self.show_instrumentation)
+            # Log the statements which take longer than 0.2 seconds with their EXPLAIN output if a log file is set
+            slow_query_log_path = os.getenv("Habit_Tracker_Slow_Query_Log")
+            if slow_query_log_path:
+                self.db.enable_slow_query_log(slow_query_log_path, threshold=0.2)
+            # Report statements which are repeated more often than the given number within one callback (N+1 queries)
+            query_detector_threshold = os.getenv("Habit_Tracker_Query_Detector")
+            if query_detector_threshold:
+                self.query_detector = self.db.enable_query_detector(threshold=int(query_detector_threshold))
+            # Run the database calls of buttons and refresh loops on worker threads, one per pooled connection
+            self.db_executor = TkDatabaseExecutor(self, max_workers=3)
 
             # Retrieve environment variable for the active user information
             retrieved_var_string = os.getenv("User_Variables")
@@ -61,6 +117,14 @@ class Main_screen(tk.Tk):
             self.username = retrieved_vars[0]
             self.password = retrieved_vars [1]
             self.user_ID = self.db.get_userID(self.username)
+            # Resolve the names of the user's habits and categories from memory, the index is filled with one query
+            self.db.load_name_index(self.user_ID)
+            # Load the system habits, categories and intervals before the window is shown, so the handlers only read them from memory
+            get_reference_data(self.db)
+
+            # Sweeper which sets all expired active habits of the user to "failed" with one UPDATE, with the time of the database unless a clock was passed
+            self.sweeper = ExpirySweeper(self.db, self.user_ID, clock=clock)
+            self.sweeper.sweep()
 
             # Button for opening the MyHabits Screen where user can see and define own habits
             Button_1 = tk.Button(text="MyHabits",  width = 22, height=3, font = ("Arial",12, "bold"),command = self.open_myHabits)
@@ -99,7 +163,7 @@ class Main_screen(tk.Tk):
             Button_10.place(x = 525, y = 350)
 
             # Button for updating whole table.
-            Button_11 = tk.Button(text = "Update Table", font = ("Arial",8, "bold"), width = 15, height=2, command = self.update_active_habits_table)
+            Button_11 = tk.Button(text = "Update Table", font = ("Arial",8, "bold"), width = 15, height=2, command = self.request_table_update)
             Button_11.place(x = 645, y = 350)
 
             # Create a label to show the current time on screen
@@ -140,106 +204,33 @@ class Main_screen(tk.Tk):
             self.active_habits_tree.heading("Remaining Time", text="Remaining Time", anchor="center")
             self.active_habits_tree.heading("Deadline", text="Deadline", anchor="w")
 
-            # Get active user habits from the database using user_ID
-            active_habits = self.db.get_active_habits(self.user_ID)
-            # set a counter
-            counter = 0
-            for record in active_habits:
-                # Calculate deadline
-                self.last_check = record[4]  # Get last checkoff from database
-                self.monitoring_interval = record[6]  # Get monitoring interval from database
-                
-                # Get the active habits ID from database and store it in variable for db.update.data function if failed
-                self.data = {'status': 'failed'}
-                self.active_habit_ID = record[0] 
-                
-                # Check if the stored monitoring interval is daily, weekly or monthly and calculate the remaining time for checkoff depending on the interval
-                if self.monitoring_interval == "daily":
-                    self.time_interval = timedelta(days=2)
-                    # Calculate Deadline until user has to check off habit
-                    # Get update_expiry from database
-                    self.update_expiry = self.db.check_value("update_expiry","active_user_habits","active_habits_ID",self.active_habit_ID)
-                    self.deadline = self.update_expiry[0][0] # Extracts the datetime object from list
-                    # Calculate Countdown
-                    self.remaining_time = self.deadline - dt.now()
-                    self.remaining_timedelta = timedelta(seconds=self.remaining_time.seconds)
-                    remaining_datetime = dt(1, 1, 1) + self.remaining_timedelta
-                    # Format Countdown
-                    remaining_days = self.remaining_time.days
-                    remaining_time = remaining_datetime.time()
-                    formatted_remaining_time = f"{remaining_days}d {remaining_time}"
-                    if self.remaining_time.total_seconds() > 0:        
-                        self.active_habits_tree.insert(parent="", index="end", iid=counter, text="", values=(record[1], record[5], record[6], str(formatted_remaining_time), self.deadline))
-                        counter += 1
-                    # if user fails to check off habit within timeframe the streak goes to zero
-                    else:
-                        formatted_remaining_time = "Time is up!"
-                        self.active_habits_tree.insert(parent="", index="end", iid=counter,text ="", values=(record[1], record[5], record[6], formatted_remaining_time,self.deadline))
-                        # Set status in active_habits_table to "failed"
-                        self.db.update_data("active_user_habits", self.data,"active_habits", self.active_habit_ID)
-                        counter += 1
-                elif self.monitoring_interval == "weekly":
-                    self.time_interval = timedelta(days=7)
-                    # Calculate Deadline until user has to check off habit
-                    self.update_expiry = self.db.check_value("update_expiry", "active_user_habits","active_habits_ID", self.active_habit_ID)
-                    self.deadline = self.update_expiry[0][0]  # Extracts the datetime object from list
-                    # Calculate Countdown
-                    self.remaining_time = self.deadline - dt.now()
-                    self.remaining_timedelta = timedelta(seconds=self.remaining_time.seconds)
-                    remaining_days = self.remaining_time.days
-                    remaining_hours = self.remaining_timedelta.seconds // 3600
-                    remaining_minutes = (self.remaining_timedelta.seconds % 3600) // 60
-                    remaining_seconds = self.remaining_timedelta.seconds % 60
-                    # Format Countdown
-                    formatted_remaining_time = f"{remaining_days}d {remaining_hours:02d}:{remaining_minutes:02d}:{remaining_seconds:02d}"
-                    if self.remaining_time.total_seconds() > 0:    
-                        self.active_habits_tree.insert(parent="", index="end", iid=counter,text ="", values=(record[1], record[5], record[6], formatted_remaining_time, self.deadline))
-                        counter += 1
-                    else:
-                        formatted_remaining_time = "Time is up!"
-                        self.active_habits_tree.insert(parent="",index="end", iid=counter,text ="", values=(record[1], record[5], record[6], formatted_remaining_time, self.deadline))
-                        # Set status in active_habits_table to "failed"
-                        self.db.update_data("active_user_habits", self.data,"active_habits", self.active_habit_ID)
-                        counter +=1
-                # If the monitoring isn't daily or weekly it has to be monthly
-                else:
-                    self.time_interval = timedelta(days = 30)
-                    # Calculate Deadline until user has to check off habit
-                    self.update_expiry = self.db.check_value("update_expiry","active_user_habits","active_habits_ID", self.active_habit_ID)
-                    self.deadline = self.update_expiry[0][0]  # Extracts the datetime object from list
-                    # Calculate Countdown
-                    self.remaining_time = self.deadline - dt.now()
-                    self.remaining_timedelta = timedelta(seconds=self.remaining_time.seconds)
-                    remaining_days = self.remaining_time.days
-                    remaining_hours = self.remaining_timedelta.seconds // 3600
-                    remaining_minutes = (self.remaining_timedelta.seconds % 3600) // 60
-                    remaining_seconds = self.remaining_timedelta.seconds % 60
-                    # Format Countdown
-                    formatted_remaining_time = f"{remaining_days}d {remaining_hours:02d}:{remaining_minutes:02d}:{remaining_seconds:02d}"
-                    if self.remaining_time.total_seconds() > 0:      
-                        self.active_habits_tree.insert(parent="", index="end", iid=counter,text ="", values=(record[1], record[5], record[6], formatted_remaining_time, self.deadline))
-                        counter += 1
-                    else:
-                        formatted_remaining_time = "Time is up!"
-                        self.active_habits_tree.insert(parent="", index="end", iid=counter,text ="", values=(record[1], record[5], record[6], formatted_remaining_time, self.deadline))
-                        # Set status in active_habits_table to "failed"
-                        self.db.update_data("active_user_habits", self.data,"active_habits", self.active_habit_ID)
-                        counter +=1
-
-            # Schedule another call to the update_active_habits_tree function after every second
-            self.after(1000, self.update_active_habits_tree)
+            # The reconciler keeps the treeview in sync with the active habits, the rows are keyed by active_habits_ID
+            self.reconciler = TreeReconciler(self.active_habits_tree, self.active_habits_tree['columns'])
+
+            # Get everything the table needs for the active user habits with one query using user_ID and draw the first countdowns
+            self.draw_active_habits(self.load_active_habits())
+
+            # Start the refresh loop which calls the update_active_habits_tree function after every second
+            self.refresh_controller = RefreshController(self, self.update_active_habits_tree, 1000)
+            self.refresh_controller.start()
 
+            # Sweep the expired habits on a coarse cadence as well
+            self.sweep_controller = RefreshController(self, self.run_expiry_sweep, int(self.sweeper.interval * 1000))
+            self.sweep_controller.start()
+
+    @detect_queries
     def update_active_habits_tree(self):
         """Updates the active user habits treeview, displaying the time remaining until the next checkoff deadline
         and updating the status of any habits that have not been checked off within the deadline.
 
-        The function retrieves the active habits for the current user from the database and calculates the remaining time until
-        the next checkoff deadline for each habit, based on the monitoring interval specified for that habit (daily, weekly, or monthly).
+        The function takes the cached active habits of the current user and calculates the remaining time until
+        the next checkoff deadline for each habit with the streak engine, all countdowns for the same moment.
         If the remaining time is positive, the function updates the corresponding row in the treeview to display the time remaining in
         days, hours, minutes, and seconds. If the remaining time is negative, the function updates the corresponding row in the treeview
-        to display "Time is up!" and updates the status of the habit to "failed" in the active_habits_table in the database.
+        to display "Time is up!". If such a habit is still "in progress", the sweeper sets all expired habits to "failed" with one UPDATE.
 
-        The function is called repeatedly using the tkinter after method, causing the treeview to be updated every x seconds.
+        The function is called repeatedly by the refresh controller, causing the treeview to be updated every second.
+        The database is only queried again when the scheduler reports that the earliest deadline has passed or a write happened.
 
         Args:
             self: The tkinter object.
@@ -248,99 +239,160 @@ class Main_screen(tk.Tk):
             None.
         """
 
-        # Get active user habits from the database using user_ID
-        active_habits = self.db.get_active_habits(self.user_ID)
-        # set a counter
-        counter = 0
-        for record in active_habits:
-            # Calculate deadline
-            self.last_check = record[3]  # Get last checkoff from database
-            self.monitoring_interval = record[6] # Get monitoring interval from database
-
-            # Get the active habits ID from database and store it in variable for db.update.data function if failed
-            self.data = {'status': 'failed'}
-            self.active_habit_ID = record[0] 
-                        
-            # Check if the stored monitoring interval is daily, weekly or monthly and calculate the remaining time for checkoff depending on the interval
-            if self.monitoring_interval == "daily":
-                self.time_interval = timedelta(days = 2)
-                # Calculate Deadline until user has to check off habit
-                self.update_expiry = self.db.check_value("update_expiry","active_user_habits","active_habits_ID",self.active_habit_ID)
-                self.deadline = self.update_expiry[0][0] # Extracts the datetime object from list
-                # Calculate Countdown
-                self.remaining_time = self.deadline - dt.now()
-                self.remaining_timedelta = timedelta(seconds=self.remaining_time.seconds)
-                remaining_datetime = dt(1, 1, 1) + self.remaining_timedelta
-                # Format Countdown
-                remaining_days = self.remaining_time.days
-                remaining_time = remaining_datetime.time()
-                formatted_remaining_time = f"{remaining_days}d {remaining_time}"
-                if self.remaining_time.total_seconds() > 0:        
-                    self.active_habits_tree.set(counter,column = 3, value = formatted_remaining_time)
-                    counter += 1
-                # if user fails to check off habit within timeframe the streak goes to zero
-                else:
-                    formatted_remaining_time = "Time is up!"
-                    #self.active_habits_tree.insert(parent="",index="end",iid=counter,text ="", values=(record[1],record[5],record[6],formatted_remaining_time,self.deadline))
-                    self.active_habits_tree.set(counter,column = 3, value = formatted_remaining_time)
-                    # Set status in active_habits_table to "failed"
-                    self.db.update_data("active_user_habits",self.data,"active_habits",self.active_habit_ID)
-                    counter += 1
-            elif self.monitoring_interval == "weekly":
-                self.time_interval = timedelta(days = 7)
-                # Calculate Deadline until user has to check off habit
-                self.update_expiry = self.db.check_value("update_expiry","active_user_habits","active_habits_ID",self.active_habit_ID)
-                self.deadline = self.update_expiry[0][0] # Extracts the datetime object from list
-                # Calculate Countdown
-                self.remaining_time = self.deadline - dt.now()
-                self.remaining_timedelta = timedelta(seconds=self.remaining_time.seconds)
-                remaining_days = self.remaining_time.days
-                remaining_hours = self.remaining_timedelta.seconds // 3600
-                remaining_minutes = (self.remaining_timedelta.seconds % 3600) // 60
-                remaining_seconds = self.remaining_timedelta.seconds % 60
-                # Format Countdown
-                formatted_remaining_time = f"{remaining_days}d {remaining_hours:02d}:{remaining_minutes:02d}:{remaining_seconds:02d}"
-                if self.remaining_time.total_seconds() > 0:    
-                    #self.active_habits_tree.insert(parent="",index="end",iid=counter,text ="", values=(record[1],record[5],record[6],formatted_remaining_time,self.deadline))
-                    self.active_habits_tree.set(counter,column = 3, value = formatted_remaining_time)
-                    counter += 1
-                else:
-                    formatted_remaining_time = "Time is up!"
-                    #self.active_habits_tree.insert(parent="",index="end",iid=counter,text ="", values=(record[1],record[5],record[6],formatted_remaining_time,self.deadline))
-                    self.active_habits_tree.set(counter,column = 3, value = formatted_remaining_time)
-                    # Set status in active_habits_table to "failed"
-                    self.db.update_data("active_user_habits",self.data,"active_habits",self.active_habit_ID)
-                    counter +=1
-            # If the monitoring isn't daily or weekly it has to be monthly
-            else:
-                self.time_interval = timedelta(days = 30)
-                # Calculate Deadline until user has to check off habit
-                self.update_expiry = self.db.check_value("update_expiry","active_user_habits","active_habits_ID",self.active_habit_ID)
-                self.deadline = self.update_expiry[0][0] # Extracts the datetime object from list
-                # Calculate Countdown
-                self.remaining_time = self.deadline - dt.now()
-                self.remaining_timedelta = timedelta(seconds=self.remaining_time.seconds)
-                remaining_days = self.remaining_time.days
-                remaining_hours = self.remaining_timedelta.seconds // 3600
-                remaining_minutes = (self.remaining_timedelta.seconds % 3600) // 60
-                remaining_seconds = self.remaining_timedelta.seconds % 60
-                # Format Countdown
-                formatted_remaining_time = f"{remaining_days}d {remaining_hours:02d}:{remaining_minutes:02d}:{remaining_seconds:02d}"
-                if self.remaining_time.total_seconds() > 0:      
-                    #self.active_habits_tree.insert(parent="",index="end",iid=counter,text ="", values=(record[1],record[5],record[6],formatted_remaining_time,self.deadline))
-                    self.active_habits_tree.set(counter,column = 3, value = formatted_remaining_time)
-                    counter += 1
-                else:
-                    formatted_remaining_time = "Time is up!"
-                    #self.active_habits_tree.insert(parent="",index="end",iid=counter,text ="", values=(record[1],record[5],record[6],formatted_remaining_time,self.deadline))
-                    self.active_habits_tree.set(counter,column = 3, value = formatted_remaining_time)
-                    # Set status in active_habits_table to "failed"
-                    self.db.update_data("active_user_habits",self.data,"active_habits",self.active_habit_ID)
-                    counter +=1
+        # Query the active habits only when a deadline passed or something was written, otherwise redraw the countdowns from the cached rows.
+        # The query runs on a worker thread, the new rows are drawn at the next tick after they arrived.
+        if self.scheduler.needs_refresh():
+            self.refresh_active_habits()
+        self.draw_active_habits(self.active_habits)
+
+    def draw_active_habits(self, active_habits):
+        """
+        Draws the countdowns of the active habits into the treeview and sweeps the expired habits which are still "in progress".
+
+        Args:
+            active_habits (list): The DashboardRow objects of the user.
+        """
+        # Compute the countdowns of all rows for one moment, the rows are keyed by active_habits_ID
+        rows, countdowns = self.countdown_rows(active_habits)
+
+        # Apply only the changed rows and cells to the treeview
+        self.reconciler.reconcile(rows)
+
+        # Mark all expired habits as failed with one UPDATE instead of one update per row, compared with the same now as the countdowns
+        if countdowns.transitions.any():
+            self.run_expiry_sweep(countdowns.now)
+
+    def countdown_rows(self, active_habits):
+        """
+        Computes the countdowns of the active habits for one captured now with the streak engine.
+
+        Args:
+            active_habits (list): The DashboardRow objects of the user.
+
+        Returns:
+            tuple: The rows of the treeview as (active_habits_ID, values) tuples and the CountdownArrays with the mask of the expired habits which are still "in progress".
+        """
+        # Compute the countdowns as arrays and put the texts into the rows of the treeview
+        countdowns = self.streak_engine.countdown_arrays([record.update_expiry for record in active_habits],
+                                                         [record.status == 'in progress' for record in active_habits])
+        rows = [(record.active_habits_ID, (record.habit_name, record.streak, record.control_interval, text, record.update_expiry))
+                for record, text in zip(active_habits, countdowns.texts.tolist())]
+        return rows, countdowns
+
+    def load_active_habits(self):
+        """
+        Queries everything the active habits table needs with one query and hands the deadlines to the scheduler.
+        Until the next refresh the countdowns are redrawn from these cached rows.
+
+        Returns:
+            list: The DashboardRow objects of the user.
+        """
+        return self.set_active_habits(self.db.get_dashboard_rows(self.user_ID))
+
+    def set_active_habits(self, rows, generation=None):
+        """
+        Replaces the cached dashboard rows and hands their deadlines to the scheduler.
+
+        Args:
+            rows (list): The DashboardRow objects of the user.
+            generation (Optional[int]): The generation of the scheduler when the query was started.
+
+        Returns:
+            list: The DashboardRow objects of the user.
+        """
+        self.active_habits = rows
+        # Side table of the displayed rows keyed by active_habits_ID, the iid of the treeview items
+        self.active_habit_rows = {record.active_habits_ID: record for record in rows}
+        self.scheduler.load([record.update_expiry for record in rows], generation=generation)
+        return rows
+
+    def refresh_active_habits(self, on_loaded=None):
+        """
+        Queries the dashboard rows of the user on a worker thread. When the result arrives the cached rows are replaced,
+        until then the countdowns are redrawn from the old rows. A periodic refresh isn't started twice.
+
+        Args:
+            on_loaded (Optional[callable]): Per Default None. Called on the tkinter thread after the cached rows were replaced.
+        """
+        if on_loaded is None and self.db_executor is not None and self.db_executor.is_pending("dashboard"):
+            return
+        generation = self.scheduler.generation
+
+        def loaded(rows):
+            self.set_active_habits(rows, generation)
+            if on_loaded is not None:
+                on_loaded()
+
+        self.run_db(self.db.get_dashboard_rows, self.user_ID, on_success=loaded, key="dashboard")
 
-        # Schedule another call to this function after every second
-        self.after(1000, self.update_active_habits_tree)
+    def selected_active_habits(self):
+        """
+        Returns the cached rows of the selected items of the active habits table. The iid of every item is its active_habits_ID,
+        so no habit has to be looked up by its name.
+
+        Returns:
+            list: The DashboardRow objects of the selected items which are still cached.
+        """
+        rows = []
+        for item in self.active_habits_tree.selection():
+            row = self.active_habit_rows.get(int(item))
+            if row is not None:
+                rows.append(row)
+        return rows
+
+    def run_db(self, func, *args, on_success=None, on_error=show_database_error, key=None):
+        """
+        Runs a database call on a worker thread of the db executor, so the window doesn't freeze while the database works.
+        on_success is called with the result on the tkinter thread. Without an executor (e.g. in tests) the call is run directly.
+
+        Args:
+            func (callable): The database call, e.g. self.db.check_off.
+            *args: The arguments of the call.
+            on_success (Optional[callable]): Called with the result.
+            on_error (Optional[callable]): Called with the exception. Per Default a messagebox is shown.
+            key (Optional[str]): Per Default None. A pending call with the same key is cancelled, its result is dropped.
+        """
+        if self.db_executor is not None:
+            self.db_executor.submit(func, *args, on_success=on_success, on_error=on_error, key=key)
+            return
+        try:
+            result = func(*args)
+        except Exception as e:
+            on_error(e)
+            return
+        if on_success is not None:
+            on_success(result)
+
+    @detect_queries
+    def run_expiry_sweep(self, now=None):
+        """
+        Sets all expired active habits of the user to "failed" with one UPDATE on a worker thread.
+        The sweep controller runs it on the coarse cadence of the sweeper interval, the countdown itself is updated every second.
+
+        Args:
+            now (Optional[datetime.datetime]): Per Default None, which uses the time of the database. The time of the countdowns
+                                               which showed the expired habits, so the same habits are swept.
+        """
+        if self.db_executor is not None and self.db_executor.is_pending("sweep"):
+            return
+        # A sweep for expired cached rows refreshes them even if another process already set them to "failed",
+        # otherwise the cached rows stay "in progress" and every tick sweeps again
+        self.run_db(self.sweeper.sweep, now, on_success=partial(self.expiry_sweep_done, refresh=now is not None), key="sweep")
+
+    def expiry_sweep_done(self, transitioned, refresh=False):
+        """
+        Marks the cached rows as outdated if the sweep set active habits to "failed" or was started for expired cached rows.
+
+        Args:
+            transitioned (int): The number of active habits which were set to "failed".
+            refresh (bool): Per Default False. True if the sweep was started for expired cached rows which are still "in progress".
+        """
+        if transitioned:
+            print(f"{transitioned} active habit(s) set to failed")
+        if transitioned or refresh:
+            self.scheduler.mark_dirty()
 
+    @detect_queries
     def delete_active_habit(self):
         """
         Deletes the selected active habit from the database by updating its status to 'deleted'.
@@ -350,37 +402,38 @@ class Main_screen(tk.Tk):
         Returns:
         None.
         """
-        # Get selected items
-        selected_items = self.active_habits_tree.selection()
+        # Set the status of all selected active habits to 'deleted' with one UPDATE using their primary keys
+        active_habits_IDs = [row.active_habits_ID for row in self.selected_active_habits()]
+        if active_habits_IDs:
+            self.run_db(self.db.delete_active_habits, active_habits_IDs, self.user_ID, on_success=self.active_habit_deleted)
 
-        # Loop through selected items and delete from database
-        for item in selected_items:
-            active_habit_name = self.active_habits_tree.item(item)["values"][0]
-            print(active_habit_name)
-            user_ID = self.user_ID
-            print(user_ID)
-            query = f"""UPDATE active_user_habits INNER JOIN habits ON active_user_habits.habit_ID = habits.habit_ID
-                        SET status = 'deleted'
-                        WHERE active_user_habits.user_ID = {user_ID} AND habits.habit_name = '{active_habit_name}';                       
-                        """
-            # Use execute query function to execute the query and set the status to 'deleted' in the database for this active habit. 
-            print(query)
-            try:
-                self.db.execute_query(query)
-                messagebox.showinfo("Success","Habit not active any longer. Please update table.")
-            except Error as e:
-                messagebox.showerror("Error", f"An error occurred: {str(e)}")
+    def active_habit_deleted(self, result):
+        """
+        Shows the success message after an active habit was deleted and lets the next tick query the active habits again.
 
+        Args:
+            result (int): The number of changed rows.
+        """
+        self.scheduler.mark_dirty()
+        messagebox.showinfo("Success","Habit not active any longer. Please update table.")
+
+
+    def request_table_update(self):
+        """
+        Asks the refresh controller to rebuild the active habits table with update_active_habits_table.
+        Pressing the button several times before the refresh ran results in one refresh, and the periodic loop keeps its one timer.
+        """
+        self.refresh_controller.request(self.update_active_habits_table)
 
+    @detect_queries
     def update_active_habits_table(self):
         """Updates the active habits treeview with the current user's active habits.
 
-        Clears the treeview, retrieves the user's active habits from the database,
-        and calculates the deadline for each habit based on its monitoring interval.
-        If the user has not checked off the habit within the monitoring interval, the
-        habit's status is set to 'failed' in the database and its streak is reset to 0.
-        The active habits treeview displays the habit name, monitoring interval, remaining
-        time until the next checkoff deadline, and the deadline itself.
+        Retrieves the user's active habits from the database on a worker thread and redraws the
+        table with update_active_habits_tree when they arrived. If the user has not checked off
+        the habit within the monitoring interval, the sweeper sets the status of all expired
+        habits to 'failed' with one UPDATE. Only the rows and cells which changed are updated,
+        so the selection and the scroll position are kept.
 
         Args:
             self (object): The class instance.
@@ -389,97 +442,11 @@ class Main_screen(tk.Tk):
             None
         """
 
-        # Clear the treeview
-        self.active_habits_tree.delete(*self.active_habits_tree.get_children())
-
-        # Get active user habits from the database using user_ID
-        active_habits = self.db.get_active_habits(self.user_ID)
-        # set a counter
-        counter = 0
-        for record in active_habits:
-            # Calculate deadline
-            self.last_check = record[3]  # Get last checkoff from database
-            self.monitoring_interval = record[6] # Get monitoring interval from database
-
-            # Get the active habits ID from database and store it in variable for db.update.data function if failed
-            self.data = {'status': 'failed'}
-            self.active_habit_ID = record[0] 
-
-            # Check if the stored monitoring interval is daily, weekly or monthly and calculate the remaining time for checkoff depending on the interval
-            if self.monitoring_interval == "daily":
-                self.time_interval = timedelta(days = 2)
-                # Calculate Deadline until user has to check off habit
-                self.update_expiry = self.db.check_value("update_expiry","active_user_habits","active_habits_ID",self.active_habit_ID)
-                self.deadline = self.update_expiry[0][0] # Extracts the datetime object from list
-                # Calculate Countdown
-                self.remaining_time = self.deadline - dt.now()
-                self.remaining_timedelta = timedelta(seconds=self.remaining_time.seconds)
-                remaining_datetime = dt(1, 1, 1) + self.remaining_timedelta
-                # Format Countdown
-                remaining_days = self.remaining_time.days
-                remaining_time = remaining_datetime.time()
-                formatted_remaining_time = f"{remaining_days}d {remaining_time}"
-                if self.remaining_time.total_seconds() > 0:        
-                    self.active_habits_tree.insert(parent="", index="end", iid=counter, text="", values=(record[1], record[5], record[6], str(formatted_remaining_time), self.deadline))
-                    counter += 1
-                # if user fails to check off habit within timeframe the streak goes to zero
-                else:
-                    formatted_remaining_time = "Time is up!"
-                    self.active_habits_tree.insert(parent="",index="end",iid=counter,text ="", values=(record[1],record[5],record[6],formatted_remaining_time,self.deadline))
-                    # Set status in active_habits_table to "failed"
-                    self.db.update_data("active_user_habits",self.data,"active_habits",self.active_habit_ID)                    
-                    counter += 1
-            elif self.monitoring_interval == "weekly":
-                self.time_interval = timedelta(days = 7)
-                # Calculate Deadline until user has to check off habit
-                self.update_expiry = self.db.check_value("update_expiry","active_user_habits","active_habits_ID",self.active_habit_ID)
-                self.deadline = self.update_expiry[0][0]  # Extracts the datetime object from list
-                # Calculate Countdown
-                self.remaining_time = self.deadline - dt.now()
-                self.remaining_timedelta = timedelta(seconds=self.remaining_time.seconds)
-                remaining_days = self.remaining_time.days
-                remaining_hours = self.remaining_timedelta.seconds // 3600
-                remaining_minutes = (self.remaining_timedelta.seconds % 3600) // 60
-                remaining_seconds = self.remaining_timedelta.seconds % 60
-                # Format Countdown
-                formatted_remaining_time = f"{remaining_days}d {remaining_hours:02d}:{remaining_minutes:02d}:{remaining_seconds:02d}"
-                if self.remaining_time.total_seconds() > 0:    
-                    self.active_habits_tree.insert(parent="",index="end",iid=counter,text ="", values=(record[1],record[5],record[6],formatted_remaining_time,self.deadline))
-                    counter += 1
-                else:
-                    formatted_remaining_time = "Time is up!"
-                    self.active_habits_tree.insert(parent="",index="end",iid=counter,text ="", values=(record[1],record[5],record[6],formatted_remaining_time,self.deadline))
-                    # Set status in active_habits_table to "failed"
-                    self.db.update_data("active_user_habits",self.data,"active_habits",self.active_habit_ID)
-                    counter +=1
-            # If the monitoring isn't daily or weekly it has to be monthly
-            else:
-                self.time_interval = timedelta(days = 30)
-                # Calculate Deadline until user has to check off habit
-                self.update_expiry = self.db.check_value("update_expiry","active_user_habits","active_habits_ID",self.active_habit_ID)
-                self.deadline = self.update_expiry[0][0] # Extracts the datetime object from list
-                # Calculate Countdown
-                self.remaining_time = self.deadline - dt.now()
-                self.remaining_timedelta = timedelta(seconds=self.remaining_time.seconds)
-                remaining_days = self.remaining_time.days
-                remaining_hours = self.remaining_timedelta.seconds // 3600
-                remaining_minutes = (self.remaining_timedelta.seconds % 3600) // 60
-                remaining_seconds = self.remaining_timedelta.seconds % 60
-                # Format Countdown
-                formatted_remaining_time = f"{remaining_days}d {remaining_hours:02d}:{remaining_minutes:02d}:{remaining_seconds:02d}"
-                if self.remaining_time.total_seconds() > 0:      
-                    self.active_habits_tree.insert(parent="",index="end",iid=counter,text ="", values=(record[1],record[5],record[6],formatted_remaining_time,self.deadline))
-                    counter += 1
-                else:
-                    formatted_remaining_time = "Time is up!"
-                    self.active_habits_tree.insert(parent="",index="end",iid=counter,text ="", values=(record[1],record[5],record[6],formatted_remaining_time,self.deadline))
-                    # Set status in active_habits_table to "failed"
-                    self.db.update_data("active_user_habits",self.data,"active_habits",self.active_habit_ID)
-                    counter +=1
-
-        # Schedule another call to this function after every second
-        self.after(1000, self.update_active_habits_tree)
+        # Query the active habits in any case and redraw the table as soon as they arrived
+        self.scheduler.mark_dirty()
+        self.refresh_active_habits(on_loaded=self.update_active_habits_tree)
 
+    @detect_queries
     def reactivate_active_habit(self):
         """
         Reactivate a habit with a dead streak. In the database the active habit has to be set to 'deleted' and and 
@@ -493,193 +460,132 @@ class Main_screen(tk.Tk):
         None. 
         """
 
-        # Get selected items
-        selected_items = self.active_habits_tree.selection()
-
-        # Loop through selected items and delete from database
-        for item in selected_items:
-            active_habit_name = self.active_habits_tree.item(item)["values"][0]
+        # Loop through the rows of the selected items, they carry the habit_ID and the interval_ID of the active habit
+        for row in self.selected_active_habits():
             user_ID = self.user_ID
-            habit_ID =  self.db.get_habit_ID(user_ID, active_habit_name)
-
-            # Get the monitoring interval of the habit
-            interval_ID = self.active_habits_tree.item(item)["values"][2]
-            # convert the interval_ID from a string to a integer:
-            if interval_ID == "daily":
-                interval_ID = 1
-            elif interval_ID == "weekly":
-                interval_ID = 2
-            else:
-                interval_ID = 3            
-            # Get the current status of the selected habit from the treeview
-            status = self.active_habits_tree.item(item)["values"][3]
-            
-            # If the user fails to track the habit the staus is set to 'Time is up!' In this case the user can reactivate the habit. 
-            if status == 'Time is up!':
-               
-                # Update status for old active user habit from failed to deleted
-                query = f"""UPDATE active_user_habits
-                            INNER JOIN habits ON active_user_habits.habit_ID = habits.habit_ID
-                            SET status = 'deleted'
-                            WHERE active_user_habits.user_ID = {user_ID} AND habits.habit_name = '{active_habit_name}' AND active_user_habits.status = 'failed';                  
-                    """
-                # Execute query to delete old_active_habit
-                self.db.execute_query(query)
-                
-                # Depending on interval_ID set the new_update_expiry
-                if interval_ID == 1:
-                    new_update_expiry = dt.now() + timedelta(hours = 24)
-                elif interval_ID == 2: 
-                    new_update_expiry = dt.now() + timedelta(hours = 168)
-                else: 
-                    new_update_expiry = dt.now() + timedelta(hours = 720)
+            habit_ID = row.habit_ID
+            interval_ID = row.interval_ID
+            # The habit can be reactivated once it failed or its deadline passed, the sweep may not have set it to 'failed' yet.
+            # Deleted active habits are not in the table
+            if self.streak_engine.is_expired(row):
+                # Depending on the days of the monitoring interval set the new_update_expiry
+                new_update_expiry = self.streak_engine.first_deadline(interval_ID)
                 # Create a new active user habit with the same information as the last one using the ActiveUserHabit class
-                new_active_user_habit = ActiveUserHabit(user_ID, habit_ID, interval_ID, update_expiry=new_update_expiry)
+                new_active_user_habit = ActiveUserHabit(user_ID, habit_ID, interval_ID, update_expiry=new_update_expiry, clock=self.clock)
                 #Store the new active_user_habit in the variable data as a dictionary for inserting it into the database using the db.insert_data function
                 data = vars(new_active_user_habit)
-                data['habit_ID'] = data['habit_ID'][0] # convert the tuple to a integer using the first stored value
-                # Insert the new active_user_habit in the database
-                self.db.insert_data("active_user_habits", data)
-                messagebox.showinfo("Success", "The Habit is now reactivated for tracking")
 
-            # If the the selected habit is already set active for the user a error message pops up
-            elif status == 'in progress':
-                messagebox.showerror('Error','This habit is already active. You can delete it or go on. Stay active!')
-            
-            # If the status is already deleted only a new active_user_habit gets stored in the database 
-            elif status == 'deleted':
-                # Create a new active user habit with the same information as the last one
-                new_active_user_habit = ActiveUserHabit(user_ID, habit_ID, interval_ID)
-                # Store the new active_user_habit in the variable data as a dictionary for inserting it into the database using the db.insert_data function
-                data = vars(new_active_user_habit)
-                #print(active_user_habit)
-                self.db.insert_data("active_user_habits", data)
-                messagebox.showinfo("Success", "The Habit is now reactivated for tracking")
+                # Delete the old active user habit and insert the new one on one connection with one commit on a worker thread
+                self.run_db(self.replace_active_habit, row.active_habits_ID, user_ID, data, on_success=self.active_habit_reactivated)
+
+            # If the the selected habit is still in progress a error message pops up
             else:
-                messagebox.showerror('Error', 'No valid habit was selected for reactivation')
-            
+                messagebox.showerror('Error','This habit is already active. You can delete it or go on. Stay active!')
+
             print("done")
 
+    def replace_active_habit(self, active_habits_ID, user_ID, data):
+        """
+        Sets a failed active habit to 'deleted' and inserts the new active habit on one connection with one commit.
+        Runs on a worker thread, the transaction pins the connection of this thread.
+
+        Args:
+            active_habits_ID (int): The primary key of the failed active habit.
+            user_ID (int): The ID of the user.
+            data (dict): The values of the new active habit.
+        """
+        with self.db.transaction():
+            # Update status for old active user habit from failed to deleted using its primary key
+            self.db.delete_active_habit(active_habits_ID, user_ID)
+            # Insert the new active_user_habit in the database
+            self.db.insert_data("active_user_habits", data)
+
+    def active_habit_reactivated(self, result):
+        """
+        Shows the success message after a habit was reactivated and lets the next tick query the active habits again.
+
+        Args:
+            result: The result of the database call, not used.
+        """
+        # The active habits changed, so the next tick has to query them again
+        self.scheduler.mark_dirty()
+        messagebox.showinfo("Success", "The Habit is now reactivated for tracking")
+
+    @detect_queries
     def check_habit(self):
         """
         This Function is used for the Check Habbit button on the main_screen. If a user checks/tracks a habit the following should happen:
         1. The streak is set streak +=1 and stored in db
         2. The last_check attribute is updated to now.
         3. The update_expiry attribute is updated depending on the time_interval
+        All three happen in one conditional UPDATE (db.check_off), which also rejects checks which are too early or too late.
         """
         # Get selected items
         selected_items = self.active_habits_tree.selection()
 
-        # Loop through selected items and delete from database
+        # Collect the selected items whose time isn't up
+        intervals = {}
         for item in selected_items:
             # Get remaining time from treeview to check if time is up for checking            
             remaining_time = self.active_habits_tree.item(item)["values"][3]
-            if remaining_time == "Time is up!":
+            if remaining_time == TIME_IS_UP:
                 messagebox.showerror("Error","You've failed to check your habit in time. You can start over again by Reactivate Habit or Delete Active Habit!")
                 return
-            else:
-                # Store all needed values from the database to the corresponding variables
-                active_habit_name = self.active_habits_tree.item(item)["values"][0] # Get habit name from selected habit in tree
-                user_ID = self.user_ID  # Get user_ID from stored user_ID from the logged in user
-                habit_ID = int(self.db.get_habit_ID(user_ID, active_habit_name)[0]) # Get habit_ID from the habits table  
-                active_habits_ID = self.db.get_active_habit_ID(user_ID,habit_ID,"in progress")
-                # Get current streak from treeview
-                streak = self.db.get_streak(active_habits_ID)
-                # Get last_check from database
-                last_check = self.db.check_value("last_check","active_user_habits","active_habits_ID",active_habits_ID)
-                # Get update_expiry from database
-                update_expiry = self.db.check_value("update_expiry","active_user_habits","active_habits_ID",active_habits_ID)
-                original_update_expiry = update_expiry[0][0] # Extracts the datetime object from list
-                # Get the monitoring interval of the habit
-                interval_ID = self.active_habits_tree.item(item)["values"][2] # Get interval_ID from selected active_user_habit
-
-                # Convert the interval_ID from a string to a integer and check the control interval:
-                if interval_ID == "daily":
-                    interval_ID = 1
-                    # Calculate the new update_expiry
-                    new_update_expiry = original_update_expiry + timedelta(days = 1)
-                    # Calculate the time difference between the new_update expiry and the actual time 
-                    time_diff = new_update_expiry - dt.now() 
-                    # Calculate how much time is left until user can check this habit again
-                    next_check = original_update_expiry - dt.now()
-                    if streak == 0: # If streak is 0 the habit was activated same day.
-                        new_streak = streak +1
-                        data = {"streak": new_streak,
-                                    "last_check": dt.now().replace(microsecond=0),
-                                    "update_expiry": new_update_expiry}
-                        self.db.update_data("active_user_habits", data, "active_habits", active_habits_ID)
-                        next_check = (new_update_expiry - timedelta(days=1)) - dt.now()
-                        messagebox.showinfo("Success",f"Congrats! You have checked you daily habit and you streak continoues. Your next check is available in {next_check}. Stay focused!")
-                    elif next_check > timedelta(days = 1):
-                        next_check = (original_update_expiry - timedelta(days=1)) - dt.now()
-                        messagebox.showinfo("Info",f"This habit was already checked during this time period. You can check it again in {next_check}")
-                    else:
-                        new_streak = streak +1
-                        data = {"streak": new_streak,
-                                "last_check": dt.now(),
-                                "update_expiry": new_update_expiry}
-                        next_check = (new_update_expiry - timedelta(days=1)) - dt.now()
-                        self.db.update_data("active_user_habits", data, "active_habits", active_habits_ID)
-                        messagebox.showinfo("Success",f"Congrats! You have checked you daily habit and you streak continoues. Your next check is available in {next_check}. Stay focused!")
-                # Check if interval = weekly
-                elif interval_ID == "weekly":
-                    interval_ID = 2
-                    # Calculate the new update_expiry
-                    new_update_expiry = original_update_expiry + timedelta(days = 7)
-                    # Calculate the time difference between the new_update expiry and the actual time 
-                    time_diff = new_update_expiry - dt.now() 
-                    # Calculate how much time is left until user can check this habit again
-                    next_check = original_update_expiry - dt.now()
-                    if streak == 0: # If streak is 0 the habit was activated same week.
-                        new_streak = streak +1
-                        data = {"streak": new_streak,
-                                    "last_check": dt.now(),
-                                    "update_expiry": new_update_expiry}
-                        self.db.update_data("active_user_habits", data, "active_habits", active_habits_ID)
-                        next_check = (new_update_expiry - timedelta(days=7)) - dt.now()
-                        messagebox.showinfo("Success",f"Congrats! You have checked you daily habit and you streak continoues. Your next check is available in {next_check}. Stay focused!")
-                    elif next_check > timedelta(days = 7):
-                        next_check = (original_update_expiry - timedelta(days=7)) - dt.now()
-                        messagebox.showinfo("Info",f"This habit was already checked during this time period. You can check it again in {next_check}")
-                    else:
-                        new_streak = streak +1
-                        data = {"streak": new_streak,
-                                "last_check": dt.now(),
-                                "update_expiry": new_update_expiry}
-                        next_check = (new_update_expiry - timedelta(days=7)) - dt.now()
-                        self.db.update_data("active_user_habits", data, "active_habits", active_habits_ID)
-                        messagebox.showinfo("Success",f"Congrats! You have checked you daily habit and you streak continoues. Your next check is available in {next_check}. Stay focused!")
-                # Check if time interval = monthly
-                elif interval_ID == "monthly":
-                    interval_ID = 3
-                    # Calculate the new update_expiry
-                    new_update_expiry = original_update_expiry + timedelta(days = 30)
-                    # Calculate the time difference between the new_update expiry and the actual time 
-                    time_diff = new_update_expiry - dt.now() 
-                    # Calculate how much time is left until user can check this habit again
-                    next_check = original_update_expiry - dt.now()
-                    if streak == 0: # If streak is 0 the habit was activated same month.
-                        new_streak = streak +1
-                        data = {"streak": new_streak,
-                                    "last_check": dt.now(),
-                                    "update_expiry": new_update_expiry}
-                        self.db.update_data("active_user_habits", data, "active_habits", active_habits_ID)
-                        next_check = (new_update_expiry - timedelta(days=30)) - dt.now()
-                        messagebox.showinfo("Success",f"Congrats! You have checked you daily habit and you streak continoues. Your next check is available in {next_check}. Stay focused!")
-                    elif next_check > timedelta(days = 30):
-                        next_check = (original_update_expiry - timedelta(days=30)) - dt.now()
-                        messagebox.showinfo("Info",f"This habit was already checked during this time period. You can check it again in {next_check}")
-                    else:
-                        new_streak = streak +1
-                        data = {"streak": new_streak,
-                                "last_check": dt.now(),
-                                "update_expiry": new_update_expiry}
-                        next_check = (new_update_expiry - timedelta(days=30)) - dt.now()
-                        self.db.update_data("active_user_habits", data, "active_habits", active_habits_ID)
-                        messagebox.showinfo("Success",f"Congrats! You have checked you daily habit and you streak continoues. Your next check is available in {next_check}. Stay focused!")
-                    # Else print a error message for wrong time interval
-                else:
-                    messagebox.showerror("Error","There is something wrong with the Interval")
+            # Get the monitoring interval of the habit for the message from the cached row
+            row = self.active_habit_rows.get(int(item))
+            intervals[int(item)] = row.control_interval if row is not None else self.active_habits_tree.item(item)["values"][2]
+
+        # The iid of every selected item is the active_habits_ID, check all of them off with one UPDATE on a worker thread
+        if intervals:
+            now = self.clock().replace(microsecond=0)
+            self.run_db(self.db.check_off_many, list(intervals), self.user_ID, now, on_success=partial(self.show_check_off_results, intervals, now))
+
+    def show_check_off_results(self, intervals, now, results):
+        """
+        Shows the results of the check-offs. The result of one habit is shown in detail, several results are summed up in one message.
+
+        Args:
+            intervals (dict): The monitoring interval of every checked active_habits_ID.
+            now (datetime.datetime): The time of the check-off.
+            results (dict): The CheckOffResult of every active_habits_ID, the result of db.check_off_many.
+        """
+        if len(results) == 1:
+            active_habits_ID, result = next(iter(results.items()))
+            self.show_check_off_result(intervals[active_habits_ID], now, result)
+            return
+
+        # Count the results by status
+        counts = {'checked': 0, 'too_early': 0, 'expired': 0, 'not_found': 0}
+        for result in results.values():
+            counts[result.status] += 1
+        messagebox.showinfo("Check Habits", f"{counts['checked']} habit(s) checked. {counts['too_early']} habit(s) were already checked during this time period. {counts['expired'] + counts['not_found']} habit(s) couldn't be checked any longer.")
+
+        # The streaks and the deadlines changed, so the next tick has to query the active habits again
+        self.scheduler.mark_dirty()
+
+    def show_check_off_result(self, interval, now, result):
+        """
+        Shows the result of a check-off and lets the next tick query the active habits again.
+
+        Args:
+            interval (str): The monitoring interval of the habit.
+            now (datetime.datetime): The time of the check-off.
+            result (CheckOffResult): The result of db.check_off.
+        """
+        if result.status == 'checked':
+            # Calculate how much time is left until user can check this habit again
+            next_check = self.streak_engine.next_check(result, now)
+            messagebox.showinfo("Success",f"Congrats! You have checked you {interval} habit and you streak continoues. Your next check is available in {next_check}. Stay focused!")
+        elif result.status == 'too_early':
+            next_check = self.streak_engine.next_check(result, now)
+            messagebox.showinfo("Info",f"This habit was already checked during this time period. You can check it again in {next_check}")
+        elif result.status == 'expired':
+            messagebox.showerror("Error","You've failed to check your habit in time. You can start over again by Reactivate Habit or Delete Active Habit!")
+        else:
+            messagebox.showerror("Error","The selected habit doesn't exist any longer. Please update table.")
+
+        # The streak and the deadline changed, so the next tick has to query the active habits again
+        self.scheduler.mark_dirty()
 
     def update_time(self):
         """Function to update the time label on the bottom of the screen.
@@ -687,10 +593,27 @@ class Main_screen(tk.Tk):
         This function gets the current time and sets the text of the time label to it.
         It uses the after() method to call itself every second, effectively updating the label in real-time.
         """
-        self.current_time = dt.now().strftime('%H:%M:%S')
+        self.current_time = self.clock().strftime('%H:%M:%S')
         self.time_label.configure(text=self.current_time)
         self.time_label.after(1000, self.update_time)  # Update every second
     
+    def show_instrumentation(self, event=None):
+        """
+        Opens a popup with the recorded calls and latencies of the database methods and statements
+        and writes them to the file of the environment variable Habit_Tracker_Instrumentation.
+        """
+        if self.db.instrumentation is None:
+            return
+        self.db.instrumentation.dump_json(self.instrumentation_path)
+
+        # Show the recording as a text table
+        popup = tk.Toplevel(self)
+        popup.title("Database Instrumentation")
+        text = tk.Text(popup, width=140, height=40, font=("Courier", 9))
+        text.insert("end", self.db.instrumentation.format_table())
+        text.configure(state="disabled")
+        text.pack(fill="both", expand=True)
+
     def close_application(self):
         """Function to close the Habit Tracker application.
 
@@ -699,49 +622,42 @@ class Main_screen(tk.Tk):
         """
         confirm_exit = messagebox.askyesno("Confirm Exit", "Do you really want to leave the Habit Tracker?")
         if confirm_exit:
+            # Stop the refresh loops before the window is gone
+            self.refresh_controller.stop()
+            self.sweep_controller.stop()
+            self.db_executor.shutdown()
+            self.db.close() # Close the pooled database connections
             self.destroy() # Close the main window and exit the application
  
     def open_myHabits(self):
         """
         Creates a new popup window that displays a table of the user's habits. 
-        Adds several buttons to interact with the habits, including adding a new habit, 
+        Adds several buttons to interact with the habits, including adding a new habit,
         deleting a habit, updating the habit table, and activating a selected habit.
+        The habits are queried on a worker thread and shown as soon as they arrived.
         """
         # Create a new window
         popup = tk.Toplevel(self)
         popup.title("MyHabits")
         #popup.grab_set() # Disables interaction with parent window
 
-        # get the all habits of the user
-        habits = self.db.get_user_habits(self.user_ID)
-        
         # Create a frame to hold the table and buttons
         frame = tk.Frame(popup)
         frame.pack(padx=20, pady=20)
 
-        # Check if there are any habits to display
-        if not habits:
-        # Display a message to the user
-            message_label = tk.Label(frame, text="No habits to display")
-            message_label.pack()
-        
-        else:
-            # Create a treeview widget to display the habits
-            tree = ttk.Treeview(frame, columns=("no","habit_name", "description" ,"creation_date", "category","habit_ID"),show = "headings")
-            #tree.heading("#0",text="ID")
-            tree.heading("#1",text="No.")
-            tree.heading("#2", text="Habit Name")
-            tree.heading("#3", text="Description")
-            tree.heading("#4", text="Creation Date")
-            tree.heading("#5", text="Category")
-            tree.heading("#6", text = "Habit ID")
-            tree.pack(side="left")
-
-            # Insert habits into the treeview and start counting by 1 for each habit of each user
-            counter = 0
-            for habit in habits:
-                counter += 1
-                item = tree.insert("","end",values = (counter, habit[1], habit[2], habit[3], habit[4], habit[0], ""))
+        # Create a treeview widget to display the habits and a message which is shown instead if there are no habits
+        tree = ttk.Treeview(frame, columns=("no","habit_name", "description" ,"creation_date", "category","habit_ID"),show = "headings")
+        #tree.heading("#0",text="ID")
+        tree.heading("#1",text="No.")
+        tree.heading("#2", text="Habit Name")
+        tree.heading("#3", text="Description")
+        tree.heading("#4", text="Creation Date")
+        tree.heading("#5", text="Category")
+        tree.heading("#6", text = "Habit ID")
+        message_label = tk.Label(frame, text="No habits to display")
+
+        # get the all habits of the user on a worker thread
+        self.update_habits_table(tree, message_label)
 
         # Create a frame for the buttons
         button_frame = tk.Frame(popup)
@@ -756,7 +672,7 @@ class Main_screen(tk.Tk):
         delete_button.pack(side="left", padx=5)
 
         # Add a button for updating the habit table
-        update_button = tk.Button(button_frame, text="Update Table", command=lambda: self.update_habits_table(tree))
+        update_button = tk.Button(button_frame, text="Update Table", command=lambda: self.update_habits_table(tree, message_label))
         update_button.pack(side="left", padx=5)
 
         # Add a button for activating a selected habit from the table
@@ -767,19 +683,43 @@ class Main_screen(tk.Tk):
         popup.wait_window()
     
     # When pushing the Update Table button the screen gets updated with the newest habits
-    def update_habits_table(self, tree):
+    def update_habits_table(self, tree, message_label=None):
         """
         Update the habit table displayed in the MyHabits popup window with the latest data from the database.
+        The habits are queried on a worker thread, an older refresh which is still pending is dropped.
 
         Args:
             tree (ttk.Treeview): The treeview widget displaying the habit table.
+            message_label (Optional[tk.Label]): Per Default None. The message which is shown instead of the table if there are no habits.
 
         Returns:
             None
         """
         # Refresh the habit table by getting the latest data from the database
-        habits = self.db.get_user_habits(self.user_ID)
-        
+        self.run_db(self.db.get_user_habits, self.user_ID, on_success=partial(self.show_habits, tree, message_label), key="my_habits")
+
+    def show_habits(self, tree, message_label, habits):
+        """
+        Shows the habits of the user in the habit table of the MyHabits popup window.
+
+        Args:
+            tree (ttk.Treeview): The treeview widget displaying the habit table.
+            message_label (Optional[tk.Label]): The message which is shown instead of the table if there are no habits.
+            habits (list): The result of db.get_user_habits.
+        """
+        # The popup could have been closed while the habits were queried
+        if not tree.winfo_exists():
+            return
+
+        # Check if there are any habits to display, otherwise display a message to the user
+        if message_label is not None:
+            if habits:
+                message_label.pack_forget()
+                tree.pack(side="left")
+            else:
+                tree.pack_forget()
+                message_label.pack()
+
         # Clear the treeview and insert the updated data
         tree.delete(*tree.get_children())
         
@@ -792,6 +732,7 @@ class Main_screen(tk.Tk):
         # Reset the counter variable to 0
         counter = 0
 
+    @detect_queries
     def delete_habits(self, tree):
         """Delete the selected habit and its corresponding records from the active_user_habits table.
 
@@ -801,25 +742,33 @@ class Main_screen(tk.Tk):
         Returns:
             None.
         """
-        # Get selected items
-        selected_items = tree.selection()
+        # Get the habit IDs of the selected items
+        habit_IDs = [tree.item(item)["values"][5] for item in tree.selection()]
 
-        # Loop through selected items and delete from database
-        for item in selected_items:
-            habit_ID = tree.item(item)["values"][5]
-            sys_user_habits = self.db.get_user_habits(99)
+        # Check if one of the habit IDs is a system user habit, they are kept in the reference data
+        if any(self.db.reference_data.is_system_habit(habit_ID) for habit_ID in habit_IDs):
+            messagebox.showerror("Error", "Cannot delete a system habit!")
+            return
+        if not habit_IDs:
+            return
 
-            # Check if the habit ID is in the user's habits
-            if habit_ID in [value[0] for value in sys_user_habits]:
-                messagebox.showerror("Error", "Cannot delete a system habit!")
-            else:
-                confirmation = messagebox.askyesno("Confirm deletion", "Do you really want to delete this habit and its corresponding records from the active_user_habits table? Your streaks and history for this habit will be deleted.")
-                if confirmation:
-                    # Delete habit and its corresponding records from the database
-                    self.db.delete_habit(habit_ID)
-                    
-                    # Refresh the habit table
-                    self.update_habits_table(tree)
+        confirmation = messagebox.askyesno("Confirm deletion", f"Do you really want to delete {len(habit_IDs)} habit(s) and the corresponding records from the active_user_habits table? Your streaks and history for these habits will be deleted.")
+        if confirmation:
+            # Delete all selected habits with one statement on a worker thread
+            self.run_db(self.db.delete_habits, habit_IDs, on_success=partial(self.habits_deleted, tree))
+
+    def habits_deleted(self, tree, result):
+        """
+        Lets the next tick query the active habits again and refreshes the habit table after habits were deleted.
+
+        Args:
+            tree (ttk.Treeview): The treeview widget that displays the habit table.
+            result (int): The number of deleted habits.
+        """
+        self.scheduler.mark_dirty()
+
+        # Refresh the habit table
+        self.update_habits_table(tree)
     
 
     # Open window for adding new habit by user if pushing the Add Habit Button
@@ -857,15 +806,28 @@ class Main_screen(tk.Tk):
         self.category_var = tk.StringVar()
         self.entry_category = ttk.Combobox(self.popup, textvariable=self.category_var, state="readonly")
         self.entry_category.pack()
-        categories = self.db.get_user_categories_name(self.user_ID) # get list of available categories from database
-        self.entry_category['values'] = categories
+        # get list of available categories from database on a worker thread and fill the dropdown menu when they arrived
+        self.run_db(self.db.get_user_categories_name, self.user_ID, on_success=partial(self.show_category_names, self.entry_category), key="category_names")
 
 
         tk.Button(self.popup, text="Save new myHabit", command = self.save_habit, width=20, height=1).pack()
 
         self.popup.wait_window()  # Wait for popup window to be destroyed
 
+    def show_category_names(self, entry_category, categories):
+        """
+        Fills the dropdown menu of the categories in the add_habit window.
+
+        Args:
+            entry_category (ttk.Combobox): The dropdown menu of the categories.
+            categories (list): The result of db.get_user_categories_name.
+        """
+        # The popup could have been closed while the categories were queried
+        if entry_category.winfo_exists():
+            entry_category['values'] = categories
+
     # Function for storing the input user data in the database and closing the popup window
+    @detect_queries
     def save_habit(self):
         """
         Saves the habit entered by the user in the add_habit window to the database.
@@ -879,43 +841,80 @@ class Main_screen(tk.Tk):
         habit_name = self.entry_habit_name.get()
         description = self.entry_description.get()
         category_name = self.category_var.get()
-        user_ID = self.user_ID
+
+        # Check the entries and save the habit on a worker thread, the result is shown when it arrived
+        self.run_db(self.store_habit, habit_name, description, category_name, self.user_ID,
+                    on_success=partial(self.habit_saved, habit_name), on_error=partial(self.show_save_error, self.popup))
+
+    def store_habit(self, habit_name, description, category_name, user_ID):
+        """
+        Checks the entries of the add_habit window and saves the new habit to the database. Runs on a worker thread.
+
+        Args:
+            habit_name (str): The name of the new habit.
+            description (str): The description of the new habit.
+            category_name (str): The name of the chosen category.
+            user_ID (int): The ID of the user.
+
+        Returns:
+            str: 'saved' or why the habit wasn't saved: 'missing_fields', 'existing_habit' or 'system_habit'.
+        """
         category_ID = self.db.get_category_ID(category_name, user_ID)
-        system_user_ID = 99
-           
+
         # Check if any of the variables are empty
         if not all([habit_name, description, category_ID]):
-            messagebox.showerror("Error", "Please fill in all fields")
-            return
+            return 'missing_fields'
 
         # Check if the user already has a habit with the same name stored in the database
         existing_habit = self.db.get_habit_ID(user_ID, habit_name)
         if existing_habit:
-            messagebox.showerror("Error", "You already have a habit with the same name stored. Please choose a different name.")
-            return
-        
+            return 'existing_habit'
+
         # Check if there is already a system habit with this name in the database
-        system_habit = self.db.get_habit_ID(system_user_ID, habit_name)
+        system_habit = self.db.get_habit_ID(SYSTEM_USER_ID, habit_name)
         if system_habit:
-            messagebox.showerror("Error", "There is already a predefined habit with the same name in the database. Please choose a different name or use the existing habit.")
-            return
+            return 'system_habit'
 
         # Use User class to create a new user instance
-        new_habit = Habit(habit_name, user_ID, category_ID, description)
+        new_habit = Habit(habit_name, user_ID, category_ID, description, clock=self.clock)
         #data = {'habit_name': habit_name, 'user_ID': user_ID, 'category_ID': category_ID, 'description': description}
         data = new_habit.create_dict()
 
-        try:
-            # If everything is correct a new user is saved in the database
-            self.db.insert_data("habits", data)
+        # If everything is correct a new user is saved in the database
+        self.db.insert_data("habits", data)
+        return 'saved'
+
+    def habit_saved(self, habit_name, result):
+        """
+        Shows the result of store_habit and closes the add_habit window after the habit was saved.
+
+        Args:
+            habit_name (str): The name of the new habit.
+            result (str): The result of store_habit.
+        """
+        if result == 'missing_fields':
+            messagebox.showerror("Error", "Please fill in all fields")
+        elif result == 'existing_habit':
+            messagebox.showerror("Error", "You already have a habit with the same name stored. Please choose a different name.")
+        elif result == 'system_habit':
+            messagebox.showerror("Error", "There is already a predefined habit with the same name in the database. Please choose a different name or use the existing habit.")
+        else:
             messagebox.showinfo("Success", "Habit: {} successfully saved".format(habit_name))
             self.popup.destroy()
 
-        except mysql.connector.IntegrityError as e:
-            # Catch the exception thrown if the username already exists
-            messagebox.showerror("Error", "An error occurred: {}".format(str(e)))
-            print("MySQL error: {}".format(e))
-            self.popup.destroy()
+    def show_save_error(self, popup, error):
+        """
+        Shows the error of a failed insert. The popup is closed if the row already exists.
+
+        Args:
+            popup (tk.Toplevel): The window of the entries.
+            error (Exception): The exception of the database call.
+        """
+        messagebox.showerror("Error", "An error occurred: {}".format(str(error)))
+        # Catch the exception thrown if the name already exists
+        if isinstance(error, mysql.connector.IntegrityError):
+            print("MySQL error: {}".format(error))
+            popup.destroy()
 
     def activate_habit(self, tree):
         """Creates a popup window to activate a habit selected in a treeview widget.
@@ -931,31 +930,29 @@ class Main_screen(tk.Tk):
         # Get selected item
         selected_items = tree.selection()
 
-        # Loop through selected items and get information about the habit_ID
+        # Loop through selected items and get information about the habit_ID and the habit name from the table
         for item in selected_items:
             habit_ID = tree.item(item)["values"][5]
-
-        habit_name = self.db.check_value("habit_name", "habits", "habit_ID", habit_ID)
+            habit_name = tree.item(item)["values"][1]
 
         # Create popup window
         popup_window = tk.Toplevel()
         popup_window.title(f"Activate Habit {habit_name}")
         popup_window.geometry('600x200')
 
-        # Get user ID
+        # Get user ID, it was retrieved when the main screen was opened
         #username = os.getenv("User_Variables").split(',')[0]
-        username = self.username
-        user_ID = self.db.get_userID(username)
+        user_ID = self.user_ID
        
        # Create labels and entry widgets for control frequency, goal streak, and end date
         control_interval_label = tk.Label(popup_window, text='Please choose the control interval:')
         control_interval_label.grid(column=0, row=0, pady=10, padx=10)
 
-        # Define options
-        self.interval_options = {1: "daily", 2: "weekly", 3: "monthly"}
+        # Define options, the monitoring intervals are taken from the reference data
+        interval_names = self.db.reference_data.interval_names()
 
-        control_interval_var = tk.StringVar(value= 'daily' ) # Default Value when opening the window
-        control_interval_dropdown = tk.OptionMenu(popup_window, control_interval_var, 'daily', 'weekly', 'monthly')
+        control_interval_var = tk.StringVar(value= interval_names[0] ) # Default Value when opening the window
+        control_interval_dropdown = tk.OptionMenu(popup_window, control_interval_var, *interval_names)
         control_interval_dropdown.grid(column=1, row=0, pady=10, padx=10)
 
         goal_streak_label = tk.Label(popup_window, text='Do you have a goal for a streak? If not leave it empty')
@@ -984,13 +981,13 @@ class Main_screen(tk.Tk):
             ActiveUserHabit with the provided data, calculates the update expiry time
             based on the control interval, and inserts the new habit into the
             active_user_habits table in the database using the db.insert_data function.
+            The check and the insert run on a worker thread.
 
             Returns:
                 None.
             """
-            # Use the dictionary to get the corresponding Interval_ID for the database table monitoring_interval
-            self.interval_options = {"daily" : 1,"weekly" : 2,"monthly": 3}
-            self.interval_ID = self.interval_options[control_interval_var.get()]
+            # Use the reference data to get the corresponding Interval_ID for the database table monitoring_interval
+            self.interval_ID = self.db.reference_data.interval_ID(control_interval_var.get())
             
             # Get entry for the goal streak
             self.goal_streak = goal_streak_entry.get()
@@ -1001,62 +998,57 @@ class Main_screen(tk.Tk):
                 self.end_date = dt.strptime(self.end_date, '%Y-%m-%d').date()
 
             # Set Last_check to now when activating a habit
-            self.last_check = dt.now()
+            self.last_check = self.clock()
             
             # Check if chosen end date isn't in the past. Also possible that there is no end date, then store self.end_date as none
-            if not self.end_date or self.end_date > dt.now().date():
-                # check if the habit already set active for the user
-                habit_exists = self.db.execute_query(f"SELECT * FROM active_user_habits WHERE user_ID = {user_ID} AND habit_ID = {habit_ID} AND status != 'deleted'")
-                if habit_exists:
-                    messagebox.showerror("Error", "This habit is already active for tracking!")
-                    popup_window.destroy()
-                else:
-                    if self.interval_ID == 1:
-                        # Set the time interval to 24 hours to add it to the last_check as update expiry
-                        self.time_add_interval = timedelta(days = 1)
-                        self.update_expiry = self.last_check + self.time_add_interval
-                        # Create new instance of ActiveUserHabit
-                        active_user_habit = ActiveUserHabit(user_ID, habit_ID, self.interval_ID, self.goal_streak, self.end_date, self.last_check, self.update_expiry)
-                        # Store the new active_user_habit in the variable data as a dictionary for inserting it into the database using the db.insert_data function
-                        data = vars(active_user_habit)
-                        #print(active_user_habit)
-                        self.db.insert_data("active_user_habits", data)
-                        messagebox.showinfo("Success", "The Habit is now set active for tracking")
-                        popup_window.destroy()
-                    elif self.interval_ID == 2:
-                        # Set the time interval to 7 days to add it to the last_check as update expiry
-                        self.time_add_interval = timedelta(days = 7)
-                        self.update_expiry = self.last_check + self.time_add_interval
-                        # Create new instance of ActiveUserHabit
-                        active_user_habit = ActiveUserHabit(user_ID, habit_ID, self.interval_ID, self.goal_streak, self.end_date, self.last_check, self.update_expiry)
-                        # Store the new active_user_habit in the variable data as a dictionary for inserting it into the database using the db.insert_data function
-                        data = vars(active_user_habit)
-                        #print(active_user_habit)
-                        self.db.insert_data("active_user_habits", data)
-                        messagebox.showinfo("Success", "The Habit is now set active for tracking")
-                        popup_window.destroy()
-                    elif self.interval_ID == 3:
-                        # Set the time interval to 30 days to add it to the last_check
-                        self.time_add_interval = timedelta(days = 30)
-                        self.update_expiry = self.last_check + self.time_add_interval
-                        # Create new instance of ActiveUserHabit
-                        active_user_habit = ActiveUserHabit(user_ID, habit_ID, self.interval_ID, self.goal_streak, self.end_date, self.last_check, self.update_expiry)
-                        # Store the new active_user_habit in the variable data as a dictionary for inserting it into the database using the db.insert_data function
-                        data = vars(active_user_habit)
-                        #print(active_user_habit)
-                        self.db.insert_data("active_user_habits", data)
-                        messagebox.showinfo("Success", "The Habit is now set active for tracking")
-                        popup_window.destroy()
+            if not self.end_date or self.end_date > self.last_check.date():
+                # Add the days of the monitoring interval to the last_check as update expiry
+                self.update_expiry = self.streak_engine.first_deadline(self.interval_ID, self.last_check)
+                # Create new instance of ActiveUserHabit
+                active_user_habit = ActiveUserHabit(user_ID, habit_ID, self.interval_ID, self.goal_streak, self.end_date, self.last_check, self.update_expiry, clock=self.clock)
+                # Store the new active_user_habit in the variable data as a dictionary for inserting it into the database using the db.insert_data function
+                data = vars(active_user_habit)
+                # Check if the habit is already active and insert it on a worker thread
+                self.run_db(self.store_activation, user_ID, habit_ID, data, on_success=activation_saved)
             else:
                 messagebox.showerror("Error", "Your end date is in the past! Please try again")
                 popup_window.destroy()
 
+        def activation_saved(saved):
+            # Show the result of store_activation and close the popup window
+            if saved:
+                self.scheduler.mark_dirty()
+                messagebox.showinfo("Success", "The Habit is now set active for tracking")
+            else:
+                messagebox.showerror("Error", "This habit is already active for tracking!")
+            popup_window.destroy()
+
         save_button = tk.Button(popup_window, text='Save', command=lambda: save_activation(self))
         save_button.grid(column=0, row=3, pady=10, padx=10, columnspan=2)
-        
+
+    def store_activation(self, user_ID, habit_ID, data):
+        """
+        Inserts a new active habit unless the habit is already active for the user. Runs on a worker thread.
+
+        Args:
+            user_ID (int): The ID of the user.
+            habit_ID (int): The ID of the habit.
+            data (dict): The values of the new active habit.
+
+        Returns:
+            bool: True if the active habit was inserted, False if the habit is already active.
+        """
+        # check if the habit already set active for the user
+        habit_exists = self.db.execute_query(f"SELECT * FROM active_user_habits WHERE user_ID = {user_ID} AND habit_ID = {habit_ID} AND status != 'deleted'")
+        if habit_exists:
+            return False
+        self.db.insert_data("active_user_habits", data)
+        return True
+
     def open_myCategories(self):
         """
         Opens a new window displaying all the categories of the current user, along with options to add, delete, and update categories.
+        The categories are queried on a worker thread and shown as soon as they arrived.
 
         Returns:
         None
@@ -1066,35 +1058,22 @@ class Main_screen(tk.Tk):
         cat_popup.title("MyCategories")
         cat_popup.grab_set() # Disables interaction with parent window
 
-        # get the all categories of the user
-        categories = self.db.get_user_categories(self.user_ID)
-        
         # Create a frame to hold the table and buttons
         frame = tk.Frame(cat_popup)
         frame.pack(padx=20, pady=20)
 
-        # Check if there are any habits to display
-        if not categories:
-        # Display a message to the user
-            message_label = tk.Label(frame, text="No categories to display")
-            message_label.pack()
-        
-        else:
-            # Create a treeview widget to display the categories
-            tree = ttk.Treeview(frame, columns=("no","category_name", "description" ,"creation_date", "category_ID"),show = "headings")
-            #tree.heading("#0",text="ID")
-            tree.heading("#1",text="No.")
-            tree.heading("#2", text="Category Name")
-            tree.heading("#3", text="Description")
-            tree.heading("#4", text="Creation Date")
-            tree.heading("#5", text = "Category ID")
-            tree.pack(side="left")
-
-            # Insert habits into the treeview and start counting by 1 for each category of each user
-            counter = 0
-            for category in categories:
-                counter += 1
-                item = tree.insert("","end",values = (counter, category[1], category[2], category[3], category[0], ""))
+        # Create a treeview widget to display the categories and a message which is shown instead if there are no categories
+        tree = ttk.Treeview(frame, columns=("no","category_name", "description" ,"creation_date", "category_ID"),show = "headings")
+        #tree.heading("#0",text="ID")
+        tree.heading("#1",text="No.")
+        tree.heading("#2", text="Category Name")
+        tree.heading("#3", text="Description")
+        tree.heading("#4", text="Creation Date")
+        tree.heading("#5", text = "Category ID")
+        message_label = tk.Label(frame, text="No categories to display")
+
+        # get the all categories of the user on a worker thread
+        self.update_categories_table(tree, message_label)
 
         # Create a frame for the buttons
         button_frame = tk.Frame(cat_popup)
@@ -1109,19 +1088,43 @@ class Main_screen(tk.Tk):
         delete_button.pack(side="left", padx=5)
 
         # Add a button for updating the category table
-        update_button = tk.Button(button_frame, text="Update Table", command = lambda: self.update_categories_table(tree))
+        update_button = tk.Button(button_frame, text="Update Table", command = lambda: self.update_categories_table(tree, message_label))
         update_button.pack(side="left", padx=5)
 
-    def update_categories_table(self, tree):
+    def update_categories_table(self, tree, message_label=None):
         """
         Updates the category table with the latest data from the database.
+        The categories are queried on a worker thread, an older refresh which is still pending is dropped.
 
         Args:
             tree (ttk.Treeview): The treeview widget displaying the categories.
+            message_label (Optional[tk.Label]): Per Default None. The message which is shown instead of the table if there are no categories.
         """
         # Refresh the category table by getting the latest data from the database
-        categories = self.db.get_user_categories(self.user_ID)
-        
+        self.run_db(self.db.get_user_categories, self.user_ID, on_success=partial(self.show_categories, tree, message_label), key="my_categories")
+
+    def show_categories(self, tree, message_label, categories):
+        """
+        Shows the categories of the user in the category table of the MyCategories popup window.
+
+        Args:
+            tree (ttk.Treeview): The treeview widget displaying the categories.
+            message_label (Optional[tk.Label]): The message which is shown instead of the table if there are no categories.
+            categories (list): The result of db.get_user_categories.
+        """
+        # The popup could have been closed while the categories were queried
+        if not tree.winfo_exists():
+            return
+
+        # Check if there are any categories to display, otherwise display a message to the user
+        if message_label is not None:
+            if categories:
+                message_label.pack_forget()
+                tree.pack(side="left")
+            else:
+                tree.pack_forget()
+                message_label.pack()
+
         # Clear the treeview and insert the updated data
         tree.delete(*tree.get_children())
         
@@ -1135,6 +1138,7 @@ class Main_screen(tk.Tk):
         counter = 0
     
     # Function for the delete button
+    @detect_queries
     def delete_category(self, tree):
         """
         Deletes the selected category from the database and updates the category table using delete_category function
@@ -1143,24 +1147,31 @@ class Main_screen(tk.Tk):
         Args:
             tree (ttk.Treeview): The treeview widget displaying the categories.
         """
-        # Get selected items
-        selected_items = tree.selection()
-
-        # Loop through selected items and delete from database
-        for item in selected_items:
-            category_ID = tree.item(item)["values"][4]
-            sys_user_categories = self.db.get_user_categories(99)
+        # Get the category IDs of the selected items
+        category_IDs = [tree.item(item)["values"][4] for item in tree.selection()]
             
-            #Check if category is one of the sys users categories
-            if category_ID in [value[0] for value in sys_user_categories]:
-                messagebox.showerror("Error", "Can't delete a predefined sys user category")
-            else:
-                confirmation = messagebox.askyesno("Confirm deletion", "Do you really want to delete this category?")
-                if confirmation:
-                    # Use delete_category function from database class to delete selected category from the database
-                    self.db.delete_category(category_ID)
-                    # Refresh the habit table
-                    self.update_categories_table(tree)
+        #Check if one of the categories is a sys user category, they are kept in the reference data
+        if any(self.db.reference_data.is_system_category(category_ID) for category_ID in category_IDs):
+            messagebox.showerror("Error", "Can't delete a predefined sys user category")
+            return
+        if not category_IDs:
+            return
+
+        confirmation = messagebox.askyesno("Confirm deletion", f"Do you really want to delete {len(category_IDs)} category(s)?")
+        if confirmation:
+            # Use delete_categories function from database class to delete all selected categories with one statement on a worker thread
+            self.run_db(self.db.delete_categories, category_IDs, on_success=partial(self.categories_deleted, tree))
+
+    def categories_deleted(self, tree, result):
+        """
+        Refreshes the category table after categories were deleted.
+
+        Args:
+            tree (ttk.Treeview): The treeview widget displaying the categories.
+            result (int): The number of deleted categories.
+        """
+        # Refresh the category table
+        self.update_categories_table(tree)
 
     def add_category(self):
         """
@@ -1194,6 +1205,7 @@ class Main_screen(tk.Tk):
 
         self.add_cat_pop.wait_window() # Wait for popup window to be destroyed
 
+    @detect_queries
     def save_category(self):     
         """
         Save the new category entered by the user to the database using insert_data function
@@ -1209,19 +1221,23 @@ class Main_screen(tk.Tk):
             return
 
         # Use Category class to create a new category instance
-        new_category = Category(category_name, user_ID, description)
+        new_category = Category(category_name, user_ID, description, clock=self.clock)
         data = new_category.create_dict()
                     
-        try:
-            # If everything is correct a new user is saved in the database
-            self.db.insert_data("category", data)
-            messagebox.showinfo("Success", "Category: {} successfully saved".format(category_name))
-            self.add_cat_pop.destroy()
-        except mysql.connector.IntegrityError as e:
-            # Catch the exception thrown if the username already exists
-            messagebox.showerror("Error", "An error occurred: {}".format(str(e)))
-            print("MySQL error: {}".format(e))
-            self.add_cat_pop.destroy()
+        # If everything is correct a new category is saved in the database on a worker thread
+        self.run_db(self.db.insert_data, "category", data,
+                    on_success=partial(self.category_saved, category_name), on_error=partial(self.show_save_error, self.add_cat_pop))
+
+    def category_saved(self, category_name, result):
+        """
+        Shows the success message and closes the add_category window after the category was saved.
+
+        Args:
+            category_name (str): The name of the new category.
+            result: The result of db.insert_data, not used.
+        """
+        messagebox.showinfo("Success", "Category: {} successfully saved".format(category_name))
+        self.add_cat_pop.destroy()
      
     def update_profile(self):
         """
@@ -1239,11 +1255,24 @@ class Main_screen(tk.Tk):
 
 
         #self.username = "SYS"
-        active_user_ID = self.db.get_userID(self.username)
         # active_user_ID = int(os.getenv("active_user_ID"))
-        
-        user_dict = self.db.get_user_credentials(active_user_ID)
-        
+
+        # Get the stored credentials of the logged in user on a worker thread and show them when they arrived
+        self.run_db(self.db.get_user_credentials, self.user_ID, on_success=self.show_profile_credentials, key="profile")
+
+        self.profile_popup.wait_window()  # Wait for popup window to be destroyed
+
+    def show_profile_credentials(self, user_dict):
+        """
+        Shows the stored user credentials and the entries for the new ones in the Update Profile window.
+
+        Args:
+            user_dict (dict): The result of db.get_user_credentials.
+        """
+        # The popup could have been closed while the credentials were queried
+        if not self.profile_popup.winfo_exists():
+            return
+
         # pady for adding spacing between widgets
         pady = 5
 
@@ -1285,15 +1314,14 @@ class Main_screen(tk.Tk):
 
         tk.Button(self.profile_popup, text="Save changes", command = self.save_profile_changes, width=10, height=1).pack()
 
-        self.profile_popup.wait_window()  # Wait for popup window to be destroyed
-
+    @detect_queries
     def save_profile_changes(self):
         """
         Save changes for the user credentials in the database.
 
         Retrieves the new user entries from the entry widgets and updates the corresponding values in the user's database
         record. If the user inputs a new phone number or email address, the method checks that the phone number contains only
-        digits and the email address contains an '@' symbol.
+        digits and the email address contains an '@' symbol. The credentials are read and updated on a worker thread.
 
         Raises:
             Error: If the phone number entered contains non-numeric characters or the email address entered does not contain
@@ -1313,9 +1341,6 @@ class Main_screen(tk.Tk):
 
         # Get the user_ID value of the active habit tracker user from the environmental variable
         active_user_ID = int(os.getenv("active_user_ID"))
-        
-        # Get all stored credentials of the user stored in the database
-        user_dict = self.db.get_user_credentials(active_user_ID)
 
         # Check if the phone number entered contains only numbers
         if new_phone_number and not new_phone_number.isnumeric():
@@ -1327,33 +1352,58 @@ class Main_screen(tk.Tk):
             messagebox.showerror("Error", "Invalid email address")
             return
 
-        # Update the used dictionary (user_dict) for the user credentials with the new values if the user inputs some
+        # Collect the new values if the user inputs some
+        changes = {}
         if new_first_name:
-            user_dict['first_name'] = new_first_name
+            changes['first_name'] = new_first_name
         if new_last_name:
-            user_dict['last_name'] = new_last_name
+            changes['last_name'] = new_last_name
         if new_username:
-            user_dict['username'] = new_username
+            changes['username'] = new_username
         if new_password:
-            user_dict['password'] = new_password
+            changes['password'] = new_password
         if new_email:
-            user_dict['email'] = new_email
+            changes['email'] = new_email
         if new_phone_number:
-            user_dict['phone_number'] = new_phone_number
-        
-        # Set the value for last profile update to now and update the user_dict
-        self.last_update = dt.now()
-        user_dict['last_update'] = self.last_update
-        
+            changes['phone_number'] = new_phone_number
+
+        # Set the value for last profile update to now
+        self.last_update = self.clock()
+        changes['last_update'] = self.last_update
+
+        # Update the values in the database on a worker thread
+        self.run_db(self.store_profile_changes, active_user_ID, changes, on_success=self.profile_changes_saved)
+
+    def store_profile_changes(self, user_ID, changes):
+        """
+        Updates the stored user credentials with the changed values. Runs on a worker thread.
+
+        Args:
+            user_ID (int): The ID of the user.
+            changes (dict): The new values by column name.
+        """
+        # Get all stored credentials of the user stored in the database
+        user_dict = self.db.get_user_credentials(user_ID)
+
+        # Update the used dictionary (user_dict) for the user credentials with the new values
+        user_dict.update(changes)
+
         # Use function from database class for updating the values in the database
-        self.db.update_data("user_table",user_dict, "user", active_user_ID)
-        
-        # Print out message box 
+        self.db.update_data("user_table",user_dict, "user", user_ID)
+
+    def profile_changes_saved(self, result):
+        """
+        Shows the success message and closes the Update Profile window after the changes were saved.
+
+        Args:
+            result: The result of store_profile_changes, not used.
+        """
+        # Print out message box
         messagebox.showinfo("Success", "Profile changes successfully saved")
-        
+
         # Close Profile Update Window
         self.profile_popup.destroy()
-    
+
     def open_analyze_myhabits(self):
         """Opens a new window for analyzing the user's habits.
 
@@ -1389,6 +1439,7 @@ class Main_screen(tk.Tk):
         update_button.pack()
 
     # Function to Update the table depending on the users choice
+    @detect_queries
     def update_analyse_table(self):
         """
         Update the analysis table based on the user's choice.
@@ -1396,24 +1447,38 @@ class Main_screen(tk.Tk):
         This function retrieves data from the database and displays it in a table or chart depending on the user's choice.
         The function destroys any existing treeview widget to prevent overlapping.
 
-        The user has 4 different options to choose from.
+        The user has 4 different options to choose from. All of them need the active habits of the user,
+        which are queried on a worker thread and shown with show_analysis when they arrived.
+        """
+        # Get selected user option
+        analysis = self.selected_option.get()
+        user_ID = self.user_ID
+        # Get all records from the active habits table, an older request which is still pending is dropped
+        self.run_db(self.db.get_all_active_habits, user_ID, on_success=partial(self.show_analysis, analysis), key="analysis")
+
+    def show_analysis(self, analysis, active_user_habits):
+        """
+        Shows the chosen analysis of the active habits in a table or chart.
+
+        Args:
+            analysis (str): The option the user had chosen.
+            active_user_habits (list): The result of db.get_all_active_habits.
         """
+        # The popup could have been closed while the active habits were queried
+        if not self.analyse_popup.winfo_exists():
+            return
+
         # First check if treeview widgets exits and if so destroy it. This prevents overlapping.
         for child in self.analyse_popup.winfo_children():
             if isinstance(child, ttk.Treeview):
                 child.destroy()
 
-        # Get selected user option
-        analysis = self.selected_option.get()
-        user_ID = self.user_ID
         # Depending on users choice a specific table opens
         if analysis == self.option_1:
-            # Get all active habits and sort them by the streak decreasing
-            active_user_habits = self.db.get_all_active_habits(user_ID)
-            
+            # The active habits are sorted by the streak decreasing
             if not active_user_habits:
                 # Display a message to the user if no active habits/streaks to display
-                message_label = tk.Label(frame, text="No habits/streaks to display")
+                message_label = tk.Label(self.analyse_popup, text="No habits/streaks to display")
                 message_label.pack()
             else:
                 # Create a Treeview Widget for the longest active streaks
@@ -1454,8 +1519,6 @@ class Main_screen(tk.Tk):
         elif analysis == self.option_2:
             ''' This option returns a bar chart which sums up how a often a user already started the same habit again
             '''
-            # Get all records from the active habits table
-            active_user_habits = self.db.get_all_active_habits(user_ID)
                 
             # Create a pandas dataframe for calculation of the failrate for calculation of the failrate
             df = pd.DataFrame(active_user_habits, columns=['habit_id', 'habit_name', 'starting_date', 'last_check', 'update_expiry','streak', 'interval', 'status','target'])
@@ -1478,8 +1541,6 @@ class Main_screen(tk.Tk):
             ''' This option should show all the active habits where a goal_streak(target) was set and should show
             how far the user is away from completion regarding the current streak in percent'''
 
-            # Get all records from the active habits table (only the ones where status="in progress" are needed)
-            active_user_habits = self.db.get_all_active_habits(user_ID)
 
             # Create a pandas dataframe for all active habits
             df = pd.DataFrame(active_user_habits, columns=['habit_id', 'habit_name', 'starting_date', 'last_check', 'update_expiry','streak', 'interval', 'status','target'])
@@ -1509,8 +1570,6 @@ class Main_screen(tk.Tk):
             ''' This option should show all the active habits where a goal_streak(target) was set and should show
             how far the user is away from completion regarding the current streak'''
 
-            # Get all records from the active habits table (only the ones where status="in progress" are needed)
-            active_user_habits = self.db.get_all_active_habits(user_ID)
 
             # Create a pandas dataframe for all active habits
             df = pd.DataFrame(active_user_habits, columns=['habit_id', 'habit_name', 'starting_date', 'last_check', 'update_expiry','streak', 'interval', 'status','target'])
@@ -1577,6 +1636,7 @@ class Main_screen(tk.Tk):
         update_button = tk.Button(self.highscore_popup, text="Update Table", command=self.update_highscore_table)
         update_button.pack()
 
+    @detect_queries
     def update_highscore_table(self):
         """
         Updates the highscore table depending on the user's selected option. 
@@ -1603,101 +1663,119 @@ class Main_screen(tk.Tk):
         if highscore_option == self.highscore_1:
             # Let the user choose which monitoring interval he wants to see
             interval = simpledialog.askstring("Monitoring Interval", "Enter the monitoring interval you want to see (daily, weekly, or monthly):")
-                
-            if interval == "daily":    
-                interval_ID = 1
-            elif interval == "weekly":
-                interval_ID = 2
-            elif interval == "monthly":
-                interval_ID = 3
-            else:
+
+            # Convert the name into the interval_ID using the reference data
+            interval_ID = self.db.reference_data.interval_ID(interval)
+            if interval_ID is None:
                 messagebox.showerror("Error", "Please choose either daily, weekly or monthly")
-                # Get all active habits and sort them by the streak decreasing
-            all_active_user_habits = self.db.get_global_active_habits(interval_ID)
-            # If no habits active
-            if not all_active_user_habits:
-                # Display a message to the user if no active habits/streaks to display
-                message_label = tk.Label(frame, text="No habits/streaks to display")
-                message_label.pack()
-            else:
-                # Create a Treeview Widget for the longest active streaks
-                self.highscore_1_tree = ttk.Treeview(self.highscore_popup)
-                self.highscore_1_tree.place(x = 50, y = 150)
-                
-                frame = tk.Frame(self.highscore_popup)
-                frame.pack(padx=20, pady=20)
-                
-                # Define Columns
-                self.highscore_1_tree['columns'] = ("Rank","Username","Habit Name","Streak", "Interval","Status","Starting Date")
+                return
 
-                # Format Columns
-                self.highscore_1_tree.column("#0", width=0, minwidth=0) # Remove Ghost column
-                self.highscore_1_tree.column("Rank", width=70, minwidth=25)
-                self.highscore_1_tree.column("Username", anchor="w", width=100, minwidth=60)                   
-                self.highscore_1_tree.column("Habit Name", anchor="w", width=100, minwidth=60)
-                self.highscore_1_tree.column("Streak", anchor="center", width=50,minwidth=50)
-                self.highscore_1_tree.column("Interval", anchor="w", width=60,minwidth=60)
-                self.highscore_1_tree.column("Status", anchor="center", width=100,minwidth=25)
-                self.highscore_1_tree.column("Starting Date", anchor="w", width=150,minwidth=50)
-                
-                # Create Headings
-                self.highscore_1_tree.heading("#0",text="",anchor="w") # Remove Ghost column
-                self.highscore_1_tree.heading("Rank",text="Rank no. ",anchor="w")
-                self.highscore_1_tree.heading("Username",text="Habit Name", anchor="w")
-                self.highscore_1_tree.heading("Habit Name",text="Habit Name", anchor="w")
-                self.highscore_1_tree.heading("Streak",text="Streak",anchor="center")
-                self.highscore_1_tree.heading("Interval",text="Interval",anchor="w")
-                self.highscore_1_tree.heading("Status",text="Status",anchor="center")
-                self.highscore_1_tree.heading("Starting Date",text="Starting Date",anchor="w")
-                
-                # Set a counter for inserting records
-                counter = 0
+            # Get all active habits sorted by the streak decreasing on a worker thread and show them when they arrived
+            self.run_db(self.db.get_global_active_habits, interval_ID, on_success=self.show_longest_streaks, key="highscores")
 
-                for record in all_active_user_habits:
-                    counter +=1
-                    item = self.highscore_1_tree.insert(parent="",index="end",iid = counter,text = "", values = (counter,record[8],record[1], record[5], record[6], record[7],record[2]))
-        
         # Highscore Option 2. Global points ranking. Depending on the active streaks users can earn points.
         # 1 Point for every streak of daily habits, 2 points for weekly habit streaks and 3 point for every monthly streak
         elif highscore_option == self.highscore_2:
-                # Get all active habits for the selected user
-            all_active_user_habits = self.db.get_global_active_habits(1) + self.db.get_global_active_habits(2) + self.db.get_global_active_habits(3)
-
-            # Calculate points for each active habit based on its current streak and interval type
-            active_habits_points = []
-            for habit in all_active_user_habits:
-                active_habit_ID = habit[0]
-                interval_type = habit[6]
-                streak = habit[5]
-                username = habit[8]
-                if interval_type == 'daily':
-                    points = streak
-                elif interval_type == 'weekly':
-                    points = streak * 2
-                elif interval_type == 'monthly':
-                    points = streak * 3
-                active_habits_points.append((active_habit_ID, username, points))
-
-            # create a dataframe from the list 
-            df = pd.DataFrame(active_habits_points, columns=['active_habit_ID', 'username', 'points'])
-
-            # group by username and sum the points
-            total_points_df = df.groupby('username').sum().reset_index()
-
-            # sort by total points in descending order
-            total_points_df = total_points_df.sort_values('points', ascending=True)
-
-            # create a horizontal bar chart for visualization
-            plt.barh(total_points_df['username'], total_points_df['points'], color = "blue")
-
-            # set the chart title and axis labels
-            plt.title('Total Points by User')
-            plt.xlabel('User')
-            plt.ylabel('Points')
+            # Get all active habits of all intervals on a worker thread and show the ranking when they arrived
+            interval_IDs = [interval.interval_ID for interval in self.db.reference_data.intervals]
+            def get_all_intervals():
+                return [habit for interval_ID in interval_IDs for habit in self.db.get_global_active_habits(interval_ID)]
 
-            # Add actual values of each bar inside the bar
-            for i, v in enumerate(total_points_df['points']):
-                plt.text(v + 1, i, f"{v:.2f} Points", color='black', fontsize=8, va='center')
+            self.run_db(get_all_intervals, on_success=self.show_points_ranking, key="highscores")
 
-            # display the chart
-            plt.show()
+    def show_longest_streaks(self, all_active_user_habits):
+        """
+        Shows the longest global streaks of one monitoring interval in a treeview of the highscore window.
+
+        Args:
+            all_active_user_habits (list): The result of db.get_global_active_habits, sorted by the streak decreasing.
+        """
+        # If no habits active
+        if not all_active_user_habits:
+            # Display a message to the user if no active habits/streaks to display
+            message_label = tk.Label(self.highscore_popup, text="No habits/streaks to display")
+            message_label.pack()
+        else:
+            # Create a Treeview Widget for the longest active streaks
+            self.highscore_1_tree = ttk.Treeview(self.highscore_popup)
+            self.highscore_1_tree.place(x = 50, y = 150)
+
+            frame = tk.Frame(self.highscore_popup)
+            frame.pack(padx=20, pady=20)
+
+            # Define Columns
+            self.highscore_1_tree['columns'] = ("Rank","Username","Habit Name","Streak", "Interval","Status","Starting Date")
+
+            # Format Columns
+            self.highscore_1_tree.column("#0", width=0, minwidth=0) # Remove Ghost column
+            self.highscore_1_tree.column("Rank", width=70, minwidth=25)
+            self.highscore_1_tree.column("Username", anchor="w", width=100, minwidth=60)                   
+            self.highscore_1_tree.column("Habit Name", anchor="w", width=100, minwidth=60)
+            self.highscore_1_tree.column("Streak", anchor="center", width=50,minwidth=50)
+            self.highscore_1_tree.column("Interval", anchor="w", width=60,minwidth=60)
+            self.highscore_1_tree.column("Status", anchor="center", width=100,minwidth=25)
+            self.highscore_1_tree.column("Starting Date", anchor="w", width=150,minwidth=50)
+
+            # Create Headings
+            self.highscore_1_tree.heading("#0",text="",anchor="w") # Remove Ghost column
+            self.highscore_1_tree.heading("Rank",text="Rank no. ",anchor="w")
+            self.highscore_1_tree.heading("Username",text="Habit Name", anchor="w")
+            self.highscore_1_tree.heading("Habit Name",text="Habit Name", anchor="w")
+            self.highscore_1_tree.heading("Streak",text="Streak",anchor="center")
+            self.highscore_1_tree.heading("Interval",text="Interval",anchor="w")
+            self.highscore_1_tree.heading("Status",text="Status",anchor="center")
+            self.highscore_1_tree.heading("Starting Date",text="Starting Date",anchor="w")
+
+            # Set a counter for inserting records
+            counter = 0
+
+            for record in all_active_user_habits:
+                counter +=1
+                item = self.highscore_1_tree.insert(parent="",index="end",iid = counter,text = "", values = (counter,record[8],record[1], record[5], record[6], record[7],record[2]))
+
+    def show_points_ranking(self, all_active_user_habits):
+        """
+        Shows the global points ranking as a bar chart. 1 point for every streak of daily habits, 2 points for weekly habit streaks
+        and 3 points for every monthly streak.
+
+        Args:
+            all_active_user_habits (list): The active habits of all monitoring intervals.
+        """
+        # Calculate points for each active habit based on its current streak and interval type
+        active_habits_points = []
+        for habit in all_active_user_habits:
+            active_habit_ID = habit[0]
+            interval_type = habit[6]
+            streak = habit[5]
+            username = habit[8]
+            if interval_type == 'daily':
+                points = streak
+            elif interval_type == 'weekly':
+                points = streak * 2
+            elif interval_type == 'monthly':
+                points = streak * 3
+            active_habits_points.append((active_habit_ID, username, points))
+
+        # create a dataframe from the list 
+        df = pd.DataFrame(active_habits_points, columns=['active_habit_ID', 'username', 'points'])
+
+        # group by username and sum the points
+        total_points_df = df.groupby('username').sum().reset_index()
+
+        # sort by total points in descending order
+        total_points_df = total_points_df.sort_values('points', ascending=True)
+
+        # create a horizontal bar chart for visualization
+        plt.barh(total_points_df['username'], total_points_df['points'], color = "blue")
+
+        # set the chart title and axis labels
+        plt.title('Total Points by User')
+        plt.xlabel('User')
+        plt.ylabel('Points')
+
+        # Add actual values of each bar inside the bar
+        for i, v in enumerate(total_points_df['points']):
+            plt.text(v + 1, i, f"{v:.2f} Points", color='black', fontsize=8, va='center')
+
+        # display the chart
+        plt.show()
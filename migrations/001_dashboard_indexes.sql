@@ -0,0 +1,2 @@
+-- Dashboard (get_dashboard_rows, get_active_habits) and the lookup of the active habit of a user and habit
+CREATE INDEX idx_active_user_habits_user_status ON active_user_habits (user_ID, status, habit_ID);
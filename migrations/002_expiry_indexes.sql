@@ -0,0 +1,2 @@
+-- Expiry sweep (mark_expired_habits) and the deadline condition of check_off
+CREATE INDEX idx_active_user_habits_status_expiry ON active_user_habits (status, update_expiry);
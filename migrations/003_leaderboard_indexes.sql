@@ -0,0 +1,2 @@
+-- Highscores (get_global_active_habits) filter by interval and sort by streak
+CREATE INDEX idx_active_user_habits_interval_streak ON active_user_habits (interval_ID, streak);
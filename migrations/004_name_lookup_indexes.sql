@@ -0,0 +1,3 @@
+-- Name lookups of get_habit_ID and get_category_ID
+CREATE INDEX idx_habits_user_name ON habits (user_ID, habit_name);
+CREATE INDEX idx_category_user_name ON category (user_ID, category_name);
@@ -0,0 +1,122 @@
+import threading
+from reference_data import SYSTEM_USER_ID
+
+
+class NameIndex:
+    """
+    An in-memory index from (user_ID, name) to the ID of the habits and categories of the logged in user and the system user.
+
+    The index is filled with one query at login (MySQLDatabase.load_name_index). MySQLDatabase keeps it coherent:
+    insert_data adds new habits and categories and delete_habit/delete_category remove them, so resolving a name
+    never needs a round trip to the database.
+
+    Attributes:
+        user_ID (int): The user whose habits and categories are indexed, besides the ones of the system user.
+
+    Methods:
+        __init__: Initializes the NameIndex object.
+        covers: Checks if the habits and categories of a user are in the index.
+        habit_ID: Returns the ID of a habit of the user or the system user by its name.
+        category_ID: Returns the ID of a category of the user or the system user by its name.
+        added: Adds a new habit or category after it was inserted.
+        removed: Removes a habit or category after it was deleted.
+    """
+    # The tables whose names are indexed and the names of their ID and name columns
+    TABLES = {'habits': ('habit_ID', 'habit_name'), 'category': ('category_ID', 'category_name')}
+
+    def __init__(self, user_ID, rows):
+        """
+        Initializes a new NameIndex object.
+
+        Args:
+            user_ID (int): The logged in user.
+            rows (list): The rows of MySQLDatabase.get_name_index_rows as (table_name, ID, name, user_ID) tuples.
+        """
+        self.user_ID = user_ID
+        self._IDs = {table_name: {} for table_name in self.TABLES}
+        self._names = {table_name: {} for table_name in self.TABLES}
+        self._lock = threading.Lock()
+        for table_name, ID, name, owner_ID in rows:
+            self._add(table_name, ID, name, owner_ID)
+
+    def _add(self, table_name, ID, name, owner_ID):
+        # Keep the first ID if a name exists twice, like fetchone did
+        self._IDs[table_name].setdefault((owner_ID, name), ID)
+        self._names[table_name][ID] = (owner_ID, name)
+
+    def covers(self, user_ID):
+        """
+        Checks if the habits and categories of a user are in the index.
+
+        Args:
+            user_ID (int): The ID of the user.
+
+        Returns:
+            bool: True for the logged in user and the system user.
+        """
+        return user_ID in (self.user_ID, SYSTEM_USER_ID)
+
+    def _lookup(self, table_name, user_ID, name):
+        with self._lock:
+            IDs = self._IDs[table_name]
+            # The system user rows are found first, like the query with user_ID = 99 OR user_ID = x did
+            ID = IDs.get((SYSTEM_USER_ID, name))
+            if ID is None:
+                ID = IDs.get((user_ID, name))
+            return ID
+
+    def habit_ID(self, user_ID, habit_name):
+        """
+        Returns the ID of a habit of the user or the system user by its name.
+
+        Args:
+            user_ID (int): The ID of the user, it has to be covered by the index.
+            habit_name (str): The name of the habit.
+
+        Returns:
+            Optional[int]: The habit_ID or None if there is no such habit.
+        """
+        return self._lookup('habits', user_ID, habit_name)
+
+    def category_ID(self, user_ID, category_name):
+        """
+        Returns the ID of a category of the user or the system user by its name.
+
+        Args:
+            user_ID (int): The ID of the user, it has to be covered by the index.
+            category_name (str): The name of the category.
+
+        Returns:
+            Optional[int]: The category_ID or None if there is no such category.
+        """
+        return self._lookup('category', user_ID, category_name)
+
+    def added(self, table_name, data, ID):
+        """
+        Adds a new habit or category after it was inserted. Rows of other tables or other users are ignored.
+
+        Args:
+            table_name (str): The name of the table the row was inserted into.
+            data (dict): The inserted values, with keys corresponding to column names.
+            ID (int): The ID of the new row.
+        """
+        if table_name not in self.TABLES or not ID:
+            return
+        ID_column, name_column = self.TABLES[table_name]
+        owner_ID = data.get('user_ID')
+        if self.covers(owner_ID):
+            with self._lock:
+                self._add(table_name, ID, data.get(name_column), owner_ID)
+
+    def removed(self, table_name, ID):
+        """
+        Removes a habit or category after it was deleted.
+
+        Args:
+            table_name (str): The name of the table the row was deleted from.
+            ID (int): The ID of the deleted row.
+        """
+        with self._lock:
+            key = self._names[table_name].pop(ID, None)
+            if key is not None and self._IDs[table_name].get(key) == ID:
+                del self._IDs[table_name][key]
@@ -0,0 +1,195 @@
+import threading
+import weakref
+from collections import OrderedDict
+from mysql.connector import errorcode, errors
+
+
+# The parameterized statements of the hot read and write paths of MySQLDatabase
+STATEMENTS = {
+    'get_habit_ID': "SELECT habit_ID FROM habits WHERE habit_name = %s AND user_ID = %s",
+    'get_category_ID': "SELECT category_ID FROM category WHERE category_name = %s AND user_ID = %s",
+    'get_active_habit_ID': "SELECT active_habits_ID FROM active_user_habits WHERE user_ID = %s AND habit_ID = %s AND status = %s",
+    'get_streak': "SELECT streak FROM active_user_habits WHERE active_habits_ID = %s",
+    'get_global_active_habits': """SELECT active_user_habits.active_habits_ID, habits.habit_name, active_user_habits.starting_date, active_user_habits.last_check, active_user_habits.update_expiry, active_user_habits.streak, monitoring_interval.control_interval, active_user_habits.status, user_table.username
+                        FROM active_user_habits
+                        INNER JOIN habits ON active_user_habits.habit_ID = habits.habit_ID
+                        INNER JOIN monitoring_interval ON active_user_habits.interval_ID = monitoring_interval.interval_ID
+                        INNER JOIN user_table ON active_user_habits.user_ID = user_table.user_ID
+                        WHERE active_user_habits.interval_ID = %s
+                        ORDER BY active_user_habits.streak DESC""",
+    'delete_habit': "DELETE FROM habits WHERE habit_ID = %s",
+    'delete_category': "DELETE FROM category WHERE category_ID = %s",
+}
+
+
+class StatementRegistry:
+    """
+    A registry of named, parameterized statements which are prepared once per connection and reused across calls.
+
+    For every connection and statement one server-side prepared cursor (cursor(prepared=True)) is kept. The statement is
+    sent to the server at its first execution, the following executions only send the values. The cursors are dropped
+    together with their connection, so in pooled mode every pooled connection prepares each statement once.
+    Generated statements (e.g. the UPDATEs of update_data) are prepared by their SQL, so the number of cursors per connection
+    is capped: above max_cursors the least recently used cursor is closed.
+    If the server forgot the statements, e.g. because the pool reconnected the connection, the cursors of the
+    connection are prepared again and the statement is retried once.
+
+    Attributes:
+        statements (dict): The registered statements by name.
+        max_cursors (int): The maximum number of prepared cursors per connection.
+        prepares (int): The number of prepared cursors which were created.
+        reuses (int): The number of executions on an already prepared cursor.
+        retries (int): The number of executions which had to be prepared again.
+        evictions (int): The number of least recently used cursors which were closed because of max_cursors.
+
+    Methods:
+        __init__: Initializes the StatementRegistry object.
+        register: Registers a new named statement.
+        sql: Returns the SQL of a named statement.
+        cursor: Returns the prepared cursor of a connection for a statement.
+        discard: Closes and forgets all prepared cursors of a connection.
+        execute: Executes a statement on its prepared cursor.
+        stats: Returns the counters of the registry.
+    """
+    def __init__(self, statements=None, max_cursors=32):
+        """
+        Initializes a new StatementRegistry object.
+
+        Args:
+            statements (Optional[dict]): Per Default the STATEMENTS of this module. The named statements with %s placeholders.
+            max_cursors (Optional[int]): Per Default 32. The maximum number of prepared cursors per connection.
+        """
+        self.statements = dict(STATEMENTS if statements is None else statements)
+        self.max_cursors = max_cursors
+        self.prepares = 0
+        self.reuses = 0
+        self.retries = 0
+        self.evictions = 0
+        # The prepared cursors by connection and SQL in the order of their last use, a closed and collected connection drops its cursors
+        self._cursors = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def register(self, name, query):
+        """
+        Registers a new named statement.
+
+        Args:
+            name (str): The name of the statement.
+            query (str): The SQL of the statement with %s placeholders.
+        """
+        self.statements[name] = query
+
+    def sql(self, name):
+        """
+        Returns the SQL of a statement.
+
+        Args:
+            name (str): The name of a registered statement or the SQL of an unnamed statement, e.g. a generated UPDATE.
+
+        Returns:
+            str: The SQL of the statement.
+        """
+        return self.statements.get(name, name)
+
+    def cursor(self, connection, query):
+        """
+        Returns the prepared cursor of a connection for a statement, it is created at the first call.
+        If the connection has more than max_cursors cursors afterwards, the least recently used one is closed.
+
+        Args:
+            connection: The MySQL connection.
+            query (str): The SQL of the statement.
+
+        Returns:
+            MySQLCursorPrepared: The prepared cursor.
+        """
+        evicted = None
+        with self._lock:
+            cursors = self._cursors.get(connection)
+            if cursors is None:
+                cursors = OrderedDict()
+                self._cursors[connection] = cursors
+            cursor = cursors.get(query)
+            if cursor is None:
+                cursor = connection.cursor(prepared=True)
+                cursors[query] = cursor
+                self.prepares += 1
+                if len(cursors) > self.max_cursors:
+                    evicted = cursors.popitem(last=False)[1]
+                    self.evictions += 1
+            else:
+                cursors.move_to_end(query)
+                self.reuses += 1
+        # Close the evicted cursor outside of the lock, it deallocates the statement on the server
+        if evicted is not None:
+            self._close(evicted)
+        return cursor
+
+    def discard(self, connection):
+        """
+        Closes and forgets all prepared cursors of a connection.
+
+        Args:
+            connection: The MySQL connection.
+        """
+        with self._lock:
+            cursors = self._cursors.pop(connection, {})
+        for cursor in cursors.values():
+            self._close(cursor)
+
+    @staticmethod
+    def _close(cursor):
+        try:
+            cursor.close()
+        except Exception:
+            # The statement is already gone on the server
+            pass
+
+    def execute(self, connection, name, params=()):
+        """
+        Executes a statement on its prepared cursor of the connection.
+
+        Args:
+            connection: The MySQL connection.
+            name (str): The name of a registered statement or the SQL of an unnamed statement.
+            params (Optional[tuple]): The values of the placeholders.
+
+        Returns:
+            MySQLCursorPrepared: The cursor after the execution. The rows of a SELECT have to be fetched before the next statement.
+        """
+        query = self.sql(name)
+        cursor = self.cursor(connection, query)
+        try:
+            cursor.execute(query, params)
+        except errors.Error as e:
+            if not self._is_stale(e):
+                raise
+            # The server doesn't know the statement anymore, prepare it again on a new cursor
+            self.discard(connection)
+            with self._lock:
+                self.retries += 1
+            cursor = self.cursor(connection, query)
+            cursor.execute(query, params)
+        return cursor
+
+    @staticmethod
+    def _is_stale(error):
+        # Unknown statement handler after a reconnect or a cursor which lost its statement in the meantime
+        return error.errno == errorcode.ER_UNKNOWN_STMT_HANDLER or isinstance(error, errors.InterfaceError)
+
+    def stats(self):
+        """
+        Returns the counters of the registry.
+
+        Returns:
+            dict: The number of connections with prepared cursors, prepared cursors, prepares, reuses, retries and evictions.
+        """
+        with self._lock:
+            return {
+                'connections': len(self._cursors),
+                'cursors': sum(len(cursors) for cursors in self._cursors.values()),
+                'prepares': self.prepares,
+                'reuses': self.reuses,
+                'retries': self.retries,
+                'evictions': self.evictions,
+            }
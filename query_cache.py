@@ -0,0 +1,194 @@
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+
+class QueryCache:
+    """
+    A size-bounded LRU cache with a time to live for the results of read queries, e.g. the habits and categories of a user.
+
+    Every entry is stored with the tables it was read from. A write to one of these tables invalidates the entry.
+    Every table has a generation counter, so a query which started before a write can't store its outdated result afterwards.
+    The cache is thread-safe, because the database methods also run on worker threads (see db_executor.py).
+
+    Attributes:
+        maxsize (int): The maximum number of cached results. The least recently used result is evicted first.
+        ttl (Optional[float]): The number of seconds a result stays valid. None means no time limit.
+        hits (int): The number of lookups which were answered from the cache.
+        misses (int): The number of lookups which had to query the database.
+        evictions (int): The number of results removed because of maxsize or ttl.
+        invalidations (int): The number of results removed because one of their tables was written.
+
+    Methods:
+        __init__: Initializes the QueryCache object.
+        get: Looks up a cached result.
+        put: Stores a result with the tables it was read from.
+        generations: Returns the current generations of the given tables.
+        invalidate: Removes all cached results which were read from one of the given tables.
+        clear: Removes all cached results.
+        stats: Returns the hit and miss counters.
+    """
+    def __init__(self, maxsize=256, ttl=300, clock=time.monotonic):
+        """
+        Initializes a new QueryCache object.
+
+        Args:
+            maxsize (Optional[int]): Per Default 256. The maximum number of cached results.
+            ttl (Optional[float]): Per Default 300 seconds. The time to live of a result, None means no time limit.
+            clock (Optional[callable]): Per Default time.monotonic. Returns the current time in seconds.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Looks up a cached result and counts the hit or miss.
+
+        Args:
+            key (hashable): The key of the result, e.g. the method name and its arguments.
+
+        Returns:
+            tuple: (True, result) for a hit, (False, None) for a miss or an expired result.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, tables, expires = entry
+                if expires is None or expires > self.clock():
+                    # Mark the result as recently used
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+                self.evictions += 1
+            self.misses += 1
+            return False, None
+
+    def generations(self, tables):
+        """
+        Returns the current generations of the given tables, taken before the query is run.
+
+        Args:
+            tables (tuple): The names of the tables.
+
+        Returns:
+            tuple: The generation of the whole cache followed by the generation of every table.
+        """
+        with self._lock:
+            return self._current_generations(tables)
+
+    def _current_generations(self, tables):
+        # The epoch is increased by clear, which invalidates every table
+        return (self._epoch,) + tuple(self._generations.get(table, 0) for table in tables)
+
+    def put(self, key, value, tables, generations=None):
+        """
+        Stores a result with the tables it was read from.
+
+        Args:
+            key (hashable): The key of the result.
+            value: The result of the query.
+            tables (tuple): The names of the tables the result was read from.
+            generations (Optional[tuple]): The generations of the tables before the query was run. If one of the tables
+                                           was written in the meantime, the result is not stored.
+        """
+        with self._lock:
+            if generations is not None and generations != self._current_generations(tables):
+                return
+            expires = None if self.ttl is None else self.clock() + self.ttl
+            self._entries[key] = (value, tuple(tables), expires)
+            self._entries.move_to_end(key)
+
+            # Evict the least recently used results
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *tables):
+        """
+        Removes all cached results which were read from one of the given tables.
+
+        Args:
+            *tables (str): The names of the tables which were written.
+
+        Returns:
+            int: The number of removed results.
+        """
+        tables = {table.lower() for table in tables}
+        with self._lock:
+            for table in tables:
+                self._generations[table] = self._generations.get(table, 0) + 1
+            stale = [key for key, (value, entry_tables, expires) in self._entries.items() if tables.intersection(entry_tables)]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+            return len(stale)
+
+    def clear(self):
+        """
+        Removes all cached results, e.g. after a query which could have written to any table.
+        """
+        with self._lock:
+            self._epoch += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Returns the counters of the cache.
+
+        Returns:
+            dict: The number of cached results, hits, misses, evictions and invalidations and the hit rate.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+def cached_query(*tables):
+    """
+    Decorator for read methods of MySQLDatabase. If the database object has a query cache, the result is cached
+    under the method name and its arguments and invalidated by writes to the given tables.
+
+    Args:
+        *tables (str): The names of the tables the method reads from.
+    """
+    tables = tuple(table.lower() for table in tables)
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = getattr(self, 'query_cache', None)
+            if cache is None:
+                return method(self, *args, **kwargs)
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            hit, value = cache.get(key)
+            if hit:
+                # Hand out a copy, so the caller can't change the cached list
+                return list(value) if isinstance(value, list) else value
+            generations = cache.generations(tables)
+            value = method(self, *args, **kwargs)
+            cache.put(key, list(value) if isinstance(value, list) else value, tables, generations)
+            return value
+        return wrapper
+    return decorator
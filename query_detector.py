@@ -0,0 +1,191 @@
+import contextvars
+import functools
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from instrumentation import Instrumentation, InstrumentedCursor, statement_fingerprint
+
+
+# The operations of the running code, a copied context (see TkDatabaseExecutor.submit) carries them to the worker threads
+_operations = contextvars.ContextVar('query_operations', default=())
+
+
+class QueryOperation:
+    """
+    The statements which were executed during one logical operation, e.g. a button callback or a test case.
+
+    Attributes:
+        name (str): The name of the operation.
+        statements (list): The executed statements as (fingerprint, method) tuples.
+        repeated (dict): The fingerprints which were executed more often than the threshold, with their count when they were flagged.
+
+    Methods:
+        __init__: Initializes the QueryOperation object.
+        counts: Returns how often every fingerprint was executed.
+    """
+    def __init__(self, detector, name):
+        """
+        Initializes a new QueryOperation object.
+
+        Args:
+            detector (QueryDetector): The detector which records the operation.
+            name (str): The name of the operation.
+        """
+        self.detector = detector
+        self.name = name
+        self.statements = []
+        self.repeated = {}
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.statements)
+
+    def add(self, query, method):
+        # Returns the count of the fingerprint
+        fingerprint = statement_fingerprint(query)
+        with self._lock:
+            self.statements.append((fingerprint, method))
+            self._counts[fingerprint] += 1
+            return fingerprint, self._counts[fingerprint]
+
+    def counts(self):
+        """
+        Returns:
+            Counter: The number of executions of every fingerprint.
+        """
+        with self._lock:
+            return Counter(self._counts)
+
+
+class QueryDetector:
+    """
+    Groups the statements of one logical operation and flags statements with the same fingerprint which are executed
+    more often than a threshold, a sign for an N+1 query loop (one query per row instead of one query for all rows).
+
+    The detector is an observer of the Instrumentation of MySQLDatabase (see MySQLDatabase.enable_query_detector).
+    Operations are opened with the operation context manager or the detect_queries decorator. Statements of database calls
+    which were handed to the TkDatabaseExecutor during an operation are counted for the operation as well.
+
+    Attributes:
+        threshold (int): The number of executions of one fingerprint which is still fine within one operation.
+        report (callable): Called with a message for every flagged statement. Per Default print.
+        detections (list): The flagged statements as (operation name, fingerprint, method) tuples.
+
+    Methods:
+        __init__: Initializes the QueryDetector object.
+        operation: Context manager which groups the statements of an operation.
+        statement_executed: Adds an executed statement to the open operations.
+        statement_finished: Does nothing, the statements are counted when they are executed.
+    """
+    def __init__(self, threshold=5, report=print):
+        """
+        Initializes a new QueryDetector object.
+
+        Args:
+            threshold (Optional[int]): Per Default 5. More executions of the same fingerprint within one operation are flagged.
+            report (Optional[callable]): Per Default print. Called with the message of a flagged statement.
+        """
+        self.threshold = threshold
+        self.report = report
+        self.detections = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def operation(self, name):
+        """
+        Groups the statements which are executed within the with block, on this thread or by the TkDatabaseExecutor.
+
+        Args:
+            name (str): The name of the operation, e.g. the name of the callback.
+
+        Yields:
+            QueryOperation: The operation with its statements.
+        """
+        operation = QueryOperation(self, name)
+        token = _operations.set(_operations.get() + (operation,))
+        try:
+            yield operation
+        finally:
+            _operations.reset(token)
+
+    def statement_executed(self, query, method):
+        """
+        Adds an executed statement to the open operations of this detector and flags it if it was repeated too often.
+
+        Args:
+            query (str): The SQL of the statement.
+            method (Optional[str]): The MySQLDatabase method which ran the statement.
+        """
+        for operation in _operations.get():
+            if operation.detector is not self:
+                continue
+            fingerprint, count = operation.add(query, method)
+            # Flag every fingerprint once per operation, when it exceeds the threshold
+            if self.threshold is not None and count == self.threshold + 1:
+                operation.repeated[fingerprint] = count
+                with self._lock:
+                    self.detections.append((operation.name, fingerprint, method))
+                self.report(f"Possible N+1 queries in {operation.name}: more than {self.threshold} x {fingerprint} (from {method})")
+
+    def statement_finished(self, query, params, seconds, rows, method):
+        """
+        Does nothing, the statements are counted when they are executed.
+        """
+        pass
+
+
+def detect_queries(method):
+    """
+    Decorator for callbacks of the main screen. If the object has a query detector, the statements of the callback
+    are grouped as one operation named after the method.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        detector = getattr(self, 'query_detector', None)
+        if detector is None:
+            return method(self, *args, **kwargs)
+        with detector.operation(method.__name__):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def assert_max_queries(db, max_queries):
+    """
+    Fails with an AssertionError if more than max_queries statements are executed on the database object within the with block.
+
+        with assert_max_queries(self.db, 3):
+            self.db.check_off_many([5, 6, 7], 1, now)
+
+    The instrumentation of the database object is enabled for the block if it isn't enabled. A cursor which was set directly,
+    e.g. a mocked cursor in the tests, is counted as well.
+
+    Args:
+        db (MySQLDatabase): The database object.
+        max_queries (int): The maximum number of statements.
+
+    Yields:
+        QueryOperation: The operation with the executed statements.
+    """
+    instrumentation = db.instrumentation
+    if instrumentation is None:
+        db.instrumentation = Instrumentation()
+    cursor = db.cursor
+    wrapped = cursor is not None and not isinstance(cursor, InstrumentedCursor)
+    if wrapped:
+        db.cursor = InstrumentedCursor(cursor, db.instrumentation)
+    detector = QueryDetector(threshold=None)
+    db.instrumentation.add_observer(detector)
+    try:
+        with detector.operation("assert_max_queries") as operation:
+            yield operation
+    finally:
+        db.instrumentation.remove_observer(detector)
+        if wrapped:
+            db.cursor = cursor
+        db.instrumentation = instrumentation
+
+    if len(operation) > max_queries:
+        statements = "\n".join(f"  {fingerprint} (from {method})" for fingerprint, method in operation.statements)
+        raise AssertionError(f"{len(operation)} queries were executed, expected at most {max_queries}:\n{statements}")
@@ -0,0 +1,208 @@
+import threading
+from collections import namedtuple
+
+
+# The predefined habits and categories belong to the system user
+SYSTEM_USER_ID = 99
+
+# One row of the monitoring_interval table
+MonitoringInterval = namedtuple('MonitoringInterval', ['interval_ID', 'control_interval', 'days'])
+
+
+class ReferenceData:
+    """
+    The rows every user shares: the habits and categories of the system user (user_ID 99) and the monitoring intervals.
+
+    The rows are loaded once per process and database (see get_reference_data) and the lookups are served from memory.
+    The system rows can't be changed or deleted in the app, so they don't need to be queried again.
+
+    Attributes:
+        habits (list): The habits of the system user, in the format of MySQLDatabase.get_user_habits.
+        categories (list): The categories of the system user, in the format of MySQLDatabase.get_user_categories.
+        intervals (list): The MonitoringInterval tuples ordered by interval_ID.
+
+    Methods:
+        __init__: Initializes the ReferenceData object.
+        load: Queries the system habits, system categories and monitoring intervals from the database.
+        is_system_habit: Checks if a habit belongs to the system user.
+        is_system_category: Checks if a category belongs to the system user.
+        habit_ID: Returns the ID of a system habit by its name.
+        category_ID: Returns the ID of a system category by its name.
+        interval_names: Returns the names of all monitoring intervals.
+        interval_ID: Returns the ID of a monitoring interval by its name.
+        interval_days: Returns the number of days of a monitoring interval.
+    """
+    def __init__(self, habits, categories, intervals):
+        """
+        Initializes a new ReferenceData object.
+
+        Args:
+            habits (list): The habits of the system user as (habit_ID, habit_name, description, creation_date, category_name) tuples.
+            categories (list): The categories of the system user as (category_ID, category_name, description, creation_date) tuples.
+            intervals (list): The monitoring intervals as (interval_ID, control_interval, days) tuples.
+        """
+        self.habits = list(habits)
+        self.categories = list(categories)
+        self.intervals = sorted(MonitoringInterval(*interval) for interval in intervals)
+        self._habit_IDs = {habit[0] for habit in self.habits}
+        self._category_IDs = {category[0] for category in self.categories}
+        # Keep the first ID if a name exists twice, like fetchone did
+        self._habits_by_name = {}
+        for habit in self.habits:
+            self._habits_by_name.setdefault(habit[1], habit[0])
+        self._categories_by_name = {}
+        for category in self.categories:
+            self._categories_by_name.setdefault(category[1], category[0])
+        self._intervals_by_ID = {interval.interval_ID: interval for interval in self.intervals}
+        self._intervals_by_name = {interval.control_interval: interval for interval in self.intervals}
+
+    @classmethod
+    def load(cls, db):
+        """
+        Queries the system habits, system categories and monitoring intervals from the database.
+
+        Args:
+            db (MySQLDatabase): The database object used for the queries.
+
+        Returns:
+            ReferenceData: The loaded reference data.
+        """
+        return cls(db.get_own_habits(SYSTEM_USER_ID), db.get_own_categories(SYSTEM_USER_ID), db.get_monitoring_intervals())
+
+    def is_system_habit(self, habit_ID):
+        """
+        Checks if a habit belongs to the system user and therefore can't be deleted.
+
+        Args:
+            habit_ID (int): The ID of the habit.
+
+        Returns:
+            bool: True if the habit is a system habit.
+        """
+        return habit_ID in self._habit_IDs
+
+    def is_system_category(self, category_ID):
+        """
+        Checks if a category belongs to the system user and therefore can't be deleted.
+
+        Args:
+            category_ID (int): The ID of the category.
+
+        Returns:
+            bool: True if the category is a system category.
+        """
+        return category_ID in self._category_IDs
+
+    def habit_ID(self, habit_name):
+        """
+        Returns the ID of a system habit by its name.
+
+        Args:
+            habit_name (str): The name of the habit.
+
+        Returns:
+            Optional[int]: The habit_ID or None if there is no system habit with this name.
+        """
+        return self._habits_by_name.get(habit_name)
+
+    def category_ID(self, category_name):
+        """
+        Returns the ID of a system category by its name.
+
+        Args:
+            category_name (str): The name of the category.
+
+        Returns:
+            Optional[int]: The category_ID or None if there is no system category with this name.
+        """
+        return self._categories_by_name.get(category_name)
+
+    def interval_names(self):
+        """
+        Returns:
+            list: The names of all monitoring intervals ordered by interval_ID, e.g. ['daily', 'weekly', 'monthly'].
+        """
+        return [interval.control_interval for interval in self.intervals]
+
+    def interval_ID(self, control_interval):
+        """
+        Returns the ID of a monitoring interval by its name.
+
+        Args:
+            control_interval (str): The name of the monitoring interval, e.g. 'weekly'.
+
+        Returns:
+            Optional[int]: The interval_ID or None if there is no monitoring interval with this name.
+        """
+        interval = self._intervals_by_name.get(control_interval)
+        return interval.interval_ID if interval is not None else None
+
+    def interval_days(self, interval_ID):
+        """
+        Returns the number of days of a monitoring interval.
+
+        Args:
+            interval_ID (int): The ID of the monitoring interval.
+
+        Returns:
+            int: The number of days between two check offs.
+        """
+        return self._intervals_by_ID[interval_ID].days
+
+
+# The reference data of every database used by this process
+_reference_data = {}
+_reference_data_lock = threading.Lock()
+# One lock per database, held while its reference data is loaded
+_load_locks = {}
+
+
+def _reference_key(db):
+    return (type(db).__name__, db.host, db.port, db.database)
+
+
+def get_reference_data(db):
+    """
+    Returns the reference data of the database. It is loaded at the first call and then shared by all objects of the same database.
+
+    The queries run under the lock of the database only, so loading one database doesn't block the lookups and loads of the others.
+
+    Args:
+        db (MySQLDatabase): The database object.
+
+    Returns:
+        ReferenceData: The reference data of the database.
+    """
+    key = _reference_key(db)
+    # Return the stored data or get the load lock of the database
+    with _reference_data_lock:
+        reference_data = _reference_data.get(key)
+        if reference_data is not None:
+            return reference_data
+        load_lock = _load_locks.setdefault(key, threading.Lock())
+
+    with load_lock:
+        # Another thread may have loaded the data while this one waited for the lock
+        with _reference_data_lock:
+            reference_data = _reference_data.get(key)
+        if reference_data is None:
+            reference_data = ReferenceData.load(db)
+            with _reference_data_lock:
+                _reference_data[key] = reference_data
+        return reference_data
+
+
+def set_reference_data(db, reference_data):
+    """
+    Stores the reference data of a database, e.g. after the sample data was inserted or in tests.
+
+    Args:
+        db (MySQLDatabase): The database object.
+        reference_data (Optional[ReferenceData]): The reference data. None removes the stored data, so it is loaded again.
+    """
+    key = _reference_key(db)
+    with _reference_data_lock:
+        if reference_data is None:
+            _reference_data.pop(key, None)
+        else:
+            _reference_data[key] = reference_data
@@ -0,0 +1,190 @@
+import heapq
+from clock import system_clock
+
+
+class DeadlineScheduler:
+    """
+    Decides when the active habits of the main screen have to be queried from the database again.
+
+    The dashboard rows are cached on the main screen and the countdowns are redrawn locally every second.
+    The scheduler keeps a min-heap of the cached deadlines (update_expiry) which are still in the future.
+    A database refresh is only needed when the earliest deadline has passed, when a write marked the cache as dirty
+    or, if max_age is set, when the cache is older than max_age.
+
+    Attributes:
+        max_age (Optional[datetime.timedelta]): The maximum age of the cached rows. None means no age limit.
+        clock (callable): Returns the current time, see clock.py.
+        last_refresh (Optional[datetime.datetime]): The time of the last load or None if nothing was loaded yet.
+        refreshes (int): The number of times the cached rows were loaded.
+        generation (int): Counts the calls of mark_dirty. A query started before a write can't clear the dirty flag.
+
+    Methods:
+        __init__: Initializes the DeadlineScheduler object.
+        load: Replaces the cached deadlines after a database refresh.
+        mark_dirty: Forces a database refresh at the next tick, used after writes.
+        next_deadline: Returns the earliest cached deadline which is still in the future.
+        needs_refresh: Checks if the cached rows have to be queried from the database again.
+    """
+    def __init__(self, max_age=None, clock=None):
+        """
+        Initializes a new DeadlineScheduler object. Until the first load a refresh is always needed.
+
+        Args:
+            max_age (Optional[datetime.timedelta]): Per Default None. The maximum age of the cached rows.
+            clock (Optional[callable]): Per Default None, which uses the system clock.
+        """
+        self.max_age = max_age
+        self.clock = clock or system_clock
+        self.last_refresh = None
+        self.refreshes = 0
+        self.generation = 0
+        self._deadlines = []
+        self._dirty = True
+
+    def load(self, deadlines, now=None, generation=None):
+        """
+        Replaces the cached deadlines after the rows were queried from the database.
+        Deadlines which already passed are not stored, they don't need another refresh.
+
+        Args:
+            deadlines (iterable): The update_expiry values of the queried rows.
+            now (Optional[datetime.datetime]): The time of the query. Per Default None, which uses the clock.
+            generation (Optional[int]): The generation when the query was started. Per Default None, which means the query is up to date.
+                                        If a write marked the cache dirty in the meantime, the cache stays dirty.
+        """
+        now = now or self.clock()
+        self._deadlines = [deadline for deadline in deadlines if deadline is not None and deadline > now]
+        heapq.heapify(self._deadlines)
+        self._dirty = generation is not None and generation != self.generation
+        self.last_refresh = now
+        self.refreshes += 1
+
+    def mark_dirty(self):
+        """
+        Marks the cached rows as outdated, so the next tick queries the database again.
+        """
+        self._dirty = True
+        self.generation += 1
+
+    def next_deadline(self):
+        """
+        Returns the earliest cached deadline.
+
+        Returns:
+            Optional[datetime.datetime]: The earliest deadline which was still in the future at the last load or None.
+        """
+        return self._deadlines[0] if self._deadlines else None
+
+    def needs_refresh(self, now=None):
+        """
+        Checks if the cached rows have to be queried from the database again.
+
+        Args:
+            now (Optional[datetime.datetime]): The current time. Per Default None, which uses the clock.
+
+        Returns:
+            bool: True if the cache is dirty, the earliest deadline has passed or the cache is older than max_age.
+        """
+        if self._dirty:
+            return True
+        now = now or self.clock()
+        if self._deadlines and self._deadlines[0] <= now:
+            return True
+        return self.max_age is not None and now - self.last_refresh >= self.max_age
+
+
+class RefreshController:
+    """
+    Owns the one pending tkinter timer of a refresh loop, so a screen never runs more than one refresh chain.
+
+    The periodic refresh reschedules itself after every run. A manual request (e.g. the Update button) cancels the
+    pending timer and runs as soon as the event loop is idle. Several requests before that run are coalesced into one.
+
+    Attributes:
+        widget (tk.Misc): The tkinter widget whose after/after_cancel methods are used.
+        callback (callable): The function of the periodic refresh.
+        interval_ms (int): The number of milliseconds between two periodic refreshes.
+        runs (int): The number of refreshes which were run.
+
+    Methods:
+        __init__: Initializes the RefreshController object.
+        start: Schedules the first periodic refresh if no refresh is pending.
+        request: Runs a refresh as soon as possible, coalesced with all other pending requests.
+        stop: Cancels the pending refresh.
+        active_timers: The number of pending timers, 0 or 1.
+    """
+    def __init__(self, widget, callback, interval_ms=1000):
+        """
+        Initializes a new RefreshController object. Nothing is scheduled until start or request is called.
+
+        Args:
+            widget (tk.Misc): The tkinter widget used for scheduling.
+            callback (callable): The function of the periodic refresh.
+            interval_ms (Optional[int]): Per Default 1000. The number of milliseconds between two periodic refreshes.
+        """
+        self.widget = widget
+        self.callback = callback
+        self.interval_ms = interval_ms
+        self.runs = 0
+        self._after_id = None
+        self._requested_callback = None
+        self._running = False
+
+    @property
+    def active_timers(self):
+        """
+        Returns:
+            int: 1 if a refresh is pending, otherwise 0.
+        """
+        return 0 if self._after_id is None else 1
+
+    def start(self):
+        """
+        Schedules the next periodic refresh. If a refresh is already pending nothing happens.
+        """
+        if self._after_id is None:
+            self._after_id = self.widget.after(self.interval_ms, self._run)
+
+    def request(self, callback=None):
+        """
+        Runs a refresh as soon as the event loop is idle instead of waiting for the next periodic one.
+        All requests made before that refresh ran are coalesced into one.
+
+        Args:
+            callback (Optional[callable]): Per Default None, which runs the periodic callback. Otherwise this function is run once instead.
+        """
+        if callback is not None:
+            self._requested_callback = callback
+        if self._running:
+            # The refresh which is running right now schedules the requested one when it's done
+            return
+        self._cancel()
+        self._after_id = self.widget.after(0, self._run)
+
+    def stop(self):
+        """
+        Cancels the pending refresh. The loop can be started again with start or request.
+        """
+        self._cancel()
+        self._requested_callback = None
+
+    def _cancel(self):
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _run(self):
+        self._after_id = None
+        callback = self._requested_callback or self.callback
+        self._requested_callback = None
+        self._running = True
+        try:
+            callback()
+        finally:
+            self._running = False
+            self.runs += 1
+            # Run a request which came in during the refresh right away, otherwise continue the periodic loop
+            if self._requested_callback is not None:
+                self._after_id = self.widget.after(0, self._run)
+            else:
+                self.start()
@@ -0,0 +1,137 @@
+import os
+import re
+from collections import namedtuple
+from datetime import datetime as dt
+
+
+# Folder with the numbered migration files, e.g. migrations/001_dashboard_indexes.sql
+MIGRATIONS_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+# Error number of MySQL for an index name which already exists (ER_DUP_KEYNAME)
+DUPLICATE_KEY_NAME = 1061
+
+Migration = namedtuple('Migration', ['version', 'name', 'path'])
+
+
+def _already_applied(error):
+    # The index or table was created before, e.g. by hand or by a run which was interrupted before it was recorded
+    return getattr(error, 'errno', None) == DUPLICATE_KEY_NAME or "already exists" in str(error)
+
+
+class MigrationRunner:
+    """
+    Applies the numbered SQL files of the migrations folder to an existing database and records every applied version
+    in the schema_version table. Every migration is applied only once, so the runner can be started at every connect.
+
+    A migration file is named <version>_<name>.sql and contains SQL statements separated by semicolons. Lines starting with '--' are comments.
+    Statements which fail because the index or table already exists are skipped, so a migration can be applied to a database
+    where the change was already made.
+
+    Attributes:
+        db (MySQLDatabase): The database object (MySQLDatabase or SQLiteDatabase) the migrations are applied to.
+        directory (str): The folder with the migration files.
+
+    Methods:
+        __init__: Initializes the MigrationRunner object.
+        available_migrations: Returns all migration files sorted by version.
+        applied_versions: Returns the versions which are recorded in the schema_version table.
+        pending_migrations: Returns the migrations which weren't applied yet.
+        migrate: Applies all pending migrations.
+    """
+    def __init__(self, db, directory=MIGRATIONS_DIRECTORY):
+        """
+        Initializes a new MigrationRunner object.
+
+        Args:
+            db (MySQLDatabase): The database object the migrations are applied to.
+            directory (Optional[str]): Per Default the migrations folder next to this file.
+        """
+        self.db = db
+        self.directory = directory
+
+    def available_migrations(self):
+        """
+        Returns all migration files of the migrations folder.
+
+        Returns:
+            list: Migration tuples (version, name, path) sorted by version.
+        """
+        migrations = []
+        for file_name in os.listdir(self.directory):
+            match = re.match(r"^(\d+)_(\w+)\.sql$", file_name)
+            if match:
+                migrations.append(Migration(int(match.group(1)), match.group(2), os.path.join(self.directory, file_name)))
+        return sorted(migrations)
+
+    def applied_versions(self):
+        """
+        Returns the versions which are recorded in the schema_version table. The table is created if it doesn't exist yet.
+
+        Returns:
+            set: The applied versions.
+        """
+        self.db.connect()
+        self.db.cursor.execute("""CREATE TABLE IF NOT EXISTS schema_version(
+                                    version INTEGER NOT NULL,
+                                    name VARCHAR(100) NOT NULL,
+                                    applied_at TIMESTAMP NOT NULL,
+                                    PRIMARY KEY (version))""")
+        self.db.cursor.execute("SELECT version FROM schema_version")
+        versions = {row[0] for row in self.db.cursor.fetchall()}
+        self.db.connection.commit()
+        self.db.disconnect()
+        return versions
+
+    def pending_migrations(self):
+        """
+        Returns the migrations which weren't applied to the database yet.
+
+        Returns:
+            list: Migration tuples sorted by version.
+        """
+        applied = self.applied_versions()
+        return [migration for migration in self.available_migrations() if migration.version not in applied]
+
+    def migrate(self):
+        """
+        Applies all pending migrations in the order of their versions and records each of them in the schema_version table.
+
+        Returns:
+            list: The versions which were applied.
+
+        Raises:
+            Exception: If a statement of a migration fails. The migrations before are kept, the failed one can be run again.
+        """
+        pending = self.pending_migrations()
+        applied = []
+        if not pending:
+            return applied
+
+        # Use one connection for all migrations
+        self.db.connect()
+        try:
+            for migration in pending:
+                with open(migration.path, 'r') as f:
+                    sql = "\n".join(line for line in f.read().splitlines() if not line.strip().startswith("--"))
+
+                # Execute each statement, statements which were already applied are skipped
+                for statement in [x.strip() for x in sql.split(';')]:
+                    if not statement:
+                        continue
+                    try:
+                        self.db.cursor.execute(statement)
+                    except Exception as e:
+                        if not _already_applied(e):
+                            self.db.connection.rollback()
+                            raise Exception(f"Migration {migration.version} ({migration.name}) failed: {e}")
+                        print(f"Migration {migration.version}: skipped statement which was already applied ({e})")
+
+                # Record the version
+                self.db.cursor.execute("INSERT INTO schema_version (version, name, applied_at) VALUES (%s, %s, %s)",
+                                       (migration.version, migration.name, dt.now().replace(microsecond=0)))
+                self.db.connection.commit()
+                applied.append(migration.version)
+                print(f"Migration {migration.version} ({migration.name}) applied")
+        finally:
+            self.db.disconnect()
+        return applied
@@ -0,0 +1,297 @@
+"""
+Replays a month of check-ins for thousands of users on a FakeClock and reports the database calls and latencies per simulated day.
+
+    python simulator.py --users 2000 --days 30
+    python simulator.py --script visits.json
+    python simulator.py --mysql localhost root password 3306 habit_tracker
+
+Without --mysql a temporary SQLite database with the sample data is used. With --mysql the users are added to an existing
+MySQL database. Every user gets some active habits and a diligence: the chance to open the app on a day. A visit loads
+the dashboard, checks off every habit whose period is open and reactivates the failed habits, like a user of the main screen.
+The sweeper sets the expired habits to 'failed' every simulated hour. A script is a JSON list of {"user": index, "day": day, "minute": minute}
+visits instead of the random ones.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import tempfile
+import time
+from collections import namedtuple
+from datetime import datetime as dt
+from datetime import timedelta
+from active_user_habits import ActiveUserHabit
+from clock import FakeClock
+from database import open_database
+from expiry_sweeper import ExpirySweeper
+from instrumentation import LatencyHistogram
+from sqlite_database import SQLiteDatabase
+from streak_engine import StreakEngine
+from user import User
+
+
+# The result of one simulated day
+DaySummary = namedtuple('DaySummary', ['day', 'date', 'visits', 'db_calls', 'statements', 'p50_us', 'p99_us', 'db_ms',
+                                       'checked', 'failed', 'reactivated'])
+
+
+class Simulator:
+    """
+    Simulates the usage of the habit tracker by many users, fast-forwarded with a FakeClock.
+
+    Attributes:
+        db (MySQLDatabase): The database object.
+        clock (FakeClock): The simulated time, used by the engine, the sweeper and the models.
+        engine (StreakEngine): Decides which habits a user can check off.
+        sweeper (ExpirySweeper): Sets the expired habits of all users to 'failed'.
+        user_IDs (list): The IDs of the simulated users, filled by setup.
+        diligence (dict): The chance of every user to open the app on a day.
+
+    Methods:
+        __init__: Initializes the Simulator object.
+        setup: Creates the simulated users and their active habits.
+        random_visits: Returns the random visits of a day.
+        visit: Simulates one visit of a user.
+        run_day: Simulates one day.
+        run: Simulates several days.
+    """
+    def __init__(self, db, users=1000, habits_per_user=3, seed=1, start=None):
+        """
+        Initializes a new Simulator object.
+
+        Args:
+            db (MySQLDatabase): The database object with the tables and the system habits.
+            users (Optional[int]): Per Default 1000. The number of simulated users.
+            habits_per_user (Optional[int]): Per Default 3. The number of active habits of every user.
+            seed (Optional[int]): Per Default 1. The seed of the random visits and habits.
+            start (Optional[datetime.datetime]): Per Default None, which starts at midnight of today.
+        """
+        self.db = db
+        self.users = users
+        self.habits_per_user = habits_per_user
+        self.random = random.Random(seed)
+        self.clock = FakeClock(start or dt.now().replace(hour=0, minute=0, second=0, microsecond=0))
+        self.engine = StreakEngine(lambda: db.reference_data.intervals, clock=self.clock)
+        self.sweeper = ExpirySweeper(db, clock=self.clock)
+        self.user_IDs = []
+        self.diligence = {}
+        self._latency = LatencyHistogram()
+        self._counts = {}
+
+    def setup(self):
+        """
+        Creates the simulated users and their active habits with two multi-row inserts.
+        The habits are system habits with a random interval, their first deadline is one interval after the start.
+        """
+        # Insert the users and read their IDs back
+        prefix = f"sim_{self.random.randrange(10 ** 9)}_"
+        users = [vars(User("Sim", f"User {index}", f"{prefix}{index}", "secret", f"{prefix}{index}@example.com", "0")) for index in range(self.users)]
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.db.insert_many("user_table", users)
+        self.db.connect()
+        try:
+            self.db.cursor.execute("SELECT user_ID FROM user_table WHERE username LIKE %s ORDER BY user_ID", (f"{prefix}%",))
+            self.user_IDs = [row[0] for row in self.db.cursor.fetchall()]
+        finally:
+            self.db.disconnect()
+
+        # Give every user some system habits with random intervals
+        habit_IDs = [habit[0] for habit in self.db.reference_data.habits]
+        interval_IDs = [interval.interval_ID for interval in self.db.reference_data.intervals]
+        active_habits = []
+        for user_ID in self.user_IDs:
+            self.diligence[user_ID] = self.random.uniform(0.6, 1.0)
+            for habit_ID in self.random.sample(habit_IDs, min(self.habits_per_user, len(habit_IDs))):
+                interval_ID = self.random.choice(interval_IDs)
+                active_habit = ActiveUserHabit(user_ID, habit_ID, interval_ID, last_check=self.clock(),
+                                               update_expiry=self.engine.first_deadline(interval_ID), clock=self.clock)
+                active_habits.append(vars(active_habit))
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.db.insert_many("active_user_habits", active_habits)
+
+    def random_visits(self, day):
+        """
+        Returns the random visits of a day: every user opens the app with the chance of their diligence at a random minute.
+
+        Args:
+            day (int): The number of the simulated day, starting with 0.
+
+        Returns:
+            list: The visits as (minute, user_ID) tuples.
+        """
+        return [(self.random.randrange(24 * 60), user_ID) for user_ID in self.user_IDs if self.random.random() < self.diligence[user_ID]]
+
+    def _call(self, function, *args):
+        # Runs a database call and records its latency
+        started = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self._latency.record(time.perf_counter() - started)
+
+    def visit(self, user_ID):
+        """
+        Simulates one visit of a user: load the dashboard, check off every habit whose period is open and reactivate the failed habits.
+
+        Args:
+            user_ID (int): The ID of the user.
+        """
+        now = self.clock()
+        rows = self._call(self.db.get_dashboard_rows, user_ID)
+
+        # Check off the habits the engine lets through, all with one call like the Check Habit button
+        to_check = [row.active_habits_ID for row in rows if self.engine.check_off(row, now).status == 'checked']
+        if to_check:
+            results = self._call(self.db.check_off_many, to_check, user_ID, now)
+            self._counts['checked'] += sum(1 for result in results.values() if result.status == 'checked')
+
+        # Start the failed habits over again like the Reactivate Habit button
+        for row in rows:
+            if row.status == 'failed':
+                new_active_habit = ActiveUserHabit(user_ID, row.habit_ID, row.interval_ID, update_expiry=self.engine.first_deadline(row.interval_ID, now), clock=self.clock)
+                self._call(self._reactivate, row.active_habits_ID, user_ID, vars(new_active_habit))
+                self._counts['reactivated'] += 1
+
+    def _reactivate(self, active_habits_ID, user_ID, data):
+        # Delete the failed habit and insert the new one in one transaction
+        with self.db.transaction():
+            self.db.delete_active_habit(active_habits_ID, user_ID)
+            self.db.insert_data("active_user_habits", data)
+
+    def run_day(self, day, visits=None):
+        """
+        Simulates one day. The visits are replayed in the order of their minute, the sweeper runs at the end of every hour.
+
+        Args:
+            day (int): The number of the simulated day, starting with 0.
+            visits (Optional[list]): The visits as (minute, user_ID) tuples. Per Default None, which uses random_visits.
+
+        Returns:
+            DaySummary: The visits, the database calls and latencies and the check-offs of the day.
+        """
+        visits = sorted(self.random_visits(day) if visits is None else visits)
+        day_start = self.clock().replace(hour=0, minute=0, second=0, microsecond=0)
+        self._latency = LatencyHistogram()
+        self._counts = {'checked': 0, 'failed': 0, 'reactivated': 0}
+        if self.db.instrumentation is not None:
+            self.db.instrumentation.reset()
+
+        # Replay the visits hour by hour, the database prints are not shown
+        with contextlib.redirect_stdout(io.StringIO()):
+            next_visit = 0
+            for hour in range(24):
+                while next_visit < len(visits) and visits[next_visit][0] < (hour + 1) * 60:
+                    minute, user_ID = visits[next_visit]
+                    self.clock.set(max(self.clock(), day_start + timedelta(minutes=minute)))
+                    self.visit(user_ID)
+                    next_visit += 1
+                self.clock.set(day_start + timedelta(hours=hour + 1))
+                self._counts['failed'] += self._call(self.sweeper.sweep)
+
+        # Count the database method calls and statements of the day
+        db_calls = statements = 0
+        if self.db.instrumentation is not None:
+            stats = self.db.instrumentation.stats()
+            db_calls = sum(method['calls'] for method in stats['methods'].values())
+            statements = sum(statement['calls'] for statement in stats['statements'].values())
+        return DaySummary(day, day_start.date(), len(visits), db_calls, statements, self._latency.percentile(50), self._latency.percentile(99),
+                          self._latency.total / 1000, self._counts['checked'], self._counts['failed'], self._counts['reactivated'])
+
+    def run(self, days=30, script=None, report=None):
+        """
+        Simulates several days.
+
+        Args:
+            days (Optional[int]): Per Default 30. The number of simulated days.
+            script (Optional[list]): Per Default None, which uses random visits. The visits as {"user": index, "day": day, "minute": minute}
+                                     dictionaries, the index is the position of the user in user_IDs.
+            report (Optional[callable]): Per Default None. Called with the DaySummary of every day.
+
+        Returns:
+            list: The DaySummary of every day.
+        """
+        # Group the scripted visits by day
+        scripted = None
+        if script is not None:
+            scripted = {}
+            for visit in script:
+                scripted.setdefault(visit['day'], []).append((visit['minute'], self.user_IDs[visit['user']]))
+
+        summaries = []
+        for day in range(days):
+            summary = self.run_day(day, scripted.get(day, []) if scripted is not None else None)
+            summaries.append(summary)
+            if report is not None:
+                report(summary)
+        return summaries
+
+
+def format_header():
+    return (f"{'day':>4} {'date':>10} {'visits':>7} {'db calls':>9} {'stmts':>7} {'p50 us':>7} {'p99 us':>7} {'db ms':>9} "
+            f"{'checked':>8} {'failed':>7} {'reactivated':>11}")
+
+
+def format_summary(summary):
+    return (f"{summary.day:>4} {summary.date.isoformat():>10} {summary.visits:>7} {summary.db_calls:>9} {summary.statements:>7} {summary.p50_us:>7} "
+            f"{summary.p99_us:>7} {summary.db_ms:>9.1f} {summary.checked:>8} {summary.failed:>7} {summary.reactivated:>11}")
+
+
+def simulate(db, args):
+    """
+    Creates the users on the database, runs the simulation and prints a line per simulated day.
+
+    Args:
+        db (MySQLDatabase): The database object.
+        args (argparse.Namespace): The command line arguments.
+    """
+    script = None
+    if args.script:
+        with open(args.script) as f:
+            script = json.load(f)
+        args.days = max([visit['day'] for visit in script], default=-1) + 1
+
+    db.enable_instrumentation()
+    simulator = Simulator(db, users=args.users, habits_per_user=args.habits, seed=args.seed)
+    started = time.perf_counter()
+    simulator.setup()
+    print(f"{len(simulator.user_IDs)} users with {args.habits} active habits each created in {time.perf_counter() - started:.1f}s")
+    print(format_header())
+    started = time.perf_counter()
+    summaries = simulator.run(args.days, script, report=lambda summary: print(format_summary(summary)))
+    print(f"{len(summaries)} simulated days in {time.perf_counter() - started:.1f}s wall time, "
+          f"{sum(summary.db_calls for summary in summaries)} database calls")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mysql', nargs=5, metavar=('HOST', 'USER', 'PASSWORD', 'PORT', 'DATABASE'))
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--habits', type=int, default=3, help="The number of active habits of every user.")
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--script', help="A JSON file with the visits instead of random visits.")
+    args = parser.parse_args(argv)
+
+    if args.mysql:
+        host, user, password, port, database = args.mysql
+        db = open_database([host, user, password, int(port), database], pool_size=1)
+        try:
+            simulate(db, args)
+        finally:
+            db.close()
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = SQLiteDatabase(os.path.join(tmp_dir, "simulation"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            db.create_database_file(db.database)
+        try:
+            simulate(db, args)
+        finally:
+            db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+import argparse
+import datetime
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import RotatingFileHandler
+from instrumentation import statement_fingerprint
+
+
+class SlowQueryLog:
+    """
+    Writes every statement of MySQLDatabase which takes longer than a threshold to a rotating log file
+    (see MySQLDatabase.enable_slow_query_log). Each entry is one JSON line with the time, method, statement,
+    fingerprint, parameters, duration and rows of the statement.
+
+    The EXPLAIN output of a slow SELECT is captured on a background thread, so the slow call is not delayed
+    any further. The entry is written once the EXPLAIN is done.
+
+    Attributes:
+        path (str): The path of the log file. Full files are renamed to path.1, path.2, ...
+        threshold (float): The duration in seconds above which a statement is logged.
+        explain (Optional[callable]): Returns the EXPLAIN rows of a statement, e.g. MySQLDatabase.explain. None means no EXPLAIN.
+        entries (int): The number of slow statements which were logged.
+
+    Methods:
+        __init__: Initializes the SlowQueryLog object.
+        statement_executed: Does nothing, a statement is checked when it is finished.
+        statement_finished: Logs a statement if it was slower than the threshold.
+        flush: Waits until the pending EXPLAIN captures are written.
+        close: Writes the pending entries and closes the log file.
+    """
+    def __init__(self, path="slow_queries.log", threshold=0.2, explain=None, max_bytes=1000000, backup_count=3):
+        """
+        Initializes a new SlowQueryLog object.
+
+        Args:
+            path (Optional[str]): Per Default "slow_queries.log". The path of the log file.
+            threshold (Optional[float]): Per Default 0.2 seconds. Statements which take longer are logged.
+            explain (Optional[callable]): Per Default None. Called with (query, params) on a background thread, returns the EXPLAIN rows.
+            max_bytes (Optional[int]): Per Default 1 MB. The size at which the log file is rotated.
+            backup_count (Optional[int]): Per Default 3. The number of rotated files which are kept.
+        """
+        self.path = path
+        self.threshold = threshold
+        self.explain = explain
+        self.entries = 0
+        self._handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count)
+        self._handler.setFormatter(logging.Formatter("%(message)s"))
+        # A logger of its own which is not registered globally, so the entries don't show up in other logs
+        self._logger = logging.Logger(f"slow_query_log.{path}")
+        self._logger.addHandler(self._handler)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="habit-tracker-explain")
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def statement_executed(self, query, method):
+        """
+        Called by the Instrumentation right after the execution of a statement. The duration is only known when the rows were fetched.
+        """
+        pass
+
+    def statement_finished(self, query, params, seconds, rows, method):
+        """
+        Logs a statement if it was slower than the threshold. Called by the Instrumentation after every statement.
+
+        Args:
+            query (str): The SQL of the statement.
+            params (tuple): The values of the placeholders.
+            seconds (float): The execute and fetch time.
+            rows (int): The number of fetched or changed rows.
+            method (Optional[str]): The MySQLDatabase method which ran the statement.
+        """
+        # The EXPLAIN statements themselves are not logged
+        if seconds < self.threshold or getattr(self._local, 'explaining', False):
+            return
+        entry = {
+            'time': datetime.datetime.now().isoformat(" ", "milliseconds"),
+            'method': method,
+            'fingerprint': statement_fingerprint(query),
+            'statement': " ".join(query.split()),
+            'params': [str(param) for param in params] if params else [],
+            'duration_ms': round(seconds * 1000, 3),
+            'rows': rows,
+        }
+        if self.explain is not None and entry['statement'].upper().startswith("SELECT"):
+            self._executor.submit(self._explain_and_write, entry, query, params)
+        else:
+            self._write(entry)
+
+    def _explain_and_write(self, entry, query, params):
+        # Runs on the background thread
+        self._local.explaining = True
+        try:
+            entry['explain'] = self.explain(query, params)
+        except Exception as e:
+            entry['explain_error'] = str(e)
+        finally:
+            self._local.explaining = False
+        self._write(entry)
+
+    def _write(self, entry):
+        with self._lock:
+            self._logger.info(json.dumps(entry, default=str))
+            self.entries += 1
+
+    def flush(self):
+        """
+        Waits until the pending EXPLAIN captures are written to the log file.
+        """
+        self._executor.submit(lambda: None).result()
+
+    def close(self):
+        """
+        Writes the pending entries and closes the log file.
+        """
+        self._executor.shutdown(wait=True)
+        self._handler.close()
+
+
+def read_entries(path):
+    """
+    Reads the entries of a slow query log file and its rotated files, the oldest first.
+
+    Args:
+        path (str): The path of the log file.
+
+    Returns:
+        list: The entries as dictionaries.
+    """
+    entries = []
+    index = 1
+    files = [path]
+    while os.path.exists(f"{path}.{index}"):
+        files.insert(0, f"{path}.{index}")
+        index += 1
+    for file_name in files:
+        if not os.path.exists(file_name):
+            continue
+        with open(file_name, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entries.append(json.loads(line))
+    return entries
+
+
+def summarize(entries, top=10):
+    """
+    Groups the entries by statement fingerprint and sorts the groups by their total duration.
+
+    Args:
+        entries (list): The entries of read_entries.
+        top (Optional[int]): Per Default 10. The number of groups to be returned.
+
+    Returns:
+        list: Dictionaries with the fingerprint, count, total, mean and max duration in ms, the average rows,
+              the methods and the EXPLAIN of the slowest entry.
+    """
+    groups = {}
+    for entry in entries:
+        group = groups.setdefault(entry['fingerprint'], {'fingerprint': entry['fingerprint'], 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                                                         'rows': 0, 'methods': set(), 'explain': None})
+        group['count'] += 1
+        group['total_ms'] += entry['duration_ms']
+        group['rows'] += entry['rows'] if isinstance(entry.get('rows'), int) and entry['rows'] >= 0 else 0
+        if entry.get('method'):
+            group['methods'].add(entry['method'])
+        if entry['duration_ms'] >= group['max_ms']:
+            group['max_ms'] = entry['duration_ms']
+            group['explain'] = entry.get('explain', group['explain'])
+
+    summary = sorted(groups.values(), key=lambda group: group['total_ms'], reverse=True)[:top]
+    for group in summary:
+        group['mean_ms'] = group['total_ms'] / group['count']
+        group['avg_rows'] = group['rows'] / group['count']
+        group['methods'] = sorted(group['methods'])
+    return summary
+
+
+def format_summary(summary):
+    """
+    Formats the summary of summarize as a text table.
+
+    Args:
+        summary (list): The groups of summarize.
+
+    Returns:
+        str: The text table.
+    """
+    lines = [f"{'count':>6} {'total ms':>10} {'mean ms':>9} {'max ms':>9} {'avg rows':>9}  methods / statement"]
+    for group in summary:
+        lines.append(f"{group['count']:>6} {group['total_ms']:>10.1f} {group['mean_ms']:>9.1f} {group['max_ms']:>9.1f} {group['avg_rows']:>9.1f}  "
+                     f"{', '.join(group['methods'])}")
+        lines.append(f"{'':>48}{group['fingerprint']}")
+        for row in group['explain'] or []:
+            lines.append(f"{'':>48}EXPLAIN {row}")
+    return "\n".join(lines)
+
+
+def main(args=None):
+    """
+    Command line interface: prints the worst statements of a slow query log.
+
+        python slow_query_log.py slow_queries.log --top 5
+    """
+    parser = argparse.ArgumentParser(description="Summarizes a slow query log by statement fingerprint.")
+    parser.add_argument('path', nargs='?', default="slow_queries.log", help="The path of the slow query log.")
+    parser.add_argument('--top', type=int, default=10, help="The number of statements to show.")
+    args = parser.parse_args(args)
+    print(format_summary(summarize(read_entries(args.path), args.top)))
+
+
+if __name__ == '__main__':
+    main()
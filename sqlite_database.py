@@ -0,0 +1,308 @@
+import datetime
+import os
+import re
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from tkinter import messagebox
+from database import MySQLDatabase
+from instrumentation import instrumented_method
+
+
+# Store datetime values as ISO strings with a space, just like MySQL returns them, and convert them back when reading
+sqlite3.register_adapter(datetime.datetime, lambda value: value.isoformat(" "))
+sqlite3.register_adapter(datetime.date, lambda value: value.isoformat())
+sqlite3.register_converter("TIMESTAMP", lambda value: datetime.datetime.fromisoformat(value.decode()))
+sqlite3.register_converter("DATE", lambda value: datetime.date.fromisoformat(value.decode()[:10]))
+
+
+@lru_cache(maxsize=256)
+def translate_query(query):
+    """
+    Translates a query written for MySQL into the SQLite dialect.
+
+    Args:
+        query (str): The MySQL query with %s placeholders.
+
+    Returns:
+        str: The query with ? placeholders and DATE_ADD(x, INTERVAL n DAY) rewritten to the DATE_ADD(x, n) function.
+    """
+    query = query.replace("%s", "?")
+    query = re.sub(r"INTERVAL\s+(.+?)\s+DAY\b", r"\1", query, flags=re.IGNORECASE)
+    return query
+
+
+def translate_ddl(sql):
+    """
+    Translates the CREATE TABLE statements of database_tables.txt into SQLite DDL.
+
+    Args:
+        sql (str): The MySQL DDL statements.
+
+    Returns:
+        str: The DDL with AUTO_INCREMENT columns turned into INTEGER PRIMARY KEY AUTOINCREMENT columns.
+    """
+    sql = re.sub(r"(\w+)\s+INTEGER\s+NOT\s+NULL\s+AUTO_INCREMENT", r"\1 INTEGER PRIMARY KEY AUTOINCREMENT", sql, flags=re.IGNORECASE)
+    sql = re.sub(r",\s*PRIMARY\s+KEY\s*\(\w+\)", "", sql, flags=re.IGNORECASE)
+    return sql
+
+
+def _now():
+    return datetime.datetime.now().replace(microsecond=0).isoformat(" ")
+
+
+def _date_add(value, days):
+    if value is None or days is None:
+        return None
+    return (datetime.datetime.fromisoformat(str(value)) + datetime.timedelta(days=days)).isoformat(" ")
+
+
+def _datediff(first, second):
+    if first is None or second is None:
+        return None
+    first_date = datetime.datetime.fromisoformat(str(first)).date()
+    second_date = datetime.datetime.fromisoformat(str(second)).date()
+    return (first_date - second_date).days
+
+
+class SQLiteCursor:
+    """
+    A thin wrapper around a sqlite3 cursor which accepts the MySQL queries used by the MySQLDatabase methods.
+
+    Methods:
+        execute: Translates and executes a query.
+        executemany: Translates and executes a query for several rows of parameters.
+        fetchone: Returns the next row of the result.
+        fetchall: Returns all remaining rows of the result.
+        close: Closes the cursor.
+    """
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, query, params=()):
+        self._cursor.execute(translate_query(query), params)
+        return self
+
+    def executemany(self, query, seq_of_params):
+        self._cursor.executemany(translate_query(query), seq_of_params)
+        return self
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def close(self):
+        self._cursor.close()
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+
+class SQLiteDatabase(MySQLDatabase):
+    """
+    A drop-in replacement for MySQLDatabase which stores the Habit Tracker in a local SQLite file.
+    All query methods are inherited from MySQLDatabase, the queries are translated into the SQLite dialect by the SQLiteCursor.
+
+    Attributes:
+        database (str): The path of the SQLite database file.
+
+    Methods:
+        __init__: Initializes the SQLiteDatabase object.
+        connect: Opens the database file (once) and creates a new cursor.
+        create_database_file: Creates and initializes the database file if it doesn't exist yet.
+        create_database: Calls create_database_file and shows the result in a messagebox.
+        initialize_database: Creates the tables from database_tables.txt and inserts the sample data from inserts.txt.
+        create_table: Creates a new table in the SQLite database.
+    """
+    # SQLite shows the execution plan with EXPLAIN QUERY PLAN, EXPLAIN alone lists the byte code
+    EXPLAIN = "EXPLAIN QUERY PLAN"
+    # SQLite has no row locks, the UPDATE locks the whole database file
+    LOCK_ROWS = ""
+
+    def __init__(self, database):
+        """
+        Initializes a new SQLiteDatabase object. The file is opened at the first connect.
+
+        Args:
+            database (str): The path or name of the SQLite database file. '.db' is added if the name has no file extension.
+        """
+        super().__init__(None, None, None, None, self._database_path(database))
+        # Every thread gets its own connection to the file, an in-memory database is shared by all threads
+        self._sqlite_connections = []
+        self._connections_lock = threading.Lock()
+
+    @staticmethod
+    def _database_path(database):
+        if database and database != ":memory:" and not os.path.splitext(database)[1]:
+            database = f"{database}.db"
+        return database
+
+    def connect(self):
+        """
+        Connects to the SQLite database file. The file connection of the calling thread is kept open and reused, only the cursor is new for every call.
+
+        Raises:
+            Exception: If the database file cannot be opened.
+        """
+        # Inside a transaction all statements run on its pinned connection
+        transaction = self._transaction
+        if transaction is not None:
+            self.cursor = self._instrument_cursor(transaction.cursor)
+            return
+
+        connect_started = time.perf_counter()
+        try:
+            self.connection = self._acquire_connection()
+        except sqlite3.Error as e:
+            # No messagebox here, connect also runs on the worker threads. The caller shows the error on the tkinter thread
+            raise Exception(f"Failed to open SQLite database: {e}")
+        self.cursor = self._instrument_cursor(SQLiteCursor(self.connection.cursor()), connect_started)
+
+    def _acquire_connection(self):
+        # Open the database file only once per thread
+        connection = getattr(self._local, 'sqlite_connection', None)
+        if connection is None and self.database == ":memory:" and self._sqlite_connections:
+            connection = self._sqlite_connections[0]
+        if connection is None:
+            connection = sqlite3.connect(self.database, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            connection.execute("PRAGMA foreign_keys = ON")
+            connection.execute("PRAGMA busy_timeout = 5000")
+
+            # Register the MySQL functions used by the queries and inserts.txt
+            connection.create_function("NOW", 0, _now)
+            connection.create_function("DATE_ADD", 2, _date_add)
+            connection.create_function("DATEDIFF", 2, _datediff)
+            with self._connections_lock:
+                self._sqlite_connections.append(connection)
+        self._local.sqlite_connection = connection
+        return connection
+
+    def _execute_statement(self, name, params=()):
+        # sqlite3 caches the compiled statements of every connection by their SQL, so the normal cursor is used
+        self.cursor.execute(self.statements.sql(name), params)
+        return self.cursor
+
+    def _release_connection(self, connection):
+        # Keep the file open, only roll back what wasn't committed
+        if connection.in_transaction:
+            connection.rollback()
+
+    def close(self):
+        """
+        Closes the connections of all threads to the SQLite database file.
+        """
+        self.disconnect()
+        with self._connections_lock:
+            connections, self._sqlite_connections = self._sqlite_connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+    @instrumented_method
+    def _has_tables(self):
+        self.connect()
+        self.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'user_table'")
+        result = self.cursor.fetchone()
+        self.disconnect()
+        return result is not None
+
+    def create_database_file(self, new_database):
+        """
+        Creates and initializes the database file with the given name if it does not already exist, without any dialog.
+
+        Args:
+            new_database (str): The path or name of the database file.
+
+        Returns:
+            bool: True if the database already existed, False if it was created.
+
+        Raises:
+            sqlite3.Error: If the database file cannot be created or initialized.
+        """
+        self.database = self._database_path(new_database)
+        if self._has_tables():
+            return True
+        self.initialize_database(self.database)
+        return False
+
+    def create_database(self, new_database):
+        """
+        Creates a new SQLite database file with the given name if it does not already exist, and initializes the database with the necessary tables and sample data.
+        The result is shown in a messagebox.
+
+        Args:
+            new_database (str): The path or name of the new database file.
+        """
+        try:
+            if self.create_database_file(new_database):
+                # Database already exists
+                messagebox.showinfo("Info", "Database already exists, you can now login or register.")
+            else:
+                # New database created
+                messagebox.showinfo("Success", "Database created. You can go on and login/register.")
+        except sqlite3.Error as err:
+            messagebox.showerror("Error", f"Database creation failed: {err}")
+
+    @instrumented_method
+    def initialize_database(self, database):
+        """
+        Initializes the SQLite database with the tables of database_tables.txt and the sample data of inserts.txt.
+        The MySQL DDL is translated into SQLite DDL before it is executed.
+
+        Args:
+            database (str): The path of the database file to be initialized.
+        """
+        # Read the contents of the file that contains the SQL statements database_tables.txt
+        with open('database_tables.txt', 'r') as f:
+            sql = translate_ddl(f.read())
+
+        self.connect()
+
+        # Execute each CREATE TABLE statement
+        for statement in [x.strip() for x in sql.split(';')]:
+            if statement:
+                self.cursor.execute(statement)
+        print("Tables created")
+
+        # Insert all predefined insert statements of the inserts.txt file in batches
+        self.load_inserts('inserts.txt')
+
+        self.disconnect()
+
+    @instrumented_method
+    def create_table(self, table_name, *columns):
+        """
+        Creates a new table in the database if it doesn't already exist.
+
+        Args:
+            table_name (str): The name of the table to be created.
+            *columns (str): One or more column definitions, each formatted as a string like 'column_name column_type', separated by commas.
+
+        Returns:
+            None
+        """
+        self.connect()
+        self.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = %s", (table_name,))
+        result = self.cursor.fetchone()
+        if result:
+            print(f"Table '{table_name}' already exists")
+        else:
+            # Construct the SQL query for creating the table
+            query = f"CREATE TABLE IF NOT EXISTS {table_name} ({', '.join(columns)})"
+            self.cursor.execute(query)
+            print(f"Table '{table_name}' created successfully")
+        self.disconnect()
@@ -0,0 +1,35 @@
+import os
+import tempfile
+import unittest
+from reference_data import set_reference_data
+from sqlite_database import SQLiteDatabase
+
+
+class SQLiteDatabaseFixture:
+    """
+    Creates a new SQLite database file with the sample data of inserts.txt for every test and removes it afterwards.
+    Mixed into the test cases which run against a real database, before the unittest base class.
+
+    Attributes:
+        tmp_dir (tempfile.TemporaryDirectory): The temporary directory of the database file.
+        db (SQLiteDatabase): The database object of the test.
+    """
+    def setUp(self):
+        print("\nRunning setUp method..")
+        # Create and initialize a new SQLite database file for every test
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db = SQLiteDatabase(os.path.join(self.tmp_dir.name, "habit_tracker"))
+        self.db.create_database_file(self.db.database)
+
+    def tearDown(self):
+        print("Running tear down method")
+        # The reference data of the removed file must not be reused by the next test
+        set_reference_data(self.db, None)
+        self.db.close()
+        self.tmp_dir.cleanup()
+
+
+class SQLiteTestCase(SQLiteDatabaseFixture, unittest.TestCase):
+    """
+    A unittest.TestCase with a new SQLite database file for every test, see SQLiteDatabaseFixture.
+    """
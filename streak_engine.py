@@ -0,0 +1,224 @@
+from collections import namedtuple
+from datetime import datetime as dt
+from datetime import timedelta
+
+
+# The text of the countdown when the deadline of an active habit has passed
+TIME_IS_UP = "Time is up!"
+
+# The countdown of one active habit. remaining_seconds is negative or 0 if the deadline has passed.
+Countdown = namedtuple('Countdown', ['active_habits_ID', 'remaining_seconds', 'text', 'expired'])
+
+# The result of one tick: the time it was computed for, the Countdown of every row and the IDs of the rows which have to be set to 'failed'
+StreakTick = namedtuple('StreakTick', ['now', 'countdowns', 'transitions'])
+
+# Result of a check-off. status is 'checked', 'too_early', 'expired' or 'not_found', the other values are the state after the check-off.
+CheckOffResult = namedtuple('CheckOffResult', ['status', 'streak', 'last_check', 'update_expiry', 'interval_days'])
+
+
+def format_remaining(seconds):
+    """
+    Formats the remaining time of a countdown as "Xd HH:MM:SS". Fractions of a second are cut off.
+
+    Args:
+        seconds (float): The remaining seconds, greater than 0.
+
+    Returns:
+        str: The formatted countdown, e.g. "6d 23:59:59".
+    """
+    days, rest = divmod(int(seconds), 86400)
+    hours, rest = divmod(rest, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{days}d {hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+class StreakEngine:
+    """
+    The deadline, countdown and check-off rules of the active habits, without tkinter and without database access.
+    The main screen, the batch jobs and the tests use the same engine, so the rules exist only once.
+
+    The engine works on batches of rows which have the attributes of DashboardRow (active_habits_ID, streak, interval_ID,
+    update_expiry and status). The current time is taken once per batch from the clock, so all countdowns of a tick
+    are computed for the same moment. The number of days of every interval comes from the monitoring_interval table,
+    there is no branch per interval.
+
+    Attributes:
+        clock (callable): Returns the current time as datetime.datetime. Per Default datetime.now.
+
+    Methods:
+        __init__: Initializes the StreakEngine object.
+        interval_days: Returns the number of days of a monitoring interval.
+        tick: Computes the countdowns and expiry transitions of a batch of rows.
+        remaining_seconds: Computes the remaining seconds of a batch of deadlines.
+        format_countdowns: Formats a batch of remaining seconds.
+        first_deadline: Returns the deadline of a newly activated habit.
+        is_expired: Checks if an active habit can't be checked off any longer.
+        check_off: Applies the check-off rules to one row.
+        check_off_many: Applies the check-off rules to a batch of rows.
+        next_check: Returns the time until the next check-off of a habit is possible.
+    """
+    def __init__(self, intervals=(), clock=None):
+        """
+        Initializes a new StreakEngine object.
+
+        Args:
+            intervals (Optional[iterable or callable]): Per Default empty. The rows of the monitoring_interval table as
+                (interval_ID, control_interval, days) tuples, e.g. ReferenceData.intervals. A callable which returns the
+                rows is called whenever the days of an interval are needed, so the engine always uses the current reference data.
+            clock (Optional[callable]): Per Default None, which uses datetime.now. Returns the current time.
+        """
+        self.clock = clock or dt.now
+        self._intervals = intervals if callable(intervals) else self._interval_table(intervals)
+
+    @staticmethod
+    def _interval_table(intervals):
+        # The days of every interval by interval_ID and by name
+        table = {}
+        for interval_ID, control_interval, days in intervals:
+            table[interval_ID] = days
+            table[control_interval] = days
+        return table
+
+    def interval_days(self, interval):
+        """
+        Returns the number of days of a monitoring interval.
+
+        Args:
+            interval (int or str): The interval_ID or the name of the monitoring interval, e.g. 2 or 'weekly'.
+
+        Returns:
+            int: The number of days between two check-offs.
+        """
+        table = self._interval_table(self._intervals()) if callable(self._intervals) else self._intervals
+        if interval not in table:
+            raise Exception(f"Unknown monitoring interval: {interval}")
+        return table[interval]
+
+    def tick(self, rows, now=None):
+        """
+        Computes the countdowns of a batch of active habits for one moment. Rows whose deadline has passed get the countdown
+        "Time is up!". The rows which are expired but still 'in progress' are returned as transitions, the sweeper sets them to 'failed'.
+
+        Args:
+            rows (list): The DashboardRow objects (or rows with the same attributes).
+            now (Optional[datetime.datetime]): Per Default None, which uses the clock.
+
+        Returns:
+            StreakTick: The time of the tick, the Countdown of every row in the order of rows and the active_habits_IDs to be set to 'failed'.
+        """
+        now = now or self.clock()
+        # Compute the columns of the batch
+        remaining = self.remaining_seconds([row.update_expiry for row in rows], now)
+        texts = self.format_countdowns(remaining)
+        countdowns = [Countdown(row.active_habits_ID, seconds, text, seconds <= 0) for row, seconds, text in zip(rows, remaining, texts)]
+        transitions = [countdown.active_habits_ID for row, countdown in zip(rows, countdowns) if countdown.expired and row.status == 'in progress']
+        return StreakTick(now, countdowns, transitions)
+
+    def remaining_seconds(self, deadlines, now):
+        """
+        Computes the seconds until every deadline.
+
+        Args:
+            deadlines (list): The update_expiry values as datetime.datetime.
+            now (datetime.datetime): The current time.
+
+        Returns:
+            list: The remaining seconds as floats, negative or 0 if the deadline has passed.
+        """
+        return [(deadline - now).total_seconds() for deadline in deadlines]
+
+    def format_countdowns(self, remaining):
+        """
+        Formats the countdowns of a batch.
+
+        Args:
+            remaining (list): The remaining seconds of remaining_seconds.
+
+        Returns:
+            list: "Xd HH:MM:SS" for every running countdown and "Time is up!" for every passed deadline.
+        """
+        return [format_remaining(seconds) if seconds > 0 else TIME_IS_UP for seconds in remaining]
+
+    def first_deadline(self, interval, now=None):
+        """
+        Returns the deadline of a habit which is activated or reactivated now.
+
+        Args:
+            interval (int or str): The interval_ID or the name of the monitoring interval.
+            now (Optional[datetime.datetime]): Per Default None, which uses the clock.
+
+        Returns:
+            datetime.datetime: now plus the days of the monitoring interval.
+        """
+        now = now or self.clock()
+        return now + timedelta(days=self.interval_days(interval))
+
+    def is_expired(self, row, now=None):
+        """
+        Checks if an active habit can't be checked off any longer, because it isn't 'in progress' or its deadline has passed.
+
+        Args:
+            row (DashboardRow): The active habit.
+            now (Optional[datetime.datetime]): Per Default None, which uses the clock.
+
+        Returns:
+            bool: True if the habit is expired.
+        """
+        now = now or self.clock()
+        return row.status != 'in progress' or row.update_expiry <= now
+
+    def check_off(self, row, now=None):
+        """
+        Applies the check-off rules to one active habit, the same rules as the conditional UPDATE of MySQLDatabase.check_off:
+        the habit has to be 'in progress', its deadline must not have passed and the current period must not be checked already
+        (the deadline is at most one interval ahead, or the streak is 0). A checked habit gets streak + 1 and its deadline
+        is moved forward by the days of the interval.
+
+        Args:
+            row (DashboardRow): The active habit, None if it doesn't exist.
+            now (Optional[datetime.datetime]): Per Default None, which uses the clock.
+
+        Returns:
+            CheckOffResult: The status 'checked', 'too_early', 'expired' or 'not_found' and the state of the active habit after the check-off.
+        """
+        if row is None:
+            return CheckOffResult('not_found', None, None, None, None)
+        now = now or self.clock()
+        days = self.interval_days(row.interval_ID)
+        interval = timedelta(days=days)
+        last_check = getattr(row, 'last_check', None)
+
+        # Check the conditions in the order of the UPDATE
+        if self.is_expired(row, now):
+            return CheckOffResult('expired', row.streak, last_check, row.update_expiry, days)
+        if row.streak != 0 and row.update_expiry > now + interval:
+            return CheckOffResult('too_early', row.streak, last_check, row.update_expiry, days)
+        return CheckOffResult('checked', row.streak + 1, now, row.update_expiry + interval, days)
+
+    def check_off_many(self, rows, now=None):
+        """
+        Applies the check-off rules to a batch of active habits for one moment.
+
+        Args:
+            rows (list): The DashboardRow objects.
+            now (Optional[datetime.datetime]): Per Default None, which uses the clock.
+
+        Returns:
+            dict: The CheckOffResult of every active_habits_ID.
+        """
+        now = now or self.clock()
+        return {row.active_habits_ID: self.check_off(row, now) for row in rows}
+
+    @staticmethod
+    def next_check(result, now):
+        """
+        Returns the time until the next check-off of a habit is possible, i.e. until its current period ends.
+
+        Args:
+            result (CheckOffResult): The result of a check-off with the state after the check-off.
+            now (datetime.datetime): The time of the check-off.
+
+        Returns:
+            datetime.timedelta: The time until the next check-off.
+        """
+        return (result.update_expiry - timedelta(days=result.interval_days)) - now
@@ -0,0 +1,99 @@
+from async_habit_database import AsyncHabitDatabase
+from sqlite_test_case import SQLiteDatabaseFixture
+import unittest
+import asyncio
+import datetime
+import threading
+
+class TestAsyncHabitDatabase(SQLiteDatabaseFixture, unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        super().setUp()
+        self.async_db = AsyncHabitDatabase(self.db, max_workers=3)
+
+    def tearDown(self):
+        self.async_db.close()
+        super().tearDown()
+
+    async def test_get_active_habits(self):
+        """
+        Test case for the `get_active_habits` and `get_dashboard_rows` coroutines with the sample data of inserts.txt.
+        """
+        print("Running test_get_active_habits")
+        active_habits = await self.async_db.get_active_habits(1)
+        rows = await self.async_db.get_dashboard_rows(1)
+
+        self.assertEqual(len(active_habits), 5)
+        self.assertEqual(active_habits[0][1], 'Homeworkout')
+        self.assertEqual([row.active_habits_ID for row in rows], [2, 3, 4, 18, 19])
+
+    async def test_check_off_scoped_to_user(self):
+        """
+        Test case for the `check_off` coroutine, which only checks off the active habits of the given user.
+        """
+        print("Running test_check_off_scoped_to_user")
+        now = datetime.datetime(2023, 5, 1, 12, 0)
+        self.db.update_data("active_user_habits", {'streak': 3, 'status': 'in progress', 'update_expiry': now + datetime.timedelta(hours=12)}, "active_habits", 2)
+
+        # Active habit 2 belongs to user 1, user 2 can't check it off
+        self.assertEqual((await self.async_db.check_off(2, 2, now)).status, 'not_found')
+        result = await self.async_db.check_off(2, 1, now)
+        self.assertEqual((result.status, result.streak), ('checked', 4))
+
+    async def test_get_leaderboards(self):
+        """
+        Test case for fetching the leaderboards of all three monitoring intervals concurrently.
+        """
+        print("Running test_get_leaderboards")
+        daily, weekly, monthly = await self.async_db.get_leaderboards()
+
+        self.assertEqual({record[6] for record in daily}, {'daily'})
+        self.assertEqual({record[6] for record in weekly}, {'weekly'})
+        self.assertEqual(len(monthly), 6)
+        self.assertEqual(monthly, self.db.get_global_active_habits(3))
+
+    async def test_insert_and_update_data(self):
+        """
+        Test case for the `insert_data` and `update_data` coroutines.
+        """
+        print("Running test_insert_and_update_data")
+        data = {'category_name': 'Music', 'user_ID': 1, 'creation_date': datetime.datetime(2023, 5, 1, 12, 0), 'description': 'Music'}
+        await self.async_db.insert_data("category", data)
+        category_ID = await self.async_db.run(self.db.get_category_ID, 'Music', 1)
+
+        await self.async_db.update_data("category", {'description': 'Playing music'}, "category", category_ID)
+
+        self.assertEqual(self.db.check_value("description", "category", "category_ID", category_ID), [('Playing music',)])
+
+    async def test_errors_are_raised(self):
+        """
+        Test case for an exception of the database, which is raised in the awaiting coroutine.
+        """
+        print("Running test_errors_are_raised")
+        with self.assertRaises(Exception):
+            await self.async_db.update_data("no_such_table", {'description': 'x'}, "category", 1)
+
+    async def test_concurrency_is_bounded(self):
+        """
+        Test case for a large fan-out, no more than max_workers calls run at the same time.
+        """
+        print("Running test_concurrency_is_bounded")
+        lock = threading.Lock()
+        running = {'now': 0, 'max': 0}
+
+        def query(user_ID):
+            with lock:
+                running['now'] += 1
+                running['max'] = max(running['max'], running['now'])
+            try:
+                return len(self.db.get_active_habits(user_ID))
+            finally:
+                with lock:
+                    running['now'] -= 1
+
+        results = await asyncio.gather(*(self.async_db.run(query, 1) for number in range(20)))
+
+        self.assertEqual(results, [5] * 20)
+        self.assertLessEqual(running['max'], 3)
+
+if __name__ == '__main__':
+    unittest.main()
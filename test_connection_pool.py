@@ -0,0 +1,96 @@
+from connection_pool import ConnectionPool
+import unittest
+import threading
+from unittest import mock
+
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self):
+        print("\nRunning setUp method..")
+        # Every call of the factory returns a new mocked connection
+        self.factory = mock.MagicMock(side_effect=lambda **kwargs: self._new_connection())
+        self.pool = ConnectionPool({'host': 'localhost'}, size=2, timeout=0.2, connection_factory=self.factory)
+
+    def tearDown(self):
+        print("Running tear down method")
+        self.pool.close_all()
+
+    def _new_connection(self):
+        connection = mock.MagicMock()
+        connection.in_transaction = False
+        connection.is_connected.return_value = True
+        return connection
+
+    def test_lease_reuses_released_connection(self):
+        """
+        Test case for reusing a released connection instead of opening a new one.
+        """
+        print("Running test_lease_reuses_released_connection")
+        connection = self.pool.lease()
+        self.pool.release(connection)
+        second_connection = self.pool.lease()
+
+        self.assertIs(connection, second_connection)
+        self.factory.assert_called_once_with(host='localhost')
+        self.assertEqual(self.pool.stats()['leases'], 2)
+        self.assertEqual(self.pool.stats()['open'], 1)
+
+    def test_lease_waits_for_free_connection(self):
+        """
+        Test case for a lease which has to wait until another connection is released.
+        """
+        print("Running test_lease_waits_for_free_connection")
+        first = self.pool.lease()
+        second = self.pool.lease()
+
+        # Release one connection from another thread while the third lease waits
+        timer = threading.Timer(0.05, self.pool.release, args=(first,))
+        timer.start()
+        third = self.pool.lease()
+        timer.join()
+
+        self.assertIs(third, first)
+        self.assertEqual(self.pool.stats()['waits'], 1)
+        self.assertEqual(self.factory.call_count, 2)
+        self.pool.release(second)
+        self.pool.release(third)
+
+    def test_lease_timeout_when_pool_exhausted(self):
+        """
+        Test case for a lease which fails because all connections stay in use.
+        """
+        print("Running test_lease_timeout_when_pool_exhausted")
+        self.pool.lease()
+        self.pool.lease()
+
+        with self.assertRaises(Exception):
+            self.pool.lease()
+        self.assertEqual(self.pool.stats()['in_use'], 2)
+
+    def test_release_rolls_back_open_transaction(self):
+        """
+        Test case for releasing a connection with an open transaction.
+        """
+        print("Running test_release_rolls_back_open_transaction")
+        connection = self.pool.lease()
+        connection.in_transaction = True
+        self.pool.release(connection)
+
+        connection.rollback.assert_called_once()
+
+    def test_keepalive_reconnects_broken_connection(self):
+        """
+        Test case for the keepalive function reconnecting an idle connection which lost its connection.
+        """
+        print("Running test_keepalive_reconnects_broken_connection")
+        connection = self.pool.lease()
+        self.pool.release(connection)
+        connection.is_connected.return_value = False
+
+        self.pool.keepalive()
+
+        connection.reconnect.assert_called_once_with(attempts=1, delay=0)
+        self.assertEqual(self.pool.stats()['reconnects'], 1)
+        self.assertEqual(self.pool.stats()['idle'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,7 @@
-from database import MySQLDatabase
+from database import MySQLDatabase, DashboardRow, CheckOffResult, batch_insert_statements, open_database
+from reference_data import ReferenceData, set_reference_data
+from prepared_statements import STATEMENTS
+from query_detector import assert_max_queries
 import unittest
 import datetime
 from unittest import mock
@@ -10,9 +13,15 @@ class TestMySQLDatabase(unittest.TestCase):
         self.db = MySQLDatabase('localhost','root','password')
         self.db.cursor = mock.MagicMock()
         self.db.connection = mock.MagicMock()
+        # The system user habits and categories are served from the reference data
+        sys_categories = [(1, 'Art', 'Art', datetime.datetime(2023, 3, 10, 0, 0)), (2, 'Sport', 'Sport', datetime.datetime(2023, 3, 10, 0, 0)), (3, 'Entertainment', 'Entertainment', datetime.datetime(2023, 3, 10, 0, 0)), (4, 'Finance', 'Finance', datetime.datetime(2023, 3, 10, 0, 0)), (5, 'Health', 'Health', datetime.datetime(2023, 3, 10, 0, 0)), (6, 'Work', 'Work', datetime.datetime(2023, 3, 10, 0, 0)), (7, 'Food', 'Food', datetime.datetime(2023, 3, 10, 0, 0)), (8, 'Any', 'Any', datetime.datetime(2023, 3, 10, 0, 0))]
+        sys_habits = [(1, 'Homeworkout', 'Homeworkout', datetime.datetime(2023, 3, 10, 0, 0), 'Sport')]
+        intervals = [(1, 'daily', 1), (2, 'weekly', 7), (3, 'monthly', 30)]
+        set_reference_data(self.db, ReferenceData(sys_habits, sys_categories, intervals))
     @classmethod
     def tearDown(self):
         print("Running tear down method")
+        set_reference_data(self.db, None)
 
     @mock.patch.object(MySQLDatabase, 'connect')
     @mock.patch.object(MySQLDatabase, 'disconnect')
@@ -57,7 +66,9 @@ class TestMySQLDatabase(unittest.TestCase):
 
         # Assert that the method calls were made correctly
         mock_connect.assert_called_once()
-        self.db.cursor.execute.assert_called_once_with("UPDATE user_table SET username = 'test_user' WHERE user_ID = 1")
+        # Without a pool the statement runs on the normal cursor, no statement is prepared
+        self.db.connection.cursor.assert_not_called()
+        self.db.cursor.execute.assert_called_once_with("UPDATE user_table SET username = %s WHERE user_ID = %s", ('test_user', 1))
         self.db.connection.commit.assert_called_once()
         mock_disconnect.assert_called_once()
     
@@ -156,9 +167,10 @@ class TestMySQLDatabase(unittest.TestCase):
         expected_query = """SELECT habits.habit_ID, habits.habit_name, habits.description, habits.creation_date, category.category_name
 	                    FROM habits  
                         INNER JOIN category ON habits.category_ID = category.category_ID
-                        WHERE habits.user_ID = %s OR habits.user_ID = 99;                
+                        WHERE habits.user_ID = %s;                
                 """
-        expected_result = [(2, 'Singing', 'Singing', datetime.datetime(2023, 3, 25, 15, 0), 'Art'), (3, 'Reading', 'Reading', datetime.datetime(2023, 3, 10, 0, 0), 'Any')]
+        # The system habits are added from the reference data
+        expected_result = [(1, 'Homeworkout', 'Homeworkout', datetime.datetime(2023, 3, 10, 0, 0), 'Sport'), (2, 'Singing', 'Singing', datetime.datetime(2023, 3, 25, 15, 0), 'Art'), (3, 'Reading', 'Reading', datetime.datetime(2023, 3, 10, 0, 0), 'Any')]
 
         self.db.cursor.fetchall.return_value = [(2, 'Singing', 'Singing', datetime.datetime(2023, 3, 25, 15, 0), 'Art'), (3, 'Reading', 'Reading', datetime.datetime(2023, 3, 10, 0, 0), 'Any')]
 
@@ -182,23 +194,24 @@ class TestMySQLDatabase(unittest.TestCase):
         user_ID = 1
         habit_name = "Sports"
 
-        # Mock the expected SQL query and result
-        expected_query = f'''SELECT habit_ID FROM habits
-                WHERE habit_name = '{habit_name}' AND (user_ID = {user_ID} OR user_ID = 99);
-                '''
-
-        self.db.cursor.fetchone.return_value = 2
+        # Mock the cursor and its result, without a pool the statement isn't prepared
+        cursor = self.db.cursor
+        cursor.fetchall.return_value = [(2,)]
 
         # Call the function
         expected_return = self.db.get_habit_ID(user_ID, habit_name) 
 
-        self.db.cursor.execute.assert_called_once_with(expected_query)
+        cursor.execute.assert_called_once_with(STATEMENTS['get_habit_ID'], (habit_name, user_ID))
 
         # Assert that the method calls were made correctly        
-        self.assertEqual(expected_return, 2)
+        self.assertEqual(expected_return, (2,))
         mock_connect.assert_called_once()
         mock_disconnect.assert_called_once()
 
+        # A system habit is found without a query
+        self.assertEqual(self.db.get_habit_ID(user_ID, 'Homeworkout'), (1,))
+        cursor.execute.assert_called_once()
+
     @mock.patch.object(MySQLDatabase, 'connect')
     @mock.patch.object(MySQLDatabase, 'disconnect')  
     def test_get_active_habits(self, mock_connect, mock_disconnect):
@@ -229,6 +242,119 @@ class TestMySQLDatabase(unittest.TestCase):
         mock_connect.assert_called_once()
         mock_disconnect.assert_called_once()
     
+    @mock.patch.object(MySQLDatabase, 'connect')
+    @mock.patch.object(MySQLDatabase, 'disconnect')
+    def test_get_dashboard_rows(self, mock_connect, mock_disconnect):
+        """
+        Test case for the `get_dashboard_rows` method of `MySQLDatabase` class.
+        """
+        print("Running test_get_dashboard_rows")
+        # Mock data 
+        user_ID = 1
+        self.db.cursor.fetchall.return_value = [(2, 14, 'Homeworkout', 19, 1, 'daily', datetime.datetime(2023, 4, 29, 22, 53, 55), 'in progress')]
+
+        # Call the function
+        return_value = self.db.get_dashboard_rows(user_ID)
+
+        # Assert that one query was executed and typed rows were returned
+        mock_connect.assert_called_once()
+        self.db.cursor.execute.assert_called_once()
+        self.assertEqual(self.db.cursor.execute.call_args[0][1], (user_ID,))
+        self.assertEqual(return_value, [DashboardRow(2, 14, 'Homeworkout', 19, 1, 'daily', datetime.datetime(2023, 4, 29, 22, 53, 55), 'in progress')])
+        self.assertEqual(return_value[0].update_expiry, datetime.datetime(2023, 4, 29, 22, 53, 55))
+        mock_disconnect.assert_called_once()
+
+    @mock.patch.object(MySQLDatabase, 'connect')
+    @mock.patch.object(MySQLDatabase, 'disconnect')
+    def test_mark_expired_habits(self, mock_connect, mock_disconnect):
+        """
+        Test case for the `mark_expired_habits` method of `MySQLDatabase` class.
+        """
+        print("Running test_mark_expired_habits")
+        # Mock data
+        now = datetime.datetime(2023, 5, 1, 12, 0)
+        self.db.cursor.rowcount = 3
+
+        # Call the function for one user and for all users
+        return_value = self.db.mark_expired_habits(1, now)
+        self.db.mark_expired_habits()
+
+        # Assert that one set-based UPDATE was executed per call and the number of changed rows was returned
+        self.assertEqual(return_value, 3)
+        self.assertEqual(self.db.cursor.execute.call_args_list[0], mock.call("UPDATE active_user_habits SET status = 'failed' WHERE status = 'in progress' AND update_expiry < %s AND user_ID = %s", (now, 1)))
+        self.assertEqual(self.db.cursor.execute.call_args_list[1], mock.call("UPDATE active_user_habits SET status = 'failed' WHERE status = 'in progress' AND update_expiry < NOW()", ()))
+        self.assertEqual(self.db.connection.commit.call_count, 2)
+
+    @mock.patch.object(MySQLDatabase, 'connect')
+    @mock.patch.object(MySQLDatabase, 'disconnect')
+    def test_check_off(self, mock_connect, mock_disconnect):
+        """
+        Test case for the `check_off` method of `MySQLDatabase` class.
+        """
+        print("Running test_check_off")
+        # Mock data
+        now = datetime.datetime(2023, 5, 1, 12, 0)
+        new_update_expiry = datetime.datetime(2023, 5, 2, 22, 0)
+        self.db.cursor.rowcount = 1
+        self.db.cursor.fetchone.return_value = (5, now, new_update_expiry, 'in progress', 1)
+
+        # Call the function, it must not issue more than the UPDATE and the read back
+        with assert_max_queries(self.db, 2):
+            return_value = self.db.check_off(2, 1, now)
+
+        # Assert that one conditional UPDATE and one read back were executed in one transaction
+        self.assertEqual(self.db.cursor.execute.call_count, 2)
+        update_query, update_params = self.db.cursor.execute.call_args_list[0][0]
+        self.assertTrue(update_query.startswith("UPDATE active_user_habits"))
+        self.assertEqual(update_params, (now, 2, 1, now, now))
+        # The read back is scoped to the user as well
+        self.assertEqual(self.db.cursor.execute.call_args_list[1][0][1], (2, 1))
+        self.db.connection.commit.assert_called_once()
+        self.assertEqual(return_value, CheckOffResult('checked', 5, now, new_update_expiry, 1))
+
+        # No changed row and a deadline in the future means the period was already checked
+        self.db.cursor.rowcount = 0
+        self.assertEqual(self.db.check_off(2, 1, now).status, 'too_early')
+
+    @mock.patch.object(MySQLDatabase, 'connect')
+    @mock.patch.object(MySQLDatabase, 'disconnect')
+    def test_insert_many(self, mock_connect, mock_disconnect):
+        """
+        Test case for the `insert_many` method of `MySQLDatabase` class.
+        """
+        print("Running test_insert_many")
+        # Mock data
+        rows = [{'category_name': 'Music', 'description': '', 'user_ID': 1},
+                {'category_name': 'Games', 'description': 'Games', 'user_ID': 1}]
+
+        # Call the function
+        return_value = self.db.insert_many("category", rows)
+
+        # Assert that all rows were sent with one executemany call and committed once
+        self.db.cursor.executemany.assert_called_once_with("INSERT INTO category (category_name, description, user_ID) VALUES (%s, %s, %s)",
+                                                           [('Music', None, 1), ('Games', 'Games', 1)])
+        self.db.connection.commit.assert_called_once()
+        self.assertEqual(return_value, 2)
+
+    def test_batch_insert_statements(self):
+        """
+        Test case for combining the single row INSERT statements of inserts.txt into multi-row INSERT statements.
+        """
+        print("Running test_batch_insert_statements")
+        statements = ["INSERT INTO monitoring_interval (interval_ID, control_interval, days) VALUES (1, 'daily', 1);\n",
+                      "INSERT INTO monitoring_interval (interval_ID, control_interval, days) VALUES (2, 'weekly', 7);\n",
+                      "\n",
+                      "INSERT INTO category(category_ID, category_name) VALUES (1,'Art');\n",
+                      "INSERT INTO monitoring_interval (interval_ID, control_interval, days) VALUES (3, 'monthly', 30);\n"]
+
+        batches = batch_insert_statements(statements)
+
+        # Consecutive statements into the same table are combined, the order is kept
+        self.assertEqual(batches, ["INSERT INTO monitoring_interval (interval_ID, control_interval, days) VALUES (1, 'daily', 1), (2, 'weekly', 7)",
+                                   "INSERT INTO category(category_ID, category_name) VALUES (1,'Art')",
+                                   "INSERT INTO monitoring_interval (interval_ID, control_interval, days) VALUES (3, 'monthly', 30)"])
+        self.assertEqual(len(batch_insert_statements(statements[:2], batch_size=1)), 2)
+
     @mock.patch.object(MySQLDatabase, 'connect')
     @mock.patch.object(MySQLDatabase, 'disconnect')  
     def test_get_global_active_habits(self, mock_connect, mock_disconnect):
@@ -239,16 +365,9 @@ class TestMySQLDatabase(unittest.TestCase):
         # Mock data 
         interval_ID = 1
 
-        # Mock the expected SQL query and result
-        expected_query = f"""SELECT active_user_habits.active_habits_ID, habits.habit_name, active_user_habits.starting_date, active_user_habits.last_check, active_user_habits.update_expiry, active_user_habits.streak, monitoring_interval.control_interval, active_user_habits.status, user_table.username
-	                    FROM active_user_habits  
-                        INNER JOIN habits ON active_user_habits.habit_ID = habits.habit_ID
-                        INNER JOIN monitoring_interval ON active_user_habits.interval_ID = monitoring_interval.interval_ID
-                        INNER JOIN user_table ON active_user_habits.user_ID = user_table.user_ID
-                        WHERE active_user_habits.interval_ID = {interval_ID}   
-                        ORDER BY active_user_habits.streak DESC;
-                """
-        self.db.cursor.fetchall.return_value = [(2, 'Homeworkout', datetime.datetime(2023, 4, 28, 17, 33, 13), datetime.datetime(2023, 4, 28, 17, 33, 13), datetime.datetime(2023, 4, 29, 22, 53, 55), 19, 'daily', 'in progress')]
+        # Mock the cursor and its result, without a pool the statement isn't prepared
+        cursor = self.db.cursor
+        cursor.fetchall.return_value = [(2, 'Homeworkout', datetime.datetime(2023, 4, 28, 17, 33, 13), datetime.datetime(2023, 4, 28, 17, 33, 13), datetime.datetime(2023, 4, 29, 22, 53, 55), 19, 'daily', 'in progress')]
         expected_return = [(2, 'Homeworkout', datetime.datetime(2023, 4, 28, 17, 33, 13), datetime.datetime(2023, 4, 28, 17, 33, 13), datetime.datetime(2023, 4, 29, 22, 53, 55), 19, 'daily', 'in progress')]
         
         # Call the function
@@ -256,7 +375,7 @@ class TestMySQLDatabase(unittest.TestCase):
 
         # Assert that the method calls were made correctly
         mock_connect.assert_called_once()
-        self.db.cursor.execute.assert_called_once_with(expected_query)        
+        cursor.execute.assert_called_once_with(STATEMENTS['get_global_active_habits'], (interval_ID,))        
         self.assertEqual(return_value, expected_return)
         mock_connect.assert_called_once()
         mock_disconnect.assert_called_once()
@@ -302,16 +421,9 @@ class TestMySQLDatabase(unittest.TestCase):
         # Mock data 
         interval_ID = 1
 
-        # Mock the expected SQL query and result
-        expected_query = f"""SELECT active_user_habits.active_habits_ID, habits.habit_name, active_user_habits.starting_date, active_user_habits.last_check, active_user_habits.update_expiry, active_user_habits.streak, monitoring_interval.control_interval, active_user_habits.status, user_table.username
-	                    FROM active_user_habits  
-                        INNER JOIN habits ON active_user_habits.habit_ID = habits.habit_ID
-                        INNER JOIN monitoring_interval ON active_user_habits.interval_ID = monitoring_interval.interval_ID
-                        INNER JOIN user_table ON active_user_habits.user_ID = user_table.user_ID
-                        WHERE active_user_habits.interval_ID = {interval_ID}   
-                        ORDER BY active_user_habits.streak DESC;
-                """
-        self.db.cursor.fetchall.return_value = [(2, 'Homeworkout', datetime.datetime(2023, 4, 28, 17, 33, 13), datetime.datetime(2023, 4, 28, 17, 33, 13), datetime.datetime(2023, 4, 29, 22, 53, 55), 19, 'daily', 'in progress')]
+        # Mock the cursor and its result, without a pool the statement isn't prepared
+        cursor = self.db.cursor
+        cursor.fetchall.return_value = [(2, 'Homeworkout', datetime.datetime(2023, 4, 28, 17, 33, 13), datetime.datetime(2023, 4, 28, 17, 33, 13), datetime.datetime(2023, 4, 29, 22, 53, 55), 19, 'daily', 'in progress')]
         expected_return = [(2, 'Homeworkout', datetime.datetime(2023, 4, 28, 17, 33, 13), datetime.datetime(2023, 4, 28, 17, 33, 13), datetime.datetime(2023, 4, 29, 22, 53, 55), 19, 'daily', 'in progress')]
         
         # Call the function
@@ -319,7 +431,7 @@ class TestMySQLDatabase(unittest.TestCase):
 
         # Assert that the method calls were made correctly
         mock_connect.assert_called_once()
-        self.db.cursor.execute.assert_called_once_with(expected_query)        
+        cursor.execute.assert_called_once_with(STATEMENTS['get_global_active_habits'], (interval_ID,))        
         self.assertEqual(return_value, expected_return)
         mock_disconnect.assert_called_once()
 
@@ -335,11 +447,9 @@ class TestMySQLDatabase(unittest.TestCase):
         habit_ID = 2
         status = "in progress"
 
-        # Mock the expected SQL query and result
-        expected_query = f""" SELECT active_habits_ID FROM active_user_habits
-                    WHERE user_ID = {user_ID} AND habit_ID = {habit_ID} AND status = "{status}";
-        """ 
-        self.db.cursor.fetchone.return_value = (5,)
+        # Mock the cursor and its result, without a pool the statement isn't prepared
+        cursor = self.db.cursor
+        cursor.fetchall.return_value = [(5,)]
         expected_return = 5
         
         # Call the function
@@ -347,7 +457,7 @@ class TestMySQLDatabase(unittest.TestCase):
 
         # Assert that the method calls were made correctly
         mock_connect.assert_called_once()
-        self.db.cursor.execute.assert_called_once_with(expected_query)        
+        cursor.execute.assert_called_once_with(STATEMENTS['get_active_habit_ID'], (user_ID, habit_ID, status))        
         self.assertEqual(return_value, expected_return)
         mock_disconnect.assert_called_once()
 
@@ -361,11 +471,9 @@ class TestMySQLDatabase(unittest.TestCase):
         # Mock data 
         active_habits_ID = 1
 
-        # Mock the expected SQL query and result
-        expected_query = f"""SELECT streak FROM active_user_habits
-                    WHERE active_habits_ID = {active_habits_ID}"""
-
-        self.db.cursor.fetchone.return_value = (20,)
+        # Mock the cursor and its result, without a pool the statement isn't prepared
+        cursor = self.db.cursor
+        cursor.fetchall.return_value = [(20,)]
         expected_return = 20
         
         # Call the function
@@ -374,7 +482,7 @@ class TestMySQLDatabase(unittest.TestCase):
 
         # Assert that the method calls were made correctly
         mock_connect.assert_called_once()
-        self.db.cursor.execute.assert_called_once_with(expected_query)        
+        cursor.execute.assert_called_once_with(STATEMENTS['get_streak'], (active_habits_ID,))        
         self.assertEqual(return_value, expected_return)
         mock_disconnect.assert_called_once()
         
@@ -388,15 +496,12 @@ class TestMySQLDatabase(unittest.TestCase):
         # Mock data 
         habit_ID = 1
 
-        # Mock the expected SQL query
-        expected_query = f"""DELETE FROM habits WHERE habit_ID = {habit_ID};"""
-
         # Call the function
         self.db.delete_habit(habit_ID)
 
         # Assert that the method calls were made correctly
         mock_connect.assert_called_once()
-        self.db.cursor.execute.assert_called_once_with(expected_query)        
+        self.db.cursor.execute.assert_called_once_with(STATEMENTS['delete_habit'], (habit_ID,))        
         mock_disconnect.assert_called_once()
 
     @mock.patch.object(MySQLDatabase, 'connect')
@@ -415,14 +520,14 @@ class TestMySQLDatabase(unittest.TestCase):
         value2 = "7878997"
 
         # Mock the expected SQL query
-        expected_query = f"UPDATE {table_name} SET username = 'Marc', phone_number = '12232131' WHERE user_table.username = 'Sippi' AND user_table.phone_number = '7878997';"
+        expected_query = f"UPDATE {table_name} SET username = %s, phone_number = %s WHERE user_table.username = %s AND user_table.phone_number = %s"
 
         # Call the function
         self.db.update_value(table_name, data, column1, column2, value1, value2)
 
         # Assert that the method calls were made correctly
         mock_connect.assert_called_once()
-        self.db.cursor.execute.assert_called_once_with(expected_query)        
+        self.db.cursor.execute.assert_called_once_with(expected_query, ("Marc", "12232131", value1, value2))        
         mock_disconnect.assert_called_once()
 
     @mock.patch.object(MySQLDatabase, 'connect')
@@ -438,10 +543,11 @@ class TestMySQLDatabase(unittest.TestCase):
         # Mock the expected SQL query and result
         expected_query = """SELECT category.category_ID, category.category_name, category.description, category.creation_date
 	                    FROM category  
-                        WHERE category.user_ID = %s OR category.user_ID = 99;
+                        WHERE category.user_ID = %s;
                 """ 
         
-        self.db.cursor.fetchall.return_value = [(1, 'Art', 'Art', datetime.datetime(2023, 3, 10, 0, 0)), (2, 'Sport', 'Sport', datetime.datetime(2023, 3, 10, 0, 0)), (3, 'Entertainment', 'Entertainment', datetime.datetime(2023, 3, 10, 0, 0)), (4, 'Finance', 'Finance', datetime.datetime(2023, 3, 10, 0, 0)), (5, 'Health', 'Health', datetime.datetime(2023, 3, 10, 0, 0)), (6, 'Work', 'Work', datetime.datetime(2023, 3, 10, 0, 0)), (7, 'Food', 'Food', datetime.datetime(2023, 3, 10, 0, 0)), (8, 'Any', 'Any', datetime.datetime(2023, 3, 10, 0, 0)), (9, 'Traveling', 'Traveling', datetime.datetime(2023, 3, 15, 10, 0))]
+        # Only the own categories of the user are queried, the system categories are added from the reference data
+        self.db.cursor.fetchall.return_value = [(9, 'Traveling', 'Traveling', datetime.datetime(2023, 3, 15, 10, 0))]
         expected_return = [(1, 'Art', 'Art', datetime.datetime(2023, 3, 10, 0, 0)), (2, 'Sport', 'Sport', datetime.datetime(2023, 3, 10, 0, 0)), (3, 'Entertainment', 'Entertainment', datetime.datetime(2023, 3, 10, 0, 0)), (4, 'Finance', 'Finance', datetime.datetime(2023, 3, 10, 0, 0)), (5, 'Health', 'Health', datetime.datetime(2023, 3, 10, 0, 0)), (6, 'Work', 'Work', datetime.datetime(2023, 3, 10, 0, 0)), (7, 'Food', 'Food', datetime.datetime(2023, 3, 10, 0, 0)), (8, 'Any', 'Any', datetime.datetime(2023, 3, 10, 0, 0)), (9, 'Traveling', 'Traveling', datetime.datetime(2023, 3, 15, 10, 0))]
         
         # Call the function
@@ -465,11 +571,11 @@ class TestMySQLDatabase(unittest.TestCase):
         
         expected_query = """SELECT category.category_name
 	                    FROM category  
-                        WHERE category.user_ID = %s OR category.user_ID = 99;      
+                        WHERE category.user_ID = %s;      
                 """    
         
-        # Mock the expected SQL query and result
-        self.db.cursor.fetchall.return_value = [('Art',), ('Sport',), ('Entertainment',), ('Finance',), ('Health',), ('Work',), ('Food',), ('Any',), ('Traveling',)]
+        # Mock the expected SQL query and result, the system categories are added from the reference data
+        self.db.cursor.fetchall.return_value = [('Traveling',)]
         expected_return = [('Art',), ('Sport',), ('Entertainment',), ('Finance',), ('Health',), ('Work',), ('Food',), ('Any',), ('Traveling',)]
         
         # Call the function
@@ -489,24 +595,27 @@ class TestMySQLDatabase(unittest.TestCase):
         """
         print("Running test_get_category_ID")
         # Mock data 
-        category_name = "Art"
+        category_name = "Traveling"
         user_ID = 1
 
-        # Mock the expected SQL query and result        
-        expected_query = "SELECT category_ID FROM category WHERE category_name = 'Art' AND (user_ID = 1 OR user_ID = 99);"
-        
-        self.db.cursor.fetchone.return_value = (1,)
-        expected_return = 1
+        # Mock the cursor and its result, without a pool the statement isn't prepared
+        cursor = self.db.cursor
+        cursor.fetchall.return_value = [(9,)]
+        expected_return = 9
         
         # Call the function
         return_value = self.db.get_category_ID(category_name, user_ID) 
         
         # Assert that the method calls were made correctly
         mock_connect.assert_called_once()
-        self.db.cursor.execute.assert_called_once_with(expected_query)
+        cursor.execute.assert_called_once_with(STATEMENTS['get_category_ID'], (category_name, user_ID))
         self.assertEqual(return_value, expected_return)        
         mock_disconnect.assert_called_once()
 
+        # A system category is found without a query
+        self.assertEqual(self.db.get_category_ID('Art', user_ID), 1)
+        cursor.execute.assert_called_once()
+
     @mock.patch.object(MySQLDatabase, 'connect')
     @mock.patch.object(MySQLDatabase, 'disconnect')  
     def test_delete_category(self, mock_connect, mock_disconnect):
@@ -517,15 +626,12 @@ class TestMySQLDatabase(unittest.TestCase):
         # Mock data 
         category_ID = 1
 
-        # Mock the expected SQL query and result    
-        expected_query = f"""DELETE FROM category WHERE category_ID = 1;"""
-
         # Call the function
         self.db.delete_category(category_ID)
 
         # Assert that the method calls were made correctly
         mock_connect.assert_called_once()
-        self.db.cursor.execute.assert_called_once_with(expected_query)        
+        self.db.cursor.execute.assert_called_once_with(STATEMENTS['delete_category'], (category_ID,))        
         mock_disconnect.assert_called_once()
 
 
@@ -554,7 +660,79 @@ class TestMySQLDatabase(unittest.TestCase):
         mock_connect.assert_called_once()
         self.db.cursor.execute.assert_called_once_with(test_query)
         self.assertEqual(return_value, expected_return)
-        mock_disconnect.assert_called_once()    
+        mock_disconnect.assert_called_once()
+
+    @mock.patch('connection_pool.mysql.connector.connect')
+    def test_pooled_connect_reuses_connection(self, mock_mysql_connect):
+        """
+        Test case for `connect` and `disconnect` of the `MySQLDatabase` class in pooled mode.
+        """
+        print("Running test_pooled_connect_reuses_connection")
+        mock_mysql_connect.return_value.in_transaction = False
+        db = MySQLDatabase('localhost', 'root', 'password', 3306, 'habits', pool_size=2)
+
+        # Connect and disconnect twice
+        db.connect()
+        db.disconnect()
+        db.connect()
+        db.disconnect()
+
+        # Assert that only one connection was opened and it wasn't closed
+        mock_mysql_connect.assert_called_once_with(host='localhost', user='root', password='password', port=3306, database='habits')
+        mock_mysql_connect.return_value.close.assert_not_called()
+        self.assertEqual(db.pool_stats()['leases'], 2)
+        self.assertEqual(db.pool_stats()["in_use"], 0)
+
+    @mock.patch('connection_pool.mysql.connector.connect')
+    def test_pooled_statements_are_prepared(self, mock_mysql_connect):
+        """
+        Test case for running the statements of the statement registry on prepared cursors in pooled mode.
+        """
+        print("Running test_pooled_statements_are_prepared")
+        mock_mysql_connect.return_value.in_transaction = False
+        connection = mock_mysql_connect.return_value
+        prepared_cursor = mock.MagicMock(name="prepared_cursor")
+        prepared_cursor.fetchall.return_value = [(20,)]
+        connection.cursor.side_effect = lambda prepared=False, buffered=False: prepared_cursor if prepared else mock.MagicMock()
+        db = MySQLDatabase('localhost', 'root', 'password', 3306, 'habits', pool_size=1)
+        self.addCleanup(db.close)
+
+        # The statement is prepared once on the pooled connection and reused by the next call
+        self.assertEqual(db.get_streak(1), 20)
+        self.assertEqual(db.get_streak(2), 20)
+        prepared_cursor.execute.assert_called_with(STATEMENTS['get_streak'], (2,))
+        self.assertEqual([call.kwargs for call in connection.cursor.call_args_list].count({'prepared': True}), 1)
+        self.assertEqual(db.statement_stats()['reuses'], 1)
+
+    @mock.patch('connection_pool.mysql.connector.connect')
+    def test_pooled_keepalive_interval(self, mock_mysql_connect):
+        """
+        Test case for the keepalive interval which `open_database` passes to the connection pool.
+        """
+        print("Running test_pooled_keepalive_interval")
+        db = open_database(['localhost', 'root', 'password', 3306, 'habits'], pool_size=2, keepalive_interval=300)
+        self.addCleanup(db.close)
+
+        # Assert that the pool pings its idle connections in the background
+        self.assertEqual(db.pool.keepalive_interval, 300)
+        self.assertTrue(db.pool._keepalive_thread.is_alive())
+        # Without a pool there is nothing to keep alive
+        self.assertIsNone(open_database(['localhost', 'root', 'password', 3306, 'habits'], keepalive_interval=300).pool)
+
+    @mock.patch('database.messagebox')
+    @mock.patch('database.mysql.connector.connect')
+    def test_connect_failure_raises_without_dialog(self, mock_mysql_connect, mock_messagebox):
+        """
+        Test case for a failed `connect`, which only raises because it also runs on the worker threads.
+        """
+        print("Running test_connect_failure_raises_without_dialog")
+        mock_mysql_connect.side_effect = Exception("Access denied")
+        db = MySQLDatabase('localhost', 'root', 'wrong', 3306, 'habits')
+
+        # The error is shown by the caller on the tkinter thread, not by connect
+        with self.assertRaises(Exception):
+            db.connect()
+        mock_messagebox.showerror.assert_not_called()
 
     if __name__ == '__main__':
         unittest.main()
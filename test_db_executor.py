@@ -0,0 +1,119 @@
+from db_executor import TkDatabaseExecutor
+import unittest
+import threading
+import time
+from unittest import mock
+
+class FakeWidget:
+    """
+    Stands in for a tkinter widget, the pending after callbacks are run by hand with fire.
+    """
+    def __init__(self):
+        self.pending = {}
+        self.next_id = 0
+
+    def after(self, ms, func):
+        self.next_id += 1
+        self.pending[f"after#{self.next_id}"] = func
+        return f"after#{self.next_id}"
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def fire(self):
+        pending, self.pending = self.pending, {}
+        for func in pending.values():
+            func()
+
+class TestTkDatabaseExecutor(unittest.TestCase):
+    def setUp(self):
+        print("\nRunning setUp method..")
+        self.widget = FakeWidget()
+        self.executor = TkDatabaseExecutor(self.widget, max_workers=2)
+
+    def tearDown(self):
+        print("Running tear down method")
+        self.executor.shutdown()
+
+    def _wait(self, request):
+        # Wait until the worker thread finished and let the tkinter thread poll the result
+        try:
+            request.future.result(timeout=2)
+        except Exception:
+            pass
+        self.widget.fire()
+
+    def test_result_delivered_on_poll(self):
+        """
+        Test case for a database call whose result is handed to the callback when the queue is polled.
+        """
+        print("Running test_result_delivered_on_poll")
+        on_success = mock.MagicMock()
+        request = self.executor.submit(lambda user_ID: [(user_ID, 'Homeworkout')], 1, on_success=on_success)
+
+        # The callback is not called on the worker thread
+        request.future.result(timeout=2)
+        on_success.assert_not_called()
+
+        self.widget.fire()
+        on_success.assert_called_once_with([(1, 'Homeworkout')])
+        self.assertEqual(self.executor.pending, 0)
+        self.assertEqual(self.widget.pending, {})
+
+    def test_submit_does_not_block(self):
+        """
+        Test case for a slow database call which doesn't block the thread which submitted it.
+        """
+        print("Running test_submit_does_not_block")
+        release = threading.Event()
+        start = time.monotonic()
+        request = self.executor.submit(release.wait, 2)
+
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(self.executor.pending, 1)
+        release.set()
+        self._wait(request)
+
+    def test_stale_request_is_cancelled(self):
+        """
+        Test case for two requests with the same key, only the result of the newer one is delivered.
+        """
+        print("Running test_stale_request_is_cancelled")
+        release = threading.Event()
+        on_success = mock.MagicMock()
+
+        def slow_query(value):
+            release.wait(2)
+            return value
+
+        first = self.executor.submit(slow_query, "old", on_success=on_success, key="dashboard")
+        second = self.executor.submit(slow_query, "new", on_success=on_success, key="dashboard")
+        self.assertTrue(first.cancelled)
+        self.assertTrue(self.executor.is_pending("dashboard"))
+
+        release.set()
+        self._wait(first)
+        self._wait(second)
+
+        on_success.assert_called_once_with("new")
+        self.assertFalse(self.executor.is_pending("dashboard"))
+
+    def test_error_delivered_to_error_callback(self):
+        """
+        Test case for a database call which raises an exception.
+        """
+        print("Running test_error_delivered_to_error_callback")
+        on_success = mock.MagicMock()
+        on_error = mock.MagicMock()
+
+        def broken_query():
+            raise Exception("Lost connection to MySQL server")
+
+        request = self.executor.submit(broken_query, on_success=on_success, on_error=on_error)
+        self._wait(request)
+
+        on_success.assert_not_called()
+        self.assertEqual(str(on_error.call_args[0][0]), "Lost connection to MySQL server")
+
+if __name__ == '__main__':
+    unittest.main()
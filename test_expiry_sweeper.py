@@ -0,0 +1,45 @@
+from expiry_sweeper import ExpirySweeper
+from sqlite_test_case import SQLiteTestCase
+import unittest
+import datetime
+
+class TestExpirySweeper(SQLiteTestCase):
+    def _count_status(self, status, user_ID=None):
+        query = f"SELECT COUNT(*) FROM active_user_habits WHERE status = '{status}'"
+        if user_ID is not None:
+            query += f" AND user_ID = {user_ID}"
+        return self.db.execute_query(query)[0]
+
+    def test_sweep_marks_expired_habits_failed(self):
+        """
+        Test case for one sweep setting all expired active habits of all users to 'failed'.
+        """
+        print("Running test_sweep_marks_expired_habits_failed")
+        now = datetime.datetime(2100, 1, 1)
+        in_progress = self._count_status('in progress')
+        sweeper = ExpirySweeper(self.db)
+
+        # Every habit in progress is expired in the year 2100
+        self.assertEqual(sweeper.sweep(now), in_progress)
+        self.assertEqual(self._count_status('in progress'), 0)
+
+        # A second sweep has nothing left to do
+        self.assertEqual(sweeper.sweep(now), 0)
+        self.assertEqual(sweeper.total_transitioned, in_progress)
+        self.assertFalse(sweeper.is_due())
+
+    def test_sweep_only_for_one_user(self):
+        """
+        Test case for a sweep which is limited to the active habits of one user.
+        """
+        print("Running test_sweep_only_for_one_user")
+        now = datetime.datetime(2100, 1, 1)
+        in_progress_other_users = self._count_status('in progress') - self._count_status('in progress', 1)
+
+        ExpirySweeper(self.db, user_ID=1).sweep(now)
+
+        self.assertEqual(self._count_status('in progress', 1), 0)
+        self.assertEqual(self._count_status('in progress'), in_progress_other_users)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+from instrumentation import Instrumentation, LatencyHistogram, statement_fingerprint
+from sqlite_test_case import SQLiteTestCase
+import unittest
+import json
+import os
+
+class TestInstrumentation(SQLiteTestCase):
+    def test_latency_histogram(self):
+        """
+        Test case for the percentiles of the LatencyHistogram.
+        """
+        print("Running test_latency_histogram")
+        histogram = LatencyHistogram()
+        for microseconds in range(1, 1001):
+            histogram.record(microseconds / 1e6)
+
+        # The percentiles are exact for small values and at most 1/16 too large for larger values
+        self.assertEqual(histogram.count, 1000)
+        self.assertEqual(histogram.min, 1)
+        self.assertEqual(histogram.max, 1000)
+        self.assertAlmostEqual(histogram.mean(), 500.5)
+        self.assertEqual(histogram.percentile(1), 10)
+        self.assertTrue(500 <= histogram.percentile(50) <= 500 * 17 / 16)
+        self.assertTrue(990 <= histogram.percentile(99) <= 1000)
+        self.assertEqual(histogram.percentile(100), 1000)
+        self.assertEqual(LatencyHistogram().to_dict()['p99'], 0)
+
+    def test_statement_fingerprint(self):
+        """
+        Test case for counting the executions of a statement with different values together.
+        """
+        print("Running test_statement_fingerprint")
+        self.assertEqual(statement_fingerprint("SELECT habit_ID FROM habits\n  WHERE habit_name = 'Yoga' AND user_ID = 12;"),
+                         "SELECT habit_ID FROM habits WHERE habit_name = ? AND user_ID = ?")
+        self.assertEqual(statement_fingerprint("DELETE FROM habits WHERE habit_ID IN (%s, %s, %s)"), "DELETE FROM habits WHERE habit_ID IN (?)")
+        self.assertEqual(statement_fingerprint("INSERT INTO category (a, b) VALUES ('x', 1), ('y', 2)"), "INSERT INTO category (a, b) VALUES (?)")
+
+    def test_records_methods_and_statements(self):
+        """
+        Test case for recording the calls, rows and latencies of the database methods and their statements.
+        """
+        print("Running test_records_methods_and_statements")
+        instrumentation = self.db.enable_instrumentation()
+        active_habits = self.db.get_active_habits(1)
+        self.db.get_active_habits(1)
+        self.db.get_global_active_habits(1)
+        self.db.update_data("user_table", {"first_name": "Marc"}, "user", 1)
+
+        stats = self.db.instrumentation_stats()
+        get_active_habits = stats['methods']['get_active_habits']
+        self.assertEqual(get_active_habits['calls'], 2)
+        self.assertEqual(get_active_habits['rows'], 2 * len(active_habits))
+        self.assertEqual(get_active_habits['connect_us']['count'], 2)
+        self.assertEqual(get_active_habits['execute_us']['count'], 2)
+        self.assertEqual(stats['methods']['get_global_active_habits']['calls'], 1)
+        self.assertEqual(stats['methods']['update_data']['fetch_us']['count'], 0)
+        self.assertIn("UPDATE user_table SET first_name = ? WHERE user_ID = ?", stats['statements'])
+
+        # The recording can be written as JSON and shown as a text table
+        path = os.path.join(self.tmp_dir.name, "instrumentation.json")
+        instrumentation.dump_json(path)
+        with open(path) as f:
+            self.assertEqual(json.load(f)['methods']['get_active_habits']['calls'], 2)
+        self.assertIn("get_active_habits", instrumentation.format_table())
+
+        # Without instrumentation nothing is recorded
+        instrumentation.reset()
+        self.db.instrumentation = None
+        self.db.get_active_habits(1)
+        self.assertEqual(instrumentation.stats()['methods'], {})
+        self.assertEqual(self.db.instrumentation_stats(), {})
+
+    def test_method_names_are_recorded_explicitly(self):
+        """
+        Test case for counting the calls under the name of the decorated method, also behind wrappers and within transactions.
+        """
+        print("Running test_method_names_are_recorded_explicitly")
+        # Load the reference data first, its queries are counted under the methods which load it
+        self.db.reference_data
+        self.db.enable_instrumentation()
+        self.db.enable_query_cache()
+
+        # A method behind the cache wrapper, a nested call and the methods of a transaction
+        self.db.get_category_ID("Reading", 1)
+        self.db.get_user_habits(1)
+        with self.db.transaction():
+            self.db.insert_data("category", {'category_name': 'Music', 'user_ID': 1, 'creation_date': '2023-05-01 12:00:00', 'description': 'Music'})
+            self.db.get_streak(2)
+        # A connect outside of a decorated method
+        self.db.connect()
+        self.db.disconnect()
+
+        methods = self.db.instrumentation_stats()['methods']
+        self.assertEqual({name: stats['calls'] for name, stats in methods.items()},
+                         {'get_category_ID': 1, 'get_own_habits': 1, 'transaction': 1, 'insert_data': 1, 'get_streak': 1, 'connect': 1})
+        self.assertEqual(methods['get_streak']['execute_us']['count'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
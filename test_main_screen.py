@@ -4,13 +4,19 @@ from unittest.mock import Mock
 from unittest.mock import MagicMock
 from unittest.mock import patch
 from main import Main_screen
-from database import MySQLDatabase
+from database import MySQLDatabase, CheckOffResult, DashboardRow
 from datetime import timedelta
 import datetime 
 import tkinter as tk
 from tkinter import ttk
 from habit import Habit
 from category import Category
+from reference_data import ReferenceData, set_reference_data
+from sqlite_database import SQLiteDatabase
+from query_detector import assert_max_queries
+from clock import FakeClock
+import os
+import tempfile
 
 class TestMain(unittest.TestCase):
     def setUp(self):
@@ -141,16 +147,13 @@ class TestMain(unittest.TestCase):
     @mock.patch('tkinter.ttk.Treeview')
     @mock.patch('tkinter.messagebox.showerror')
     @mock.patch('tkinter.messagebox.showinfo')
-    @mock.patch.object(MySQLDatabase,'update_data')
-    @mock.patch.object(MySQLDatabase,'check_value')
-    @mock.patch.object(MySQLDatabase,'get_streak')
-    @mock.patch.object(MySQLDatabase,'get_active_habit_ID')
-    @mock.patch.object(MySQLDatabase,'get_habit_ID')
-    def test_check_daily_habit(self, mock_get_habit_ID, mock_get_active_habit_ID, mock_get_streak,mock_check_value,mock_update_data, mock_showinfo, mock_showerror,mock_treeview):
+    @mock.patch.object(MySQLDatabase,'check_off_many')
+    def test_check_daily_habit(self, mock_check_off, mock_showinfo, mock_showerror,mock_treeview):
         print(" Running test_check_daily_habit")
 
+        # The iid of the selected item is the active_habits_ID
         treeview_mock_object = mock.MagicMock(name="mock_treeview")
-        treeview_mock_object.selection.return_value =[("test_habit", 0, "daily", timedelta(hours=23))]
+        treeview_mock_object.selection.return_value = ["5"]
         treeview_mock_object.item.return_value = {"values": ("test_habit", 0, "daily", timedelta(hours=23))}
         
         mock_main_screen = Main_screen(isTest=True)
@@ -159,29 +162,260 @@ class TestMain(unittest.TestCase):
 
         mock_main_screen.user_ID = 1
 
-        mock_get_habit_ID.return_value = (5,)
-        mock_get_active_habit_ID.return_value = 5
-        mock_get_streak.return_value = 0
-        mock_check_value.return_value = [(datetime.datetime.now(),)]
-        mock_check_value.return_value = [(datetime.datetime.now()+timedelta(hours=23),)]
+        now = datetime.datetime.now().replace(microsecond=0)
+        mock_check_off.return_value = {5: CheckOffResult('checked', 1, now, now + timedelta(hours=47), 1)}
 
-        expected_new_streak = 1
-        expected_new_update_expiry = datetime.datetime.now()+timedelta(hours=47)
+        mock_main_screen.check_habit()
 
-        expected_next_check = datetime.datetime.now()+timedelta(hours=23) -datetime.datetime.now()
-      
-        expected_data = {"streak": expected_new_streak,
-                                "last_check": datetime.datetime.now().replace(microsecond=0),
-                                "update_expiry": expected_new_update_expiry}
+        # Assert statements for checking 1 active habit for the first time(streak=0 and daily habit) with one check_off_many call
+        mock_check_off.assert_called_once()
+        self.assertEqual(mock_check_off.call_args[0][0], [5])
+        mock_showinfo.assert_called_once()
+        mock_showerror.assert_not_called()
+
+    @mock.patch('tkinter.messagebox.showerror')
+    @mock.patch('tkinter.messagebox.showinfo')
+    @mock.patch.object(MySQLDatabase,'check_off_many')
+    def test_check_habit_too_early(self, mock_check_off, mock_showinfo, mock_showerror):
+        print(" Running test_check_habit_too_early")
+
+        treeview_mock_object = mock.MagicMock(name="mock_treeview")
+        treeview_mock_object.selection.return_value = ["5"]
+        treeview_mock_object.item.return_value = {"values": ("test_habit", 1, "weekly", "6d 23:00:00")}
+
+        mock_main_screen = Main_screen(isTest=True)
+        mock_main_screen.db = self.db
+        mock_main_screen.user_ID = 1
+        mock_main_screen.active_habits_tree = treeview_mock_object
+
+        now = datetime.datetime.now().replace(microsecond=0)
+        mock_check_off.return_value = {5: CheckOffResult('too_early', 1, now, now + timedelta(days=13), 7)}
 
-        
         mock_main_screen.check_habit()
 
-        # Assert statements for checking 1 active habit for the first time(streak=0 and daily habit
-        mock_update_data.assert_called_once_with("active_user_habits",expected_data,"active_habits", 5)
+        # The habit was already checked in this period, so only an info is shown
         mock_showinfo.assert_called_once()
+        self.assertEqual(mock_showinfo.call_args[0][0], "Info")
         mock_showerror.assert_not_called()
 
+    @mock.patch('tkinter.messagebox.showerror')
+    @mock.patch('tkinter.messagebox.showinfo')
+    @mock.patch.object(MySQLDatabase,'check_off_many')
+    def test_check_several_habits(self, mock_check_off_many, mock_showinfo, mock_showerror):
+        print(" Running test_check_several_habits")
+
+        treeview_mock_object = mock.MagicMock(name="mock_treeview")
+        treeview_mock_object.selection.return_value = ["5", "6", "7"]
+        treeview_mock_object.item.return_value = {"values": ("test_habit", 1, "daily", "0d 12:00:00")}
+
+        mock_main_screen = Main_screen(isTest=True)
+        mock_main_screen.db = self.db
+        mock_main_screen.user_ID = 1
+        mock_main_screen.active_habits_tree = treeview_mock_object
+
+        now = datetime.datetime.now().replace(microsecond=0)
+        mock_check_off_many.return_value = {5: CheckOffResult('checked', 1, now, now + timedelta(days=2), 1),
+                                            6: CheckOffResult('checked', 4, now, now + timedelta(days=2), 1),
+                                            7: CheckOffResult('too_early', 2, now, now + timedelta(days=2), 1)}
+
+        mock_main_screen.check_habit()
+
+        # All selected habits are checked off with one call and the results are summed up in one message
+        mock_check_off_many.assert_called_once()
+        self.assertEqual(mock_check_off_many.call_args[0][0], [5, 6, 7])
+        mock_showinfo.assert_called_once()
+        self.assertIn("2 habit(s) checked", mock_showinfo.call_args[0][1])
+        mock_showerror.assert_not_called()
+
+    @mock.patch('tkinter.messagebox.showinfo')
+    @mock.patch.object(MySQLDatabase,'transaction')
+    @mock.patch.object(MySQLDatabase,'insert_data')
+    @mock.patch.object(MySQLDatabase,'delete_active_habit')
+    @mock.patch.object(MySQLDatabase,'get_habit_ID')
+    def test_reactivate_active_habit_by_ID(self, mock_get_habit_ID, mock_delete_active_habit, mock_insert_data, mock_transaction, mock_showinfo):
+        print(" Running test_reactivate_active_habit_by_ID")
+
+        # The system user and the user have a habit with the same name, the row of the side table decides
+        treeview_mock_object = mock.MagicMock(name="mock_treeview")
+        treeview_mock_object.selection.return_value = ["7"]
+
+        mock_main_screen = Main_screen(isTest=True)
+        mock_main_screen.db = self.db
+        mock_main_screen.active_habits_tree = treeview_mock_object
+        mock_main_screen.user_ID = 1
+        deadline = datetime.datetime.now() - timedelta(hours=1)
+        mock_main_screen.set_active_habits([DashboardRow(7, 42, "Reading", 3, 2, "weekly", deadline, "failed")])
+        set_reference_data(self.db, ReferenceData([], [], [(1, 'daily', 1), (2, 'weekly', 7), (3, 'monthly', 30)]))
+        self.addCleanup(set_reference_data, self.db, None)
+
+        mock_main_screen.reactivate_active_habit()
+
+        # The old active habit is deleted by its ID and the new one uses habit_ID and interval_ID of the row, both in one transaction
+        mock_transaction.assert_called_once()
+        mock_get_habit_ID.assert_not_called()
+        mock_delete_active_habit.assert_called_once_with(7, 1)
+        data = mock_insert_data.call_args[0][1]
+        self.assertEqual((data['habit_ID'], data['interval_ID'], data['streak']), (42, 2, 0))
+        mock_showinfo.assert_called_once()
+
+    @mock.patch('tkinter.messagebox.showerror')
+    @mock.patch.object(Main_screen, 'replace_active_habit')
+    def test_reactivate_active_habit_uses_status_and_deadline(self, mock_replace_active_habit, mock_showerror):
+        print(" Running test_reactivate_active_habit_uses_status_and_deadline")
+        now = datetime.datetime(2023, 5, 1, 12, 0, 0)
+        treeview_mock_object = mock.MagicMock(name="mock_treeview")
+        mock_main_screen = Main_screen(isTest=True, clock=FakeClock(now))
+        mock_main_screen.db = self.db
+        mock_main_screen.active_habits_tree = treeview_mock_object
+        mock_main_screen.user_ID = 1
+        mock_main_screen.active_habit_reactivated = mock.Mock()
+        set_reference_data(self.db, ReferenceData([], [], [(1, 'daily', 1), (2, 'weekly', 7), (3, 'monthly', 30)]))
+        self.addCleanup(set_reference_data, self.db, None)
+        # The running habit and a habit whose deadline passed before the sweep set it to failed
+        mock_main_screen.set_active_habits([DashboardRow(5, 14, "Yoga", 2, 1, "daily", now + timedelta(hours=3), "in progress"),
+                                            DashboardRow(6, 15, "Reading", 4, 2, "weekly", now - timedelta(minutes=1), "in progress")])
+
+        # A running habit can't be reactivated
+        treeview_mock_object.selection.return_value = ["5"]
+        mock_main_screen.reactivate_active_habit()
+        mock_showerror.assert_called_once()
+        mock_replace_active_habit.assert_not_called()
+
+        # An expired habit is reactivated although its status is still 'in progress'
+        treeview_mock_object.selection.return_value = ["6"]
+        mock_main_screen.reactivate_active_habit()
+        mock_replace_active_habit.assert_called_once()
+        self.assertEqual(mock_replace_active_habit.call_args[0][:2], (6, 1))
+        self.assertEqual(mock_replace_active_habit.call_args[0][2]['update_expiry'], now + timedelta(days=7))
+        mock_showerror.assert_called_once()
+
+    @mock.patch('tkinter.messagebox.showerror')
+    @mock.patch('tkinter.messagebox.showinfo')
+    def test_check_several_habits_query_count(self, mock_showinfo, mock_showerror):
+        print(" Running test_check_several_habits_query_count")
+        # Check off the active habits of a real SQLite database
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        db = SQLiteDatabase(os.path.join(tmp_dir.name, "habit_tracker"))
+        db.create_database_file(db.database)
+        self.addCleanup(db.close)
+        self.addCleanup(set_reference_data, db, None)
+        now = datetime.datetime.now().replace(microsecond=0)
+        for active_habits_ID in (2, 3):
+            db.update_data("active_user_habits", {'status': 'in progress', 'update_expiry': now + timedelta(hours=12)}, "active_habits", active_habits_ID)
+
+        treeview_mock_object = mock.MagicMock(name="mock_treeview")
+        treeview_mock_object.selection.return_value = ["2", "3"]
+        treeview_mock_object.item.return_value = {"values": ("test_habit", 1, "daily", "0d 12:00:00")}
+
+        mock_main_screen = Main_screen(isTest=True)
+        mock_main_screen.db = db
+        mock_main_screen.active_habits_tree = treeview_mock_object
+        mock_main_screen.user_ID = 1
+        mock_main_screen.query_detector = db.enable_query_detector(threshold=1, report=mock.Mock())
+
+        # Checking off several habits needs one read before the UPDATE, the UPDATE and one read back, not one query per habit
+        with assert_max_queries(db, 3):
+            mock_main_screen.check_habit()
+        self.assertEqual(mock_main_screen.query_detector.detections, [])
+        mock_showinfo.assert_called_once()
+        mock_showerror.assert_not_called()
+
+
+    def test_update_active_habits_tree_sweeps_with_countdown_time(self):
+        print(" Running test_update_active_habits_tree_sweeps_with_countdown_time")
+        now = datetime.datetime(2023, 5, 1, 12, 0, 0)
+        mock_main_screen = Main_screen(isTest=True, clock=FakeClock(now))
+        mock_main_screen.db = self.db
+        mock_main_screen.reconciler = mock.MagicMock()
+        mock_main_screen.sweeper = mock.MagicMock()
+        mock_main_screen.sweeper.sweep.return_value = 0
+        mock_main_screen.set_active_habits([DashboardRow(5, 14, "Yoga", 2, 1, "daily", now + timedelta(hours=3, seconds=5), "in progress"),
+                                            DashboardRow(6, 15, "Reading", 4, 2, "weekly", now - timedelta(hours=1), "in progress")], generation=0)
+        mock_main_screen.scheduler.needs_refresh = mock.Mock(return_value=False)
+
+        mock_main_screen.update_active_habits_tree()
+
+        # All countdowns are computed for one now and the sweep compares the deadlines with the same now
+        rows = mock_main_screen.reconciler.reconcile.call_args[0][0]
+        self.assertEqual([row[1][3] for row in rows], ["0d 03:00:05", "Time is up!"])
+        mock_main_screen.sweeper.sweep.assert_called_once_with(now)
+        # The expired row was already failed elsewhere, the sweep changed nothing but the cached rows are refreshed anyway
+        self.assertEqual(mock_main_screen.scheduler.generation, 1)
+
+    def test_periodic_sweep_without_transitions_keeps_cache(self):
+        print(" Running test_periodic_sweep_without_transitions_keeps_cache")
+        now = datetime.datetime(2023, 5, 1, 12, 0, 0)
+        mock_main_screen = Main_screen(isTest=True, clock=FakeClock(now))
+        mock_main_screen.sweeper = mock.MagicMock()
+        mock_main_screen.sweeper.sweep.return_value = 0
+        mock_main_screen.set_active_habits([DashboardRow(5, 14, "Yoga", 2, 1, "daily", now + timedelta(hours=3), "in progress")], generation=0)
+
+        # The sweep of the sweep controller found nothing, so the cached rows are still up to date
+        mock_main_screen.run_expiry_sweep()
+        self.assertFalse(mock_main_screen.scheduler.needs_refresh())
+
+        # A sweep which set habits to failed refreshes the cached rows
+        mock_main_screen.sweeper.sweep.return_value = 1
+        mock_main_screen.run_expiry_sweep()
+        self.assertTrue(mock_main_screen.scheduler.needs_refresh())
+
+    @mock.patch('tkinter.messagebox.showerror')
+    @mock.patch('tkinter.messagebox.showinfo')
+    @mock.patch.object(MySQLDatabase,'check_off_many')
+    def test_check_habit_uses_clock(self, mock_check_off_many, mock_showinfo, mock_showerror):
+        print(" Running test_check_habit_uses_clock")
+        treeview_mock_object = mock.MagicMock(name="mock_treeview")
+        treeview_mock_object.selection.return_value = ["5"]
+        treeview_mock_object.item.return_value = {"values": ("test_habit", 1, "weekly", "3d 00:00:00")}
+
+        # Fast-forward the clock of the screen by two weeks
+        clock = FakeClock(datetime.datetime(2023, 5, 1, 8, 0, 0, 500))
+        mock_main_screen = Main_screen(isTest=True, clock=clock)
+        mock_main_screen.db = self.db
+        mock_main_screen.user_ID = 1
+        mock_main_screen.active_habits_tree = treeview_mock_object
+        clock.advance(weeks=2)
+        now = datetime.datetime(2023, 5, 15, 8, 0, 0)
+        mock_check_off_many.return_value = {5: CheckOffResult('checked', 2, now, now + timedelta(days=10), 7)}
+
+        mock_main_screen.check_habit()
+
+        # The check-off is done for the time of the clock and the scheduler uses the same clock
+        self.assertEqual(mock_check_off_many.call_args[0][1:], (1, now))
+        self.assertIn("3 days", mock_showinfo.call_args[0][1])
+        self.assertIs(mock_main_screen.scheduler.clock, clock)
+        mock_showerror.assert_not_called()
+
+    @mock.patch.dict(os.environ, {"active_user_ID": "1"})
+    @mock.patch('tkinter.messagebox.showinfo')
+    def test_popup_handlers_run_on_worker_threads(self, mock_showinfo):
+        print(" Running test_popup_handlers_run_on_worker_threads")
+        mock_main_screen = Main_screen(isTest=True)
+        mock_main_screen.db = mock.MagicMock(name="mock_db")
+        mock_main_screen.db_executor = mock.MagicMock(name="mock_executor")
+        mock_main_screen.user_ID = 1
+        mock_main_screen.selected_option = mock.Mock()
+        mock_main_screen.option_1 = mock_main_screen.selected_option.get.return_value
+        for entry in ("first_name", "last_name", "username", "password", "email", "phone_number"):
+            setattr(mock_main_screen, f"entry_new_{entry}", mock.Mock(**{"get.return_value": ""}))
+
+        # Reloading a table, running an analysis and saving the profile only hand the database calls to the executor
+        mock_main_screen.update_habits_table(mock.MagicMock(name="mock_treeview"))
+        mock_main_screen.update_analyse_table()
+        mock_main_screen.save_profile_changes()
+        self.assertEqual(mock_main_screen.db.mock_calls, [])
+        submitted = mock_main_screen.db_executor.submit.call_args_list
+        self.assertEqual([call.kwargs['key'] for call in submitted], ["my_habits", "analysis", None])
+
+        # The profile is read and updated on the worker thread, the popup is closed when the result arrived
+        mock_main_screen.db.get_user_credentials.return_value = {'username': 'test', 'last_update': None}
+        mock_main_screen.store_profile_changes(*submitted[2].args[1:])
+        mock_main_screen.db.update_data.assert_called_once_with("user_table", {'username': 'test', 'last_update': submitted[2].args[2]['last_update']}, "user", 1)
+        mock_main_screen.profile_popup = mock.MagicMock()
+        submitted[2].kwargs['on_success'](None)
+        mock_showinfo.assert_called_once()
+        mock_main_screen.profile_popup.destroy.assert_called_once()
 
 if __name__ == '__main__':
     unittest.main()
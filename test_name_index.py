@@ -0,0 +1,56 @@
+from name_index import NameIndex
+from sqlite_database import SQLiteDatabase
+from sqlite_test_case import SQLiteTestCase
+import unittest
+import datetime
+from unittest import mock
+
+class TestNameIndex(SQLiteTestCase):
+    def test_lookups_without_queries(self):
+        """
+        Test case for resolving the names of the user and the system user from the name index without a query.
+        """
+        print("Running test_lookups_without_queries")
+        # Resolve the names with queries first
+        reference_data = self.db.reference_data
+        own_habit = self.db.get_own_habits(1)[0]
+        expected_habit_ID = self.db.get_habit_ID(1, own_habit[1])
+        expected_category_ID = self.db.get_category_ID('Sport', 1)
+
+        self.db.load_name_index(1)
+        with mock.patch.object(SQLiteDatabase, 'connect') as mock_connect:
+            self.assertEqual(self.db.get_habit_ID(1, own_habit[1]), expected_habit_ID)
+            self.assertIsNone(self.db.get_habit_ID(1, 'Unknown habit'))
+            self.assertEqual(self.db.get_category_ID('Sport', 1), expected_category_ID)
+            self.assertEqual(self.db.get_habit_ID(99, reference_data.habits[0][1]), (reference_data.habits[0][0],))
+        mock_connect.assert_not_called()
+
+        # Other users are still resolved with a query
+        self.assertFalse(self.db.name_index.covers(2))
+
+    def test_coherent_on_insert_and_delete(self):
+        """
+        Test case for the name index, which follows the inserts and deletes of habits and categories.
+        """
+        print("Running test_coherent_on_insert_and_delete")
+        self.db.load_name_index(1)
+        data = {'category_name': 'Music', 'user_ID': 1, 'creation_date': datetime.datetime(2023, 5, 1, 12, 0), 'description': 'Music'}
+        category_ID = self.db.insert_data("category", data)
+        self.assertEqual(self.db.get_category_ID('Music', 1), category_ID)
+
+        data = {'habit_name': 'Guitar', 'user_ID': 1, 'category_ID': category_ID, 'description': 'Play guitar', 'creation_date': datetime.datetime(2023, 5, 1, 12, 0)}
+        habit_ID = self.db.insert_data("habits", data)
+        self.assertEqual(self.db.get_habit_ID(1, 'Guitar'), (habit_ID,))
+
+        self.db.delete_habit(habit_ID)
+        self.db.delete_category(category_ID)
+        self.assertIsNone(self.db.get_habit_ID(1, 'Guitar'))
+        self.assertIsNone(self.db.get_category_ID('Music', 1))
+
+        # The index of another user ignores the new rows
+        index = NameIndex(2, [])
+        index.added("habits", data, habit_ID)
+        self.assertIsNone(index.habit_ID(2, 'Guitar'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+from prepared_statements import StatementRegistry, STATEMENTS
+from mysql.connector import errorcode, errors
+import unittest
+import gc
+from unittest import mock
+
+class FakeConnection:
+    """
+    A connection whose cursor(prepared=True) returns a new mocked prepared cursor. Like a real cursor,
+    the mocked cursors don't keep the connection alive.
+    """
+    def __init__(self):
+        self.cursors = []
+
+    def cursor(self, prepared=False):
+        cursor = mock.MagicMock()
+        self.cursors.append(cursor)
+        return cursor
+
+class TestStatementRegistry(unittest.TestCase):
+    def setUp(self):
+        print("\nRunning setUp method..")
+        self.registry = StatementRegistry()
+        self.connection = FakeConnection()
+
+    def tearDown(self):
+        print("Running tear down method")
+
+    def test_prepared_once_per_connection(self):
+        """
+        Test case for reusing the prepared cursor of a statement on the same connection.
+        """
+        print("Running test_prepared_once_per_connection")
+        first = self.registry.execute(self.connection, 'get_streak', (1,))
+        second = self.registry.execute(self.connection, 'get_streak', (2,))
+
+        # The statement is prepared once and executed twice with its parameters
+        self.assertIs(first, second)
+        self.assertEqual(self.connection.cursors, [first])
+        first.execute.assert_called_with(STATEMENTS['get_streak'], (2,))
+        self.assertEqual(first.execute.call_count, 2)
+
+        # Another statement and another connection get their own cursors
+        self.assertIsNot(self.registry.execute(self.connection, 'delete_habit', (1,)), first)
+        other_connection = FakeConnection()
+        self.registry.execute(other_connection, 'get_streak', (1,))
+        self.assertEqual(len(other_connection.cursors), 1)
+        self.assertEqual(self.registry.stats(), {'connections': 2, 'cursors': 3, 'prepares': 3, 'reuses': 1, 'retries': 0, 'evictions': 0})
+
+        # An unnamed statement is prepared by its SQL
+        query = "UPDATE habits SET habit_name = %s WHERE habit_ID = %s"
+        cursor = self.registry.execute(self.connection, query, ('Yoga', 4))
+        cursor.execute.assert_called_once_with(query, ('Yoga', 4))
+        self.assertIs(self.registry.cursor(self.connection, query), cursor)
+
+        # The cursors are dropped together with their connection
+        del other_connection
+        gc.collect()
+        self.assertEqual(self.registry.stats()['connections'], 1)
+
+    def test_least_recently_used_cursor_is_closed(self):
+        """
+        Test case for capping the prepared cursors of a connection, e.g. for the generated UPDATE statements of update_data.
+        """
+        print("Running test_least_recently_used_cursor_is_closed")
+        registry = StatementRegistry(max_cursors=2)
+        first = registry.execute(self.connection, 'get_streak', (1,))
+        second = registry.execute(self.connection, 'delete_habit', (1,))
+        # Using the first cursor again makes the second one the least recently used
+        registry.execute(self.connection, 'get_streak', (2,))
+
+        registry.execute(self.connection, "UPDATE habits SET habit_name = %s WHERE habit_ID = %s", ('Yoga', 4))
+
+        # The second cursor was closed, the first one is still prepared
+        second.close.assert_called_once()
+        first.close.assert_not_called()
+        self.assertIs(registry.cursor(self.connection, STATEMENTS['get_streak']), first)
+        self.assertEqual((registry.stats()['cursors'], registry.stats()['evictions']), (2, 1))
+
+    def test_stale_statement_is_prepared_again(self):
+        """
+        Test case for preparing the statements again after the server forgot them, e.g. after a reconnect.
+        """
+        print("Running test_stale_statement_is_prepared_again")
+        stale = self.registry.execute(self.connection, 'get_streak', (1,))
+        stale.execute.side_effect = errors.DatabaseError(errno=errorcode.ER_UNKNOWN_STMT_HANDLER)
+
+        # The statement is retried once on a new prepared cursor
+        cursor = self.registry.execute(self.connection, 'get_streak', (1,))
+        self.assertIsNot(cursor, stale)
+        stale.close.assert_called_once()
+        cursor.execute.assert_called_once_with(STATEMENTS['get_streak'], (1,))
+        self.assertEqual(self.registry.retries, 1)
+
+        # Other errors are raised without a retry
+        cursor.execute.side_effect = errors.IntegrityError(errno=errorcode.ER_DUP_ENTRY)
+        with self.assertRaises(errors.IntegrityError):
+            self.registry.execute(self.connection, 'get_streak', (1,))
+        self.assertEqual(self.registry.retries, 1)
+
+if __name__ == '__main__':
+    unittest.main()
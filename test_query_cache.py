@@ -0,0 +1,95 @@
+from query_cache import QueryCache, cached_query
+import unittest
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class FakeDatabase:
+    """
+    Counts the calls of a cached read method.
+    """
+    def __init__(self, cache):
+        self.query_cache = cache
+        self.calls = 0
+
+    @cached_query("habits", "category")
+    def get_user_habits(self, user_ID):
+        self.calls += 1
+        return [(user_ID, 'Homeworkout')]
+
+class TestQueryCache(unittest.TestCase):
+    def setUp(self):
+        print("\nRunning setUp method..")
+        self.clock = FakeClock()
+        self.cache = QueryCache(maxsize=2, ttl=60, clock=self.clock)
+
+    def test_hits_and_misses(self):
+        """
+        Test case for a cached read method which is called twice with the same and once with other arguments.
+        """
+        print("Running test_hits_and_misses")
+        db = FakeDatabase(self.cache)
+
+        self.assertEqual(db.get_user_habits(1), [(1, 'Homeworkout')])
+        self.assertEqual(db.get_user_habits(1), [(1, 'Homeworkout')])
+        db.get_user_habits(2)
+
+        self.assertEqual(db.calls, 2)
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']), (1, 2, 2))
+
+        # The caller gets a copy of the cached list
+        db.get_user_habits(1).append('changed')
+        self.assertEqual(db.get_user_habits(1), [(1, 'Homeworkout')])
+
+    def test_ttl_and_lru_eviction(self):
+        """
+        Test case for results which expire after the ttl and for the least recently used result which is evicted first.
+        """
+        print("Running test_ttl_and_lru_eviction")
+        self.cache.put('a', 1, ('habits',))
+        self.cache.put('b', 2, ('habits',))
+        self.assertEqual(self.cache.get('a'), (True, 1))
+
+        # 'b' is the least recently used result
+        self.cache.put('c', 3, ('category',))
+        self.assertEqual(self.cache.get('b'), (False, None))
+        self.assertEqual(self.cache.get('a'), (True, 1))
+
+        self.clock.now = 61
+        self.assertEqual(self.cache.get('a'), (False, None))
+        self.assertEqual(self.cache.stats()['evictions'], 2)
+
+    def test_invalidate_by_table(self):
+        """
+        Test case for a write to a table, which removes only the results read from that table.
+        """
+        print("Running test_invalidate_by_table")
+        self.cache.put('habits', 1, ('habits', 'category'))
+        self.cache.put('users', 2, ('user_table',))
+
+        self.assertEqual(self.cache.invalidate('category'), 1)
+        self.assertEqual(self.cache.get('habits'), (False, None))
+        self.assertEqual(self.cache.get('users'), (True, 2))
+
+    def test_outdated_result_is_not_stored(self):
+        """
+        Test case for a query which started before a write, its result must not be cached.
+        """
+        print("Running test_outdated_result_is_not_stored")
+        generations = self.cache.generations(('category',))
+        self.cache.invalidate('category')
+        self.cache.put('categories', 1, ('category',), generations)
+        self.assertEqual(len(self.cache), 0)
+
+        generations = self.cache.generations(('category',))
+        self.cache.clear()
+        self.cache.put('categories', 1, ('category',), generations)
+        self.assertEqual(len(self.cache), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+from query_detector import assert_max_queries, detect_queries
+from db_executor import TkDatabaseExecutor
+from sqlite_test_case import SQLiteTestCase
+import unittest
+from unittest import mock
+
+class TestQueryDetector(SQLiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.report = mock.Mock()
+
+    def test_flags_repeated_statements(self):
+        """
+        Test case for flagging a statement which is executed once per row within one operation.
+        """
+        print("Running test_flags_repeated_statements")
+        detector = self.db.enable_query_detector(threshold=3, report=self.report)
+
+        # One query per active habit in a loop
+        with detector.operation("streak_loop") as operation:
+            for active_habits_ID in range(1, 6):
+                self.db.get_streak(active_habits_ID)
+        self.assertEqual(len(operation), 5)
+        self.assertEqual(detector.detections, [("streak_loop", "SELECT streak FROM active_user_habits WHERE active_habits_ID = ?", "get_streak")])
+        self.report.assert_called_once()
+
+        # Statements outside of an operation and below the threshold are not flagged
+        self.db.get_streak(1)
+        with detector.operation("one_query"):
+            self.db.get_active_habits(1)
+        self.assertEqual(len(detector.detections), 1)
+
+    def test_decorator_and_worker_threads(self):
+        """
+        Test case for grouping the statements of a callback, also if they run on a worker thread of the TkDatabaseExecutor.
+        """
+        print("Running test_decorator_and_worker_threads")
+        executor = TkDatabaseExecutor(mock.MagicMock(), max_workers=1)
+        self.addCleanup(executor.shutdown)
+
+        class Screen:
+            def __init__(self, db, detector):
+                self.db = db
+                self.query_detector = detector
+                self.requests = []
+
+            @detect_queries
+            def refresh(self):
+                for user_ID in (1, 2, 3):
+                    self.requests.append(executor.submit(self.db.get_active_habits, user_ID))
+
+        screen = Screen(self.db, self.db.enable_query_detector(threshold=2, report=self.report))
+        screen.refresh()
+        for request in screen.requests:
+            request.future.result()
+        self.assertEqual(screen.query_detector.detections[0][0], "refresh")
+        self.assertEqual(screen.query_detector.detections[0][2], "get_active_habits")
+
+        # Without a detector the callback runs unchanged, wait for the calls before the database is removed
+        screen.query_detector = None
+        screen.requests = []
+        screen.refresh()
+        for request in screen.requests:
+            request.future.result()
+
+    def test_assert_max_queries(self):
+        """
+        Test case for failing when more statements than allowed are executed.
+        """
+        print("Running test_assert_max_queries")
+        with assert_max_queries(self.db, 1) as operation:
+            self.db.get_active_habits(1)
+        self.assertEqual(len(operation), 1)
+
+        with self.assertRaises(AssertionError) as context:
+            with assert_max_queries(self.db, 1):
+                self.db.get_streak(1)
+                self.db.get_streak(2)
+        self.assertIn("2 queries were executed, expected at most 1", str(context.exception))
+
+        # The instrumentation is only enabled for the block
+        self.assertIsNone(self.db.instrumentation)
+
+if __name__ == '__main__':
+    unittest.main()
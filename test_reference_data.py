@@ -0,0 +1,99 @@
+from reference_data import ReferenceData, SYSTEM_USER_ID, get_reference_data, set_reference_data
+from sqlite_database import SQLiteDatabase
+from sqlite_test_case import SQLiteTestCase
+import unittest
+import threading
+import os
+import tempfile
+from unittest import mock
+
+class TestReferenceData(SQLiteTestCase):
+    def test_loaded_once_per_database(self):
+        """
+        Test case for the reference data, which is loaded at the first use and then shared by all objects of the same database.
+        """
+        print("Running test_loaded_once_per_database")
+        with mock.patch.object(ReferenceData, 'load', wraps=ReferenceData.load) as mock_load:
+            reference_data = get_reference_data(self.db)
+            other_db = SQLiteDatabase(self.db.database)
+            self.assertIs(other_db.reference_data, reference_data)
+            other_db.close()
+        mock_load.assert_called_once()
+
+    def test_load_does_not_block_other_databases(self):
+        """
+        Test case for loading the reference data of one database while the load of another database is still running.
+        """
+        print("Running test_load_does_not_block_other_databases")
+        other_dir = tempfile.TemporaryDirectory()
+        other_db = SQLiteDatabase(os.path.join(other_dir.name, "habit_tracker"))
+        other_db.create_database_file(other_db.database)
+
+        # The load of the first database waits until the test releases it
+        started = threading.Event()
+        release = threading.Event()
+        finished = threading.Event()
+        load = ReferenceData.load
+        def slow_load(db):
+            if db.database == self.db.database:
+                started.set()
+                release.wait(5)
+                finished.set()
+            return load(db)
+
+        results = []
+        with mock.patch.object(ReferenceData, 'load', side_effect=slow_load) as mock_load:
+            threads = [threading.Thread(target=lambda: results.append(get_reference_data(self.db))) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            self.assertTrue(started.wait(5))
+
+            # The other database is loaded while the first load is still running
+            self.assertIsNotNone(get_reference_data(other_db))
+            self.assertFalse(finished.is_set())
+
+            release.set()
+            for thread in threads:
+                thread.join(5)
+
+        # Both threads got the same data of the first database, which was loaded once
+        self.assertEqual(len(results), 2)
+        self.assertIs(results[0], results[1])
+        self.assertEqual(mock_load.call_count, 2)
+
+        set_reference_data(other_db, None)
+        other_db.close()
+        other_dir.cleanup()
+
+    def test_lookups(self):
+        """
+        Test case for the lookups of the system habits, system categories and monitoring intervals.
+        """
+        print("Running test_lookups")
+        reference_data = self.db.reference_data
+
+        self.assertEqual(reference_data.interval_names(), ['daily', 'weekly', 'monthly'])
+        self.assertEqual(reference_data.interval_ID('weekly'), 2)
+        self.assertIsNone(reference_data.interval_ID('yearly'))
+        self.assertEqual(reference_data.interval_days(3), 30)
+
+        # The system habits and categories are the rows of the system user
+        self.assertEqual(reference_data.habits, self.db.get_own_habits(SYSTEM_USER_ID))
+        self.assertTrue(reference_data.is_system_category(reference_data.category_ID('Sport')))
+        self.assertFalse(reference_data.is_system_habit(9999))
+
+    def test_user_rows_merged_with_system_rows(self):
+        """
+        Test case for get_user_habits and get_user_categories, which merge the own rows of the user with the system rows.
+        """
+        print("Running test_user_rows_merged_with_system_rows")
+        reference_data = self.db.reference_data
+        habits = self.db.get_user_habits(1)
+        categories = self.db.get_user_categories(1)
+
+        self.assertEqual(habits, reference_data.habits + self.db.get_own_habits(1))
+        self.assertEqual(categories, reference_data.categories + self.db.get_own_categories(1))
+        self.assertEqual(self.db.get_user_categories_name(1), [(category[1],) for category in categories])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+from refresh_scheduler import DeadlineScheduler, RefreshController
+import unittest
+from unittest import mock
+from datetime import datetime as dt
+from datetime import timedelta
+
+class TestDeadlineScheduler(unittest.TestCase):
+    def setUp(self):
+        print("\nRunning setUp method..")
+        self.now = dt(2023, 5, 1, 12, 0)
+        self.scheduler = DeadlineScheduler()
+
+    def tearDown(self):
+        print("Running tear down method")
+
+    def test_no_refresh_before_earliest_deadline(self):
+        """
+        Test case for an idle dashboard which doesn't need a database refresh until the earliest deadline passes.
+        """
+        print("Running test_no_refresh_before_earliest_deadline")
+        self.assertTrue(self.scheduler.needs_refresh(self.now))
+        self.scheduler.load([self.now + timedelta(days=7), self.now + timedelta(hours=2), self.now - timedelta(hours=1)], self.now)
+
+        # The expired deadline isn't cached, the earliest future deadline is
+        self.assertEqual(self.scheduler.next_deadline(), self.now + timedelta(hours=2))
+        # One tick per second for the next hour needs no refresh
+        ticks = [self.now + timedelta(seconds=second) for second in range(3600)]
+        self.assertFalse(any(self.scheduler.needs_refresh(tick) for tick in ticks))
+        # After the earliest deadline passed a refresh is needed
+        self.assertTrue(self.scheduler.needs_refresh(self.now + timedelta(hours=2)))
+
+    def test_refresh_after_write(self):
+        """
+        Test case for a write which marks the cached rows as dirty.
+        """
+        print("Running test_refresh_after_write")
+        self.scheduler.load([self.now + timedelta(days=1)], self.now)
+        self.scheduler.mark_dirty()
+
+        self.assertTrue(self.scheduler.needs_refresh(self.now))
+        self.scheduler.load([self.now + timedelta(days=1)], self.now)
+        self.assertFalse(self.scheduler.needs_refresh(self.now))
+        self.assertEqual(self.scheduler.refreshes, 2)
+
+    def test_refresh_after_max_age(self):
+        """
+        Test case for cached rows which are older than max_age.
+        """
+        print("Running test_refresh_after_max_age")
+        scheduler = DeadlineScheduler(max_age=timedelta(minutes=10))
+        scheduler.load([], self.now)
+
+        self.assertFalse(scheduler.needs_refresh(self.now + timedelta(minutes=9)))
+        self.assertTrue(scheduler.needs_refresh(self.now + timedelta(minutes=10)))
+
+class FakeWidget:
+    """
+    Stands in for a tkinter widget, the pending after callbacks are run by hand with fire.
+    """
+    def __init__(self):
+        self.pending = {}
+        self.next_id = 0
+
+    def after(self, ms, func):
+        self.next_id += 1
+        self.pending[f"after#{self.next_id}"] = func
+        return f"after#{self.next_id}"
+
+    def after_cancel(self, after_id):
+        del self.pending[after_id]
+
+    def fire(self):
+        pending, self.pending = self.pending, {}
+        for func in pending.values():
+            func()
+
+class TestRefreshController(unittest.TestCase):
+    def setUp(self):
+        print("\nRunning setUp method..")
+        self.widget = FakeWidget()
+        self.tick = mock.MagicMock()
+        self.controller = RefreshController(self.widget, self.tick, 1000)
+
+    def tearDown(self):
+        print("Running tear down method")
+
+    def test_periodic_loop_keeps_one_timer(self):
+        """
+        Test case for the periodic refresh which reschedules itself with exactly one timer.
+        """
+        print("Running test_periodic_loop_keeps_one_timer")
+        self.controller.start()
+        self.controller.start()
+        for _ in range(3):
+            self.widget.fire()
+
+        self.assertEqual(self.tick.call_count, 3)
+        self.assertEqual(self.controller.active_timers, 1)
+        self.assertEqual(len(self.widget.pending), 1)
+
+    def test_manual_requests_are_coalesced(self):
+        """
+        Test case for pressing the Update button several times while the periodic loop is running.
+        """
+        print("Running test_manual_requests_are_coalesced")
+        update_table = mock.MagicMock()
+        self.controller.start()
+        for _ in range(5):
+            self.controller.request(update_table)
+        self.assertEqual(self.controller.active_timers, 1)
+
+        self.widget.fire()
+
+        # One table update instead of the periodic tick, then the periodic loop goes on with one timer
+        update_table.assert_called_once()
+        self.tick.assert_not_called()
+        self.assertEqual(self.controller.active_timers, 1)
+        self.widget.fire()
+        self.tick.assert_called_once()
+
+    def test_stop_cancels_pending_timer(self):
+        """
+        Test case for stopping the refresh loop when the screen is closed.
+        """
+        print("Running test_stop_cancels_pending_timer")
+        self.controller.start()
+        self.controller.stop()
+
+        self.assertEqual(self.controller.active_timers, 0)
+        self.assertEqual(self.widget.pending, {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+from schema_migrations import MigrationRunner
+from sqlite_test_case import SQLiteTestCase
+import unittest
+import os
+
+class TestMigrationRunner(SQLiteTestCase):
+    def _indexes(self):
+        self.db.connect()
+        self.db.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'")
+        names = {row[0] for row in self.db.cursor.fetchall()}
+        self.db.disconnect()
+        return names
+
+    def test_migrate_applies_each_version_once(self):
+        """
+        Test case for applying all migrations to an existing database and running the runner a second time.
+        """
+        print("Running test_migrate_applies_each_version_once")
+        runner = MigrationRunner(self.db)
+        versions = [migration.version for migration in runner.available_migrations()]
+
+        self.assertEqual(runner.migrate(), versions)
+        self.assertEqual(runner.applied_versions(), set(versions))
+        self.assertIn('idx_active_user_habits_user_status', self._indexes())
+        self.assertIn('idx_category_user_name', self._indexes())
+
+        # Nothing is pending any longer
+        self.assertEqual(runner.migrate(), [])
+
+    def test_migrate_skips_existing_index(self):
+        """
+        Test case for a migration whose index was already created by hand.
+        """
+        print("Running test_migrate_skips_existing_index")
+        self.db.execute_query("CREATE INDEX idx_habits_user_name ON habits (user_ID, habit_name)")
+
+        MigrationRunner(self.db).migrate()
+
+        self.assertIn('idx_habits_user_name', self._indexes())
+        self.assertEqual(self.db.execute_query("SELECT COUNT(*) FROM schema_version WHERE name = 'name_lookup_indexes'"), (1,))
+
+    def test_failed_migration_is_not_recorded(self):
+        """
+        Test case for a migration with an invalid statement, the migrations before it are kept.
+        """
+        print("Running test_failed_migration_is_not_recorded")
+        directory = os.path.join(self.tmp_dir.name, "migrations")
+        os.mkdir(directory)
+        with open(os.path.join(directory, "001_first.sql"), "w") as f:
+            f.write("-- first\nCREATE INDEX idx_first ON habits (habit_name);\n")
+        with open(os.path.join(directory, "002_broken.sql"), "w") as f:
+            f.write("CREATE INDEX idx_broken ON missing_table (column);\n")
+        runner = MigrationRunner(self.db, directory)
+
+        with self.assertRaises(Exception):
+            runner.migrate()
+        self.assertEqual(runner.applied_versions(), {1})
+        self.assertEqual([migration.version for migration in runner.pending_migrations()], [2])
+
+if __name__ == '__main__':
+    unittest.main()
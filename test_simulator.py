@@ -0,0 +1,77 @@
+from simulator import Simulator
+from clock import FakeClock
+from active_user_habits import ActiveUserHabit
+from habit import Habit
+from category import Category
+from sqlite_test_case import SQLiteTestCase
+import unittest
+import contextlib
+import datetime
+import io
+from datetime import timedelta
+
+class TestSimulator(SQLiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.start = datetime.datetime(2030, 1, 1)
+
+    def test_fake_clock(self):
+        """
+        Test case for the FakeClock and the models which take their dates from it.
+        """
+        print("Running test_fake_clock")
+        clock = FakeClock(self.start)
+        self.assertEqual(clock.advance(days=1, hours=2), self.start + timedelta(days=1, hours=2))
+        self.assertEqual(clock.advance(timedelta(minutes=5)), self.start + timedelta(days=1, hours=2, minutes=5))
+        with self.assertRaises(Exception):
+            clock.set(self.start)
+
+        # The models use the clock for their dates, but don't store it
+        active_user_habit = ActiveUserHabit(1, 2, 3, clock=clock)
+        self.assertEqual(active_user_habit.starting_date, clock())
+        self.assertNotIn('clock', vars(active_user_habit))
+        self.assertEqual(Habit("Yoga", 1, 2, clock=clock).creation_date, clock().isoformat())
+        self.assertEqual(Category("Sports", 1, clock=clock).creation_date, clock().isoformat())
+
+    def test_random_month(self):
+        """
+        Test case for simulating several days with random visits.
+        """
+        print("Running test_random_month")
+        self.db.enable_instrumentation()
+        simulator = Simulator(self.db, users=20, habits_per_user=2, seed=5, start=self.start)
+        simulator.setup()
+        self.assertEqual(len(simulator.user_IDs), 20)
+
+        summaries = simulator.run(days=9)
+
+        # The clock was fast-forwarded to the end of the last day and every day reports its database calls
+        self.assertEqual(simulator.clock(), self.start + timedelta(days=9))
+        self.assertEqual([summary.date for summary in summaries], [(self.start + timedelta(days=day)).date() for day in range(9)])
+        for summary in summaries:
+            self.assertGreaterEqual(summary.db_calls, summary.visits + 24)
+            self.assertGreater(summary.p99_us, 0)
+        # All habits are new on the first day, so every visit checks off the habits of the user
+        self.assertEqual(summaries[0].checked, 2 * summaries[0].visits)
+
+    def test_scripted_visits(self):
+        """
+        Test case for a scripted user who misses a day and reactivates the failed habits.
+        """
+        print("Running test_scripted_visits")
+        simulator = Simulator(self.db, users=1, habits_per_user=1, start=self.start)
+        simulator.setup()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.db.execute_query(f"UPDATE active_user_habits SET interval_ID = 1, update_expiry = '2030-01-02 00:00:00' WHERE user_ID = {simulator.user_IDs[0]}")
+
+        # Check off the daily habit on day 0, miss day 1 and come back on day 2
+        summaries = simulator.run(script=[{"user": 0, "day": 0, "minute": 480}, {"user": 0, "day": 2, "minute": 480}], days=3)
+
+        # The reactivated habit starts with a new period, it is checked off at the next visit
+        self.assertEqual([summary.checked for summary in summaries], [1, 0, 0])
+        # The habits of the sample data expire on the first day, the habit of the user at the start of day 2
+        self.assertEqual([summary.failed for summary in summaries[1:]], [0, 1])
+        self.assertEqual([summary.reactivated for summary in summaries], [0, 0, 1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+from slow_query_log import SlowQueryLog, read_entries, summarize, main
+from sqlite_test_case import SQLiteTestCase
+import unittest
+import io
+import os
+from contextlib import redirect_stdout
+
+class TestSlowQueryLog(SQLiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(self.tmp_dir.name, "slow_queries.log")
+
+    def test_slow_statements_with_explain(self):
+        """
+        Test case for logging the statements above the threshold with their EXPLAIN output.
+        """
+        print("Running test_slow_statements_with_explain")
+        # Every statement is slower than a threshold of 0 seconds
+        slow_query_log = self.db.enable_slow_query_log(self.path, threshold=0)
+        active_habits = self.db.get_active_habits(1)
+        self.db.get_active_habits(2)
+        self.db.update_data("user_table", {"first_name": "Marc"}, "user", 1)
+        slow_query_log.flush()
+
+        entries = read_entries(self.path)
+        self.assertEqual(len(entries), 3)
+        self.assertEqual(slow_query_log.entries, 3)
+        select = next(entry for entry in entries if entry['params'] == ['1'] and entry['method'] == 'get_active_habits')
+        self.assertEqual(select['rows'], len(active_habits))
+        self.assertIn("WHERE active_user_habits.user_ID = ?", select['fingerprint'])
+        # The plan of the SELECT was captured, the EXPLAIN itself is not logged
+        self.assertTrue(select['explain'])
+        self.assertTrue(all(entry['fingerprint'].startswith(("SELECT", "UPDATE")) for entry in entries))
+        update = next(entry for entry in entries if entry['method'] == 'update_data')
+        self.assertEqual(update['rows'], 1)
+        self.assertNotIn('explain', update)
+
+        # The summary groups both SELECTs under one fingerprint
+        summary = summarize(entries)
+        self.assertEqual(summary[0]['count'] + summary[1]['count'], 3)
+        self.assertIn(2, [group['count'] for group in summary])
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main([self.path, '--top', '2'])
+        self.assertIn("get_active_habits", output.getvalue())
+        self.assertIn("update_data", output.getvalue())
+
+    def test_threshold_and_rotation(self):
+        """
+        Test case for skipping fast statements and for rotating a full log file.
+        """
+        print("Running test_threshold_and_rotation")
+        slow_query_log = SlowQueryLog(self.path, threshold=0.5, max_bytes=300, backup_count=2)
+        slow_query_log.statement_finished("SELECT 1", (), 0.1, 1, "fast")
+        for i in range(5):
+            slow_query_log.statement_finished(f"SELECT * FROM habits WHERE habit_ID = {i}", (), 0.6 + i, 1, "slow")
+        slow_query_log.close()
+
+        # Only the slow statements are logged, the full files were rotated
+        self.assertEqual(slow_query_log.entries, 5)
+        self.assertTrue(os.path.exists(f"{self.path}.1"))
+        entries = read_entries(self.path)
+        self.assertTrue(all(entry['method'] == 'slow' for entry in entries))
+        self.assertEqual(summarize(entries)[0]['fingerprint'], "SELECT * FROM habits WHERE habit_ID = ?")
+        self.assertEqual(summarize(entries)[0]['max_ms'], 4600.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,270 @@
+from sqlite_database import SQLiteDatabase, translate_query, translate_ddl
+from sqlite_test_case import SQLiteTestCase
+import unittest
+import datetime
+import os
+import threading
+from unittest import mock
+
+class TestSQLiteDatabase(SQLiteTestCase):
+    def test_translate_query(self):
+        """
+        Test case for translating MySQL placeholders and DATE_ADD intervals into the SQLite dialect.
+        """
+        print("Running test_translate_query")
+        query = "UPDATE t SET update_expiry = DATE_ADD(update_expiry, INTERVAL 7 DAY) WHERE ID = %s"
+        self.assertEqual(translate_query(query), "UPDATE t SET update_expiry = DATE_ADD(update_expiry, 7) WHERE ID = ?")
+
+    def test_translate_ddl(self):
+        """
+        Test case for translating AUTO_INCREMENT primary keys into SQLite DDL.
+        """
+        print("Running test_translate_ddl")
+        ddl = "CREATE TABLE t(t_ID INTEGER NOT NULL AUTO_INCREMENT, name VARCHAR(45), PRIMARY KEY (t_ID))"
+        self.assertEqual(translate_ddl(ddl), "CREATE TABLE t(t_ID INTEGER PRIMARY KEY AUTOINCREMENT, name VARCHAR(45))")
+
+    def test_create_database_uses_wal(self):
+        """
+        Test case for the file name and the journal mode of a new SQLite database.
+        """
+        print("Running test_create_database_uses_wal")
+        self.assertTrue(self.db.database.endswith("habit_tracker.db"))
+        self.assertEqual(self.db.execute_query("PRAGMA journal_mode"), ('wal',))
+
+    def test_create_database_file_without_dialog(self):
+        """
+        Test case for creating the database file without a messagebox, which create_database shows on top of it.
+        """
+        print("Running test_create_database_file_without_dialog")
+        other_db = SQLiteDatabase(os.path.join(self.tmp_dir.name, "other"))
+        with mock.patch('sqlite_database.messagebox') as mock_messagebox:
+            # The first call creates the file, the second one finds it
+            self.assertFalse(other_db.create_database_file(other_db.database))
+            self.assertTrue(other_db.create_database_file(other_db.database))
+            mock_messagebox.showinfo.assert_not_called()
+
+            other_db.create_database(other_db.database)
+            mock_messagebox.showinfo.assert_called_once_with("Info", "Database already exists, you can now login or register.")
+        other_db.close()
+
+    def test_get_active_habits(self):
+        """
+        Test case for the `get_active_habits` method inherited from `MySQLDatabase` with the sample data of inserts.txt.
+        """
+        print("Running test_get_active_habits")
+        active_habits = self.db.get_active_habits(1)
+
+        # User 1 has 5 active habits which are not deleted
+        self.assertEqual(len(active_habits), 5)
+        self.assertEqual(active_habits[0][1], 'Homeworkout')
+        self.assertIsInstance(active_habits[0][4], datetime.datetime)
+        self.assertEqual(active_habits[0][6], 'daily')
+
+    def test_get_dashboard_rows(self):
+        """
+        Test case for the `get_dashboard_rows` method inherited from `MySQLDatabase` with the sample data of inserts.txt.
+        """
+        print("Running test_get_dashboard_rows")
+        rows = self.db.get_dashboard_rows(1)
+
+        self.assertEqual([row.active_habits_ID for row in rows], [2, 3, 4, 18, 19])
+        self.assertEqual(rows[0].habit_name, 'Homeworkout')
+        self.assertEqual(rows[2].control_interval, 'weekly')
+        self.assertIsInstance(rows[0].update_expiry, datetime.datetime)
+
+    def test_get_global_active_habits(self):
+        """
+        Test case for the `get_global_active_habits` method inherited from `MySQLDatabase`.
+        """
+        print("Running test_get_global_active_habits")
+        active_habits = self.db.get_global_active_habits(3)
+
+        self.assertEqual(len(active_habits), 6)
+        self.assertEqual({record[6] for record in active_habits}, {'monthly'})
+
+    def test_insert_and_update_data(self):
+        """
+        Test case for the `insert_data`, `update_data` and `check_value` methods inherited from `MySQLDatabase`.
+        """
+        print("Running test_insert_and_update_data")
+        data = {'category_name': 'Music', 'user_ID': 1, 'creation_date': datetime.datetime(2023, 5, 1, 12, 0), 'description': 'Music'}
+        self.db.insert_data("category", data)
+        category_ID = self.db.get_category_ID('Music', 1)
+
+        self.db.update_data("category", {'description': 'Playing music'}, "category", category_ID)
+
+        self.assertEqual(self.db.check_value("description", "category", "category_ID", category_ID), [('Playing music',)])
+        self.assertEqual(self.db.check_value("creation_date", "category", "category_ID", category_ID), [(datetime.datetime(2023, 5, 1, 12, 0),)])
+
+    def test_initialize_database_inserts_all_rows(self):
+        """
+        Test case for the batched inserts of `initialize_database` and for `insert_many`.
+        """
+        print("Running test_initialize_database_inserts_all_rows")
+        # Every line of inserts.txt is one row
+        self.assertEqual(self.db.execute_query("SELECT COUNT(*) FROM active_user_habits"), (21,))
+        self.assertEqual(self.db.execute_query("SELECT COUNT(*) FROM habits"), (20,))
+
+        rows = [{'category_name': f'Category {number}', 'user_ID': 1, 'creation_date': datetime.datetime(2023, 5, 1), 'description': 'Generated'} for number in range(100)]
+        self.assertEqual(self.db.insert_many("category", rows), 100)
+        self.assertEqual(self.db.execute_query("SELECT COUNT(*) FROM category WHERE description = 'Generated'"), (100,))
+
+        # One invalid row (description is NOT NULL) rolls back the whole batch
+        rows[-1]['description'] = ''
+        with self.assertRaises(Exception):
+            self.db.insert_many("category", rows)
+        self.assertEqual(self.db.execute_query("SELECT COUNT(*) FROM category WHERE description = 'Generated'"), (100,))
+
+    def test_query_cache(self):
+        """
+        Test case for the query cache, which is invalidated by the writes to the habits and category tables.
+        """
+        print("Running test_query_cache")
+        self.db.enable_query_cache()
+        categories = self.db.get_user_categories(1)
+        self.assertEqual(self.db.get_user_categories(1), categories)
+        self.assertEqual(self.db.cache_stats()['hits'], 1)
+
+        # A new category invalidates the cached categories and habits
+        self.db.get_user_habits(1)
+        data = {'category_name': 'Music', 'user_ID': 1, 'creation_date': datetime.datetime(2023, 5, 1, 12, 0), 'description': 'Music'}
+        self.db.insert_data("category", data)
+        self.assertEqual(len(self.db.query_cache), 0)
+        self.assertEqual(len(self.db.get_user_categories(1)), len(categories) + 1)
+
+        category_ID = self.db.get_category_ID('Music', 1)
+        self.db.delete_category(category_ID)
+        self.assertEqual(self.db.get_user_categories(1), categories)
+        self.assertEqual(self.db.cache_stats()['misses'], 5)
+
+    def test_connection_per_thread(self):
+        """
+        Test case for calling the database from a worker thread, every thread uses its own connection and cursor.
+        """
+        print("Running test_connection_per_thread")
+        self.db.connect()
+        main_connection = self.db.connection
+        results = {}
+
+        def worker():
+            results['rows'] = self.db.get_dashboard_rows(1)
+            self.db.connect()
+            results['connection'] = self.db.connection
+            self.db.disconnect()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+        # The worker got its own connection and didn't change the connection of this thread
+        self.assertEqual(len(results['rows']), 5)
+        self.assertIsNot(results['connection'], main_connection)
+        self.assertIs(self.db.connection, main_connection)
+        self.db.disconnect()
+
+    def test_delete_active_habit(self):
+        """
+        Test case for the keyed `delete_active_habit` method, an active habit of another user isn't changed.
+        """
+        print("Running test_delete_active_habit")
+        # Active habit 2 belongs to user 1
+        self.assertEqual(self.db.delete_active_habit(2, 2), 0)
+        self.assertEqual(self.db.delete_active_habit(2, 1), 1)
+
+        self.assertEqual(self.db.check_value("status", "active_user_habits", "active_habits_ID", 2), [('deleted',)])
+        self.assertNotIn(2, [row.active_habits_ID for row in self.db.get_dashboard_rows(1)])
+
+    def test_bulk_operations(self):
+        """
+        Test case for `check_off_many`, `delete_active_habits`, `delete_habits` and `delete_categories`, one statement for all rows.
+        """
+        print("Running test_bulk_operations")
+        now = datetime.datetime(2023, 5, 1, 12, 0)
+        # Active habits 2 and 3 belong to user 1, 2 can be checked, 3 was checked in this period already
+        self.db.update_data("active_user_habits", {'streak': 3, 'status': 'in progress', 'update_expiry': now + datetime.timedelta(hours=12)}, "active_habits", 2)
+        self.db.update_data("active_user_habits", {'streak': 3, 'status': 'in progress', 'update_expiry': now + datetime.timedelta(days=10), 'last_check': now - datetime.timedelta(days=1)}, "active_habits", 3)
+
+        results = self.db.check_off_many([2, 3, 9999], 1, now)
+        self.assertEqual({ID: result.status for ID, result in results.items()}, {2: 'checked', 3: 'too_early', 9999: 'not_found'})
+        self.assertEqual(results[2].streak, 4)
+
+        # A second check-off within the same second doesn't change the row again and isn't reported as checked
+        results = self.db.check_off_many([2], 1, now)
+        self.assertEqual((results[2].status, results[2].streak), ('too_early', 4))
+        self.assertEqual(self.db.check_off(2, 1, now).status, 'too_early')
+
+        # Another user can't check off the active habits of user 1
+        results = self.db.check_off_many([2, 3], 2, now + datetime.timedelta(hours=13))
+        self.assertEqual({ID: result.status for ID, result in results.items()}, {2: 'not_found', 3: 'not_found'})
+        self.assertEqual(self.db.get_streak(2), 4)
+
+        # Only the active habits of the user are deleted
+        self.assertEqual(self.db.delete_active_habits([2, 3], 2), 0)
+        self.assertEqual(self.db.delete_active_habits([2, 3], 1), 2)
+        self.assertEqual(self.db.delete_active_habits([], 1), 0)
+
+        # New habits and categories without active habits can be deleted together
+        categories = [{'category_name': f'Category {number}', 'user_ID': 1, 'creation_date': now, 'description': 'Generated'} for number in range(3)]
+        category_IDs = [self.db.insert_data("category", data) for data in categories]
+        habit_IDs = [self.db.insert_data("habits", {'habit_name': f'Habit {number}', 'user_ID': 1, 'category_ID': category_IDs[0], 'description': 'Generated', 'creation_date': now}) for number in range(3)]
+        self.assertEqual(self.db.delete_habits(habit_IDs), 3)
+        self.assertEqual(self.db.delete_categories(category_IDs), 3)
+        self.assertEqual(self.db.execute_query("SELECT COUNT(*) FROM category WHERE description = 'Generated'"), (0,))
+
+    def test_transaction(self):
+        """
+        Test case for the `transaction` context manager, which commits several method calls once or rolls all of them back.
+        """
+        print("Running test_transaction")
+        data = {'category_name': 'Music', 'user_ID': 1, 'creation_date': datetime.datetime(2023, 5, 1, 12, 0), 'description': 'Music'}
+
+        # An exception rolls back every statement of the transaction
+        with self.assertRaises(ValueError):
+            with self.db.transaction():
+                self.db.delete_active_habit(2, 1)
+                self.db.insert_data("category", data)
+                raise ValueError("Something went wrong")
+        self.assertEqual(self.db.check_value("status", "active_user_habits", "active_habits_ID", 2), [('in progress',)])
+        self.assertEqual(self.db.execute_query("SELECT COUNT(*) FROM category WHERE category_name = 'Music'"), (0,))
+
+        # All statements are committed together, the methods use the pinned connection
+        with mock.patch.object(self.db, '_acquire_connection', wraps=self.db._acquire_connection) as mock_acquire:
+            with self.db.transaction() as tx:
+                self.db.delete_active_habit(2, 1)
+                with self.db.transaction():
+                    self.db.insert_data("category", data)
+                tx.execute("UPDATE category SET description = %s WHERE category_name = %s", ('Playing music', 'Music'))
+        mock_acquire.assert_called_once()
+        self.assertEqual(self.db.check_value("status", "active_user_habits", "active_habits_ID", 2), [('deleted',)])
+        self.assertEqual(self.db.execute_query("SELECT description FROM category WHERE category_name = 'Music'"), ('Playing music',))
+
+    def test_check_off(self):
+        """
+        Test case for the conditional UPDATE of the `check_off` method inherited from `MySQLDatabase`.
+        """
+        print("Running test_check_off")
+        now = datetime.datetime(2023, 5, 1, 12, 0)
+        # Active habit 2 is the daily Homeworkout of user 1
+        self.db.update_data("active_user_habits", {'streak': 3, 'status': 'in progress', 'update_expiry': now + datetime.timedelta(hours=12)}, "active_habits", 2)
+
+        # Check off within the period
+        result = self.db.check_off(2, 1, now)
+        self.assertEqual(result.status, 'checked')
+        self.assertEqual(result.streak, 4)
+        self.assertEqual(result.last_check, now)
+        self.assertEqual(result.update_expiry, now + datetime.timedelta(hours=36))
+
+        # A second check in the same period is too early and changes nothing
+        result = self.db.check_off(2, 1, now + datetime.timedelta(minutes=1))
+        self.assertEqual(result.status, 'too_early')
+        self.assertEqual(result.streak, 4)
+
+        # After the deadline the habit is expired
+        self.assertEqual(self.db.check_off(2, 1, now + datetime.timedelta(days=2)).status, 'expired')
+        self.assertEqual(self.db.check_off(9999, 1, now).status, 'not_found')
+        # The active habit of another user isn't found and not changed
+        self.assertEqual(self.db.check_off(2, 2, now + datetime.timedelta(hours=13)).status, 'not_found')
+        self.assertEqual(self.db.get_streak(2), 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+from streak_engine import StreakEngine, TIME_IS_UP, format_remaining
+from database import DashboardRow
+from reference_data import set_reference_data
+from sqlite_database import SQLiteDatabase
+import unittest
+import datetime
+import os
+import tempfile
+from datetime import timedelta
+
+class TestStreakEngine(unittest.TestCase):
+    def setUp(self):
+        print("\nRunning setUp method..")
+        # The engine works on a fixed clock and the intervals of the monitoring_interval table
+        self.now = datetime.datetime(2023, 5, 1, 12, 0, 0)
+        self.engine = StreakEngine([(1, 'daily', 1), (2, 'weekly', 7), (3, 'monthly', 30)], clock=lambda: self.now)
+
+    def tearDown(self):
+        print("Running tear down method")
+
+    def test_tick(self):
+        """
+        Test case for the countdowns and expiry transitions of a batch of rows.
+        """
+        print("Running test_tick")
+        rows = [DashboardRow(1, 10, "Yoga", 2, 1, "daily", self.now + timedelta(hours=5, minutes=3, seconds=7, microseconds=900), "in progress"),
+                DashboardRow(2, 11, "Reading", 0, 2, "weekly", self.now + timedelta(days=6, seconds=59), "in progress"),
+                DashboardRow(3, 12, "Running", 4, 3, "monthly", self.now - timedelta(seconds=1), "in progress"),
+                DashboardRow(4, 13, "Cooking", 1, 1, "daily", self.now, "failed")]
+
+        tick = self.engine.tick(rows)
+
+        # All countdowns are computed for the time of the clock, fractions of a second are cut off
+        self.assertEqual(tick.now, self.now)
+        self.assertEqual([countdown.text for countdown in tick.countdowns], ["0d 05:03:07", "6d 00:00:59", TIME_IS_UP, TIME_IS_UP])
+        self.assertEqual([countdown.expired for countdown in tick.countdowns], [False, False, True, True])
+        # Only the expired row which is still in progress has to be set to failed
+        self.assertEqual(tick.transitions, [3])
+        self.assertEqual(self.engine.tick([]).countdowns, [])
+        self.assertEqual(format_remaining(30 * 86400 + 3661), "30d 01:01:01")
+
+    def test_check_off(self):
+        """
+        Test case for the check-off rules of every interval.
+        """
+        print("Running test_check_off")
+        # A daily habit which was never checked can be checked, the deadline moves forward by one day
+        result = self.engine.check_off(DashboardRow(1, 10, "Yoga", 0, 1, "daily", self.now + timedelta(hours=47), "in progress"))
+        self.assertEqual(result.status, 'checked')
+        self.assertEqual((result.streak, result.last_check, result.update_expiry, result.interval_days), (1, self.now, self.now + timedelta(hours=71), 1))
+        self.assertEqual(self.engine.next_check(result, self.now), timedelta(hours=47))
+
+        # A weekly habit whose deadline is more than one week ahead was already checked in this period
+        too_early = DashboardRow(2, 11, "Reading", 3, 2, "weekly", self.now + timedelta(days=7, hours=1), "in progress")
+        self.assertEqual(self.engine.check_off(too_early).status, 'too_early')
+        self.assertEqual(self.engine.check_off(too_early._replace(update_expiry=self.now + timedelta(days=7))).status, 'checked')
+
+        # Expired, failed and missing habits can't be checked
+        expired = DashboardRow(3, 12, "Running", 4, 3, "monthly", self.now, "in progress")
+        results = self.engine.check_off_many([expired, expired._replace(active_habits_ID=4, update_expiry=self.now + timedelta(days=1), status='failed')])
+        self.assertEqual([result.status for result in results.values()], ['expired', 'expired'])
+        self.assertEqual(self.engine.check_off(None).status, 'not_found')
+
+        # The deadline of a new habit is the days of its interval from now, the interval can be given by ID or name
+        self.assertEqual(self.engine.first_deadline('monthly'), self.now + timedelta(days=30))
+        self.assertEqual(self.engine.first_deadline(2, self.now - timedelta(days=1)), self.now + timedelta(days=6))
+        with self.assertRaises(Exception):
+            self.engine.interval_days('yearly')
+
+    def test_check_off_matches_database(self):
+        """
+        Test case for the same results of the engine and the conditional UPDATE of the database.
+        """
+        print("Running test_check_off_matches_database")
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        db = SQLiteDatabase(os.path.join(tmp_dir.name, "habit_tracker"))
+        db.create_database_file(db.database)
+        self.addCleanup(db.close)
+        self.addCleanup(set_reference_data, db, None)
+        engine = StreakEngine(lambda: db.reference_data.intervals)
+
+        # Put active habits of every interval in the states of the check-off rules
+        now = datetime.datetime.now().replace(microsecond=0)
+        states = {2: (0, now + timedelta(hours=12), 'in progress'), 3: (3, now + timedelta(days=1, hours=12), 'in progress'),
+                  4: (2, now + timedelta(days=8), 'in progress'), 18: (5, now - timedelta(hours=1), 'in progress'),
+                  19: (1, now + timedelta(hours=1), 'failed')}
+        for active_habits_ID, (streak, update_expiry, status) in states.items():
+            db.update_data("active_user_habits", {'streak': streak, 'last_check': now - timedelta(days=2), 'update_expiry': update_expiry, 'status': status}, "active_habits", active_habits_ID)
+        rows = [row for row in db.get_dashboard_rows(1) if row.active_habits_ID in states]
+        self.assertEqual(len(rows), 5)
+
+        expected = engine.check_off_many(rows, now)
+        actual = db.check_off_many([row.active_habits_ID for row in rows], 1, now)
+        self.assertEqual(sorted(result.status for result in expected.values()), ['checked', 'expired', 'expired', 'too_early', 'too_early'])
+        for active_habits_ID, result in expected.items():
+            self.assertEqual((result.status, result.streak, result.update_expiry), (actual[active_habits_ID].status, actual[active_habits_ID].streak, actual[active_habits_ID].update_expiry))
+
+    def test_tick_large_batch(self):
+        """
+        Test case for a batch of many rows, like the batch jobs use it.
+        """
+        print("Running test_tick_large_batch")
+        rows = [DashboardRow(ID, 1, "Habit", 1, 1, "daily", self.now + timedelta(seconds=ID - 5000), "in progress") for ID in range(10000)]
+
+        tick = self.engine.tick(rows)
+
+        # The deadlines up to now are expired, the others are running
+        self.assertEqual(len(tick.countdowns), 10000)
+        self.assertEqual(len(tick.transitions), 5001)
+        self.assertEqual(tick.countdowns[5001].text, "0d 00:00:01")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+from tree_reconciler import TreeReconciler
+import unittest
+from unittest import mock
+
+class TestTreeReconciler(unittest.TestCase):
+    def setUp(self):
+        print("\nRunning setUp method..")
+        # Mock the treeview, the reconciler must only call insert/delete/set/item/move for real changes
+        self.tree = mock.MagicMock()
+        self.reconciler = TreeReconciler(self.tree, ("Habit Name", "Streak", "Interval", "Remaining Time", "Deadline"))
+        self.rows = [(2, ('Homeworkout', 19, 'daily', '0d 10:00:00', '2023-05-02 12:00:00')),
+                     (3, ('Running', 4, 'weekly', '3d 10:00:00', '2023-05-05 12:00:00'))]
+
+    def tearDown(self):
+        print("Running tear down method")
+
+    def test_first_reconcile_inserts_rows(self):
+        """
+        Test case for the first reconcile which inserts every row with its active_habits_ID as iid.
+        """
+        print("Running test_first_reconcile_inserts_rows")
+        stats = self.reconciler.reconcile(self.rows)
+
+        self.assertEqual(stats, {'inserted': 2, 'deleted': 0, 'updated': 0})
+        self.tree.insert.assert_any_call(parent="", index="end", iid="2", text="", values=self.rows[0][1])
+        self.tree.insert.assert_any_call(parent="", index="end", iid="3", text="", values=self.rows[1][1])
+        self.tree.delete.assert_not_called()
+
+    def test_countdown_updated_in_place(self):
+        """
+        Test case for a tick where only the countdowns changed.
+        """
+        print("Running test_countdown_updated_in_place")
+        self.reconciler.reconcile(self.rows)
+        self.tree.reset_mock()
+        new_rows = [(2, ('Homeworkout', 19, 'daily', '0d 09:59:59', '2023-05-02 12:00:00')),
+                    (3, ('Running', 4, 'weekly', '3d 10:00:00', '2023-05-05 12:00:00'))]
+
+        stats = self.reconciler.reconcile(new_rows)
+
+        # Only the changed cell is set, nothing is inserted, deleted or moved
+        self.assertEqual(stats, {'inserted': 0, 'deleted': 0, 'updated': 1})
+        self.tree.set.assert_called_once_with("2", column="Remaining Time", value='0d 09:59:59')
+        self.tree.insert.assert_not_called()
+        self.tree.delete.assert_not_called()
+        self.tree.move.assert_not_called()
+
+    def test_deleted_and_changed_rows(self):
+        """
+        Test case for a refresh where one row is gone, one row changed several cells and one row is new.
+        """
+        print("Running test_deleted_and_changed_rows")
+        self.reconciler.reconcile(self.rows)
+        self.tree.reset_mock()
+        new_rows = [(1, ('Reading', 0, 'daily', '0d 23:59:59', '2023-05-02 11:59:59')),
+                    (3, ('Running', 5, 'weekly', '10d 10:00:00', '2023-05-12 12:00:00'))]
+
+        stats = self.reconciler.reconcile(new_rows)
+
+        self.assertEqual(stats, {'inserted': 1, 'deleted': 1, 'updated': 1})
+        self.tree.delete.assert_called_once_with("2")
+        self.tree.item.assert_called_once_with("3", values=new_rows[1][1])
+        # The new row with the lower ID is moved in front of the existing one
+        self.tree.move.assert_any_call("1", "", 0)
+
+if __name__ == '__main__':
+    unittest.main()
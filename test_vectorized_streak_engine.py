@@ -0,0 +1,60 @@
+from vectorized_streak_engine import VectorizedStreakEngine, to_datetime64
+from streak_engine import StreakEngine, TIME_IS_UP
+from database import DashboardRow
+import unittest
+import datetime
+import random
+import numpy as np
+from datetime import timedelta
+
+class TestVectorizedStreakEngine(unittest.TestCase):
+    def setUp(self):
+        print("\nRunning setUp method..")
+        # Both engines work on the same fixed clock
+        self.now = datetime.datetime(2023, 5, 1, 12, 0, 0, 250000)
+        self.engine = StreakEngine(clock=lambda: self.now)
+        self.vectorized = VectorizedStreakEngine(clock=lambda: self.now)
+
+    def tearDown(self):
+        print("Running tear down method")
+
+    def test_tick_matches_streak_engine(self):
+        """
+        Test case for the same countdowns and transitions as the StreakEngine, also at the boundaries.
+        """
+        print("Running test_tick_matches_streak_engine")
+        random.seed(3)
+        offsets = [timedelta(0), timedelta(microseconds=1), timedelta(microseconds=-1), timedelta(seconds=1), timedelta(days=1),
+                   timedelta(days=400, seconds=86399, microseconds=999999)]
+        offsets += [timedelta(microseconds=random.randint(-10 ** 11, 10 ** 13)) for i in range(2000)]
+        rows = [DashboardRow(ID, 1, "Habit", 1, 1, "daily", self.now + offset, random.choice(['in progress', 'failed'])) for ID, offset in enumerate(offsets)]
+
+        expected = self.engine.tick(rows)
+        actual = self.vectorized.tick(rows)
+
+        self.assertEqual(actual.now, self.now)
+        self.assertEqual(actual.countdowns, expected.countdowns)
+        self.assertEqual(actual.transitions, expected.transitions)
+        self.assertEqual(actual.countdowns[5].text, "400d 23:59:59")
+        self.assertEqual(self.vectorized.tick([]).countdowns, [])
+
+    def test_countdown_arrays(self):
+        """
+        Test case for the countdowns of a datetime64 array, like the batch jobs use them.
+        """
+        print("Running test_countdown_arrays")
+        update_expiry = to_datetime64([self.now + timedelta(hours=25, seconds=1.5), self.now - timedelta(minutes=1), self.now - timedelta(days=2), None])
+
+        countdowns = self.vectorized.countdown_arrays(update_expiry, in_progress=[True, True, False, True])
+
+        # All rows are compared with the same now, a missing deadline counts as expired
+        self.assertEqual(countdowns.now, self.now)
+        np.testing.assert_allclose(countdowns.remaining_seconds[:3], [90001.5, -60, -172800])
+        self.assertEqual(countdowns.expired.tolist(), [False, True, True, True])
+        self.assertEqual(countdowns.texts.tolist(), ["1d 01:00:01", TIME_IS_UP, TIME_IS_UP, TIME_IS_UP])
+        self.assertEqual(countdowns.transitions.tolist(), [False, True, False, True])
+        # Without a status mask every expired row is a transition
+        self.assertEqual(self.vectorized.countdown_arrays(update_expiry).transitions.tolist(), [False, True, True, True])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+class TransactionConnection:
+    """
+    Wraps the pinned connection of a transaction. The MySQLDatabase methods commit after every statement,
+    inside a transaction these commits are skipped, so everything is committed once at the end.
+
+    Methods:
+        commit: Does nothing, the transaction commits once at the end.
+        rollback: Rolls back the transaction on the pinned connection.
+    """
+    def __init__(self, connection):
+        self._connection = connection
+
+    def commit(self):
+        # The transaction commits once when the with block ends
+        pass
+
+    def rollback(self):
+        self._connection.rollback()
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+class Transaction:
+    """
+    A unit of work on one pinned connection, created by MySQLDatabase.transaction().
+
+    While the transaction is open, every MySQLDatabase method called on the same thread runs on its connection and cursor
+    instead of connecting on its own, and the commits of the methods are skipped. The transaction is committed once when
+    the with block ends or rolled back if an exception is raised.
+
+        with db.transaction() as tx:
+            db.delete_active_habit(active_habits_ID, user_ID)
+            db.insert_data("active_user_habits", data)
+
+    Attributes:
+        connection: The pinned database connection.
+        cursor: The cursor which is shared by all statements of the transaction.
+        statements (int): The number of statements executed with execute.
+        depth (int): The number of nested with blocks, only the outermost one commits.
+
+    Methods:
+        __init__: Initializes the Transaction object.
+        execute: Executes a statement within the transaction.
+        commit: Commits all statements of the transaction.
+        rollback: Rolls back all statements of the transaction.
+    """
+    def __init__(self, connection, cursor):
+        """
+        Initializes a new Transaction object.
+
+        Args:
+            connection: The connection the transaction is pinned to.
+            cursor: The cursor of the connection.
+        """
+        self.connection = connection
+        self.cursor = cursor
+        self.statements = 0
+        self.depth = 1
+
+    def execute(self, query, params=()):
+        """
+        Executes a statement within the transaction.
+
+        Args:
+            query (str): The SQL statement with %s placeholders.
+            params (Optional[tuple]): The values of the placeholders.
+
+        Returns:
+            int: The number of changed rows.
+        """
+        self.cursor.execute(query, params)
+        self.statements += 1
+        return self.cursor.rowcount
+
+    def commit(self):
+        """
+        Commits all statements of the transaction.
+        """
+        self.connection.commit()
+
+    def rollback(self):
+        """
+        Rolls back all statements of the transaction.
+        """
+        self.connection.rollback()
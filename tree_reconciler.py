@@ -0,0 +1,86 @@
+class TreeReconciler:
+    """
+    Keeps a ttk.Treeview in sync with a list of rows by applying only the differences instead of clearing and refilling it.
+
+    Every row is keyed by a stable ID (e.g. active_habits_ID), which is used as the iid of the treeview item.
+    New rows are inserted, missing rows are deleted and changed rows are updated in place. If only one cell of a row changed
+    (e.g. the countdown) only that cell is set. Items which stay in the table keep their selection and the scroll position is kept.
+
+    Attributes:
+        tree (ttk.Treeview): The treeview which is kept in sync.
+        columns (tuple): The column identifiers of the treeview, used for updating single cells.
+
+    Methods:
+        __init__: Initializes the TreeReconciler object.
+        reconcile: Applies the differences between the displayed rows and the given rows to the treeview.
+        clear: Removes all rows which were inserted by the reconciler.
+    """
+    def __init__(self, tree, columns):
+        """
+        Initializes a new TreeReconciler object.
+
+        Args:
+            tree (ttk.Treeview): The treeview which is kept in sync.
+            columns (tuple): The column identifiers of the treeview in the order of the row values.
+        """
+        self.tree = tree
+        self.columns = tuple(columns)
+        self._rows = {}
+        self._order = []
+
+    def reconcile(self, rows):
+        """
+        Applies the differences between the displayed rows and the given rows to the treeview.
+
+        Args:
+            rows (list): The rows to be displayed as (key, values) tuples in the order they should be displayed.
+
+        Returns:
+            dict: The number of inserted, deleted and updated rows.
+        """
+        rows = [(str(key), tuple(values)) for key, values in rows]
+        keys = [key for key, values in rows]
+        stats = {'inserted': 0, 'deleted': 0, 'updated': 0}
+
+        # Delete the rows which aren't there any longer with one call
+        stale = set(self._rows) - set(keys)
+        if stale:
+            self.tree.delete(*stale)
+            for key in stale:
+                del self._rows[key]
+            self._order = [key for key in self._order if key not in stale]
+            stats['deleted'] = len(stale)
+
+        for key, values in rows:
+            old_values = self._rows.get(key)
+            if old_values is None:
+                # Insert new rows at the end, the order is fixed below if needed
+                self.tree.insert(parent="", index="end", iid=key, text="", values=values)
+                self._order.append(key)
+                stats['inserted'] += 1
+            elif old_values != values:
+                changed = [index for index, (old, new) in enumerate(zip(old_values, values)) if old != new]
+                if len(old_values) == len(values) and len(changed) == 1:
+                    # Only one cell changed, e.g. the countdown
+                    self.tree.set(key, column=self.columns[changed[0]], value=values[changed[0]])
+                else:
+                    self.tree.item(key, values=values)
+                stats['updated'] += 1
+            self._rows[key] = values
+
+        # Move rows only if the order differs from the displayed order
+        if self._order != keys:
+            for index, key in enumerate(keys):
+                self.tree.move(key, "", index)
+            self._order = keys
+
+        return stats
+
+    def clear(self):
+        """
+        Removes all rows which were inserted by the reconciler from the treeview.
+        """
+        if self._rows:
+            self.tree.delete(*self._rows)
+        self._rows = {}
+        self._order = []